@@ -0,0 +1,113 @@
+/*
+ * Live PDF download progress over Server-Sent Events.
+ *
+ * followPdfDownloads (a Dash clientside callback) keeps one EventSource open per
+ * project in the "pdf-download-project-id" store. Progress events are pushed into
+ * the "pdf-download-event-store" (at most every EVENT_FLUSH_MS) for rendering, and
+ * the status poll slows down to a fallback while all streams are connected.
+ * EventSource reconnects by itself and resumes with Last-Event-ID.
+ */
+(function () {
+    var FALLBACK_POLL_MS = 2000;      // Poll interval without (working) streams
+    var CONNECTED_POLL_MS = 15000;    // Poll interval while streams are connected
+    var EVENT_FLUSH_MS = 250;
+    var FINAL_STATUSES = ["completed", "error", "interrupted"];
+
+    var sources = {};   // project id -> EventSource
+    var pending = {};   // project id -> latest event data not yet pushed to Dash
+    var flushTimer = null;
+
+    function setProps(id, props) {
+        if (window.dash_clientside && window.dash_clientside.set_props) {
+            window.dash_clientside.set_props(id, props);
+        }
+    }
+
+    function allConnected() {
+        var ids = Object.keys(sources);
+        return ids.length > 0 && ids.every(function (id) {
+            return sources[id].readyState === EventSource.OPEN;
+        });
+    }
+
+    function updatePollInterval() {
+        setProps("pdf-download-progress-interval", {
+            interval: allConnected() ? CONNECTED_POLL_MS : FALLBACK_POLL_MS
+        });
+    }
+
+    function flush() {
+        flushTimer = null;
+        if (Object.keys(pending).length === 0) {
+            return;
+        }
+        setProps("pdf-download-event-store", {data: {events: pending, ts: Date.now()}});
+        pending = {};
+    }
+
+    function close(projectId) {
+        if (sources[projectId]) {
+            sources[projectId].close();
+            delete sources[projectId];
+        }
+    }
+
+    function onProgress(projectId, message) {
+        var data;
+        try {
+            data = JSON.parse(message.data);
+        } catch (e) {
+            return;
+        }
+        pending[projectId] = Object.assign({}, pending[projectId], data);
+        if (FINAL_STATUSES.indexOf(data.status) !== -1) {
+            // The poll callback fetches and renders the final report right away
+            close(projectId);
+            flush();
+            setProps("pdf-download-progress-interval", {n_intervals: Date.now(), interval: FALLBACK_POLL_MS});
+            return;
+        }
+        if (flushTimer === null) {
+            flushTimer = setTimeout(flush, EVENT_FLUSH_MS);
+        }
+    }
+
+    function open(projectId, baseUrl) {
+        var source = new EventSource(baseUrl + projectId);
+        ["snapshot", "doi", "status"].forEach(function (type) {
+            source.addEventListener(type, function (message) {
+                onProgress(projectId, message);
+            });
+        });
+        source.onopen = updatePollInterval;
+        source.onerror = function () {
+            if (source.readyState === EventSource.CLOSED) {
+                // 204 (nothing left to follow) or a failed proxy: polling takes over
+                delete sources[projectId];
+            }
+            updatePollInterval();
+        };
+        sources[projectId] = source;
+    }
+
+    window.dash_clientside = window.dash_clientside || {};
+    window.dash_clientside.harvest = Object.assign({}, window.dash_clientside.harvest, {
+        followPdfDownloads: function (activeProjects, baseUrl) {
+            if (typeof EventSource === "undefined" || !baseUrl) {
+                return FALLBACK_POLL_MS;
+            }
+            var wanted = Object.keys(activeProjects || {});
+            Object.keys(sources).forEach(function (id) {
+                if (wanted.indexOf(id) === -1) {
+                    close(id);
+                }
+            });
+            wanted.forEach(function (id) {
+                if (!sources[id]) {
+                    open(id, baseUrl);
+                }
+            });
+            return allConnected() ? CONNECTED_POLL_MS : FALLBACK_POLL_MS;
+        }
+    });
+})();
@@ -55,6 +55,14 @@ URL_BASE_PATHNAME = "/harvest/"  # Default: "/" for root deployment
 # Database Configuration
 DB_PATH = "harvest.db"  # Path to SQLite database file
 
+# Per-project database sharding (for very large multi-project deployments)
+# When enabled, each project's triples, sentences, batches and annotation statuses are
+# stored in their own SQLite file, so bulk imports or deletions in one project no longer
+# lock the others. Schema types, projects, admins and settings stay in DB_PATH.
+# Existing databases can be split with: python3 split_project_shards.py
+ENABLE_PROJECT_SHARDING = False  # Store per-project data in separate SQLite files
+PROJECT_SHARD_DIR = "project_shards"  # Shard directory (relative paths resolve next to DB_PATH)
+
 # API Configuration
 # Email required by Unpaywall API for PDF access checking
 # Please update this to your email address
@@ -70,6 +78,90 @@ HARVEST_CONTACT_EMAIL = "your-email@example.com"  # CHANGE THIS to your email
 # These emails will have admin access in addition to database admin_users
 ADMIN_EMAILS = ""  # Example: "admin@example.com,researcher@university.edu"
 
+# CrossRef API Client
+# All CrossRef calls share one pooled client with a process-wide rate limit.
+# Requests include HARVEST_CONTACT_EMAIL so they are served from CrossRef's polite pool;
+# the rate also adapts to the X-Rate-Limit headers CrossRef returns.
+CROSSREF_RATE_LIMIT_PER_SECOND = 10  # Max CrossRef requests per second (per process)
+CROSSREF_MAX_CONCURRENT_REQUESTS = 3  # Max simultaneous CrossRef requests (per process)
+CROSSREF_BATCH_SIZE = 50  # DOIs resolved per works query (filter=doi:...)
+
+# DOI Validation Cache
+# CrossRef validation results are cached in the database (shared by all backend workers)
+# with a bounded in-memory LRU in front. Invalid results expire sooner because newly
+# minted DOIs can take a while to appear in CrossRef.
+DOI_CACHE_POSITIVE_TTL = 2592000  # Seconds to trust a valid DOI result (30 days)
+DOI_CACHE_NEGATIVE_TTL = 3600  # Seconds to trust a "not found" result (1 hour)
+DOI_CACHE_MAX_MEMORY_ENTRIES = 10000  # Max DOIs kept in each worker's in-memory cache
+
+# DOI Metadata
+# CrossRef title/authors/year are stored per DOI so each DOI is fetched once, not once per
+# annotator. Entries older than the TTL are still served and refreshed in the background;
+# POST /api/admin/projects/<id>/prefetch-metadata warms the store for a whole project.
+DOI_METADATA_TTL = 2592000  # Seconds before stored metadata is refreshed (30 days)
+
+# Project Creation
+# New projects are created by a "project_creation" background job that validates the DOI
+# list in chunks and commits valid DOIs as each chunk completes; a retried job resumes
+# after the last committed chunk (progress: /api/admin/project-jobs/<id>)
+PROJECT_CREATION_CHUNK_SIZE = 50  # DOIs validated per chunk
+
+# Background Jobs
+# Long-running work (PDF downloads, project creation) is queued in the database and run by a worker that
+# holds a renewable lease on each job; jobs interrupted by a crash or restart resume
+# automatically. "embedded": every backend process runs a worker thread (single-server
+# setups, launch_harvest.py). "external": run `python3 harvest_worker.py` as its own
+# process/service (recommended with gunicorn).
+JOB_WORKER_MODE = "embedded"
+JOB_LEASE_SECONDS = 60  # A job is re-claimed this long after its worker stops heartbeating
+JOB_MAX_ATTEMPTS = 3  # Attempts before a job is marked failed
+JOB_RETRY_DELAY = 30  # Seconds before the first retry (doubles per attempt)
+JOB_POLL_INTERVAL = 2  # Seconds between queue polls when a worker is idle
+
+# PDF Retry Scheduler
+# DOIs whose download failed temporarily (timeouts, rate limits, server errors) are
+# queued in pdf_downloads.db (retry_queue) with exponential backoff, up to the
+# max_retry_attempts setting. Workers drain ready entries in small batches, only when
+# no job is waiting, and stop a batch early when one is queued.
+PDF_RETRY_SCHEDULER = True
+PDF_RETRY_INTERVAL = 60  # Seconds between checks of the retry queue by an idle worker
+PDF_RETRY_BATCH_SIZE = 20  # DOIs retried per batch
+PDF_RETRY_CONCURRENCY = 2  # DOIs retried in parallel (interactive jobs use PDF_DOWNLOAD_CONCURRENCY)
+PDF_RETRY_LEASE_SECONDS = 900  # A claimed retry is released to other workers after this long
+
+# Download Progress Stream (Server-Sent Events)
+# With PROGRESS_STREAM_ENABLED the admin panel follows PDF downloads over an SSE stream
+# and only polls the status endpoint as a fallback. Each open stream holds a worker in
+# both the backend and the frontend (which proxies it) for up to PROGRESS_STREAM_MAX_SECONDS,
+# so with gunicorn's default sync workers (`-w 4`) a few open admin panels block every
+# other request. Only enable it when both services run a threaded worker class, e.g.
+# `gunicorn -w 4 --worker-class gthread --threads 16` (see docs/DEPLOYMENT_GUIDE.md).
+# Disabled, the stream endpoints answer 503 and the panel polls every 2 seconds.
+# Set HARVEST_PROGRESS_STREAM=true for both services to override.
+PROGRESS_STREAM_ENABLED = False
+PROGRESS_STREAM_POLL_INTERVAL = 0.5  # Seconds between checks for new progress events
+PROGRESS_STREAM_KEEPALIVE = 15  # Seconds between keep-alive comments on an idle stream
+PROGRESS_STREAM_MAX_SECONDS = 300  # Close streams after this long (clients reconnect)
+
+# API Response Layer (opt-in)
+# Large responses (/api/rows with up to MAX_BROWSE_LIMIT rows, /api/projects, exports)
+# are serialized with orjson when RESPONSE_FAST_JSON is enabled and `orjson` is installed,
+# and compressed (brotli if the `brotli` package is installed, otherwise gzip) when the
+# client accepts it. Enable compression in internal mode; behind nginx, let nginx gzip.
+# Serialization/compression time is reported in the Server-Timing response header.
+RESPONSE_FAST_JSON = False  # Override with HARVEST_FAST_JSON=true
+RESPONSE_COMPRESSION = False  # Override with HARVEST_RESPONSE_COMPRESSION=true
+RESPONSE_COMPRESSION_MIN_BYTES = 1024  # Smaller responses are sent uncompressed
+
+# Metrics (Prometheus)
+# When enabled, the backend records per-route latency histograms, SQL queries/time per
+# request and outgoing HTTP latency per host, exported at /metrics in Prometheus text
+# format. With several gunicorn workers, point METRICS_MULTIPROC_DIR at a directory
+# writable by all workers so /metrics aggregates them. /metrics is unauthenticated:
+# restrict it at the reverse proxy (or firewall) in public deployments.
+ENABLE_METRICS = False  # Override with HARVEST_ENABLE_METRICS=true
+METRICS_MULTIPROC_DIR = ""  # e.g. "/var/lib/harvest/metrics"; override with HARVEST_METRICS_DIR
+
 # PDF Storage Configuration
 PDF_STORAGE_DIR = "project_pdfs"  # Directory for storing project PDFs
 
@@ -80,6 +172,16 @@ ENABLE_PDF_HIGHLIGHTING = False  # Enable PDF highlighting/annotation feature in
 ENABLE_LITERATURE_SEARCH = True  # Enable Literature Search tab (requires admin authentication)
 ENABLE_OTP_VALIDATION = False  # Enable OTP email verification for annotations (prevents fake emails)
 
+# Literature Search Jobs
+# Searches run as "literature_search" background jobs (POST /api/literature/search returns a
+# job id that the frontend polls), so they no longer block a frontend worker. Results are
+# cached in the database by normalized query, sources, limits and pipeline options, shared by
+# all users and backend workers. Searches that build on earlier session results are not cached.
+# In embedded mode this many extra worker threads only run searches, so they do not wait
+# behind PDF downloads; with external workers run `harvest_worker.py --job-type literature_search`.
+LITERATURE_SEARCH_WORKERS = 2
+LITERATURE_SEARCH_CACHE_TTL = 86400  # Seconds a cached search result is reused (1 day)
+
 # Literature Review Configuration (ASReview Integration)
 # ASReview provides AI-powered systematic review with active learning
 # This feature helps researchers efficiently screen and shortlist papers
@@ -161,6 +263,101 @@ PDF_SMART_RETRY_BASE_DELAY_MINUTES = 60  # Base delay before first retry (uses e
 PDF_RATE_LIMIT_DELAY_SECONDS = 1  # Delay between API requests to respect rate limits
 PDF_CLEANUP_RETENTION_DAYS = 90  # Days to keep download attempt history before cleanup
 
+# Concurrent Downloads
+# A download job works on several DOIs at once. Instead of sleeping between requests, each
+# upstream host gets its own limits: requests in flight (concurrency) and request starts per
+# second (rps). Hosts not listed use PDF_HOST_CONCURRENCY and one request per
+# rate_limit_delay_seconds (set in the PDF download database, default 1 second).
+# Lookups are keyed by the source's API host, publisher_direct by "publisher:<DOI prefix>"
+# (e.g. "publisher:10.1371"), and PDF file downloads by the host of the PDF URL.
+PDF_DOWNLOAD_CONCURRENCY = 8  # DOIs downloaded in parallel per job
+PDF_HOST_CONCURRENCY = 2  # Default max simultaneous requests per host
+PDF_HOST_LIMITS = {
+    "api.unpaywall.org": {"concurrency": 4, "rps": 5},
+    "www.ebi.ac.uk": {"concurrency": 4, "rps": 5},
+    "www.ncbi.nlm.nih.gov": {"concurrency": 2, "rps": 3},  # NCBI limit without an API key
+    "api.semanticscholar.org": {"concurrency": 1, "rps": 1},  # Shared unauthenticated pool
+    "api.core.ac.uk": {"concurrency": 1, "rps": 0.5},
+    "export.arxiv.org": {"concurrency": 1, "rps": 0.33},  # arXiv asks for one request per 3 seconds
+}
+
+# Source racing within a DOI
+# How download_pdf_smart queries the ranked sources for one DOI:
+#   "serial"   - one source at a time, in ranking order
+#   "parallel" - up to PDF_SOURCE_RACE_WIDTH sources at once
+#   "hedged"   - start with the best-ranked source and start the next one when the
+#                newest lookup has not answered within that source's median (p50)
+#                latency, or as soon as a lookup fails; at most PDF_SOURCE_RACE_WIDTH at once
+# The first PDF URL that downloads wins; sources not yet started are skipped.
+PDF_SOURCE_RACE_MODE = "hedged"
+PDF_SOURCE_RACE_WIDTH = 3
+PDF_SOURCE_HEDGE_DELAY_MS = 3000  # Hedge delay for sources without latency history
+
+# Pooled HTTP sessions (http_sessions.py)
+# PDF lookups and downloads reuse keep-alive connections through one session per host,
+# with a connection pool of PDF_DOWNLOAD_CONCURRENCY connections. Connection errors and
+# 5xx responses are retried PDF_HTTP_RETRIES times with backoff (read timeouts are not).
+PDF_HTTP_RETRIES = 2
+
+# PDF URL resolution cache
+# The last working PDF URL of every DOI is kept in pdf_downloads.db (pdf_url_cache) and
+# tried before any source lookup, for any project. URLs verified within PDF_URL_CACHE_TTL
+# seconds are downloaded directly; older ones are first revalidated with a conditional
+# HEAD request (If-None-Match). URLs that fail are evicted and the DOI is resolved again.
+PDF_URL_CACHE_TTL = 7 * 24 * 3600  # 7 days
+
+# Shared PDF store (pdf_store.py)
+# Each distinct PDF (by sha256 of its bytes) is stored once under PDF_STORAGE_DIR/.blobs;
+# project files are hard links (or reflinks) to it, and a DOI already stored for one
+# project is linked into the next instead of downloaded. Convert existing project
+# directories with: python3 scripts/dedupe_pdf_store.py
+PDF_BLOB_STORE_ENABLED = True
+
+# Download attempt logging (pdf_download_db.py)
+# Attempts are buffered in memory and written by a background thread, one transaction
+# per batch of up to PDF_ATTEMPT_BATCH_SIZE attempts or every PDF_ATTEMPT_FLUSH_INTERVAL
+# seconds; source_performance aggregates are updated in the same transaction.
+# Set PDF_ATTEMPT_BUFFERING = False to write each attempt immediately.
+PDF_ATTEMPT_BUFFERING = True
+PDF_ATTEMPT_BATCH_SIZE = 200
+PDF_ATTEMPT_FLUSH_INTERVAL = 1.0  # seconds
+PDF_ATTEMPT_BUFFER_SIZE = 10000  # attempts held in memory before logging blocks
+
+# Source ordering (source_ranking.py)
+# "thompson": sources are ordered per DOI prefix by expected cost to success (latency /
+#   success probability), sampling the success probability from time-decayed statistics
+#   per (source, DOI prefix), so sources that stopped working drop and new ones get tried
+# "success_rate": the previous global order by lifetime success rate, with the publisher's
+#   best source tried first
+PDF_SOURCE_ORDERING = "thompson"
+PDF_SOURCE_STATS_HALF_LIFE_DAYS = 30  # an observation counts half after this many days
+PDF_SOURCE_RANKING_REFRESH_SECONDS = 30  # statistics are reloaded from the database this often
+PDF_SOURCE_PRIOR_WEIGHT = 2.0  # pseudo-observations a source's overall record lends to a new prefix
+PDF_SOURCE_DEFAULT_LATENCY_MS = 3000  # assumed lookup time of a source never timed
+
+# Sources that (almost) never have a publisher's papers - by their not_found/paywall
+# answers for its DOI prefix - are skipped for that prefix once the upper bound of their
+# hit rate there is below PDF_SOURCE_SUPPRESS_MAX_HIT_RATE (about 75 answers without a
+# hit). They are still re-probed for PDF_SOURCE_REPROBE_RATE of the publisher's DOIs.
+PDF_SOURCE_SUPPRESSION = True
+PDF_SOURCE_SUPPRESS_MAX_HIT_RATE = 0.05
+PDF_SOURCE_REPROBE_RATE = 0.05
+
+# Source health (source_health.py)
+# A source whose lookups time out, fail to connect or get 5xx answers
+# PDF_BREAKER_FAILURE_THRESHOLD times in a row is skipped (circuit open) for
+# PDF_BREAKER_OPEN_SECONDS; then one probe lookup is let through (half-open). A failed
+# probe doubles the open time, up to PDF_BREAKER_MAX_OPEN_SECONDS. Breaker states are
+# shown at /api/admin/pdf-analytics/circuit-breakers.
+PDF_BREAKER_FAILURE_THRESHOLD = 5
+PDF_BREAKER_OPEN_SECONDS = 60
+PDF_BREAKER_MAX_OPEN_SECONDS = 900
+# Lookup timeouts adapt to each source's recent latency: PDF_SOURCE_TIMEOUT_MULTIPLIER x
+# its p95, at least PDF_SOURCE_MIN_TIMEOUT seconds and at most the source's configured
+# timeout (sources table)
+PDF_SOURCE_TIMEOUT_MULTIPLIER = 2.0
+PDF_SOURCE_MIN_TIMEOUT = 3.0  # seconds
+
 # User Agent Rotation
 # Rotate User-Agent headers to avoid being blocked by some sources
 PDF_USER_AGENT_ROTATION = True  # Enable rotating User-Agent strings
@@ -204,3 +401,12 @@ PARTNER_LOGOS = [
 # Debug Configuration
 # Enable verbose logging for troubleshooting (DO NOT enable in production - fills logs!)
 ENABLE_DEBUG_LOGGING = False  # Set to True only for debugging specific issues
+
+# Frontend Bytecode Caching
+# "checked": keep .pyc files for the frontend package as checked hash-based pycs (PEP 552),
+#   validated against the source hash on every import, and verify the callback registry
+#   against the one recorded for the same sources. Restarts skip recompiling the
+#   frontend without serving stale callbacks.
+# "off": write no bytecode and clear existing .pyc files (previous behaviour).
+# Override with HARVEST_FRONTEND_BYTECODE; HARVEST_CLEAR_CACHE or PYTHONDONTWRITEBYTECODE force "off".
+FRONTEND_BYTECODE_MODE = "checked"
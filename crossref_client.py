@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared CrossRef API client for HARVEST.
+
+All CrossRef traffic from a process goes through one client so that:
+- HTTP connections are pooled and reused (one requests.Session)
+- a process-wide token bucket keeps us within the polite-pool rate limits
+  (and adapts to the X-Rate-Limit-* headers CrossRef returns)
+- transient failures (429, 5xx, timeouts) are retried with jittered backoff
+- many DOIs are resolved per request via the works `filter=doi:` query
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Import configuration
+try:
+    from config import HARVEST_CONTACT_EMAIL
+except ImportError:
+    HARVEST_CONTACT_EMAIL = ""
+
+try:
+    from config import (
+        CROSSREF_RATE_LIMIT_PER_SECOND, CROSSREF_MAX_CONCURRENT_REQUESTS, CROSSREF_BATCH_SIZE
+    )
+except ImportError:
+    CROSSREF_RATE_LIMIT_PER_SECOND = 10
+    CROSSREF_MAX_CONCURRENT_REQUESTS = 3
+    CROSSREF_BATCH_SIZE = 50
+
+HARVEST_CONTACT_EMAIL = os.environ.get("HARVEST_CONTACT_EMAIL", HARVEST_CONTACT_EMAIL)
+
+CROSSREF_API_BASE = "https://api.crossref.org"
+NOT_FOUND_REASON = "DOI not found in CrossRef database"
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Fields needed for validation and the metadata shown in the UI
+WORK_SELECT_FIELDS = "DOI,title,author,published-print,published-online"
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate: float) -> None:
+        with self._lock:
+            self.rate = max(0.1, float(rate))
+            self.capacity = max(1.0, self.rate)
+            self._tokens = min(self._tokens, self.capacity)
+
+    def acquire(self) -> None:
+        """Block until a token is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def parse_work_metadata(message: dict) -> Dict[str, str]:
+    """Extract title, authors and year from a CrossRef work message."""
+    title = message.get("title", [""])[0] if message.get("title") else ""
+
+    authors = []
+    for author in message.get("author", []):
+        given = author.get("given", "")
+        family = author.get("family", "")
+        if given and family:
+            authors.append(f"{given} {family}")
+        elif family:
+            authors.append(family)
+
+    year = ""
+    for date_field in ("published-print", "published-online"):
+        if message.get(date_field):
+            date_parts = message[date_field].get("date-parts", [[]])
+            if date_parts and date_parts[0]:
+                year = str(date_parts[0][0])
+            break
+
+    return {
+        "title": title,
+        "authors": ", ".join(authors) if authors else "",
+        "year": year,
+    }
+
+
+class CrossRefClient:
+    """Pooled, rate-limited CrossRef client (use get_crossref_client() for the shared instance)."""
+
+    def __init__(self, mailto: str = "", rate_per_second: float = CROSSREF_RATE_LIMIT_PER_SECOND,
+                 max_concurrent: int = CROSSREF_MAX_CONCURRENT_REQUESTS, max_retries: int = 3,
+                 backoff_base: float = 0.5, batch_size: int = CROSSREF_BATCH_SIZE):
+        self.mailto = mailto
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.batch_size = max(1, batch_size)
+        self.max_rate = float(rate_per_second)
+        self.bucket = TokenBucket(rate_per_second)
+        self._concurrency = threading.BoundedSemaphore(max(1, max_concurrent))
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_concurrent),
+                                            thread_name_prefix="crossref")
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(4, max_concurrent * 2))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        user_agent = "HARVEST/1.0 (https://github.com/MDSharma/HARVEST"
+        user_agent += f"; mailto:{mailto})" if mailto else ")"
+        self.session.headers.update({"Accept": "application/json", "User-Agent": user_agent})
+
+    def _adapt_rate(self, response: requests.Response) -> None:
+        """Follow the rate limit CrossRef advertises (never above our configured maximum)."""
+        try:
+            limit = int(response.headers.get("X-Rate-Limit-Limit", 0))
+            interval = response.headers.get("X-Rate-Limit-Interval", "1s")
+            seconds = float(interval.rstrip("s") or 1)
+        except (TypeError, ValueError):
+            return
+        if limit > 0 and seconds > 0:
+            new_rate = min(limit / seconds, self.max_rate)
+            if abs(new_rate - self.bucket.rate) > 1e-6:
+                self.bucket.set_rate(new_rate)
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> None:
+        if retry_after:
+            try:
+                time.sleep(min(float(retry_after), 30))
+                return
+            except ValueError:
+                pass
+        delay = self.backoff_base * (2 ** attempt)
+        time.sleep(random.uniform(0, delay))  # full jitter
+
+    def get(self, path: str, params: Optional[dict] = None, timeout: float = 10) -> requests.Response:
+        """
+        GET a CrossRef API path with rate limiting and retries.
+        Returns the final response (which may still be an error status);
+        raises requests exceptions if every attempt failed at the network level.
+        """
+        params = dict(params or {})
+        if self.mailto:
+            params.setdefault("mailto", self.mailto)
+        url = f"{CROSSREF_API_BASE}{path}"
+
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                with self._concurrency:
+                    response = self.session.get(url, params=params, timeout=timeout)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                if attempt >= self.max_retries:
+                    raise
+                logger.debug(f"[CrossRef] {type(e).__name__} on {path}, retrying (attempt {attempt + 1})")
+                self._backoff(attempt)
+                continue
+
+            self._adapt_rate(response)
+            if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                logger.debug(f"[CrossRef] HTTP {response.status_code} on {path}, retrying (attempt {attempt + 1})")
+                self._backoff(attempt, response.headers.get("Retry-After"))
+                continue
+            return response
+        return response
+
+    def get_work(self, doi: str, timeout: float = 10) -> Tuple[int, Optional[dict]]:
+        """
+        Fetch a single work.
+        Returns: (http_status, message) - message is None unless status is 200
+        """
+        response = self.get(f"/works/{doi}", timeout=timeout)
+        if response.status_code == 200:
+            return 200, response.json().get("message", {})
+        return response.status_code, None
+
+    def lookup_works(self, dois: List[str], timeout: float = 20) -> Dict[str, dict]:
+        """
+        Resolve many DOIs with one works query (`filter=doi:a,doi:b,...`).
+        Returns: {lowercase_doi: message} for the DOIs CrossRef knows; DOIs absent from
+        the result are not registered with CrossRef. Raises on request failure.
+        """
+        if not dois:
+            return {}
+        params = {
+            "filter": ",".join(f"doi:{doi}" for doi in dois),
+            "rows": len(dois),
+            "select": WORK_SELECT_FIELDS,
+        }
+        response = self.get("/works", params=params, timeout=timeout)
+        response.raise_for_status()
+        items = response.json().get("message", {}).get("items", [])
+        return {item.get("DOI", "").lower(): item for item in items if item.get("DOI")}
+
+    def _validate_batch(self, dois: List[str]) -> Dict[str, Tuple[bool, str, bool]]:
+        """Validate one batch; falls back to per-DOI lookups if the batch query fails."""
+        try:
+            found = self.lookup_works(dois)
+            return {doi: (True, "", True) if doi in found else (False, NOT_FOUND_REASON, True)
+                    for doi in dois}
+        except Exception as e:
+            logger.warning(f"[CrossRef] Batch lookup of {len(dois)} DOIs failed ({e}), checking individually")
+
+        results = {}
+        for doi in dois:
+            results[doi] = self.validate_doi(doi)
+        return results
+
+    def validate_doi(self, doi: str, timeout: float = 5) -> Tuple[bool, str, bool]:
+        """
+        Validate a single normalized DOI.
+        Returns: (is_valid, reason, definitive) - definitive is False for errors worth retrying later
+        """
+        try:
+            status, _ = self.get_work(doi, timeout=timeout)
+        except requests.exceptions.Timeout:
+            return (False, "CrossRef API timeout", False)
+        except requests.exceptions.RequestException as e:
+            return (False, f"Network error: {str(e)}", False)
+        except Exception as e:
+            return (False, f"Validation error: {str(e)}", False)
+        if status == 200:
+            return (True, "", True)
+        if status == 404:
+            return (False, NOT_FOUND_REASON, True)
+        return (False, f"CrossRef validation failed (HTTP {status})", False)
+
+    def validate_dois(self, dois: List[str]) -> Dict[str, Tuple[bool, str, bool]]:
+        """
+        Validate many normalized DOIs using batched works queries, fanned out over the
+        client's shared worker pool (bounded by the concurrency limit).
+        Returns: {doi: (is_valid, reason, definitive)}
+        """
+        unique = list(dict.fromkeys(dois))
+        # DOIs containing commas cannot be expressed in a filter query
+        batchable = [d for d in unique if "," not in d]
+        single = [d for d in unique if "," in d]
+
+        results = {}
+        batches = [batchable[i:i + self.batch_size] for i in range(0, len(batchable), self.batch_size)]
+        for batch_result in self._executor.map(self._validate_batch, batches):
+            results.update(batch_result)
+        for doi in single:
+            results[doi] = self.validate_doi(doi)
+        return results
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_crossref_client() -> CrossRefClient:
+    """Return the process-wide CrossRef client."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            # Only join the polite pool with a real contact address (not the config placeholder)
+            mailto = HARVEST_CONTACT_EMAIL if "@" in HARVEST_CONTACT_EMAIL else ""
+            if mailto.endswith("@example.com"):
+                mailto = ""
+            _client = CrossRefClient(mailto=mailto)
+        return _client
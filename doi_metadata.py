@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Stored CrossRef metadata (title, authors, year) for DOIs.
+
+Metadata lives in the doi_crossref_metadata table, so each DOI is fetched from
+CrossRef once for all annotators and backend workers. Reads are
+stale-while-revalidate:
+
+- fresh entries (younger than DOI_METADATA_TTL) are returned as they are
+- stale entries are returned immediately and queued for a background refresh
+- only DOIs never fetched before wait for CrossRef
+
+prefetch_doi_metadata() fetches many DOIs with batched works queries; the
+doi_metadata_prefetch job in harvest_worker uses it to warm a whole project.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from crossref_client import get_crossref_client, parse_work_metadata
+from harvest_store import get_cached_doi_metadata, store_doi_metadata
+
+logger = logging.getLogger(__name__)
+
+# Import configuration
+try:
+    from config import DOI_METADATA_TTL
+except ImportError:
+    DOI_METADATA_TTL = 2592000
+
+
+def _public(entry: dict) -> Dict[str, str]:
+    return {"title": entry["title"], "authors": entry["authors"], "year": entry["year"]}
+
+
+class MetadataRefresher:
+    """Refreshes stale metadata from a daemon thread, one batched works query at a time."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._pending = []
+        self._queued = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def schedule(self, dois: List[str]) -> None:
+        """Queue DOIs for a refresh (DOIs already queued are not added twice)."""
+        with self._lock:
+            for doi in dois:
+                if doi not in self._queued:
+                    self._queued.add(doi)
+                    self._pending.append(doi)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True, name="doi-metadata-refresher")
+                self._thread.start()
+        self._wake.set()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def _take_batch(self) -> List[str]:
+        with self._lock:
+            batch = self._pending[:get_crossref_client().batch_size]
+            del self._pending[:len(batch)]
+            if not self._pending:
+                self._wake.clear()
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            batch = self._take_batch()
+            if not batch:
+                continue
+            try:
+                prefetch_doi_metadata(self.db_path, batch, max_age=0)
+            except Exception as e:
+                logger.warning(f"[DOI Metadata] Background refresh of {len(batch)} DOIs failed: {e}")
+            finally:
+                with self._lock:
+                    self._queued.difference_update(batch)
+
+
+_refreshers: Dict[str, MetadataRefresher] = {}
+_refreshers_lock = threading.Lock()
+
+
+def get_refresher(db_path: str) -> MetadataRefresher:
+    """Return the process-wide refresher for a database."""
+    with _refreshers_lock:
+        if db_path not in _refreshers:
+            _refreshers[db_path] = MetadataRefresher(db_path)
+        return _refreshers[db_path]
+
+
+def get_doi_metadata(db_path: str, doi: str) -> Tuple[int, Optional[Dict[str, str]]]:
+    """
+    Metadata for one normalized DOI, from the store when possible.
+    Returns: (http_status, metadata) like CrossRefClient.get_work - metadata is None
+    unless status is 200. Raises requests exceptions if CrossRef could not be reached.
+    """
+    entry = get_cached_doi_metadata(db_path, [doi]).get(doi)
+    if entry:
+        if time.time() - entry["fetched_at"] >= DOI_METADATA_TTL:
+            get_refresher(db_path).schedule([doi])
+        return 200, _public(entry)
+
+    status, message = get_crossref_client().get_work(doi)
+    if status != 200:
+        return status, None
+    metadata = parse_work_metadata(message)
+    store_doi_metadata(db_path, [(doi, metadata)])
+    return 200, metadata
+
+
+def prefetch_doi_metadata(db_path: str, dois: List[str], max_age: float = DOI_METADATA_TTL,
+                          progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, int]:
+    """
+    Fetch and store metadata for normalized DOIs that have none or only older than max_age.
+    progress_callback(done, total) is called after each batch.
+    Returns counts: {"total", "cached", "fetched", "not_found", "failed"}
+    """
+    unique = list(dict.fromkeys(dois))
+    now = time.time()
+    cached = get_cached_doi_metadata(db_path, unique)
+    todo = [doi for doi in unique if doi not in cached or now - cached[doi]["fetched_at"] >= max_age]
+    counts = {"total": len(unique), "cached": len(unique) - len(todo), "fetched": 0, "not_found": 0, "failed": 0}
+
+    client = get_crossref_client()
+    # DOIs containing commas cannot be expressed in a filter query
+    batches = [[doi] for doi in todo if "," in doi]
+    batchable = [doi for doi in todo if "," not in doi]
+    batches += [batchable[i:i + client.batch_size] for i in range(0, len(batchable), client.batch_size)]
+
+    done = 0
+    for batch in batches:
+        try:
+            if len(batch) == 1:
+                status, message = client.get_work(batch[0])
+                if status not in (200, 404):
+                    raise RuntimeError(f"HTTP {status}")
+                found = {batch[0]: message} if status == 200 else {}
+            else:
+                found = client.lookup_works(batch)
+            store_doi_metadata(db_path, [(doi, parse_work_metadata(found[doi])) for doi in batch if doi in found])
+            counts["fetched"] += sum(1 for doi in batch if doi in found)
+            counts["not_found"] += sum(1 for doi in batch if doi not in found)
+        except Exception as e:
+            logger.warning(f"[DOI Metadata] Fetching {len(batch)} DOIs failed: {e}")
+            counts["failed"] += len(batch)
+        done += len(batch)
+        if progress_callback:
+            progress_callback(done, len(todo))
+    return counts
+
+
+def get_metadata_coverage(db_path: str, dois: List[str]) -> Dict[str, int]:
+    """How many of the DOIs have stored metadata, and how many of those are stale."""
+    unique = list(dict.fromkeys(dois))
+    now = time.time()
+    cached = get_cached_doi_metadata(db_path, unique)
+    return {
+        "total": len(unique),
+        "cached": len(cached),
+        "stale": sum(1 for entry in cached.values() if now - entry["fetched_at"] >= DOI_METADATA_TTL),
+    }
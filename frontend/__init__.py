@@ -3,32 +3,51 @@
 HARVEST Frontend Package
 Modular Dash application for HARVEST triple annotation interface.
 """
-# IMPORTANT: Clear bytecode cache BEFORE any other imports to prevent stale callback issues
+# IMPORTANT: Set up bytecode caching BEFORE any other imports to prevent stale callback issues
 # This must run before Dash imports to ensure clean callback registration
 import os
 import sys
 import glob
 import shutil
 
-# Clear bytecode cache if requested or if .pyc files exist that might be stale
-# This prevents Dash from loading old callback definitions
+# Bytecode mode for this package:
+# - "checked" (default): keep .pyc files, compiled as checked hash-based pycs that Python
+#   validates against the source on every import (see frontend/bytecode.py), so restarts
+#   skip recompiling callbacks.py/layout.py without risking stale callbacks
+# - "off": write no bytecode and clear existing .pyc files (previous behaviour)
+# HARVEST_CLEAR_CACHE or PYTHONDONTWRITEBYTECODE select "off".
+try:
+    from config import FRONTEND_BYTECODE_MODE
+except ImportError:
+    FRONTEND_BYTECODE_MODE = "checked"
+FRONTEND_BYTECODE_MODE = os.getenv("HARVEST_FRONTEND_BYTECODE", FRONTEND_BYTECODE_MODE).lower()
+if FRONTEND_BYTECODE_MODE not in ("checked", "off"):
+    raise ValueError(f"Invalid FRONTEND_BYTECODE_MODE: {FRONTEND_BYTECODE_MODE}. Must be 'checked' or 'off'")
+
 _module_dir = os.path.dirname(os.path.abspath(__file__))
 _pycache_dir = os.path.join(_module_dir, "__pycache__")
 _should_clear = (
     os.getenv('HARVEST_CLEAR_CACHE', '').lower() in ('true', '1', 'yes') or
     os.getenv('PYTHONDONTWRITEBYTECODE', '').lower() in ('true', '1', 'yes')
 )
+if _should_clear:
+    FRONTEND_BYTECODE_MODE = "off"
 
-if _should_clear and os.path.exists(_pycache_dir):
-    # Clear this module's cache directory
-    for cache_file in glob.glob(os.path.join(_pycache_dir, "*.pyc")):
-        try:
-            os.remove(cache_file)
-        except (OSError, PermissionError):
-            pass  # Silently continue if clearing individual file fails
+if FRONTEND_BYTECODE_MODE == "checked":
+    from frontend.bytecode import ensure_checked_pycs
+    ensure_checked_pycs(_module_dir)
+else:
+    if os.path.exists(_pycache_dir):
+        # Clear this module's cache directory
+        # This prevents Dash from loading old callback definitions
+        for cache_file in glob.glob(os.path.join(_pycache_dir, "*.pyc")):
+            try:
+                os.remove(cache_file)
+            except (OSError, PermissionError):
+                pass  # Silently continue if clearing individual file fails
 
-# Prevent bytecode generation for this session
-sys.dont_write_bytecode = True
+    # Prevent bytecode generation for this session
+    sys.dont_write_bytecode = True
 
 import logging
 import dash
@@ -78,6 +97,14 @@ BACKEND_PUBLIC_URL = os.getenv("HARVEST_BACKEND_PUBLIC_URL", BACKEND_PUBLIC_URL)
 URL_BASE_PATHNAME = os.getenv("HARVEST_URL_BASE_PATHNAME", URL_BASE_PATHNAME)
 ASREVIEW_SERVICE_URL = os.getenv("ASREVIEW_SERVICE_URL", ASREVIEW_SERVICE_URL)
 
+# Live download progress over SSE holds a worker per open stream (see config.py);
+# without it the admin panel polls the status endpoint
+try:
+    from config import PROGRESS_STREAM_ENABLED
+except ImportError:
+    PROGRESS_STREAM_ENABLED = False
+PROGRESS_STREAM_ENABLED = os.getenv("HARVEST_PROGRESS_STREAM", str(PROGRESS_STREAM_ENABLED)).lower() in ('true', '1', 'yes')
+
 # Validate deployment mode
 if DEPLOYMENT_MODE not in ["internal", "nginx"]:
     raise ValueError(f"Invalid DEPLOYMENT_MODE: {DEPLOYMENT_MODE}. Must be 'internal' or 'nginx'")
@@ -123,8 +150,11 @@ API_SAVE = f"{API_BASE}/api/save"
 API_RECENT = f"{API_BASE}/api/recent"
 API_VALIDATE_DOI = f"{API_BASE}/api/validate-doi"
 API_ADMIN_AUTH = f"{API_BASE}/api/admin/auth"
+API_ADMIN_LOGOUT = f"{API_BASE}/api/admin/logout"
 API_PROJECTS = f"{API_BASE}/api/projects"
 API_ADMIN_PROJECTS = f"{API_BASE}/api/admin/projects"
+API_ADMIN_PROJECT_JOBS = f"{API_BASE}/api/admin/project-jobs"
+API_LITERATURE_SEARCH = f"{API_BASE}/api/literature/search"
 API_ADMIN_TRIPLE = f"{API_BASE}/api/admin/triple"
 API_BROWSE_FIELDS = f"{API_BASE}/api/browse-fields"
 API_ADMIN_BROWSE_FIELDS = f"{API_BASE}/api/admin/browse-fields"
@@ -385,4 +415,17 @@ def validate_callback_map():
 # Run callback validation after all callbacks are registered
 validate_callback_map()
 
+# Fingerprint the callback registry; in checked mode, a registry that differs from the
+# one recorded for the same sources means stale bytecode
+from frontend.bytecode import callback_registry_fingerprint, verify_callback_registry
+if FRONTEND_BYTECODE_MODE == "checked":
+    CALLBACK_FINGERPRINT = verify_callback_registry(
+        app, _module_dir,
+        strict=os.getenv('HARVEST_STRICT_CALLBACK_CHECKS', 'true').lower() in ('true', '1', 'yes'),
+    )
+else:
+    CALLBACK_FINGERPRINT = callback_registry_fingerprint(app)
+logger.info(f"Callback registry fingerprint {CALLBACK_FINGERPRINT[:12]} ({len(app.callback_map)} callbacks, "
+            f"bytecode mode: {FRONTEND_BYTECODE_MODE})")
+
 logger.info("HARVEST frontend initialized successfully")
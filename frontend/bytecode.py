@@ -0,0 +1,147 @@
+# frontend/bytecode.py
+"""
+Bytecode caching for the frontend package without stale callbacks.
+
+Timestamp-based .pyc files are trusted whenever the source mtime and size
+match, which deployments that preserve mtimes (or edit within the same second)
+can defeat - the stale-callback bug. Instead the package is compiled to
+checked hash-based pycs (PEP 552): Python hashes the source on every import
+and recompiles when it changed, so restarts reuse bytecode safely.
+
+As a second guard, a fingerprint of the registered callbacks is stored next to
+the bytecode, keyed by a digest of the package sources. The same sources must
+always produce the same callback registry; if they do not, the bytecode cache
+is cleared and startup fails so the next start compiles from source.
+"""
+import glob
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import py_compile
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_RECORD = "callback_registry.json"
+
+# Flags word of a checked hash-based pyc (PEP 552): hash-based | check_source
+_CHECKED_HASH_FLAGS = 0b11
+
+
+def _source_files(package_dir: str):
+    return sorted(glob.glob(os.path.join(package_dir, "*.py")))
+
+
+def is_checked_pyc(source_path: str) -> bool:
+    """True if the cached pyc for source_path exists, is current for this Python and is checked hash-based."""
+    try:
+        with open(importlib.util.cache_from_source(source_path), "rb") as f:
+            header = f.read(8)
+    except OSError:
+        return False
+    return (len(header) == 8 and header[:4] == importlib.util.MAGIC_NUMBER
+            and int.from_bytes(header[4:8], "little") == _CHECKED_HASH_FLAGS)
+
+
+def ensure_checked_pycs(package_dir: str) -> int:
+    """
+    Compile the package's modules to checked hash-based pycs where they are missing
+    or timestamp-based. Once converted, the import system keeps them hash-based.
+    Returns the number of modules compiled.
+    """
+    compiled = 0
+    for source_path in _source_files(package_dir):
+        if is_checked_pyc(source_path):
+            continue
+        try:
+            py_compile.compile(source_path, doraise=True,
+                               invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH)
+            compiled += 1
+        except (py_compile.PyCompileError, OSError) as e:
+            # Read-only installs still work, they just compile on every start
+            logger.warning(f"Could not write checked bytecode for {source_path}: {e}")
+    if compiled:
+        logger.info(f"Compiled {compiled} frontend modules to checked hash-based bytecode")
+    return compiled
+
+
+def sources_digest(package_dir: str) -> str:
+    """Digest of the package's source files (names and contents)."""
+    digest = hashlib.sha256()
+    for source_path in _source_files(package_dir):
+        digest.update(os.path.basename(source_path).encode("utf-8") + b"\0")
+        with open(source_path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _callback_entries(app) -> dict:
+    entries = {}
+    for callback_id, spec in app.callback_map.items():
+        func = spec.get("callback")
+        func = getattr(func, "__wrapped__", func)
+        code = getattr(func, "__code__", None)
+        entries[callback_id] = {
+            "inputs": [f"{i.get('id')}.{i.get('property')}" for i in spec.get("inputs", [])],
+            "state": [f"{s.get('id')}.{s.get('property')}" for s in spec.get("state", [])],
+            "function": f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', '')}",
+            # Line numbers tie the registered function to the source it was compiled from
+            "line": code.co_firstlineno if code else None,
+        }
+    return entries
+
+
+def callback_registry_fingerprint(app) -> str:
+    """Fingerprint of the app's callback registry (ids, inputs, state and functions)."""
+    payload = json.dumps(_callback_entries(app), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def verify_callback_registry(app, package_dir: str, strict: bool = True) -> str:
+    """
+    Compare the callback registry with the one recorded for the current sources.
+    The first start after a source change records it. A mismatch for unchanged sources
+    means stale bytecode: the package's pycs and the record are removed, and a
+    RuntimeError is raised when strict. Returns the fingerprint.
+    """
+    fingerprint = callback_registry_fingerprint(app)
+    cache_dir = os.path.join(package_dir, "__pycache__")
+    record_path = os.path.join(cache_dir, REGISTRY_RECORD)
+    digest = sources_digest(package_dir)
+
+    try:
+        with open(record_path, "r", encoding="utf-8") as f:
+            record = json.load(f)
+    except (OSError, ValueError):
+        record = None
+
+    if record and record.get("sources") == digest and record.get("fingerprint") != fingerprint:
+        current = set(app.callback_map)
+        recorded = set(record.get("callbacks", []))
+        message = (
+            "Callback registry does not match the one recorded for the current frontend sources "
+            f"({len(current - recorded)} callbacks added, {len(recorded - current)} missing) - "
+            "stale bytecode suspected. Cleared the frontend bytecode cache; restart to recompile."
+        )
+        for path in glob.glob(os.path.join(cache_dir, "*.pyc")) + [record_path]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        logger.error(message)
+        if strict:
+            raise RuntimeError(message)
+        return fingerprint
+
+    if not record or record.get("sources") != digest:
+        tmp_path = f"{record_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"sources": digest, "fingerprint": fingerprint,
+                           "callbacks": sorted(app.callback_map)}, f)
+            os.replace(tmp_path, record_path)
+        except OSError as e:
+            logger.warning(f"Could not record callback registry fingerprint: {e}")
+    return fingerprint
@@ -17,14 +17,15 @@ from datetime import datetime, timedelta
 from functools import lru_cache
 from typing import Dict
 
-from dash import Input, Output, State, MATCH, ALL, ctx, no_update, dcc, html, dash_table
+from dash import Input, Output, State, MATCH, ALL, ctx, no_update, dcc, html, dash_table, ClientsideFunction, set_props
 import dash_bootstrap_components as dbc
 
 # Import from parent frontend package
 from frontend import (
     app, server, markdown_cache,
     API_BASE, API_CHOICES, API_SAVE, API_RECENT,
-    API_VALIDATE_DOI, API_ADMIN_AUTH, API_PROJECTS, API_ADMIN_PROJECTS,
+    API_VALIDATE_DOI, API_ADMIN_AUTH, API_ADMIN_LOGOUT, API_PROJECTS, API_ADMIN_PROJECTS,
+    API_ADMIN_PROJECT_JOBS, API_LITERATURE_SEARCH,
     API_ADMIN_TRIPLE, API_BROWSE_FIELDS, API_ADMIN_BROWSE_FIELDS,
     SCHEMA_JSON, OTHER_SENTINEL, EMAIL_HASH_SALT,
     ENABLE_LITERATURE_SEARCH, ENABLE_PDF_HIGHLIGHTING, ENABLE_LITERATURE_REVIEW,
@@ -40,9 +41,6 @@ from frontend.layout import (
     build_relation_options
 )
 
-# Import literature search module
-import literature_search
-
 # Import PDF storage configuration and utilities
 try:
     from config import PDF_STORAGE_DIR
@@ -70,6 +68,12 @@ if ENABLE_DEBUG_LOGGING:
     logger.setLevel(logging.DEBUG)
     logger.debug("DEBUG LOGGING ENABLED - This will generate verbose logs!")
 
+# Project lists only need names and counts; DOIs are paged from /api/projects/<id>/dois
+PROJECT_SUMMARY_PARAMS = {"fields": "summary"}
+PROJECT_DOIS_PAGE_SIZE = 1000
+# DOIs listed in the Edit DOIs modal
+EDIT_DOIS_PREVIEW_LIMIT = 500
+
 DEFAULT_BROWSE_FIELDS = [
     "project_id",
     "sentence_id",
@@ -655,19 +659,144 @@ def check_lit_review_auth(auth_data):
         return {"display": "block"}, {"display": "none"}
 
 
-# Literature Search callback
+def _literature_search_empty_outputs(status, session_papers):
+    """Outputs of the search callbacks when there are no results to show."""
+    return (
+        status,
+        None,
+        [],
+        {"display": "none"},
+        session_papers or [],
+        [],
+        {},  # pagination_state
+        {"display": "none"},  # pagination-controls style
+        None,  # pagination-info
+        True,  # prev button disabled
+        True   # next button disabled
+    )
+
+
+def _render_literature_search_result(result, query, sources, session_papers):
+    """Outputs of the search callbacks for a finished search_papers() result."""
+    if not result.get('success'):
+        # Show execution log even on failure
+        execution_log = result.get('execution_log', [])
+        if execution_log:
+            return _literature_search_empty_outputs(
+                html.Div([
+                    dbc.Alert(result.get('message', 'Search failed'), color="danger"),
+                    create_execution_log_display(execution_log)
+                ]),
+                session_papers
+            )
+        return _literature_search_empty_outputs(
+            dbc.Alert(result.get('message', 'Search failed'), color="danger"), session_papers
+        )
+
+    papers = result['papers']
+
+    if not papers:
+        return _literature_search_empty_outputs(
+            dbc.Alert("No papers found. Try a different query or different sources.", color="info"),
+            session_papers
+        )
+
+    # Store all unique papers from session
+    new_session_papers = result.get('all_session_papers', papers)
+
+    # Create execution log display
+    execution_log = result.get('execution_log', [])
+    log_display = create_execution_log_display(execution_log)
+    
+    # Create sources info
+    sources_used = result.get('sources_used', [])
+    sources_display = ', '.join([
+        {'semantic_scholar': 'Semantic Scholar', 'arxiv': 'arXiv', 'web_of_science': 'Web of Science', 'openalex': 'OpenAlex'}.get(s, s)
+        for s in sources_used
+    ])
+
+    # Create status message with execution log
+    status = html.Div([
+        dbc.Alert(
+            [
+                html.Strong(result['message']),
+                html.Br(),
+                html.Small(f"Sources: {sources_display}" + (" (cached result)" if result.get('cached') else "")),
+                html.Br(),
+                html.Small(f"Total found: {result['total_found']} | Unique: {result['total_unique']} | Displaying: {result['returned']}")
+            ],
+            color="success"
+        ),
+        log_display
+    ])
+
+    # Store paper data for later use
+    papers_data = []
+    
+    # Create results table using helper function
+    results_content = []
+
+    for i, paper in enumerate(papers, 1):
+        # Store paper data including DOI
+        papers_data.append({
+            'index': i,
+            'doi': paper.get('doi', ''),
+            'title': paper.get('title', 'N/A'),
+            'authors': paper.get('authors', []),
+            'year': paper.get('year', 'N/A'),
+            'source': paper.get('source', 'N/A'),
+            'citations': paper.get('citations', 0),
+            'is_open_access': paper.get('is_open_access', False),
+            'abstract_snippet': paper.get('abstract_snippet', '')
+        })
+        
+        # Create paper card using helper function
+        paper_card = _create_paper_card(paper, i)
+        results_content.append(paper_card)
+
+    # Initialize pagination state for new search
+    pagination_state = {
+        'current_page': {'web_of_science': 1, 'openalex': 1},
+        'total_results': {},
+        'last_query': query,
+        'last_sources': sources
+    }
+    
+    # Check if pagination is available
+    pageable_sources = [s for s in sources if s in ['web_of_science', 'openalex']]
+    has_pagination = len(pageable_sources) > 0
+    
+    # Pagination info - show if pagination is available
+    pagination_info = None
+    if has_pagination:
+        pagination_info = html.Div([
+            html.Small([
+                f"Showing {len(papers)} results (Page 1)",
+                html.Br(),
+                f"Click 'Load Next Page' to fetch more results from {', '.join([s.replace('_', ' ').title() for s in pageable_sources])}"
+            ], className="text-muted")
+        ])
+    
+    return (
+        status,
+        html.Div(results_content),
+        papers_data,
+        {"display": "block"},
+        new_session_papers,
+        papers,
+        pagination_state,
+        {"display": "block"} if has_pagination else {"display": "none"},
+        pagination_info,
+        True,  # prev button disabled on first page
+        False if has_pagination else True  # next button enabled if pagination available
+    )
+
+
+# Literature Search callback (starts a backend search job; progress is polled below)
 @app.callback(
-    Output("search-status", "children"),
-    Output("search-results", "children"),
-    Output("lit-search-selected-papers", "data"),
-    Output("lit-search-export-controls", "style"),
-    Output("lit-search-session-papers", "data"),
-    Output("all-papers-data", "data"),
-    Output("pagination-state", "data"),
-    Output("pagination-controls", "style"),
-    Output("pagination-info", "children"),
-    Output("btn-prev-page", "disabled"),
-    Output("btn-next-page", "disabled"),
+    Output("search-status", "children", allow_duplicate=True),
+    Output("lit-search-job-store", "data"),
+    Output("lit-search-progress", "children"),
     Input("btn-search-papers", "n_clicks"),
     State("lit-search-query", "value"),
     State("lit-search-sources", "value"),
@@ -679,252 +808,147 @@ def check_lit_review_auth(auth_data):
     State("limit-arxiv", "value"),
     State("limit-wos", "value"),
     State("limit-openalex", "value"),
+    State("admin-auth-store", "data"),
     prevent_initial_call=True,
 )
 def perform_literature_search(n_clicks, query, sources, pipeline_controls, build_session, session_papers, 
-                              top_k, s2_limit, arxiv_limit, wos_limit, openalex_limit):
+                              top_k, s2_limit, arxiv_limit, wos_limit, openalex_limit, auth_data):
     """
-    Callback to perform literature search when button is clicked.
-    Displays the execution pipeline for AutoResearch, DeepResearch, and DELM.
+    Callback to start a literature search when button is clicked.
     Supports multiple sources, session-based cumulative searching, pipeline controls,
     and per-source result limits.
     
-    Note: The search runs synchronously and displays results upon completion.
-    For true real-time progress updates during execution, the implementation would need:
-    - Background task processing (e.g., Celery, Redis Queue)
-    - WebSocket or Server-Sent Events for live updates
-    - State management for in-progress searches
-    Currently, users see a loading spinner during search, then full results with
-    execution timing details when complete. For typical searches (5-10s), this is
-    a reasonable user experience.
+    The search runs as a backend job (POST /api/literature/search), so it does not block
+    a frontend worker; poll_literature_search shows the AutoResearch, DeepResearch and DELM
+    stages as they complete and renders the results. Repeated searches are served from the
+    backend's shared result cache.
     """
     if not query or not query.strip():
-        return (
-            dbc.Alert("Please enter a search query", color="warning"),
-            None,
-            [],
-            {"display": "none"},
-            session_papers or [],
-            [],
-            {},  # pagination_state
-            {"display": "none"},  # pagination-controls style
-            None,  # pagination-info
-            True,  # prev button disabled
-            True   # next button disabled
-        )
+        return dbc.Alert("Please enter a search query", color="warning"), no_update, None
     
     if not sources:
-        return (
-            dbc.Alert("Please select at least one search source", color="warning"),
-            None,
-            [],
-            {"display": "none"},
-            session_papers or [],
-            [],
-            {},  # pagination_state
-            {"display": "none"},  # pagination-controls style
-            None,  # pagination-info
-            True,  # prev button disabled
-            True   # next button disabled
-        )
+        return dbc.Alert("Please select at least one search source", color="warning"), no_update, None
+    
+    if not auth_data:
+        return dbc.Alert("Please login first", color="danger"), no_update, None
+
+    # Parse pipeline controls
+    pipeline_controls = pipeline_controls or []
+    
+    # Build per-source limit dictionary (the backend applies the same caps)
+    per_source_limit = {}
+    if s2_limit and s2_limit > 0:
+        per_source_limit['semantic_scholar'] = min(s2_limit, 100)
+    if arxiv_limit and arxiv_limit > 0:
+        per_source_limit['arxiv'] = min(arxiv_limit, 100)
+    if wos_limit and wos_limit > 0:
+        per_source_limit['web_of_science'] = min(wos_limit, 100)
+    if openalex_limit and openalex_limit > 0:
+        per_source_limit['openalex'] = min(openalex_limit, 200)
+    
+    payload = {
+        "email": auth_data.get("email"),
+        "password": auth_data.get("password"),
+        "token": auth_data.get("token"),
+        "query": query.strip(),
+        "sources": sources,
+        "top_k": top_k if top_k and top_k > 0 else 20,
+        "per_source_limit": per_source_limit,
+        # Build on papers from previous searches in this session
+        "previous_papers": session_papers if build_session and session_papers else None,
+        "enable_query_expansion": "query_expansion" in pipeline_controls,
+        "enable_deduplication": "deduplication" in pipeline_controls,
+        "enable_reranking": "reranking" in pipeline_controls,
+    }
 
     try:
-        # Prepare previous papers for session build
-        previous_papers = None
-        if build_session and session_papers:
-            previous_papers = session_papers
-        
-        # Parse pipeline controls
-        pipeline_controls = pipeline_controls or []
-        enable_query_expansion = "query_expansion" in pipeline_controls
-        enable_deduplication = "deduplication" in pipeline_controls
-        enable_reranking = "reranking" in pipeline_controls
-        
-        # Validate and set top_k
-        if not top_k or top_k < 1:
-            top_k = 20
-        top_k = min(top_k, 100)  # Cap at 100
-        
-        # Build per-source limit dictionary
-        per_source_limit = {}
-        if s2_limit and s2_limit > 0:
-            per_source_limit['semantic_scholar'] = min(s2_limit, 100)
-        if arxiv_limit and arxiv_limit > 0:
-            per_source_limit['arxiv'] = min(arxiv_limit, 100)
-        if wos_limit and wos_limit > 0:
-            per_source_limit['web_of_science'] = min(wos_limit, 100)
-        if openalex_limit and openalex_limit > 0:
-            per_source_limit['openalex'] = min(openalex_limit, 200)
-        
-        # Perform search with selected sources and pipeline controls
-        result = literature_search.search_papers(
-            query.strip(), 
-            top_k=top_k,
-            sources=sources,
-            previous_papers=previous_papers,
-            enable_query_expansion=enable_query_expansion,
-            enable_deduplication=enable_deduplication,
-            enable_reranking=enable_reranking,
-            per_source_limit=per_source_limit if per_source_limit else None
-        )
-
-        if not result['success']:
-            # Show execution log even on failure
-            execution_log = result.get('execution_log', [])
-            if execution_log:
-                log_display = create_execution_log_display(execution_log)
-                return (
-                    html.Div([
-                        dbc.Alert(result['message'], color="danger"),
-                        log_display
-                    ]),
-                    None,
-                    [],
-                    {"display": "none"},
-                    session_papers or [],
-                    [],
-                    {},  # pagination_state
-                    {"display": "none"},  # pagination-controls style
-                    None,  # pagination-info
-                    True,  # prev button disabled
-                    True   # next button disabled
-                )
-            return (
-                dbc.Alert(result['message'], color="danger"),
-                None,
-                [],
-                {"display": "none"},
-                session_papers or [],
-                [],
-                {},  # pagination_state
-                {"display": "none"},  # pagination-controls style
-                None,  # pagination-info
-                True,  # prev button disabled
-                True   # next button disabled
-            )
-
-        papers = result['papers']
-
-        if not papers:
-            return (
-                dbc.Alert("No papers found. Try a different query or different sources.", color="info"),
-                None,
-                [],
-                {"display": "none"},
-                session_papers or [],
-                [],
-                {},  # pagination_state
-                {"display": "none"},  # pagination-controls style
-                None,  # pagination-info
-                True,  # prev button disabled
-                True   # next button disabled
-            )
-
-        # Store all unique papers from session
-        new_session_papers = result.get('all_session_papers', papers)
-
-        # Create execution log display
-        execution_log = result.get('execution_log', [])
-        log_display = create_execution_log_display(execution_log)
-        
-        # Create sources info
-        sources_used = result.get('sources_used', [])
-        sources_display = ', '.join([
-            {'semantic_scholar': 'Semantic Scholar', 'arxiv': 'arXiv', 'web_of_science': 'Web of Science', 'openalex': 'OpenAlex'}.get(s, s)
-            for s in sources_used
-        ])
+        r = requests.post(API_LITERATURE_SEARCH, json=payload, timeout=10)
+        result = r.json() if r.headers.get("Content-Type", "").startswith("application/json") else {}
+        if not r.ok or not result.get("job_id"):
+            return dbc.Alert(f"Search failed: {result.get('error', r.status_code)}", color="danger"), no_update, None
+    except Exception as e:
+        logger.error(f"Literature search error: {e}")
+        return dbc.Alert(f"Search failed: {str(e)}", color="danger"), no_update, None
 
-        # Create status message with execution log
-        status = html.Div([
-            dbc.Alert(
-                [
-                    html.Strong(result['message']),
-                    html.Br(),
-                    html.Small(f"Sources: {sources_display}"),
-                    html.Br(),
-                    html.Small(f"Total found: {result['total_found']} | Unique: {result['total_unique']} | Displaying: {result['returned']}")
-                ],
-                color="success"
-            ),
-            log_display
-        ])
+    job = {"job_id": result["job_id"], "query": query, "sources": sources}
+    progress = dbc.Alert(html.Strong("⏳ Searching..."), color="info")
+    return None, job, progress
 
-        # Store paper data for later use
-        papers_data = []
-        
-        # Create results table using helper function
-        results_content = []
 
-        for i, paper in enumerate(papers, 1):
-            # Store paper data including DOI
-            papers_data.append({
-                'index': i,
-                'doi': paper.get('doi', ''),
-                'title': paper.get('title', 'N/A'),
-                'authors': paper.get('authors', []),
-                'year': paper.get('year', 'N/A'),
-                'source': paper.get('source', 'N/A'),
-                'citations': paper.get('citations', 0),
-                'is_open_access': paper.get('is_open_access', False),
-                'abstract_snippet': paper.get('abstract_snippet', '')
-            })
-            
-            # Create paper card using helper function
-            paper_card = _create_paper_card(paper, i)
-            results_content.append(paper_card)
+# Enable literature search polling while a job is stored
+@app.callback(
+    Output("lit-search-progress-interval", "disabled"),
+    Input("lit-search-job-store", "data"),
+)
+def toggle_literature_search_polling(job):
+    return not (isinstance(job, dict) and job.get("job_id"))
 
-        # Initialize pagination state for new search
-        pagination_state = {
-            'current_page': {'web_of_science': 1, 'openalex': 1},
-            'total_results': {},
-            'last_query': query,
-            'last_sources': sources
-        }
-        
-        # Check if pagination is available
-        pageable_sources = [s for s in sources if s in ['web_of_science', 'openalex']]
-        has_pagination = len(pageable_sources) > 0
-        
-        # Pagination info - show if pagination is available
-        pagination_info = None
-        if has_pagination:
-            pagination_info = html.Div([
-                html.Small([
-                    f"Showing {len(papers)} results (Page 1)",
-                    html.Br(),
-                    f"Click 'Load Next Page' to fetch more results from {', '.join([s.replace('_', ' ').title() for s in pageable_sources])}"
-                ], className="text-muted")
-            ])
-        
-        return (
-            status,
-            html.Div(results_content),
-            papers_data,
-            {"display": "block"},
-            new_session_papers,
-            papers,
-            pagination_state,
-            {"display": "block"} if has_pagination else {"display": "none"},
-            pagination_info,
-            True,  # prev button disabled on first page
-            False if has_pagination else True  # next button enabled if pagination available
-        )
 
+# Poll a running literature search and render its results
+@app.callback(
+    Output("search-status", "children"),
+    Output("search-results", "children"),
+    Output("lit-search-selected-papers", "data"),
+    Output("lit-search-export-controls", "style"),
+    Output("lit-search-session-papers", "data"),
+    Output("all-papers-data", "data"),
+    Output("pagination-state", "data"),
+    Output("pagination-controls", "style"),
+    Output("pagination-info", "children"),
+    Output("btn-prev-page", "disabled"),
+    Output("btn-next-page", "disabled"),
+    Output("lit-search-progress", "children", allow_duplicate=True),
+    Output("lit-search-job-store", "data", allow_duplicate=True),
+    Input("lit-search-progress-interval", "n_intervals"),
+    State("lit-search-job-store", "data"),
+    State("lit-search-session-papers", "data"),
+    State("admin-auth-store", "data"),
+    prevent_initial_call=True,
+)
+def poll_literature_search(n_intervals, job, session_papers, auth_data):
+    unchanged = (no_update,) * 11
+    if not isinstance(job, dict) or not job.get("job_id"):
+        return unchanged + (no_update, no_update)
+    if not auth_data:
+        return unchanged + (no_update, no_update)  # Resume once logged in again
+    
+    try:
+        r = requests.get(f"{API_LITERATURE_SEARCH}/{job['job_id']}", timeout=5, **_admin_request_auth(auth_data))
     except Exception as e:
-        logger.error(f"Literature search error: {e}")
-        return (
-            dbc.Alert(f"Search failed: {str(e)}", color="danger"),
-            None,
-            [],
-            {"display": "none"},
-            session_papers or [],
-            [],
-            {},  # pagination_state
-            {"display": "none"},  # pagination-controls style
-            None,  # pagination-info
-            True,  # prev button disabled
-            True   # next button disabled
-        )
+        logger.debug(f"Literature search: could not fetch progress - {e}")
+        return unchanged + (no_update, no_update)  # Keep polling
+    
+    if r.status_code == 404:
+        # Job expired or unknown (e.g. database reset) - stop polling
+        return _literature_search_empty_outputs(
+            dbc.Alert("Search no longer available, please search again", color="warning"), session_papers
+        ) + (None, None)
+    if not r.ok:
+        return unchanged + (no_update, no_update)
+    
+    data = r.json()
+    status = data.get("status")
+    
+    if status == "completed" and data.get("result"):
+        return _render_literature_search_result(
+            data["result"], job.get("query", ""), job.get("sources", []), session_papers
+        ) + (None, None)
+    
+    if status == "failed" or data.get("is_stale"):
+        message = data.get("error") or "The search stopped responding (the server may have restarted). Please search again."
+        return _literature_search_empty_outputs(
+            html.Div([
+                dbc.Alert(message, color="danger"),
+                create_execution_log_display(data.get("execution_log", []))
+            ]),
+            session_papers
+        ) + (None, None)
+    
+    progress = dbc.Alert([
+        html.Strong("⏳ Searching..."),
+        create_execution_log_display(data.get("execution_log", [])),
+    ], color="info")
+    return unchanged + (progress, no_update)
 
 
 # Callback to clear search session
@@ -1025,6 +1049,9 @@ def handle_pagination(next_clicks, prev_clicks, query, sources, pipeline_control
     if not pageable_sources:
         return no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update
     
+    # Imported on first use to keep frontend worker start-up fast
+    import literature_search
+    
     try:
         # Initialize or retrieve pagination state
         if not pagination_state:
@@ -1172,6 +1199,7 @@ def toggle_wos_syntax_help(link_clicks, close_clicks, is_open):
 )
 def update_source_info(n_intervals):
     """Display information about available search sources"""
+    import literature_search
     try:
         sources_info = literature_search.get_available_sources()
         
@@ -1348,7 +1376,7 @@ def toggle_export_modal(export_clicks, cancel_clicks, confirm_clicks, is_open,
         
         # Get projects for dropdown
         try:
-            r = requests.get(API_PROJECTS, timeout=5)
+            r = requests.get(API_PROJECTS, params=PROJECT_SUMMARY_PARAMS, timeout=5)
             if r.ok:
                 projects = r.json()
                 project_options = [{"label": p["name"], "value": p["id"]} for p in projects]
@@ -1439,6 +1467,7 @@ def handle_export_confirmation(n_clicks, action, new_name, new_desc, target_proj
         validation_payload = {
             "email": auth_data["email"],
             "password": auth_data["password"],
+            "token": auth_data.get("token"),
             "dois": normalized_dois
         }
         val_response = requests.post(
@@ -1510,18 +1539,28 @@ def handle_export_confirmation(n_clicks, action, new_name, new_desc, target_proj
             payload = {
                 "email": auth_data["email"],
                 "password": auth_data["password"],
+                "token": auth_data.get("token"),
                 "name": new_name.strip(),
                 "description": new_desc.strip() if new_desc else "",
                 "doi_list": selected_dois
             }
-            r = requests.post(f"{API_BASE}/api/admin/projects", json=payload, timeout=10)
+            # The backend only registers a creation job; it is polled like one started
+            # from the Projects tab, which shows the progress and the final result
+            r = requests.post(API_ADMIN_PROJECTS, json=payload, timeout=10)
             if r.ok:
                 result = r.json()
-                if result.get("ok"):
-                    result_parts = [f"Project created successfully! ID: {result.get('project_id')}"]
+                if result.get("ok") and result.get("job_id"):
+                    job = {"job_id": result["job_id"], "name": new_name.strip(), "total": len(selected_dois)}
+                    set_props("project-creation-job-store", {"data": job})
+                    set_props("project-creation-progress", {"children": _render_project_creation_progress(
+                        {**job, "validated": 0, "valid_count": 0, "invalid_count": 0})})
+                    result_parts = [
+                        f"⏳ Project creation queued (job {result['job_id']}): validating {len(selected_dois)} DOI(s). "
+                        "Progress and the result are shown in the Projects tab."
+                    ]
                     if validation_warning:
                         result_parts = [validation_warning, html.Br(), html.Span(result_parts[0])]
-                    return dbc.Alert(result_parts, color="success")
+                    return dbc.Alert(result_parts, color="info")
                 else:
                     return dbc.Alert(f"Failed: {result.get('error', 'Unknown error')}", color="danger")
             else:
@@ -1557,6 +1596,7 @@ def handle_export_confirmation(n_clicks, action, new_name, new_desc, target_proj
             payload = {
                 "email": auth_data["email"],
                 "password": auth_data["password"],
+                "token": auth_data.get("token"),
                 "doi_list": merged_dois
             }
             r = requests.put(f"{API_BASE}/api/admin/projects/{target_project_id}", json=payload, timeout=10)
@@ -2000,7 +2040,7 @@ def save_triples(n_clicks, sentence_text, literature_link, contributor_email, em
 )
 def populate_browse_project_filter(load_trigger, refresh_click, tab_value):
     try:
-        r = requests.get(API_PROJECTS, timeout=5)
+        r = requests.get(API_PROJECTS, params=PROJECT_SUMMARY_PARAMS, timeout=5)
         if r.ok:
             projects = r.json()
             options = [{"label": "All (no filter)", "value": None}] + [{"label": p["name"], "value": p["id"]} for p in projects]
@@ -2157,17 +2197,52 @@ def reset_form(_):
     return "", "", True, "", None, {"display": "none"}
 
 # Load projects
+def _fetch_project_dois(project_id, max_dois=None):
+    """
+    Fetch a project's DOIs page by page (in DOI order).
+    Returns (dois, total); dois stops at max_dois if given.
+    """
+    dois, total, cursor = [], 0, None
+    while True:
+        limit = PROJECT_DOIS_PAGE_SIZE if max_dois is None else min(PROJECT_DOIS_PAGE_SIZE, max_dois - len(dois))
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        r = requests.get(f"{API_BASE}/api/projects/{project_id}/dois", params=params, timeout=10)
+        r.raise_for_status()
+        page = r.json()
+        dois.extend(page.get("dois", []))
+        total = max(total, page.get("total", 0))
+        cursor = page.get("next_cursor")
+        if not cursor or (max_dois is not None and len(dois) >= max_dois):
+            return dois, total
+
+def _edit_dois_panel(project_id, project_name):
+    """Project info and DOI list shown in the Edit DOIs modal."""
+    doi_list, total = _fetch_project_dois(project_id, max_dois=EDIT_DOIS_PREVIEW_LIMIT)
+    doi_items = [html.Div(f"• {doi}", className="small") for doi in doi_list]
+    if total > len(doi_list):
+        doi_items.append(html.Div(f"... and {total - len(doi_list)} more", className="small text-muted"))
+    
+    project_info = dbc.Alert([
+        html.Strong(f"Project: {project_name}"),
+        html.Br(),
+        html.Small(f"ID: {project_id} | Total DOIs: {total}")
+    ], color="info")
+    return project_info, doi_items
+
 @app.callback(
     Output("projects-store", "data"),
     Output("project-selector", "options"),
     Input("load-trigger", "n_intervals"),
     Input("btn-create-project", "n_clicks"),
     Input("main-tabs", "value"),
+    Input("project-creation-job-store", "data"),  # Reload when a creation job finishes
     prevent_initial_call=False,
 )
-def load_projects(load_trigger, create_click, tab_value):
+def load_projects(load_trigger, create_click, tab_value, creation_job):
     try:
-        r = requests.get(API_PROJECTS, timeout=5)
+        r = requests.get(API_PROJECTS, params=PROJECT_SUMMARY_PARAMS, timeout=5)
         if r.ok:
             projects = r.json()
             options = [{"label": p["name"], "value": p["id"]} for p in projects]
@@ -2221,7 +2296,7 @@ def show_project_info(project_id, projects):
     if not project:
         return "", [], True
     
-    doi_count = len(project.get("doi_list", []))
+    doi_count = project.get("doi_count", 0)
     info_text = f"Project: {project['name']} ({doi_count} DOIs available)"
     
     # Check if project has batches
@@ -2253,12 +2328,15 @@ def show_project_info(project_id, projects):
             ]
         else:
             # Fallback to simple list if API fails
-            doi_list = project.get("doi_list", [])
+            doi_list, _ = _fetch_project_dois(project_id)
             doi_options = [{"label": doi, "value": doi} for doi in doi_list]
     except Exception as e:
         logger.error(f"Failed to fetch DOI PDF indicators: {e}")
         # Fallback to simple list
-        doi_list = project.get("doi_list", [])
+        try:
+            doi_list, _ = _fetch_project_dois(project_id)
+        except Exception:
+            doi_list = []
         doi_options = [{"label": doi, "value": doi} for doi in doi_list]
     
     return info_text, doi_options, False
@@ -2620,7 +2698,7 @@ def admin_login(n_clicks, email, password):
                 return (
                     dbc.Alert("Logged in successfully!", color="success"),
                     {"display": "block"},
-                    {"email": email, "password": password},
+                    {"email": email, "password": password, "token": result.get("token")},
                     {"display": "none"},  # Hide login button
                     {"display": "inline-block"}  # Show logout button
                 )
@@ -2658,9 +2736,16 @@ def admin_login(n_clicks, email, password):
     Output("btn-admin-login", "style", allow_duplicate=True),
     Output("btn-admin-logout", "style", allow_duplicate=True),
     Input("btn-admin-logout", "n_clicks"),
+    State("admin-auth-store", "data"),
     prevent_initial_call=True,
 )
-def admin_logout(n_clicks):
+def admin_logout(n_clicks, auth_data):
+    # Revoke the session token so it stops working on every backend worker
+    if auth_data and auth_data.get("token"):
+        try:
+            requests.post(API_ADMIN_LOGOUT, json={"token": auth_data["token"]}, timeout=5)
+        except Exception as e:
+            logger.warning(f"Failed to revoke admin token: {e}")
     return (
         dbc.Alert("Logged out successfully", color="info"),
         {"display": "none"},
@@ -2669,10 +2754,12 @@ def admin_logout(n_clicks):
         {"display": "none"}  # Hide logout button
     )
 
-# Create project
+# Create project (starts a background job; progress is polled below)
 @app.callback(
     Output("project-message", "children"),
     Output("btn-create-project", "disabled"),
+    Output("project-creation-job-store", "data"),
+    Output("project-creation-progress", "children"),
     Input("btn-create-project", "n_clicks"),
     State("new-project-name", "value"),
     State("new-project-description", "value"),
@@ -2682,84 +2769,140 @@ def admin_logout(n_clicks):
 )
 def create_project_callback(n_clicks, name, description, doi_list_text, auth_data):
     if not auth_data:
-        return dbc.Alert("Please login first", color="danger"), False
+        return dbc.Alert("Please login first", color="danger"), False, no_update, no_update
     
     if not name or not doi_list_text:
-        return dbc.Alert("Project name and DOI list are required", color="danger"), False
+        return dbc.Alert("Project name and DOI list are required", color="danger"), False, no_update, no_update
     
     # Parse DOI list
     doi_list = [doi.strip() for doi in doi_list_text.split("\n") if doi.strip()]
     
-    # Count total DOIs submitted
-    total_submitted = len(doi_list)
-    
     try:
         payload = {
             "email": auth_data["email"],
             "password": auth_data["password"],
+            "token": auth_data.get("token"),
             "name": name,
             "description": description or "",
             "doi_list": doi_list
         }
-        # Increase timeout for large DOI lists (base 30s + 0.1s per DOI, max 300s = 5 minutes)
-        timeout = min(30 + (len(doi_list) * 0.1), 300)
-        
-        # Show progress message for large lists
-        if total_submitted > 50:
-            # This is a workaround - ideally we'd show a spinner during the request
-            # but Dash callbacks are synchronous
-            pass
-        
-        r = requests.post(API_ADMIN_PROJECTS, json=payload, timeout=timeout)
+        # The backend only registers the job; validation runs in the background
+        r = requests.post(API_ADMIN_PROJECTS, json=payload, timeout=10)
         if r.ok:
             result = r.json()
-            if result.get("ok"):
-                project_id = result.get('project_id')
-                valid_count = result.get('valid_count', 0)
-                
-                # Build success message with warnings if applicable
-                message_parts = [f"✅ Project created successfully! ID: {project_id}"]
-                message_parts.append(f"Added {valid_count} valid DOI(s).")
-                
-                # Check for discrepancies
-                if total_submitted != valid_count:
-                    excluded_count = total_submitted - valid_count
-                    message_parts.append(f"⚠️ {excluded_count} DOI(s) were excluded (duplicates or invalid).")
-                
-                # Show details about invalid DOIs if provided
-                if result.get("warning"):
-                    message_parts.append(result.get("warning"))
-                
-                if result.get("invalid_dois"):
-                    invalid_dois = result.get("invalid_dois", [])
-                    if len(invalid_dois) <= 5:
-                        # Show all if few
-                        details = "\n".join([f"  • {item.get('doi', '')}: {item.get('reason', '')}" 
-                                           for item in invalid_dois])
-                        message_parts.append(f"Invalid DOIs:\n{details}")
-                    else:
-                        # Show first 5 if many
-                        details = "\n".join([f"  • {item.get('doi', '')}: {item.get('reason', '')}" 
-                                           for item in invalid_dois[:5]])
-                        message_parts.append(f"Invalid DOIs (showing first 5 of {len(invalid_dois)}):\n{details}")
-                
-                message_text = "\n".join(message_parts)
-                alert_color = "warning" if total_submitted != valid_count else "success"
-                return dbc.Alert(message_text, color=alert_color, style={"whiteSpace": "pre-wrap"}), False
+            if result.get("ok") and result.get("job_id"):
+                job = {"job_id": result["job_id"], "name": name, "total": len(doi_list)}
+                progress = _render_project_creation_progress({**job, "validated": 0, "valid_count": 0, "invalid_count": 0})
+                return "", False, job, progress
             else:
-                return dbc.Alert(f"Failed: {result.get('error', 'Unknown error')}", color="danger"), False
+                return dbc.Alert(f"Failed: {result.get('error', 'Unknown error')}", color="danger"), False, no_update, no_update
         else:
-            return dbc.Alert(f"Failed: {r.status_code} - {r.text[:200]}", color="danger"), False
-    except requests.exceptions.Timeout:
-        return dbc.Alert(
-            f"⏱️ Request timed out while validating {total_submitted} DOIs.\n\n"
-            f"This usually means the validation is taking longer than expected. "
-            f"For large DOI lists (300+), try breaking them into smaller batches of 100-200 DOIs.\n\n"
-            f"The backend may still be processing your request. Please refresh the projects list in a moment to check if it completed.",
-            color="danger"
-        ), False
+            return dbc.Alert(f"Failed: {r.status_code} - {r.text[:200]}", color="danger"), False, no_update, no_update
+    except Exception as e:
+        return dbc.Alert(f"Error: {str(e)}", color="danger"), False, no_update, no_update
+
+def _admin_request_auth(auth_data):
+    """requests kwargs authenticating an admin GET: the session token, else the credentials."""
+    if auth_data.get("token"):
+        return {"headers": {"Authorization": f"Bearer {auth_data['token']}"}}
+    return {"json": {"email": auth_data.get("email"), "password": auth_data.get("password")}}
+
+def _render_project_creation_progress(job):
+    """Progress bar for a running project creation job."""
+    total = job.get("total") or 0
+    validated = job.get("validated") or 0
+    percent = int(validated * 100 / total) if total else 0
+    return dbc.Alert([
+        html.Strong(f"⏳ Creating project '{job.get('name', '')}' - validating DOIs..."),
+        dbc.Progress(value=percent, label=f"{percent}%", striped=True, animated=True, className="my-2"),
+        html.Small(
+            f"Validated {validated} / {total} DOIs · {job.get('valid_count', 0)} valid · "
+            f"{job.get('invalid_count', 0)} invalid"
+        ),
+    ], color="info")
+
+def _render_project_creation_result(result):
+    """Final message for a finished project creation job."""
+    invalid_dois = result.get("invalid_dois", [])
+    
+    def invalid_details():
+        if len(invalid_dois) <= 5:
+            details = "\n".join([f"  • {item.get('doi', '')}: {item.get('reason', '')}" for item in invalid_dois])
+            return f"Invalid DOIs:\n{details}"
+        details = "\n".join([f"  • {item.get('doi', '')}: {item.get('reason', '')}" for item in invalid_dois[:5]])
+        return f"Invalid DOIs (showing first 5 of {len(invalid_dois)}):\n{details}"
+    
+    if result.get("status") != "completed":
+        message_parts = [f"Failed: {result.get('error') or 'Unknown error'}"]
+        if invalid_dois:
+            message_parts.append(invalid_details())
+        return dbc.Alert("\n".join(message_parts), color="danger", style={"whiteSpace": "pre-wrap"})
+    
+    total_submitted = result.get("total", 0)
+    valid_count = result.get("valid_count", 0)
+    message_parts = [f"✅ Project created successfully! ID: {result.get('project_id')}"]
+    message_parts.append(f"Added {valid_count} valid DOI(s).")
+    
+    # Check for discrepancies
+    if total_submitted != valid_count:
+        excluded_count = total_submitted - valid_count
+        message_parts.append(f"⚠️ {excluded_count} DOI(s) were excluded (duplicates or invalid).")
+    if invalid_dois:
+        message_parts.append(f"{len(invalid_dois)} DOI(s) failed validation and were excluded")
+        message_parts.append(invalid_details())
+    
+    alert_color = "warning" if total_submitted != valid_count else "success"
+    return dbc.Alert("\n".join(message_parts), color=alert_color, style={"whiteSpace": "pre-wrap"})
+
+# Enable project creation polling while a job is stored (also restores polling after refresh)
+@app.callback(
+    Output("project-creation-progress-interval", "disabled"),
+    Input("project-creation-job-store", "data"),
+)
+def toggle_project_creation_polling(job):
+    return not (isinstance(job, dict) and job.get("job_id"))
+
+# Poll project creation progress
+@app.callback(
+    Output("project-creation-progress", "children", allow_duplicate=True),
+    Output("project-creation-job-store", "data", allow_duplicate=True),
+    Input("project-creation-progress-interval", "n_intervals"),
+    State("project-creation-job-store", "data"),
+    State("admin-auth-store", "data"),
+    prevent_initial_call=True,
+)
+def poll_project_creation_progress(n_intervals, job, auth_data):
+    if not isinstance(job, dict) or not job.get("job_id"):
+        return no_update, no_update
+    if not auth_data:
+        return no_update, no_update  # Resume once logged in again
+    
+    try:
+        r = requests.get(f"{API_ADMIN_PROJECT_JOBS}/{job['job_id']}", timeout=5, **_admin_request_auth(auth_data))
     except Exception as e:
-        return dbc.Alert(f"Error: {str(e)}", color="danger"), False
+        print(f"[Frontend] Project creation: could not fetch progress - {e}")
+        return no_update, no_update  # Keep polling
+    
+    if r.status_code == 404:
+        # Job expired or unknown (e.g. database reset) - stop polling
+        return html.Div(), None
+    if not r.ok:
+        return no_update, no_update
+    
+    result = r.json()
+    status = result.get("status")
+    
+    if status in ("completed", "failed"):
+        return _render_project_creation_result(result), None
+    
+    if result.get("is_stale"):
+        return dbc.Alert(
+            "⚠️ Project creation stopped responding (the server may have restarted). "
+            "DOIs validated so far were saved; refresh the projects list and add any missing DOIs.",
+            color="warning"
+        ), None
+    
+    return _render_project_creation_progress({**job, **result}), no_update
 
 # Display projects list
 @app.callback(
@@ -2768,14 +2911,17 @@ def create_project_callback(n_clicks, name, description, doi_list_text, auth_dat
     Input("project-message", "children"),  # Trigger refresh when project message changes
     Input("delete-project-confirm", "n_clicks"),
     Input("admin-auth-store", "data"),  # Trigger refresh when auth changes
+    Input("project-creation-job-store", "data"),  # Trigger refresh when a creation job starts/finishes
     prevent_initial_call=False,
 )
-def display_projects_list(refresh_clicks, project_message, delete_clicks, auth_data):
+def display_projects_list(refresh_clicks, project_message, delete_clicks, auth_data, creation_job):
     if not auth_data:
         return dbc.Alert("Please login to view projects", color="info")
     
     try:
-        r = requests.get(API_PROJECTS, timeout=5)
+        # Counts and download status come with the list, so no per-project status requests
+        r = requests.get(API_PROJECTS, params={**PROJECT_SUMMARY_PARAMS, "include": "download_status,pdf_count,doi_count"},
+                         timeout=5)
         if r.ok:
             projects = r.json()
             if not projects:
@@ -2784,23 +2930,13 @@ def display_projects_list(refresh_clicks, project_message, delete_clicks, auth_d
             # Create a table of projects
             project_items = []
             for p in projects:
-                doi_count = len(p.get("doi_list", []))
+                doi_count = p.get("doi_count", 0)
+                pdf_count = p.get("pdf_count", 0)
                 project_id = p["id"]
                 
-                # Check if download is stale for this project
-                is_stale = False
-                try:
-                    status_url = f"{API_BASE}/api/admin/projects/{project_id}/download-pdfs/status"
-                    progress_resp = requests.get(status_url, timeout=2)
-                    if progress_resp.ok:
-                        progress_data = progress_resp.json()
-                        # Only show force restart button if download is running and stale
-                        if progress_data.get("status") == "running":
-                            is_stale = progress_data.get("is_stale", False)
-                except Exception as e:
-                    # Log error but continue - download status check is not critical for listing projects
-                    if ENABLE_DEBUG_LOGGING:
-                        logger.debug(f"Could not check download status for project {project_id}: {e}")
+                # Only show force restart button if download is running and stale
+                download_status = p.get("download_status") or {}
+                is_stale = download_status.get("status") == "running" and download_status.get("is_stale", False)
                 
                 # Build button list for this project
                 button_list = [
@@ -2845,6 +2981,8 @@ def display_projects_list(refresh_clicks, project_message, delete_clicks, auth_d
                                 html.P([
                                     html.Strong("DOIs: "), f"{doi_count}",
                                     html.Br(),
+                                    html.Strong("PDFs: "), f"{pdf_count}",
+                                    html.Br(),
                                     html.Strong("Created by: "), p.get("created_by", "Unknown"),
                                     html.Br(),
                                     html.Strong("ID: "), str(project_id)
@@ -2905,7 +3043,10 @@ def view_project_dois(n_clicks_list, projects):
     if not project:
         return dbc.Alert("Project not found", color="danger")
     
-    doi_list = project.get("doi_list", [])
+    try:
+        doi_list, _ = _fetch_project_dois(project_id)
+    except Exception as e:
+        return dbc.Alert(f"Failed to load DOIs: {str(e)}", color="danger")
     
     # Split DOIs into those with PDFs and those without
     # Check if PDF file exists for each DOI
@@ -3032,14 +3173,11 @@ def handle_edit_dois_modal(edit_clicks_list, close_clicks, add_clicks, remove_cl
         if not project:
             return no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update
         
-        doi_list = project.get("doi_list", [])
-        doi_items = [html.Div(f"• {doi}", className="small") for doi in doi_list]
-        
-        project_info = dbc.Alert([
-            html.Strong(f"Project: {project['name']}"),
-            html.Br(),
-            html.Small(f"ID: {project['id']} | Total DOIs: {len(doi_list)}")
-        ], color="info")
+        try:
+            project_info, doi_items = _edit_dois_panel(project_id, project["name"])
+        except Exception as e:
+            return True, project_id, no_update, [], "", "", False, \
+                   dbc.Alert(f"Failed to load DOIs: {str(e)}", color="danger")
         
         return True, project_id, project_info, doi_items, "", "", False, ""
     
@@ -3060,6 +3198,7 @@ def handle_edit_dois_modal(edit_clicks_list, close_clicks, add_clicks, remove_cl
             payload = {
                 "email": auth_data.get("email"),
                 "password": auth_data.get("password"),
+                "token": auth_data.get("token"),
                 "dois": dois_to_add
             }
             # Scale timeout based on number of DOIs being added
@@ -3092,21 +3231,14 @@ def handle_edit_dois_modal(edit_clicks_list, close_clicks, add_clicks, remove_cl
                 message_text = "\n".join(message_parts)
                 alert_color = "warning" if result.get("invalid_dois") else "success"
                 
-                # Refresh project list
-                projects_r = requests.get(API_PROJECTS, timeout=5)
-                if projects_r.ok:
-                    updated_projects = projects_r.json()
-                    updated_project = next((p for p in updated_projects if p["id"] == current_project_id), None)
-                    if updated_project:
-                        doi_list = updated_project.get("doi_list", [])
-                        doi_items = [html.Div(f"• {doi}", className="small") for doi in doi_list]
-                        
-                        project_info = dbc.Alert([
-                            html.Strong(f"Project: {updated_project['name']}"),
-                            html.Br(),
-                            html.Small(f"ID: {updated_project['id']} | Total DOIs: {len(doi_list)}")
-                        ], color="info")
-                        
+                # Refresh the DOI list
+                project = next((p for p in projects or [] if p["id"] == current_project_id), None)
+                if project:
+                    try:
+                        project_info, doi_items = _edit_dois_panel(current_project_id, project["name"])
+                    except Exception as e:
+                        logger.error(f"Failed to refresh DOIs of project {current_project_id}: {e}")
+                    else:
                         return True, current_project_id, project_info, doi_items, "", no_update, no_update, \
                                dbc.Alert(message_text, color=alert_color, dismissable=True, style={"whiteSpace": "pre-wrap"})
                 
@@ -3144,6 +3276,7 @@ def handle_edit_dois_modal(edit_clicks_list, close_clicks, add_clicks, remove_cl
             payload = {
                 "email": auth_data.get("email"),
                 "password": auth_data.get("password"),
+                "token": auth_data.get("token"),
                 "dois": dois_to_remove,
                 "delete_pdfs": delete_pdfs
             }
@@ -3153,21 +3286,14 @@ def handle_edit_dois_modal(edit_clicks_list, close_clicks, add_clicks, remove_cl
             
             if r.ok:
                 result = r.json()
-                # Refresh project list
-                projects_r = requests.get(API_PROJECTS, timeout=5)
-                if projects_r.ok:
-                    updated_projects = projects_r.json()
-                    updated_project = next((p for p in updated_projects if p["id"] == current_project_id), None)
-                    if updated_project:
-                        doi_list = updated_project.get("doi_list", [])
-                        doi_items = [html.Div(f"• {doi}", className="small") for doi in doi_list]
-                        
-                        project_info = dbc.Alert([
-                            html.Strong(f"Project: {updated_project['name']}"),
-                            html.Br(),
-                            html.Small(f"ID: {updated_project['id']} | Total DOIs: {len(doi_list)}")
-                        ], color="info")
-                        
+                # Refresh the DOI list
+                project = next((p for p in projects or [] if p["id"] == current_project_id), None)
+                if project:
+                    try:
+                        project_info, doi_items = _edit_dois_panel(current_project_id, project["name"])
+                    except Exception as e:
+                        logger.error(f"Failed to refresh DOIs of project {current_project_id}: {e}")
+                    else:
                         message = result.get("message", "DOIs removed successfully")
                         if result.get("deleted_pdfs", 0) > 0:
                             message += f" | {result['deleted_pdfs']} PDF(s) deleted"
@@ -3240,7 +3366,7 @@ def start_download_project_pdfs(n_clicks_list, auth_data, current_active_project
         # If timeout occurs, the task may still be running on the server
         r = requests.post(
             f"{API_BASE}/api/admin/projects/{project_id}/download-pdfs",
-            json={"email": email, "password": password},
+            json={"email": email, "password": password, "token": auth_data.get("token")},
             timeout=10
         )
         
@@ -3318,6 +3444,123 @@ def _build_progress_outputs(progress_div_ids, active_projects_content):
             outputs.append(html.Div())  # Empty div for non-active projects
     return outputs
 
+_pdf_sources_cache = {"sources": None, "fetched_at": 0.0}
+
+def _get_enabled_pdf_sources():
+    """Enabled download sources for display (re-fetched at most once a minute)"""
+    if time.time() - _pdf_sources_cache["fetched_at"] < 60:
+        return _pdf_sources_cache["sources"]
+    config_info = None
+    try:
+        config_resp = requests.get(f"{API_BASE}/api/pdf-download-config", timeout=3)
+        if config_resp.ok:
+            config_data = config_resp.json()
+            sources = config_data.get("sources", [])
+            enabled_sources = [s for s in sources if s.get("enabled") and s.get("available")]
+            if enabled_sources:
+                config_info = enabled_sources
+    except Exception as e:
+        print(f"[Frontend] Could not fetch PDF config: {e}")
+    _pdf_sources_cache.update(sources=config_info, fetched_at=time.time())
+    return config_info
+
+def _render_pdf_download_running(data, config_info=None):
+    """
+    Progress alert for a running download. `data` is a status response or a
+    progress event (current, total, current_doi, current_source and counts).
+    """
+    total = data.get("total", 0)
+    current = data.get("current", 0)
+    current_doi = data.get("current_doi", "")
+    current_source = data.get("current_source", "")
+    # Check if download is stale
+    is_stale = data.get("is_stale", False)
+    time_since_update = data.get("time_since_update_seconds", 0)
+    
+    # Show progress
+    # Format the source name for display
+    source_display = ""
+    if current_source:
+        source_map = {
+            "unpaywall": "Unpaywall",
+            "unpywall": "Unpywall",
+            "metapub": "Metapub",
+            "habanero": "Habanero",
+            "habanero_proxy": "Habanero (via proxy)",
+            "cached": "Cached",
+            "none": "All sources attempted"
+        }
+        source_display = source_map.get(current_source, current_source)
+    
+    # Build progress text content
+    progress_content = [
+        html.Strong(f"Progress: {current} / {total} DOIs processed"),
+        html.Br(),
+        html.Strong("Currently processing: "), current_doi or "...",
+    ]
+    
+    # Add source information if available
+    if source_display:
+        progress_content.extend([
+            html.Br(),
+            html.Strong("Last source used: "),
+            source_display
+        ])
+    
+    # Add stale warning if applicable
+    if is_stale:
+        progress_content.extend([
+            html.Br(),
+            html.Br(),
+            html.Div([
+                html.I(className="bi bi-exclamation-triangle-fill me-2", style={"color": "#ffc107"}),
+                html.Strong("⚠️ Download appears stale", style={"color": "#ffc107"}),
+            ]),
+            html.Br(),
+            html.Small(
+                f"No updates for {time_since_update} seconds. The download may have been interrupted by a server restart.",
+                className="text-muted"
+            ),
+        ])
+    
+    # Add download configuration info (cached, refreshed once a minute)
+    if config_info:
+        progress_content.extend([
+            html.Br(),
+            html.Br(),
+            html.Strong("Active download mechanisms: "),
+            html.Br(),
+        ])
+        for src in config_info:
+            progress_content.extend([
+                f"  • {src['name']}: {src['description']}",
+                html.Br(),
+            ])
+    
+    # Build the alert components
+    alert_children = [
+        html.H6("PDF Download In Progress", className="alert-heading"),
+        html.Hr(),
+        html.P(progress_content),
+        dbc.Progress(value=current, max=total, striped=True, animated=True, className="mb-2"),
+        html.P([
+            html.Strong("Downloaded: "), str(data.get("downloaded_count", 0)),
+            html.Br(),
+            html.Strong("Need Manual Upload: "), str(data.get("needs_upload_count", 0)),
+            html.Br(),
+            html.Strong("Errors: "), str(data.get("errors_count", 0)),
+        ], className="mb-2"),
+    ]
+    
+    # Note: Force Restart button is in the Projects card (button row), not here
+    
+    progress_message = dbc.Alert(
+        alert_children,
+        color="warning" if is_stale else "info",
+        dismissable=False
+    )
+    return progress_message
+
 # Poll for PDF download progress
 @app.callback(
     Output({"type": "project-pdf-progress", "index": ALL}, "children", allow_duplicate=True),
@@ -3365,17 +3608,7 @@ def poll_pdf_download_progress(n_intervals, progress_div_ids, active_projects, a
     projects_to_remove = []
     
     # Fetch download config once per poll (not per project) - cache for display
-    config_info = None
-    try:
-        config_resp = requests.get(f"{API_BASE}/api/pdf-download-config", timeout=3)
-        if config_resp.ok:
-            config_data = config_resp.json()
-            sources = config_data.get("sources", [])
-            enabled_sources = [s for s in sources if s.get("enabled") and s.get("available")]
-            if enabled_sources:
-                config_info = enabled_sources
-    except Exception as e:
-        print(f"[Frontend] Could not fetch PDF config: {e}")
+    config_info = _get_enabled_pdf_sources()
     
     # Poll each active project
     for project_id in list(active_projects.keys()):
@@ -3417,93 +3650,7 @@ def poll_pdf_download_progress(n_intervals, progress_div_ids, active_projects, a
             }
             
             if status == "running":
-                # Check if download is stale
-                is_stale = data.get("is_stale", False)
-                time_since_update = data.get("time_since_update_seconds", 0)
-                
-                # Show progress
-                # Format the source name for display
-                source_display = ""
-                if current_source:
-                    source_map = {
-                        "unpaywall": "Unpaywall",
-                        "unpywall": "Unpywall",
-                        "metapub": "Metapub",
-                        "habanero": "Habanero",
-                        "habanero_proxy": "Habanero (via proxy)",
-                        "cached": "Cached",
-                        "none": "All sources attempted"
-                    }
-                    source_display = source_map.get(current_source, current_source)
-                
-                # Build progress text content
-                progress_content = [
-                    html.Strong(f"Progress: {current} / {total} DOIs processed"),
-                    html.Br(),
-                    html.Strong("Currently processing: "), current_doi or "...",
-                ]
-                
-                # Add source information if available
-                if source_display:
-                    progress_content.extend([
-                        html.Br(),
-                        html.Strong("Last source used: "),
-                        source_display
-                    ])
-                
-                # Add stale warning if applicable
-                if is_stale:
-                    progress_content.extend([
-                        html.Br(),
-                        html.Br(),
-                        html.Div([
-                            html.I(className="bi bi-exclamation-triangle-fill me-2", style={"color": "#ffc107"}),
-                            html.Strong("⚠️ Download appears stale", style={"color": "#ffc107"}),
-                        ]),
-                        html.Br(),
-                        html.Small(
-                            f"No updates for {time_since_update} seconds. The download may have been interrupted by a server restart.",
-                            className="text-muted"
-                        ),
-                    ])
-                
-                # Add download configuration info (fetched once at start of poll)
-                if config_info:
-                    progress_content.extend([
-                        html.Br(),
-                        html.Br(),
-                        html.Strong("Active download mechanisms: "),
-                        html.Br(),
-                    ])
-                    for src in config_info:
-                        progress_content.extend([
-                            f"  • {src['name']}: {src['description']}",
-                            html.Br(),
-                        ])
-                
-                # Build the alert components
-                alert_children = [
-                    html.H6("PDF Download In Progress", className="alert-heading"),
-                    html.Hr(),
-                    html.P(progress_content),
-                    dbc.Progress(value=current, max=total, striped=True, animated=True, className="mb-2"),
-                    html.P([
-                        html.Strong("Downloaded: "), str(data.get("downloaded_count", 0)),
-                        html.Br(),
-                        html.Strong("Need Manual Upload: "), str(data.get("needs_upload_count", 0)),
-                        html.Br(),
-                        html.Strong("Errors: "), str(data.get("errors_count", 0)),
-                    ], className="mb-2"),
-                ]
-                
-                # Note: Force Restart button is in the Projects card (button row), not here
-                
-                progress_message = dbc.Alert(
-                    alert_children,
-                    color="warning" if is_stale else "info",
-                    dismissable=False
-                )
-                
+                progress_message = _render_pdf_download_running(data, config_info)
                 progress_contents[project_id] = progress_message
                 # Keep this project active
             
@@ -3605,6 +3752,60 @@ def poll_pdf_download_progress(n_intervals, progress_div_ids, active_projects, a
     )
 
 
+# Follow active downloads over Server-Sent Events (assets/pdf_download_events.js).
+# Streams push each processed DOI as it happens; while every stream is connected the
+# progress interval above slows down to a 15 second fallback poll. Without
+# PROGRESS_STREAM_ENABLED the events URL is empty and the 2 second poll is kept.
+app.clientside_callback(
+    ClientsideFunction(namespace="harvest", function_name="followPdfDownloads"),
+    Output("pdf-download-progress-interval", "interval"),
+    Input("pdf-download-project-id", "data"),
+    State("pdf-download-events-url", "data"),
+)
+
+@app.callback(
+    Output({"type": "project-pdf-progress", "index": ALL}, "children", allow_duplicate=True),
+    Output("pdf-download-state-store", "data", allow_duplicate=True),
+    Input("pdf-download-event-store", "data"),
+    State({"type": "project-pdf-progress", "index": ALL}, "id"),
+    State("pdf-download-project-id", "data"),
+    State("pdf-download-state-store", "data"),
+    prevent_initial_call=True,
+)
+def apply_pdf_download_events(event_data, progress_div_ids, active_projects, download_state):
+    """Render progress pushed over SSE; final reports are still fetched by the poll callback"""
+    events = (event_data or {}).get("events") or {}
+    active_projects = active_projects if isinstance(active_projects, dict) else {}
+    if not events or not active_projects:
+        return [no_update] * len(progress_div_ids), no_update
+    
+    active_ids = {int(k) for k in active_projects}
+    state_store = {int(k): v for k, v in (download_state or {}).items() if k not in (None, '')}
+    config_info = _get_enabled_pdf_sources()
+    progress_contents = {}
+    for project_id, data in events.items():
+        project_id = int(project_id)
+        if project_id not in active_ids or data.get("status", "running") != "running":
+            continue
+        progress_contents[project_id] = _render_pdf_download_running(data, config_info)
+        state_store[project_id] = {
+            "project_id": project_id,
+            "active": True,
+            "status": "running",
+            "current": data.get("current", 0),
+            "total": data.get("total", 0)
+        }
+    
+    if not progress_contents:
+        return [no_update] * len(progress_div_ids), no_update
+    
+    outputs = [
+        progress_contents[div_id["index"]] if div_id["index"] in progress_contents else no_update
+        for div_id in progress_div_ids
+    ]
+    return outputs, state_store
+
+
 # Handle Force Restart Download button click
 @app.callback(
     Output("pdf-download-progress-interval", "disabled", allow_duplicate=True),
@@ -3646,7 +3847,7 @@ def force_restart_download(n_clicks_list, auth_data, current_active_projects, cu
         # Call backend to start download with force_restart flag
         r = requests.post(
             f"{API_BASE}/api/admin/projects/{project_id}/download-pdfs",
-            json={"email": email, "password": password, "force_restart": True},
+            json={"email": email, "password": password, "token": auth_data.get("token"), "force_restart": True},
             timeout=10
         )
         
@@ -3766,6 +3967,7 @@ def confirm_delete_project(n_clicks, project_id, option, target_project_id, auth
         payload = {
             "email": auth_data["email"],
             "password": auth_data["password"],
+            "token": auth_data.get("token"),
             "handle_triples": option
         }
         if option == "reassign":
@@ -3778,7 +3980,7 @@ def confirm_delete_project(n_clicks, project_id, option, target_project_id, auth
             if result.get("ok"):
                 # Refresh the projects list
                 try:
-                    projects_r = requests.get(API_PROJECTS, timeout=5)
+                    projects_r = requests.get(API_PROJECTS, params=PROJECT_SUMMARY_PARAMS, timeout=5)
                     if projects_r.ok:
                         projects = projects_r.json()
                         if not projects:
@@ -3786,7 +3988,7 @@ def confirm_delete_project(n_clicks, project_id, option, target_project_id, auth
                         
                         project_items = []
                         for p in projects:
-                            doi_count = len(p.get("doi_list", []))
+                            doi_count = p.get("doi_count", 0)
                             card = dbc.Card(
                                 [
                                     dbc.CardBody(
@@ -3931,6 +4133,7 @@ def handle_upload_pdf_modal(upload_clicks_list, cancel_click, confirm_click,
                 data = {
                     'email': auth_data.get('email'),
                     'password': auth_data.get('password'),
+                    'token': auth_data.get('token') or '',
                     'doi': doi.strip()
                 }
                 
@@ -4011,7 +4214,7 @@ def display_upload_file_doi_inputs(filenames):
 )
 def populate_triple_editor_project_filter(load_trigger, refresh_click, tab_value):
     try:
-        r = requests.get(API_PROJECTS, timeout=5)
+        r = requests.get(API_PROJECTS, params=PROJECT_SUMMARY_PARAMS, timeout=5)
         if r.ok:
             projects = r.json()
             options = [{"label": "All triples (no filter)", "value": "all"}] + \
@@ -4109,6 +4312,7 @@ def edit_triple_callback(update_clicks, delete_clicks, triple_id, src_name, src_
             payload = {
                 "email": auth_data["email"],
                 "password": auth_data["password"],
+                "token": auth_data.get("token"),
             }
             if src_name:
                 payload["source_entity_name"] = src_name
@@ -4138,7 +4342,8 @@ def edit_triple_callback(update_clicks, delete_clicks, triple_id, src_name, src_
             # Delete triple
             r = requests.delete(
                 f"{API_BASE}/api/triple/{triple_id}",
-                json={"email": auth_data["email"], "password": auth_data["password"]},
+                json={"email": auth_data["email"], "password": auth_data["password"],
+                      "token": auth_data.get("token")},
                 timeout=10
             )
             if r.ok:
@@ -4172,10 +4377,10 @@ def populate_batch_mgmt_projects(auth_data, _):
         return []
     
     try:
-        r = requests.get(API_PROJECTS, timeout=5)
+        r = requests.get(API_PROJECTS, params=PROJECT_SUMMARY_PARAMS, timeout=5)
         if r.ok:
             projects = r.json()
-            return [{"label": f"{p['name']} ({len(p.get('doi_list', []))} DOIs)", "value": p["id"]} for p in projects]
+            return [{"label": f"{p['name']} ({p.get('doi_count', 0)} DOIs)", "value": p["id"]} for p in projects]
         else:
             return []
     except Exception as e:
@@ -4208,6 +4413,7 @@ def create_batches_callback(n_clicks, project_id, batch_size, strategy, auth_dat
             json={
                 "admin_email": auth_data["email"],
                 "admin_password": auth_data["password"],
+                "token": auth_data.get("token"),
                 "batch_size": batch_size or 20,
                 "strategy": strategy or "sequential"
             },
@@ -4334,6 +4540,7 @@ def export_triples_callback(n_clicks, auth_data, export_project, unmask_toggle):
             json={
                 "email": auth_data["email"],
                 "password": auth_data["password"],
+                "token": auth_data.get("token"),
                 "project_id": export_project
             },
             timeout=30
@@ -4531,6 +4738,8 @@ def save_browse_field_config(selected_fields, admin_auth):
         if email and password:
             payload["email"] = email
             payload["password"] = password
+        if admin_auth.get("token"):
+            payload["token"] = admin_auth["token"]
 
     try:
         resp = requests.post(API_ADMIN_BROWSE_FIELDS, json=payload, timeout=5)
@@ -13,7 +13,7 @@ import dash_bootstrap_components as dbc
 from frontend import (
     APP_TITLE, PARTNER_LOGOS, ENABLE_LITERATURE_SEARCH, 
     ENABLE_PDF_HIGHLIGHTING, ENABLE_LITERATURE_REVIEW,
-    DASH_REQUESTS_PATHNAME_PREFIX, app, markdown_cache,
+    DASH_REQUESTS_PATHNAME_PREFIX, PROGRESS_STREAM_ENABLED, app, markdown_cache,
     OTHER_SENTINEL
 )
 
@@ -442,6 +442,13 @@ def get_layout():
             dcc.Store(id="admin-unmask-store", data=False, storage_type="session"),  # Admin toggle for unmasked emails
             dcc.Interval(id="load-trigger", n_intervals=0, interval=200, max_intervals=1),
             dcc.Interval(id="pdf-download-progress-interval", interval=2000, disabled=True),  # Poll every 2 seconds
+            dcc.Store(id="pdf-download-events-url",  # No URL: poll only (PROGRESS_STREAM_ENABLED off)
+                      data=f"{DASH_REQUESTS_PATHNAME_PREFIX.rstrip('/')}/proxy/download-events/" if PROGRESS_STREAM_ENABLED else None),
+            dcc.Store(id="pdf-download-event-store"),  # Latest SSE progress event per project (set by assets/pdf_download_events.js)
+            dcc.Store(id="project-creation-job-store", storage_type="local"),  # Active project creation job (survives refresh)
+            dcc.Interval(id="project-creation-progress-interval", interval=1000, disabled=True),  # Poll every second
+            dcc.Store(id="lit-search-job-store"),  # Running literature search job (polled below)
+            dcc.Interval(id="lit-search-progress-interval", interval=1000, disabled=True),  # Poll every second
         
             # Modal for Privacy Policy
             dbc.Modal(
@@ -1377,6 +1384,8 @@ def get_layout():
                                                                 style={"display": "none"},
                                                             ),
                                                         
+                                                            # Pipeline stages of a running search (outside the spinner)
+                                                            html.Div(id="lit-search-progress", className="mb-3"),
                                                             dcc.Loading(
                                                                 id="loading-search",
                                                                 type="default",
@@ -2010,9 +2019,10 @@ def get_layout():
                                                                     type="default",
                                                                     children=html.Div(id="project-message", className="mb-3")
                                                                 ),
+                                                                html.Div(id="project-creation-progress", className="mb-3"),
                                                                 html.Small(
-                                                                    "💡 Tip: For 300+ DOIs, validation may take 1-2 minutes. "
-                                                                    "A spinner will appear while processing.",
+                                                                    "💡 Tip: DOIs are validated in the background. Large lists "
+                                                                    "show live progress here and you can keep working meanwhile.",
                                                                     className="text-muted d-block mb-2"
                                                                 ),
                                                             ]),
@@ -11,7 +11,7 @@ from functools import lru_cache
 from flask import Response, request as flask_request, render_template_string
 
 # Import from parent frontend package  
-from frontend import server, API_BASE, ASREVIEW_PROXY_FILTERED_HEADERS
+from frontend import server, API_BASE, ASREVIEW_PROXY_FILTERED_HEADERS, PROGRESS_STREAM_ENABLED
 
 logger = logging.getLogger(__name__)
 
@@ -258,6 +258,63 @@ def proxy_highlights(project_id: int, filename: str):
         )
 
 
+@server.route('/proxy/download-events/<int:project_id>')
+def proxy_download_events(project_id: int):
+    """
+    Proxy the backend's PDF download progress stream (Server-Sent Events).
+    Forwards Last-Event-ID so reconnecting browsers resume where they stopped,
+    and passes the stream through unbuffered. The stream holds this worker while
+    open, so it is only served with PROGRESS_STREAM_ENABLED (threaded workers).
+    """
+    if not PROGRESS_STREAM_ENABLED:
+        return Response(
+            json.dumps({"error": "Progress streaming is disabled"}),
+            status=503,
+            mimetype='application/json'
+        )
+
+    backend_url = f"{API_BASE}/api/admin/projects/{project_id}/download-pdfs/events"
+    headers = {}
+    last_event_id = flask_request.headers.get('Last-Event-ID')
+    if last_event_id:
+        headers['Last-Event-ID'] = last_event_id
+
+    try:
+        # The backend sends a keep-alive comment at least every 15 seconds
+        response = requests.get(backend_url, headers=headers, stream=True, timeout=(5, 60))
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Cannot connect to backend for download events: {e}")
+        return Response(
+            json.dumps({"error": "Cannot connect to backend"}),
+            status=502,
+            mimetype='application/json'
+        )
+
+    if response.status_code != 200:
+        content = response.content
+        response.close()
+        return Response(content, status=response.status_code, mimetype='application/json')
+
+    def generate():
+        try:
+            for chunk in response.iter_content(chunk_size=None):
+                if chunk:
+                    yield chunk
+        except requests.exceptions.RequestException:
+            pass  # Browser reconnects with Last-Event-ID
+        finally:
+            response.close()
+
+    return Response(
+        generate(),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+
 def _get_content_type_from_path(path: str) -> str:
     """
     Determine Content-Type based on file extension.
@@ -4,7 +4,6 @@
 import os
 import re
 import json
-import requests
 import sqlite3
 import logging
 import hashlib
@@ -13,14 +12,17 @@ import threading
 import time
 from datetime import datetime
 import secrets
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from functools import lru_cache
+from collections import OrderedDict
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 
+from crossref_client import get_crossref_client
+from doi_metadata import get_doi_metadata, get_metadata_coverage
 from harvest_store import (
     init_db,
+    configure_connection_factory,
     fetch_entity_dropdown_options,
     fetch_relation_dropdown_options,
     upsert_sentence,
@@ -32,8 +34,9 @@ from harvest_store import (
     is_admin_user,
     verify_admin_password,
     create_admin_user,
-    create_project,
     get_all_projects,
+    get_project_summaries,
+    get_project_dois_page,
     get_project_by_id,
     update_project,
     delete_project,
@@ -42,9 +45,12 @@ from harvest_store import (
     init_pdf_download_progress,
     update_pdf_download_progress,
     get_pdf_download_progress,
+    get_pdf_download_events,
+    get_pdf_download_overview,
+    get_latest_pdf_download_event_id,
     cleanup_old_pdf_download_progress,
-    is_download_stale,
     reset_stale_download,
+    is_download_stale,
     create_batches,
     get_project_batches,
     get_batch_dois,
@@ -52,6 +58,33 @@ from harvest_store import (
     get_doi_status_summary,
     set_browse_visible_fields,
     get_browse_visible_fields,
+    store_admin_token,
+    get_admin_token_email,
+    delete_admin_token,
+    cleanup_expired_admin_tokens,
+    get_cached_doi_validations,
+    store_doi_validations,
+    get_doi_validation_cache_size,
+    cleanup_doi_validation_cache,
+    configure_project_sharding,
+    get_project_conn,
+    get_row_conn,
+    iter_read_conns,
+    reassign_project_triples,
+    create_project_creation_job,
+    update_project_creation_job,
+    get_project_creation_job,
+    cleanup_old_project_creation_jobs,
+    create_literature_search_job,
+    update_literature_search_job,
+    get_literature_search_job,
+    cleanup_old_literature_search_jobs,
+    get_cached_literature_search,
+    cleanup_literature_search_cache,
+    enqueue_job,
+    cancel_job,
+    get_active_job,
+    cleanup_old_jobs,
 )
 
 # Import configuration
@@ -100,37 +133,155 @@ BACKEND_PUBLIC_URL = os.environ.get("HARVEST_BACKEND_PUBLIC_URL", BACKEND_PUBLIC
 if DEPLOYMENT_MODE not in ["internal", "nginx"]:
     raise ValueError(f"Invalid DEPLOYMENT_MODE: {DEPLOYMENT_MODE}. Must be 'internal' or 'nginx'")
 
-# Ensure database directory exists and DB_PATH is not a directory
+# DB_PATH must name a file; the directory itself is created by boot()
 abs_db_path = os.path.abspath(DB_PATH)
 if os.path.isdir(abs_db_path):
     raise ValueError(f"HARVEST_DB points to a directory, expected file path: {abs_db_path}")
-db_dir = os.path.dirname(abs_db_path) or "."
-if db_dir and db_dir != '/' and not os.path.exists(db_dir):
-    try:
-        os.makedirs(db_dir, exist_ok=True)
-        logger.info(f"Created database directory: {db_dir}")
-    except Exception as e:
-        raise RuntimeError(f"Failed to create database directory '{db_dir}': {e}") from e
 
-    logger.info(f"Created database directory: {db_dir}")
+# Per-project database sharding (optional)
+try:
+    from config import ENABLE_PROJECT_SHARDING, PROJECT_SHARD_DIR
+except ImportError:
+    ENABLE_PROJECT_SHARDING = False
+    PROJECT_SHARD_DIR = "project_shards"
+ENABLE_PROJECT_SHARDING = os.environ.get(
+    "HARVEST_ENABLE_PROJECT_SHARDING", str(ENABLE_PROJECT_SHARDING)
+).lower() in ("1", "true", "yes")
+PROJECT_SHARD_DIR = os.environ.get("HARVEST_PROJECT_SHARD_DIR", PROJECT_SHARD_DIR)
+configure_project_sharding(ENABLE_PROJECT_SHARDING, PROJECT_SHARD_DIR)
+if ENABLE_PROJECT_SHARDING:
+    logger.info(f"Per-project database sharding enabled (shard dir: {PROJECT_SHARD_DIR})")
+
+# DOI validation cache TTLs (valid DOIs rarely disappear; unknown ones may be registered soon)
+try:
+    from config import (
+        DOI_CACHE_POSITIVE_TTL, DOI_CACHE_NEGATIVE_TTL, DOI_CACHE_MAX_MEMORY_ENTRIES
+    )
+except ImportError:
+    DOI_CACHE_POSITIVE_TTL = 30 * 86400
+    DOI_CACHE_NEGATIVE_TTL = 3600
+    DOI_CACHE_MAX_MEMORY_ENTRIES = 10000
+
+# Literature searches run as background jobs; results are cached in the database
+try:
+    from config import LITERATURE_SEARCH_CACHE_TTL
+except ImportError:
+    LITERATURE_SEARCH_CACHE_TTL = 86400
 
-# Initialize required directories (.cache, project_pdfs)
+# Background jobs: "embedded" runs a worker thread in this process, "external"
+# leaves the queue to separate `python3 harvest_worker.py` processes
 try:
-    from init_directories import init_harvest_directories
-    success, messages = init_harvest_directories()
-    if not success:
-        logger.warning("Some required directories could not be created. The application may encounter issues.")
-        for msg in messages:
-            if "Failed" in msg or "not" in msg.lower():
-                logger.warning(msg)
-except Exception as e:
-    logger.warning(f"Failed to initialize directories: {e}. The application may encounter issues.")
+    from config import JOB_WORKER_MODE, JOB_MAX_ATTEMPTS
+except ImportError:
+    JOB_WORKER_MODE = "embedded"
+    JOB_MAX_ATTEMPTS = 3
+JOB_WORKER_MODE = os.environ.get("HARVEST_JOB_WORKER_MODE", JOB_WORKER_MODE)
+
+# SSE streams hold a worker each: only enabled under threaded gunicorn workers (see config.py)
+try:
+    from config import PROGRESS_STREAM_ENABLED
+except ImportError:
+    PROGRESS_STREAM_ENABLED = False
+PROGRESS_STREAM_ENABLED = os.environ.get("HARVEST_PROGRESS_STREAM", str(PROGRESS_STREAM_ENABLED)).lower() in ("true", "1", "yes")
+
+try:
+    from config import PROGRESS_STREAM_POLL_INTERVAL, PROGRESS_STREAM_KEEPALIVE, PROGRESS_STREAM_MAX_SECONDS
+except ImportError:
+    PROGRESS_STREAM_POLL_INTERVAL = 0.5
+    PROGRESS_STREAM_KEEPALIVE = 15
+    PROGRESS_STREAM_MAX_SECONDS = 300
+
+try:
+    from config import RESPONSE_FAST_JSON, RESPONSE_COMPRESSION, RESPONSE_COMPRESSION_MIN_BYTES
+except ImportError:
+    RESPONSE_FAST_JSON = False
+    RESPONSE_COMPRESSION = False
+    RESPONSE_COMPRESSION_MIN_BYTES = 1024
+RESPONSE_FAST_JSON = os.environ.get(
+    "HARVEST_FAST_JSON", str(RESPONSE_FAST_JSON)
+).lower() in ("1", "true", "yes")
+RESPONSE_COMPRESSION = os.environ.get(
+    "HARVEST_RESPONSE_COMPRESSION", str(RESPONSE_COMPRESSION)
+).lower() in ("1", "true", "yes")
+
+try:
+    from config import ENABLE_METRICS, METRICS_MULTIPROC_DIR
+except ImportError:
+    ENABLE_METRICS = False
+    METRICS_MULTIPROC_DIR = ""
+ENABLE_METRICS = os.environ.get(
+    "HARVEST_ENABLE_METRICS", str(ENABLE_METRICS)
+).lower() in ("1", "true", "yes")
+METRICS_MULTIPROC_DIR = os.environ.get("HARVEST_METRICS_DIR", METRICS_MULTIPROC_DIR)
+if ENABLE_METRICS:
+    # Count and time SQL for every store connection
+    from metrics import InstrumentedConnection
+    configure_connection_factory(InstrumentedConnection)
+
+_boot_lock = threading.Lock()
+_booted = False
+
+def boot():
+    """
+    Create the database directory, HARVEST directories and schemas (idempotent), and
+    in embedded mode start the job worker, which resumes interrupted jobs and drains
+    the PDF retry queue. Run by __main__ and wsgi_be at startup, and before the first
+    request otherwise, so importing this module stays cheap (see scripts/benchmark_startup.py).
+    """
+    global _booted
+    with _boot_lock:
+        if _booted:
+            return
+        db_dir = os.path.dirname(abs_db_path) or "."
+        if db_dir and db_dir != '/' and not os.path.exists(db_dir):
+            try:
+                os.makedirs(db_dir, exist_ok=True)
+                logger.info(f"Created database directory: {db_dir}")
+            except Exception as e:
+                raise RuntimeError(f"Failed to create database directory '{db_dir}': {e}") from e
+
+        # Initialize required directories (.cache, project_pdfs)
+        try:
+            from init_directories import init_harvest_directories
+            success, messages = init_harvest_directories()
+            if not success:
+                logger.warning("Some required directories could not be created. The application may encounter issues.")
+                for msg in messages:
+                    if "Failed" in msg or "not" in msg.lower():
+                        logger.warning(msg)
+        except Exception as e:
+            logger.warning(f"Failed to initialize directories: {e}. The application may encounter issues.")
 
-# Initialize DB on startup
-init_db(DB_PATH)
+        init_db(DB_PATH)
+        try:
+            from pdf_download_db import init_pdf_download_db
+            init_pdf_download_db()
+        except ImportError as e:
+            logger.warning(f"PDF download tracking database not available: {e}")
+        _booted = True
+    _ensure_job_worker()
 
 app = Flask(__name__)
 
+@app.before_request
+def _boot_before_first_request():
+    if not _booted:
+        boot()
+    else:
+        # Worker threads do not survive a fork (gunicorn --preload booted in the master)
+        _ensure_job_worker()
+
+# Registered first so its after_request hook runs last and times the whole response
+if ENABLE_METRICS:
+    from metrics import init_metrics
+    init_metrics(app, multiproc_dir=METRICS_MULTIPROC_DIR)
+    logger.info(f"Metrics enabled at /metrics (multiprocess dir: {METRICS_MULTIPROC_DIR or 'none'})")
+
+if RESPONSE_FAST_JSON or RESPONSE_COMPRESSION:
+    from response_layer import init_response_layer
+    init_response_layer(app, fast_json=RESPONSE_FAST_JSON, compression=RESPONSE_COMPRESSION,
+                        min_size=RESPONSE_COMPRESSION_MIN_BYTES)
+
 # Configure CORS based on deployment mode
 if DEPLOYMENT_MODE == "nginx":
     # In nginx mode, allow CORS from any origin since requests come directly from client
@@ -171,154 +322,206 @@ ALLOWED_BROWSE_FIELDS = {
 }
 MAX_BROWSE_LIMIT = 10000
 
-# Token storage for admin sessions (in-memory)
-# Format: {token: {"email": email, "expires_at": timestamp}}
-_admin_tokens = {}
-_token_lock = threading.Lock()
+# Token storage for admin sessions
+# Tokens live in the admin_tokens table so every gunicorn worker accepts them.
 TOKEN_EXPIRATION = 86400  # 24 hours in seconds
 
 def generate_admin_token(email: str) -> str:
     """Generate a secure random token for admin session."""
     token = secrets.token_urlsafe(32)
     expires_at = time.time() + TOKEN_EXPIRATION
-    with _token_lock:
-        _admin_tokens[token] = {"email": email, "expires_at": expires_at}
+    store_admin_token(DB_PATH, token, email, expires_at)
     return token
 
 def verify_admin_token(token: str) -> str | None:
     """Verify admin token and return email if valid, None otherwise."""
     if not token:
         return None
-    
-    with _token_lock:
-        token_data = _admin_tokens.get(token)
-        if not token_data:
-            return None
-        
-        # Check expiration
-        if time.time() > token_data["expires_at"]:
-            # Token expired, remove it
-            del _admin_tokens[token]
-            return None
-        
-        return token_data["email"]
+    return get_admin_token_email(DB_PATH, token)
 
 def revoke_admin_token(token: str) -> bool:
     """Revoke an admin token."""
-    with _token_lock:
-        if token in _admin_tokens:
-            del _admin_tokens[token]
-            return True
-        return False
+    return delete_admin_token(DB_PATH, token)
 
 def cleanup_expired_tokens():
     """Clean up expired tokens (should be called periodically)."""
-    with _token_lock:
-        current_time = time.time()
-        expired_tokens = [
-            token for token, data in _admin_tokens.items()
-            if current_time > data["expires_at"]
-        ]
-        for token in expired_tokens:
-            del _admin_tokens[token]
-        if expired_tokens:
-            logger.info(f"Cleaned up {len(expired_tokens)} expired admin tokens")
+    removed = cleanup_expired_admin_tokens(DB_PATH)
+    if removed:
+        logger.info(f"Cleaned up {removed} expired admin tokens")
+
+def get_request_admin_token(payload: dict | None = None) -> str:
+    """
+    Admin token from the JSON payload ("token") or the request headers
+    ("Authorization: Bearer <token>" or "X-Admin-Token").
+    """
+    token = ((payload or {}).get("token") or "").strip()
+    if token:
+        return token
+    auth_header = request.headers.get("Authorization", "")
+    if auth_header.startswith("Bearer "):
+        return auth_header[len("Bearer "):].strip()
+    return request.headers.get("X-Admin-Token", "").strip()
 
-def verify_admin_auth(payload: dict) -> tuple[bool, str | None]:
+def verify_admin_auth(payload: dict, email_key: str = "email",
+                      password_key: str = "password") -> tuple[bool, str | None]:
     """
     Verify admin authentication from request payload.
-    Accepts either token OR email/password.
+    Accepts either token (payload or headers) OR email/password.
     Returns: (is_authenticated, email)
     """
+    payload = payload or {}
+
     # Try token-based auth first
-    token = payload.get("token", "").strip()
+    token = get_request_admin_token(payload)
     if token:
         email = verify_admin_token(token)
         if email:
             return True, email
     
     # Fall back to email/password auth for backwards compatibility
-    email = (payload.get("email") or "").strip()
-    password = payload.get("password") or ""
+    email = (payload.get(email_key) or "").strip()
+    password = payload.get(password_key) or ""
     
     if email and password:
-        if verify_admin_password(DB_PATH, email, password) or is_admin_user(email):
+        if is_admin_user(email) or verify_admin_password(DB_PATH, email, password):
             return True, email
     
     return False, None
 
+def require_admin_auth(payload: dict, email_key: str = "email", password_key: str = "password"):
+    """
+    Authenticate an admin request by token or email/password.
+    Returns: (email, None) on success, or (None, (response, status_code)) on failure.
+    """
+    payload = payload or {}
+    is_authenticated, email = verify_admin_auth(payload, email_key, password_key)
+    if is_authenticated:
+        return email, None
+    if not get_request_admin_token(payload) and not (payload.get(email_key) and payload.get(password_key)):
+        return None, (jsonify({"error": "Admin authentication required"}), 401)
+    return None, (jsonify({"error": "Invalid admin credentials"}), 403)
+
 # DOI Validation Cache - stores validation results to avoid redundant API calls
-# Format: {doi: {"valid": bool, "reason": str, "timestamp": float}}
-_doi_validation_cache = {}
+# Results are persisted in the doi_validation_cache table (shared by all workers,
+# survives restarts) with an LRU-bounded in-memory front per process.
+# Memory format: OrderedDict {doi: (valid, reason, checked_at)}
+_doi_validation_cache = OrderedDict()
 _doi_cache_lock = threading.Lock()
-DOI_CACHE_TTL = 3600  # 1 hour cache TTL
+_doi_cache_stats = {"memory_hits": 0, "db_hits": 0, "misses": 0}
 
-def _validate_single_doi(doi: str) -> Tuple[str, bool, str]:
+def _doi_cache_ttl(valid: bool) -> int:
+    return DOI_CACHE_POSITIVE_TTL if valid else DOI_CACHE_NEGATIVE_TTL
+
+def _doi_cache_get_many(dois: List[str]) -> Dict[str, Tuple[bool, str]]:
     """
-    Validate a single DOI via CrossRef API.
-    Returns: (doi, is_valid, reason)
+    Look up cached validation results for normalized DOIs: memory first,
+    then one bulk query against the shared database cache.
+    Returns: {doi: (is_valid, reason)} for fresh entries only
+    """
+    results = {}
+    remaining = []
+    now = time.time()
+    with _doi_cache_lock:
+        for doi in dois:
+            entry = _doi_validation_cache.get(doi)
+            if entry and now - entry[2] < _doi_cache_ttl(entry[0]):
+                _doi_validation_cache.move_to_end(doi)
+                results[doi] = (entry[0], entry[1])
+            else:
+                if entry:
+                    del _doi_validation_cache[doi]
+                remaining.append(doi)
+        _doi_cache_stats["memory_hits"] += len(results)
+
+    db_results = get_cached_doi_validations(DB_PATH, remaining, DOI_CACHE_POSITIVE_TTL, DOI_CACHE_NEGATIVE_TTL)
+    with _doi_cache_lock:
+        for doi, entry in db_results.items():
+            _doi_validation_cache[doi] = entry
+            results[doi] = (entry[0], entry[1])
+        while len(_doi_validation_cache) > DOI_CACHE_MAX_MEMORY_ENTRIES:
+            _doi_validation_cache.popitem(last=False)
+        _doi_cache_stats["db_hits"] += len(db_results)
+        _doi_cache_stats["misses"] += len(remaining) - len(db_results)
+    return results
+
+def _doi_cache_put_many(entries: List[Tuple[str, bool, str]]) -> None:
+    """Cache definitive validation results (doi, is_valid, reason) in memory and the database."""
+    if not entries:
+        return
+    now = time.time()
+    with _doi_cache_lock:
+        for doi, valid, reason in entries:
+            _doi_validation_cache[doi] = (valid, reason, now)
+            _doi_validation_cache.move_to_end(doi)
+        while len(_doi_validation_cache) > DOI_CACHE_MAX_MEMORY_ENTRIES:
+            _doi_validation_cache.popitem(last=False)
+    store_doi_validations(DB_PATH, entries)
+
+def get_doi_cache_stats() -> Dict[str, Any]:
+    """Hit rate (this worker) and size (memory and shared database) of the DOI validation cache."""
+    with _doi_cache_lock:
+        stats = dict(_doi_cache_stats)
+        stats["memory_entries"] = len(_doi_validation_cache)
+    lookups = stats["memory_hits"] + stats["db_hits"] + stats["misses"]
+    stats["lookups"] = lookups
+    stats["hit_rate"] = round((stats["memory_hits"] + stats["db_hits"]) / lookups, 4) if lookups else 0.0
+    stats["db_entries"] = get_doi_validation_cache_size(DB_PATH)
+    stats["max_memory_entries"] = DOI_CACHE_MAX_MEMORY_ENTRIES
+    stats["positive_ttl_seconds"] = DOI_CACHE_POSITIVE_TTL
+    stats["negative_ttl_seconds"] = DOI_CACHE_NEGATIVE_TTL
+    return stats
+
+def _check_doi_format(doi: str) -> Tuple[str, str]:
+    """
+    Normalize a DOI and check its format (fast check before any API call).
+    Returns: (normalized_doi, error_reason) - error_reason is "" if the format is valid
     """
-    # Normalize DOI
     doi_normalized = normalize_doi(doi)
     if not doi_normalized:
-        return (doi, False, "Empty DOI")
-    
-    # Check format first (fast check before API call)
+        return (doi_normalized, "Empty DOI")
     doi_pattern = r'^10\.\d{4,9}/[-._;()/:A-Za-z0-9]+$'
     if not re.match(doi_pattern, doi_normalized):
-        return (doi, False, "Invalid DOI format")
+        return (doi_normalized, "Invalid DOI format")
+    return (doi_normalized, "")
+
+def _fetch_doi_validation(doi: str, doi_normalized: str) -> Tuple[str, bool, str]:
+    """
+    Validate a single normalized DOI via CrossRef API (no cache lookup).
+    Definitive answers (found / not found) are written to the cache.
+    Returns: (doi, is_valid, reason)
+    """
+    is_valid, reason, definitive = get_crossref_client().validate_doi(doi_normalized)
+    if definitive:
+        # Not-found results get the shorter negative TTL (the DOI may be registered soon)
+        _doi_cache_put_many([(doi_normalized, is_valid, reason)])
+    return (doi, is_valid, reason)
+
+def _validate_single_doi(doi: str) -> Tuple[str, bool, str]:
+    """
+    Validate a single DOI via CrossRef API.
+    Returns: (doi, is_valid, reason)
+    """
+    doi_normalized, format_error = _check_doi_format(doi)
+    if format_error:
+        return (doi, False, format_error)
     
     # Check cache first
-    with _doi_cache_lock:
-        cached = _doi_validation_cache.get(doi_normalized)
-        if cached and (time.time() - cached["timestamp"]) < DOI_CACHE_TTL:
-            return (doi, cached["valid"], cached.get("reason", ""))
+    cached = _doi_cache_get_many([doi_normalized]).get(doi_normalized)
+    if cached:
+        return (doi, cached[0], cached[1])
     
-    # Validate via CrossRef API
-    try:
-        headers = {"Accept": "application/json"}
-        response = requests.get(
-            f"https://api.crossref.org/works/{doi_normalized}",
-            headers=headers,
-            timeout=5
-        )
-        
-        if response.status_code == 200:
-            # Cache success
-            with _doi_cache_lock:
-                _doi_validation_cache[doi_normalized] = {
-                    "valid": True,
-                    "reason": "",
-                    "timestamp": time.time()
-                }
-            return (doi, True, "")
-        elif response.status_code == 404:
-            reason = "DOI not found in CrossRef database"
-            # Cache failure
-            with _doi_cache_lock:
-                _doi_validation_cache[doi_normalized] = {
-                    "valid": False,
-                    "reason": reason,
-                    "timestamp": time.time()
-                }
-            return (doi, False, reason)
-        else:
-            return (doi, False, f"CrossRef validation failed (HTTP {response.status_code})")
-            
-    except requests.exceptions.Timeout:
-        return (doi, False, "CrossRef API timeout")
-    except requests.exceptions.RequestException as e:
-        return (doi, False, f"Network error: {str(e)}")
-    except Exception as e:
-        return (doi, False, f"Validation error: {str(e)}")
+    return _fetch_doi_validation(doi, doi_normalized)
 
-def validate_dois_concurrent(dois: List[str], max_workers: int = 10) -> Tuple[List[str], List[Dict[str, str]]]:
+def validate_dois_concurrent(dois: List[str]) -> Tuple[List[str], List[Dict[str, str]]]:
     """
-    Validate multiple DOIs concurrently with caching.
+    Validate multiple DOIs with caching and batched CrossRef lookups.
+    
+    Cached results for the whole list are looked up in bulk first; cache misses
+    are resolved by the shared CrossRef client, many DOIs per request, within
+    its process-wide rate limit.
     
     Args:
         dois: List of DOI strings to validate
-        max_workers: Maximum number of concurrent validation threads
         
     Returns:
         Tuple of (valid_dois, invalid_dois)
@@ -331,27 +534,49 @@ def validate_dois_concurrent(dois: List[str], max_workers: int = 10) -> Tuple[Li
     valid_dois = []
     invalid_dois = []
     
-    # Use ThreadPoolExecutor for concurrent validation
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all validation tasks
-        future_to_doi = {executor.submit(_validate_single_doi, doi): doi for doi in dois}
-        
-        # Process results as they complete
-        for future in as_completed(future_to_doi):
-            try:
-                original_doi, is_valid, reason = future.result()
-                if is_valid:
-                    # Add normalized version
-                    valid_dois.append(normalize_doi(original_doi))
-                else:
-                    invalid_dois.append({"doi": original_doi, "reason": reason})
-            except Exception as e:
-                original_doi = future_to_doi[future]
-                invalid_dois.append({"doi": original_doi, "reason": f"Unexpected error: {str(e)}"})
-        
-        # Add small delay to be respectful to CrossRef API (total, not per request)
-        # Since we're making concurrent requests, we add a small delay at the end
-        time.sleep(0.1)
+    # Format check, then bulk cache lookup before any network call
+    to_check = []
+    for doi in dois:
+        doi_normalized, format_error = _check_doi_format(doi)
+        if format_error:
+            invalid_dois.append({"doi": doi, "reason": format_error})
+        else:
+            to_check.append((doi, doi_normalized))
+    
+    cached = _doi_cache_get_many(list({n for _, n in to_check}))
+    to_fetch = []
+    for doi, doi_normalized in to_check:
+        if doi_normalized in cached:
+            is_valid, reason = cached[doi_normalized]
+            if is_valid:
+                valid_dois.append(doi_normalized)
+            else:
+                invalid_dois.append({"doi": doi, "reason": reason})
+        else:
+            to_fetch.append((doi, doi_normalized))
+    
+    if not to_fetch:
+        return (list(set(valid_dois)), invalid_dois)
+    
+    try:
+        results = get_crossref_client().validate_dois([n for _, n in to_fetch])
+    except Exception as e:
+        logger.error(f"CrossRef batch validation failed: {e}", exc_info=True)
+        results = {}
+    
+    # Cache definitive answers only; timeouts and server errors are retried next time
+    _doi_cache_put_many([
+        (doi_normalized, is_valid, reason)
+        for doi_normalized, (is_valid, reason, definitive) in results.items()
+        if definitive
+    ])
+    
+    for doi, doi_normalized in to_fetch:
+        is_valid, reason, _ = results.get(doi_normalized, (False, "Validation error: no result", False))
+        if is_valid:
+            valid_dois.append(doi_normalized)
+        else:
+            invalid_dois.append({"doi": doi, "reason": reason})
     
     return (list(set(valid_dois)), invalid_dois)  # Deduplicate valid DOIs
 
@@ -405,6 +630,8 @@ def normalize_doi(doi: str) -> str:
 def validate_doi():
     """
     Validate a DOI and fetch metadata from CrossRef API.
+    Metadata already stored for the DOI is returned without a CrossRef request
+    (stale entries are refreshed in the background, see doi_metadata.py).
     Expected JSON: { "doi": "10.1234/example" }
     Returns: { "valid": true/false, "metadata": {...} }
     """
@@ -425,45 +652,18 @@ def validate_doi():
         return jsonify({"valid": False, "error": "Invalid DOI format"}), 200
 
     try:
-        headers = {"Accept": "application/json"}
-        response = requests.get(f"https://api.crossref.org/works/{doi}", headers=headers, timeout=10)
-
-        if response.status_code == 200:
-            data = response.json()
-            message = data.get("message", {})
-
-            title = message.get("title", [""])[0] if message.get("title") else ""
-
-            authors = []
-            for author in message.get("author", []):
-                given = author.get("given", "")
-                family = author.get("family", "")
-                if given and family:
-                    authors.append(f"{given} {family}")
-                elif family:
-                    authors.append(family)
-            authors_str = ", ".join(authors) if authors else ""
-
-            year = ""
-            if message.get("published-print"):
-                date_parts = message["published-print"].get("date-parts", [[]])
-                if date_parts and date_parts[0]:
-                    year = str(date_parts[0][0])
-            elif message.get("published-online"):
-                date_parts = message["published-online"].get("date-parts", [[]])
-                if date_parts and date_parts[0]:
-                    year = str(date_parts[0][0])
+        status, metadata = get_doi_metadata(DB_PATH, doi)
 
+        if status == 200:
+            _doi_cache_put_many([(doi, True, "")])
             return jsonify({
                 "valid": True,
                 "doi": doi,
-                "metadata": {
-                    "title": title,
-                    "authors": authors_str,
-                    "year": year,
-                }
+                "metadata": metadata,
             })
         else:
+            if status == 404:
+                _doi_cache_put_many([(doi, False, "DOI not found in CrossRef database")])
             return jsonify({"valid": False, "error": "DOI not found in CrossRef"}), 200
 
     except Exception as e:
@@ -555,7 +755,7 @@ def save():
 
     # Upsert the sentence, then insert triples
     try:
-        sid = upsert_sentence(DB_PATH, sentence_id, sentence, literature_link, doi_hash)
+        sid = upsert_sentence(DB_PATH, sentence_id, sentence, literature_link, doi_hash, project_id)
         insert_triple_rows(DB_PATH, sid, triples, contributor_email, project_id)
         return jsonify({"ok": True, "sentence_id": sid, "doi_hash": doi_hash})
     except Exception as e:
@@ -576,15 +776,19 @@ def delete_triple(triple_id: int):
     requester_email = (payload.get("email") or "").strip()
     password = payload.get("password")
 
+    # Admin token holders may delete any triple
+    token_email = verify_admin_token(get_request_admin_token(payload))
+    if token_email:
+        requester_email = requester_email or token_email
+
     if not requester_email:
         return jsonify({"error": "Missing 'email'"}), 400
 
     # Check admin status
-    is_admin = check_admin_status(DB_PATH, requester_email, password)
+    is_admin = bool(token_email) or check_admin_status(DB_PATH, requester_email, password)
 
-    from harvest_store import get_conn
     try:
-        conn = get_conn(DB_PATH)
+        conn = get_row_conn(DB_PATH, triple_id)
         cur = conn.cursor()
 
         # Get triple info before deletion
@@ -628,13 +832,13 @@ def delete_triple(triple_id: int):
 def rows():
     """
     List recent rows with DOI information.
-    Note: Article metadata (title, authors, year) are not stored and would need to be fetched on-demand from CrossRef.
+    Note: Article metadata (title, authors, year) is not included; it is stored per DOI by
+    /api/validate-doi and the project metadata prefetch job (see doi_metadata.py).
     Supports query parameters:
       - project_id (int): filter by project
       - triple_contributor (str): prefix match on hashed annotator ID (SHA256 salt-prefixed); admins may pass plain email
       - limit (int): max records to return (capped at MAX_BROWSE_LIMIT)
     """
-    from harvest_store import get_conn
     try:
         project_id = request.args.get('project_id', type=int)
         triple_contributor_filter = request.args.get('triple_contributor', type=str)
@@ -644,8 +848,6 @@ def rows():
         if limit is not None and limit > MAX_BROWSE_LIMIT:
             limit = MAX_BROWSE_LIMIT
         
-        conn = get_conn(DB_PATH)
-        cur = conn.cursor()
         query = """
             SELECT s.id, s.text, s.literature_link, s.doi_hash,
                    dm.doi, t.id, t.source_entity_name,
@@ -664,10 +866,17 @@ def rows():
             query += " LIMIT ?"
             params.append(limit)
 
-        cur.execute(query, tuple(params))
-        
-        data = cur.fetchall()
-        conn.close()
+        # Project shards (if enabled) are ATTACHed; results from several
+        # connections are merged back into the same ordering and limit
+        data = []
+        read_conns = 0
+        for conn in iter_read_conns(DB_PATH, [project_id] if project_id else None):
+            data.extend(conn.execute(query, tuple(params)).fetchall())
+            read_conns += 1
+        if read_conns > 1:
+            data.sort(key=lambda r: (-(r[0] or 0), r[5] if r[5] is not None else -1))
+            if limit is not None and limit > 0:
+                data = data[:limit]
         cols = ["sentence_id", "sentence", "literature_link", "doi_hash",
                 "doi", "triple_id",
                 "source_entity_name", "source_entity_attr", "relation_type",
@@ -719,7 +928,8 @@ def admin_auth():
     is_env_admin = is_admin_user(email)
 
     if authenticated or is_env_admin:
-        # Generate and return token
+        # Generate and return token (expired tokens are pruned on each login)
+        cleanup_expired_tokens()
         token = generate_admin_token(email)
         return jsonify({
             "authenticated": True,
@@ -735,6 +945,18 @@ def admin_auth():
         }), 401
 
 
+@app.post("/api/admin/logout")
+def admin_logout():
+    """
+    Revoke an admin session token.
+    Expected JSON: { "token": "..." } (or Authorization: Bearer <token>)
+    """
+    token = get_request_admin_token(request.get_json(silent=True))
+    if not token:
+        return jsonify({"error": "Missing token"}), 400
+    return jsonify({"ok": True, "revoked": revoke_admin_token(token)})
+
+
 @app.get("/api/browse-fields")
 def get_browse_fields():
     """
@@ -794,17 +1016,12 @@ def admin_create_user():
     except Exception:
         return jsonify({"error": "Invalid JSON"}), 400
 
-    admin_email = (payload.get("admin_email") or "").strip()
-    admin_password = payload.get("admin_password") or ""
     new_email = (payload.get("new_email") or "").strip()
     new_password = payload.get("new_password") or ""
 
-    if not admin_email or not admin_password:
-        return jsonify({"error": "Admin authentication required"}), 401
-
-    # Verify admin credentials
-    if not (verify_admin_password(DB_PATH, admin_email, admin_password) or is_admin_user(admin_email)):
-        return jsonify({"error": "Invalid admin credentials"}), 403
+    admin_email, auth_error = require_admin_auth(payload, "admin_email", "admin_password")
+    if auth_error:
+        return auth_error
 
     if not new_email or not new_password:
         return jsonify({"error": "Missing new user email or password"}), 400
@@ -827,15 +1044,10 @@ def admin_update_triple(triple_id: int):
     except Exception:
         return jsonify({"error": "Invalid JSON"}), 400
 
-    email = (payload.get("email") or "").strip()
-    password = payload.get("password") or ""
-
-    if not email or not password:
-        return jsonify({"error": "Admin authentication required"}), 401
 
-    # Verify admin credentials
-    if not (verify_admin_password(DB_PATH, email, password) or is_admin_user(email)):
-        return jsonify({"error": "Invalid admin credentials"}), 403
+    email, auth_error = require_admin_auth(payload)
+    if auth_error:
+        return auth_error
 
     # Extract update fields
     source_entity_name = payload.get("source_entity_name")
@@ -858,9 +1070,12 @@ def admin_update_triple(triple_id: int):
 @app.post("/api/admin/projects")
 def create_new_project():
     """
-    Create a new project (admin only).
+    Start creating a new project (admin only).
     Expected JSON: { "token": "...", OR "email": "admin@example.com", "password": "secret",
                      "name": "Project Name", "description": "...", "doi_list": ["10.1234/...", ...] }
+    Returns 202 with a job id immediately; DOIs are validated by a "project_creation"
+    background job (see harvest_worker; poll /api/admin/project-jobs/<job_id> for
+    progress and the new project id).
     """
     try:
         payload = request.get_json(force=True, silent=False)
@@ -881,39 +1096,271 @@ def create_new_project():
     if not doi_list or not isinstance(doi_list, list):
         return jsonify({"error": "DOI list is required and must be an array"}), 400
 
-    # Validate DOIs concurrently with caching
-    valid_dois, invalid_dois = validate_dois_concurrent(doi_list)
-    
-    if not valid_dois:
-        return jsonify({"error": "No valid DOIs provided", "invalid_dois": invalid_dois}), 400
+    job_id = secrets.token_urlsafe(16)
+    if not create_project_creation_job(DB_PATH, job_id, name, email, len(doi_list)):
+        return jsonify({"error": "Failed to start project creation"}), 500
+
+    queued = _enqueue_background_job("project_creation", {
+        "job_id": job_id,
+        "name": name,
+        "description": description,
+        "doi_list": doi_list,
+        "created_by": email,
+    }, dedupe_key=f"project_creation:{job_id}")
+    if queued <= 0:
+        update_project_creation_job(DB_PATH, job_id, {"status": "failed", "error": "Failed to queue job"})
+        return jsonify({"error": "Failed to start project creation"}), 500
 
-    project_id = create_project(DB_PATH, name, description, valid_dois, email)
-    
-    if project_id > 0:
-        response_data = {
-            "ok": True, 
-            "project_id": project_id, 
-            "message": "Project created successfully",
-            "valid_count": len(valid_dois)
+    return jsonify({
+        "ok": True,
+        "job_id": job_id,
+        "status": "queued",
+        "total": len(doi_list),
+        "message": "Project creation started",
+        "status_url": f"/api/admin/project-jobs/{job_id}"
+    }), 202
+
+@app.get("/api/admin/project-jobs/<job_id>")
+def get_project_creation_status(job_id: str):
+    """
+    Get progress of a project creation job (admin only, like creating the project).
+    Accepts an admin token (Authorization: Bearer <token>) or JSON credentials.
+    Returns: { "status", "total", "validated", "valid_count", "invalid_count",
+               "invalid_dois", "project_id", "error" }
+    """
+    _, auth_error = require_admin_auth(request.get_json(silent=True))
+    if auth_error:
+        return auth_error
+
+    job = get_project_creation_job(DB_PATH, job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+
+    response = {
+        "ok": True,
+        "job_id": job_id,
+        "status": job["status"],
+        "name": job["name"],
+        "project_id": job["project_id"],
+        "total": job["total"],
+        "validated": job["validated"],
+        "valid_count": job["valid_count"],
+        "invalid_count": len(job["invalid_dois"]),
+        "invalid_dois": job["invalid_dois"],
+        "error": job["error"],
+    }
+
+    if job["status"] in ("queued", "running"):
+        response["is_stale"] = _is_background_job_stale(f"project_creation:{job_id}")
+
+    return jsonify(response)
+
+# -----------------------------
+# Literature search jobs
+# -----------------------------
+LITERATURE_SEARCH_MAX_TOP_K = 100
+LITERATURE_SEARCH_MAX_LIMITS = {"semantic_scholar": 100, "arxiv": 100, "web_of_science": 100, "openalex": 200}
+LITERATURE_SEARCH_FLAGS = ("enable_query_expansion", "enable_deduplication", "enable_reranking")
+
+def _literature_search_cache_key(params: Dict[str, Any]) -> str:
+    """
+    Cache key for a search: the query with whitespace collapsed (and lowercased unless it
+    is a case-sensitive Web of Science advanced query), sorted sources, effective
+    per-source limits, top_k and pipeline options.
+    """
+    from literature_search import DEFAULT_PER_SOURCE_LIMITS, is_wos_advanced_query
+    query = " ".join(params["query"].split())
+    if not is_wos_advanced_query(query):
+        query = query.lower()
+    limits = params.get("per_source_limit") or {}
+    key = {
+        "query": query,
+        "sources": sorted(params["sources"]),
+        "limits": {source: limits.get(source, DEFAULT_PER_SOURCE_LIMITS[source]) for source in params["sources"]},
+        "top_k": params["top_k"],
+        **{flag: params[flag] for flag in LITERATURE_SEARCH_FLAGS},
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()
+
+@app.post("/api/literature/search")
+def start_literature_search():
+    """
+    Start a literature search (admin only).
+    Expected JSON: { "token": "...", OR "email": "admin@example.com", "password": "secret",
+                     "query": "...", "sources": ["semantic_scholar", "openalex"], "top_k": 20,
+                     "per_source_limit": {"openalex": 50}, "previous_papers": [...],
+                     "enable_query_expansion": true, "enable_deduplication": true,
+                     "enable_reranking": true }
+    Returns a job id (poll /api/literature/search/<job_id>). Identical searches are answered
+    from the shared result cache (status "completed" right away); searches that build on
+    previous_papers are always run.
+    """
+    try:
+        payload = request.get_json(force=True, silent=False)
+    except Exception:
+        return jsonify({"error": "Invalid JSON"}), 400
+
+    email, auth_error = require_admin_auth(payload)
+    if auth_error:
+        return auth_error
+
+    from literature_search import VALID_SOURCES
+    query = (payload.get("query") or "").strip()
+    if not query:
+        return jsonify({"error": "Missing 'query'"}), 400
+    sources = payload.get("sources") or []
+    if not isinstance(sources, list) or not sources or any(source not in VALID_SOURCES for source in sources):
+        return jsonify({"error": f"sources must be a non-empty list of: {', '.join(sorted(VALID_SOURCES))}"}), 400
+    per_source_limit = payload.get("per_source_limit") or {}
+    if not isinstance(per_source_limit, dict):
+        return jsonify({"error": "per_source_limit must be an object"}), 400
+    try:
+        top_k = min(max(int(payload.get("top_k") or 20), 1), LITERATURE_SEARCH_MAX_TOP_K)
+        per_source_limit = {
+            source: min(int(limit), LITERATURE_SEARCH_MAX_LIMITS[source])
+            for source, limit in per_source_limit.items()
+            if source in LITERATURE_SEARCH_MAX_LIMITS and limit and int(limit) > 0
         }
-        
-        # Include warning about invalid DOIs if any
-        if invalid_dois:
-            response_data["warning"] = f"{len(invalid_dois)} DOI(s) failed validation and were excluded"
-            response_data["invalid_dois"] = invalid_dois
-            
-        return jsonify(response_data)
-    else:
-        return jsonify({"error": "Failed to create project"}), 500
+    except (TypeError, ValueError):
+        return jsonify({"error": "top_k and per_source_limit values must be integers"}), 400
+
+    params = {
+        "query": query,
+        "sources": list(dict.fromkeys(sources)),
+        "top_k": top_k,
+        "per_source_limit": per_source_limit or None,
+        "previous_papers": payload.get("previous_papers") or None,
+        **{flag: bool(payload.get(flag, True)) for flag in LITERATURE_SEARCH_FLAGS},
+    }
+    # Results that include a user's earlier session papers are not shareable
+    cache_key = None if params["previous_papers"] else _literature_search_cache_key(params)
+
+    job_id = secrets.token_urlsafe(16)
+    if not create_literature_search_job(DB_PATH, job_id, email, cache_key):
+        return jsonify({"error": "Failed to start search"}), 500
+
+    cached = get_cached_literature_search(DB_PATH, cache_key, LITERATURE_SEARCH_CACHE_TTL) if cache_key else None
+    if cached is not None:
+        update_literature_search_job(DB_PATH, job_id, {
+            "status": "completed",
+            "execution_log": cached.get("execution_log", []),
+            "result": {**cached, "cached": True},
+        })
+        return jsonify({"ok": True, "job_id": job_id, "status": "completed", "cached": True,
+                        "status_url": f"/api/literature/search/{job_id}"})
+
+    queued = _enqueue_background_job("literature_search", {
+        "search_id": job_id,
+        "params": params,
+        "cache_key": cache_key,
+    }, dedupe_key=f"literature_search:{job_id}")
+    if queued <= 0:
+        update_literature_search_job(DB_PATH, job_id, {"status": "failed", "error": "Failed to queue search"})
+        return jsonify({"error": "Failed to start search"}), 500
+    return jsonify({"ok": True, "job_id": job_id, "status": "queued", "cached": False,
+                    "status_url": f"/api/literature/search/{job_id}"}), 202
+
+@app.get("/api/literature/search/<job_id>")
+def get_literature_search_status(job_id: str):
+    """
+    Get progress or results of a literature search job (admin only).
+    Auth: "Authorization: Bearer <token>" or "X-Admin-Token" header, or a JSON body with
+    token or email/password.
+    Returns: { "status", "execution_log": [stages completed so far], "result" (once completed),
+               "error", "is_stale" (queued/running only) }
+    is_stale means no worker runs the search any more (see _is_background_job_stale),
+    not that it is slow or still waiting for a free worker.
+    """
+    _, auth_error = require_admin_auth(request.get_json(silent=True) or {})
+    if auth_error:
+        return auth_error
+
+    job = get_literature_search_job(DB_PATH, job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+
+    response = {
+        "ok": True,
+        "job_id": job_id,
+        "status": job["status"],
+        "execution_log": job["execution_log"],
+        "result": job["result"],
+        "error": job["error"],
+    }
+
+    if job["status"] in ("queued", "running"):
+        response["is_stale"] = _is_background_job_stale(f"literature_search:{job_id}")
+
+    return jsonify(response)
+
+PROJECT_LIST_INCLUDES = {"download_status", "pdf_count", "doi_count"}
+PROJECT_DOIS_PAGE_SIZE = 100
+PROJECT_DOIS_MAX_PAGE_SIZE = 1000
+DOWNLOAD_STALE_SECONDS = 300
+
+# project PDF dir -> (directory mtime_ns, number of PDFs); adding or removing a file changes the mtime
+_pdf_count_cache: Dict[str, Tuple[int, int]] = {}
+
+def _count_project_pdfs(project_id: int) -> int:
+    """Number of PDFs in a project's directory, rescanned only when the directory changed."""
+    from pdf_manager import get_project_pdf_dir
+    project_dir = get_project_pdf_dir(project_id)
+    try:
+        mtime = os.stat(project_dir).st_mtime_ns
+    except OSError:
+        return 0
+    cached = _pdf_count_cache.get(project_dir)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with os.scandir(project_dir) as entries:
+        count = sum(1 for entry in entries if entry.name.endswith(".pdf") and entry.is_file())
+    _pdf_count_cache[project_dir] = (mtime, count)
+    return count
 
 @app.get("/api/projects")
 def list_projects():
     """
     List all projects (public endpoint).
     Returns: [{ "id": 1, "name": "...", "description": "...", "doi_list": [...] }]
+
+    ?fields=summary leaves out doi_list and returns doi_count instead; use it wherever
+    only names/ids are needed and page through DOIs with /api/projects/<id>/dois.
+
+    Optional ?include=download_status,pdf_count,doi_count adds per-project fields, so the
+    admin panel needs a single request instead of one status request per project:
+      - doi_count: number of DOIs
+      - pdf_count: PDFs in the project's directory
+      - download_status: {"status", "current", "total", "is_stale"} or null
     """
-    try:
-        projects = get_all_projects(DB_PATH)
+    include = {part.strip() for part in request.args.get("include", "").split(",") if part.strip()}
+    unknown = include - PROJECT_LIST_INCLUDES
+    if unknown:
+        return jsonify({
+            "error": f"Unknown include value(s): {', '.join(sorted(unknown))}",
+            "allowed": sorted(PROJECT_LIST_INCLUDES)
+        }), 400
+
+    fields = request.args.get("fields", "full")
+    if fields not in ("full", "summary"):
+        return jsonify({"error": "fields must be 'full' or 'summary'"}), 400
+
+    try:
+        projects = get_project_summaries(DB_PATH) if fields == "summary" else get_all_projects(DB_PATH)
+        downloads = get_pdf_download_overview(DB_PATH) if "download_status" in include else {}
+        for project in projects:
+            if "doi_count" in include and "doi_count" not in project:
+                project["doi_count"] = len(project.get("doi_list") or [])
+            if "pdf_count" in include:
+                project["pdf_count"] = _count_project_pdfs(project["id"])
+            if "download_status" in include:
+                download = downloads.get(project["id"])
+                project["download_status"] = {
+                    "status": download["status"],
+                    "current": download["current"],
+                    "total": download["total"],
+                    "is_stale": is_download_stale(DB_PATH, project["id"], DOWNLOAD_STALE_SECONDS,
+                                                  progress=download),
+                } if download else None
         return jsonify(projects)
     except Exception as e:
         # Log the error but don't expose details to user
@@ -936,6 +1383,31 @@ def get_project(project_id: int):
         print(f"Error fetching project: {e}")
         return jsonify({"error": "Failed to fetch project"}), 500
 
+@app.get("/api/projects/<int:project_id>/dois")
+def list_project_dois(project_id: int):
+    """
+    Page through a project's DOIs (public endpoint).
+    Query params: cursor (next_cursor of the previous page), limit (default 100, max 1000),
+                  q (case-insensitive substring filter)
+    Returns: { "dois": [...], "total": matching DOIs, "next_cursor": "..." or null }
+    """
+    limit = request.args.get("limit", PROJECT_DOIS_PAGE_SIZE, type=int)
+    if limit < 1:
+        return jsonify({"error": "limit must be a positive integer"}), 400
+    limit = min(limit, PROJECT_DOIS_MAX_PAGE_SIZE)
+
+    try:
+        page = get_project_dois_page(DB_PATH, project_id,
+                                     cursor=request.args.get("cursor") or None,
+                                     limit=limit,
+                                     query=request.args.get("q", "").strip() or None)
+        if page is None:
+            return jsonify({"error": "Project not found"}), 404
+        return jsonify(page)
+    except Exception as e:
+        print(f"Error fetching project DOIs: {e}")
+        return jsonify({"error": "Failed to fetch project DOIs"}), 500
+
 @app.put("/api/admin/projects/<int:project_id>")
 def update_existing_project(project_id: int):
     """
@@ -1007,57 +1479,34 @@ def validate_dois():
     except Exception:
         return jsonify({"error": "Invalid JSON"}), 400
 
-    email = (payload.get("email") or "").strip()
-    password = payload.get("password") or ""
     dois = payload.get("dois", [])
 
-    if not email or not password:
-        return jsonify({"error": "Admin authentication required"}), 401
-
-    # Verify admin credentials
-    if not (verify_admin_password(DB_PATH, email, password) or is_admin_user(email)):
-        return jsonify({"error": "Invalid admin credentials"}), 403
+    email, auth_error = require_admin_auth(payload)
+    if auth_error:
+        return auth_error
 
     if not isinstance(dois, list) or not dois:
         return jsonify({"error": "dois must be a non-empty list"}), 400
 
-    import requests
-    import time
-    
-    valid_dois = []
-    invalid_dois = []
-    
-    for doi in dois:
-        doi = normalize_doi(doi)  # Normalize DOI
-        if not doi:
-            continue
-            
-        try:
-            # Check DOI via CrossRef API
-            url = f"https://api.crossref.org/works/{doi}"
-            response = requests.get(url, timeout=5)
-            
-            if response.status_code == 200:
-                valid_dois.append(doi)
-            elif response.status_code == 404:
-                invalid_dois.append({"doi": doi, "reason": "DOI not found in CrossRef database"})
-            else:
-                invalid_dois.append({"doi": doi, "reason": f"HTTP {response.status_code}"})
-        except requests.exceptions.Timeout:
-            invalid_dois.append({"doi": doi, "reason": "Request timeout"})
-        except requests.exceptions.RequestException as e:
-            invalid_dois.append({"doi": doi, "reason": f"Network error: {str(e)}"})
-        except Exception as e:
-            invalid_dois.append({"doi": doi, "reason": f"Error: {str(e)}"})
-        
-        # Rate limit: be nice to CrossRef API
-        time.sleep(0.05)  # 50ms delay between requests
+    # Cached, batched and rate limited through the shared CrossRef client
+    valid_dois, invalid_dois = validate_dois_concurrent([doi for doi in dois if normalize_doi(doi)])
     
     return jsonify({
         "valid": valid_dois,
         "invalid": invalid_dois
     })
 
+@app.get("/api/admin/doi-validation-cache")
+def doi_validation_cache_stats():
+    """
+    Report DOI validation cache hit rate (this worker) and size (admin only).
+    Accepts an admin token (Authorization: Bearer <token>) or JSON credentials.
+    """
+    _, auth_error = require_admin_auth(request.get_json(silent=True))
+    if auth_error:
+        return auth_error
+    return jsonify(get_doi_cache_stats())
+
 @app.post("/api/admin/projects/<int:project_id>/add-dois")
 def add_dois_to_project(project_id: int):
     """
@@ -1150,17 +1599,12 @@ def remove_dois_from_project(project_id: int):
     except Exception:
         return jsonify({"error": "Invalid JSON"}), 400
 
-    email = (payload.get("email") or "").strip()
-    password = payload.get("password") or ""
     dois_to_remove = payload.get("dois", [])
     delete_pdfs = payload.get("delete_pdfs", False)
 
-    if not email or not password:
-        return jsonify({"error": "Admin authentication required"}), 401
-
-    # Verify admin credentials
-    if not (verify_admin_password(DB_PATH, email, password) or is_admin_user(email)):
-        return jsonify({"error": "Invalid admin credentials"}), 403
+    email, auth_error = require_admin_auth(payload)
+    if auth_error:
+        return auth_error
 
     if not isinstance(dois_to_remove, list) or not dois_to_remove:
         return jsonify({"error": "dois must be a non-empty list"}), 400
@@ -1191,6 +1635,7 @@ def remove_dois_from_project(project_id: int):
     failed_deletions = []
     if delete_pdfs and removed_count > 0:
         try:
+            import pdf_store
             from pdf_manager import get_project_pdf_dir
             project_dir = os.path.abspath(get_project_pdf_dir(project_id))
             
@@ -1211,7 +1656,8 @@ def remove_dois_from_project(project_id: int):
                 
                 if os.path.exists(pdf_path):
                     try:
-                        os.remove(pdf_path)
+                        # Unlinks this project's file; the stored PDF stays while other projects use it
+                        pdf_store.release(pdf_path)
                         deleted_pdfs.append(doi)
                     except OSError as e:
                         failed_deletions.append(f"{doi}: {str(e)}")
@@ -1247,17 +1693,12 @@ def delete_existing_project(project_id: int):
     except Exception:
         return jsonify({"error": "Invalid JSON"}), 400
 
-    email = (payload.get("email") or "").strip()
-    password = payload.get("password") or ""
     handle_triples = payload.get("handle_triples", "keep")  # Default: keep triples (set project_id to NULL)
     target_project_id = payload.get("target_project_id")
 
-    if not email or not password:
-        return jsonify({"error": "Admin authentication required"}), 401
-
-    # Verify admin credentials
-    if not (verify_admin_password(DB_PATH, email, password) or is_admin_user(email)):
-        return jsonify({"error": "Invalid admin credentials"}), 403
+    email, auth_error = require_admin_auth(payload)
+    if auth_error:
+        return auth_error
     
     # Validate handle_triples option
     if handle_triples not in ["delete", "reassign", "keep"]:
@@ -1267,8 +1708,7 @@ def delete_existing_project(project_id: int):
         return jsonify({"error": "target_project_id required when handle_triples is 'reassign'"}), 400
 
     try:
-        from harvest_store import get_conn
-        conn = get_conn(DB_PATH)
+        conn = get_project_conn(DB_PATH, project_id, create=False)
         cur = conn.cursor()
         
         # Check how many triples are associated with this project
@@ -1296,29 +1736,33 @@ def delete_existing_project(project_id: int):
             
             conn.commit()
         elif handle_triples == "reassign":
-            # Reassign triples to target project
-            cur.execute("UPDATE triples SET project_id = ? WHERE project_id = ?;", (target_project_id, project_id))
-            conn.commit()
+            # Reassign triples to target project (moved across shards if sharding is enabled)
+            if reassign_project_triples(DB_PATH, project_id, int(target_project_id)) < 0:
+                return jsonify({"error": "Failed to reassign triples"}), 500
         elif handle_triples == "keep":
             # Set project_id to NULL (uncategorized)
-            cur.execute("UPDATE triples SET project_id = NULL WHERE project_id = ?;", (project_id,))
-            conn.commit()
+            if reassign_project_triples(DB_PATH, project_id, None) < 0:
+                return jsonify({"error": "Failed to detach triples from project"}), 500
         
         # Now delete the project
-        success = delete_project(DB_PATH, project_id)
-        
         conn.close()
+        success = delete_project(DB_PATH, project_id)
         
         if success:
-            # Clean up project PDF directory
-            import shutil
+            # Stop any queued/running PDF download for the deleted project
+            active_job = get_active_job(DB_PATH, f"pdf_download:{project_id}")
+            if active_job:
+                cancel_job(DB_PATH, active_job["id"])
+            
+            # Clean up project PDF directory (PDFs shared with other projects stay in the store)
+            import pdf_store
             from pdf_manager import get_project_pdf_dir
             project_pdf_dir = get_project_pdf_dir(project_id)
             
             pdf_cleanup_msg = ""
             if os.path.exists(project_pdf_dir):
                 try:
-                    shutil.rmtree(project_pdf_dir)
+                    pdf_store.release_dir(project_pdf_dir)
                     pdf_cleanup_msg = " Project PDF directory cleaned up."
                 except Exception as e:
                     logging.warning(f"Failed to delete project PDF directory {project_pdf_dir}: {e}")
@@ -1340,104 +1784,76 @@ def delete_existing_project(project_id: int):
         return jsonify({"error": "Failed to delete project"}), 500
 
 # PDF Management Endpoints
-def _run_pdf_download_task(project_id: int, doi_list: List[str], project_dir: str):
-    """Background task to download PDFs and update progress in database"""
-    import json
-    
-    # Use the unified smart PDF manager
-    try:
-        from pdf_manager import process_dois_smart as process_function
-        from pdf_manager import get_project_pdf_dir, generate_doi_hash
-        print(f"[PDF Download Task] Using smart PDF download system")
-    except ImportError as e:
-        # Fallback to standard if smart version not available
-        print(f"[PDF Download Task] Warning: Smart PDF manager not available, falling back to standard: {e}")
-        from pdf_manager import process_project_dois_with_progress as process_function
-        from pdf_manager import get_project_pdf_dir, generate_doi_hash
-    
-    print(f"[PDF Download Task] Starting background download for project {project_id}")
-    
-    # Note: Progress is already initialized in the main thread before this task starts
-    # This avoids race condition where frontend polls before initialization
-    
-    # Track progress locally during processing
-    downloaded = []
-    needs_upload = []
-    errors = []
-    
+def _ensure_job_worker():
+    """In embedded mode, make sure this process runs a worker thread (no-op for external workers)."""
+    if JOB_WORKER_MODE == "embedded":
+        from harvest_worker import start_embedded_worker
+        start_embedded_worker(DB_PATH)
+
+def _is_background_job_stale(dedupe_key: str) -> bool:
+    """
+    A queued or running background job is stale once the queue gave up on it or its
+    worker stopped renewing the lease (it resumes when another worker claims it).
+    """
+    job = get_active_job(DB_PATH, dedupe_key)
+    if job is None:
+        return True
+    return job["status"] == "running" and (job["lease_expires_at"] or 0) < time.time()
+
+def _enqueue_background_job(job_type: str, payload: dict, dedupe_key: str) -> int:
+    """Queue a job for harvest_worker. Returns the job id, or -1 on error."""
+    job_id = enqueue_job(DB_PATH, job_type, payload, dedupe_key=dedupe_key, max_attempts=JOB_MAX_ATTEMPTS)
+    if job_id > 0:
+        _ensure_job_worker()
+    return job_id
+
+@app.post("/api/admin/projects/<int:project_id>/prefetch-metadata")
+def prefetch_project_metadata(project_id: int):
+    """
+    Queue a job that stores CrossRef metadata for every DOI in a project (admin only).
+    DOIs whose stored metadata is still fresh are skipped.
+    Expected JSON: { "email": "admin@example.com", "password": "secret" }
+    Returns: { "ok": true, "job_id": 12, "status_url": "..." }
+    """
     try:
-        # Process DOIs with progress callback
-        def progress_callback(current_idx: int, doi: str, success: bool, message: str, source: str = ""):
-            print(f"[PDF Download Task] Progress: {current_idx + 1}/{len(doi_list)} - {doi}: {message}")
-            
-            doi_hash = ""
-            try:
-                from pdf_manager import generate_doi_hash
-                doi_hash = generate_doi_hash(doi)
-                filename = f"{doi_hash}.pdf"
-            except (ImportError, ValueError, Exception) as e:
-                print(f"[PDF Download Task] Warning: Could not generate doi_hash for {doi}: {e}")
-                filename = "unknown.pdf"
-            
-            if success:
-                downloaded.append((doi, filename, message, source))
-            else:
-                # Categorize failures: needs_upload (not available) vs errors (technical issues)
-                # Patterns indicating the resource simply isn't available vs actual errors
-                needs_upload_patterns = ["failed", "not found", "not open access", "not available", 
-                                        "no accessible", "not a pdf", "too small"]
-                is_needs_upload = any(pattern in message.lower() for pattern in needs_upload_patterns)
-                
-                if is_needs_upload:
-                    needs_upload.append((doi, filename, message))
-                else:
-                    errors.append((doi, message))
-            
-            # Update database with current progress, including the last source used
-            update_pdf_download_progress(DB_PATH, project_id, {
-                "current": current_idx + 1,
-                "current_doi": doi,
-                "current_source": source if source else "none",
-                "downloaded": downloaded,
-                "needs_upload": needs_upload,
-                "errors": errors
-            })
-        
-        # Initialize the PDF download database (always use smart mode now)
-        try:
-            from pdf_download_db import init_pdf_download_db
-            init_pdf_download_db()
-            # Smart version needs project_id parameter
-            results = process_function(doi_list, project_id, project_dir, progress_callback)
-        except Exception as e:
-            print(f"[PDF Download Task] Error: {e}")
-            # Try fallback without project_id if using old function
-            try:
-                results = process_function(doi_list, project_dir, progress_callback)
-            except TypeError:
-                # Must be the smart function, re-raise original error
-                raise e
-        
-        # Update final status in database
-        update_pdf_download_progress(DB_PATH, project_id, {
-            "status": "completed",
-            "downloaded": results["downloaded"],
-            "needs_upload": results["needs_upload"],
-            "errors": results["errors"],
-            "end_time": time.time()
-        })
-        
-        print(f"[PDF Download Task] Completed - Downloaded: {len(results['downloaded'])}, "
-              f"Needs upload: {len(results['needs_upload'])}, Errors: {len(results['errors'])}")
-        
-    except Exception as e:
-        import traceback
-        print(f"[PDF Download Task] Error: {e}")
-        print(traceback.format_exc())
-        update_pdf_download_progress(DB_PATH, project_id, {
-            "status": "error",
-            "end_time": time.time()
-        })
+        payload = request.get_json(force=True, silent=False)
+    except Exception:
+        return jsonify({"error": "Invalid JSON"}), 400
+
+    email, auth_error = require_admin_auth(payload)
+    if auth_error:
+        return auth_error
+
+    project = get_project_by_id(DB_PATH, project_id)
+    if not project:
+        return jsonify({"error": "Project not found"}), 404
+
+    job_id = _enqueue_background_job("doi_metadata_prefetch", {"project_id": project_id},
+                                     f"doi_metadata_prefetch:{project_id}")
+    if job_id < 0:
+        return jsonify({"error": "Failed to queue metadata prefetch. See server logs."}), 500
+
+    return jsonify({
+        "ok": True,
+        "job_id": job_id,
+        "total_dois": len(project["doi_list"]),
+        "status_url": f"/api/admin/projects/{project_id}/prefetch-metadata"
+    }), 202
+
+@app.get("/api/admin/projects/<int:project_id>/prefetch-metadata")
+def get_project_metadata_status(project_id: int):
+    """
+    How much of a project's DOI metadata is stored, and the state of its prefetch job.
+    Returns: { "total": 120, "cached": 100, "stale": 3, "job_status": "running" | null }
+    """
+    project = get_project_by_id(DB_PATH, project_id)
+    if not project:
+        return jsonify({"error": "Project not found"}), 404
+
+    coverage = get_metadata_coverage(DB_PATH, project["doi_list"])
+    job = get_active_job(DB_PATH, f"doi_metadata_prefetch:{project_id}")
+    coverage["job_status"] = job["status"] if job else None
+    return jsonify(coverage)
 
 @app.post("/api/admin/projects/<int:project_id>/download-pdfs")
 def download_project_pdfs(project_id: int):
@@ -1455,38 +1871,29 @@ def download_project_pdfs(project_id: int):
         print(f"[PDF Download] Invalid JSON: {e}")
         return jsonify({"error": "Invalid JSON"}), 400
 
-    email = (payload.get("email") or "").strip()
-    password = payload.get("password") or ""
     force_restart = payload.get("force_restart", False)
 
-    if not email or not password:
-        print(f"[PDF Download] Missing authentication for project {project_id}")
-        return jsonify({"error": "Admin authentication required"}), 401
-
-    # Verify admin credentials
-    if not (verify_admin_password(DB_PATH, email, password) or is_admin_user(email)):
-        print(f"[PDF Download] Invalid credentials for {email}")
-        return jsonify({"error": "Invalid admin credentials"}), 403
+    email, auth_error = require_admin_auth(payload)
+    if auth_error:
+        return auth_error
     
     # Check if download is already running for this project (check database)
     progress = get_pdf_download_progress(DB_PATH, project_id)
+    active_job = get_active_job(DB_PATH, f"pdf_download:{project_id}")
+    if active_job and force_restart:
+        print(f"[PDF Download] Cancelling job {active_job['id']} for project {project_id}")
+        cancel_job(DB_PATH, active_job["id"])
+        active_job = None
+    if active_job:
+        print(f"[PDF Download] Download already queued/running for project {project_id} (job {active_job['id']})")
+        return jsonify({
+            "error": "Download already in progress for this project",
+            "hint": "If the download appears stuck, you can force restart it by setting 'force_restart': true"
+        }), 409
     if progress and progress.get("status") == "running":
-        # Check if the download is stale (not updated recently)
-        if is_download_stale(DB_PATH, project_id, stale_threshold_seconds=300):
-            print(f"[PDF Download] Detected stale download for project {project_id}, resetting...")
-            reset_stale_download(DB_PATH, project_id)
-            # Re-fetch progress after reset
-            progress = get_pdf_download_progress(DB_PATH, project_id)
-        elif force_restart:
-            print(f"[PDF Download] Force restart requested for project {project_id}")
-            reset_stale_download(DB_PATH, project_id)
-            progress = get_pdf_download_progress(DB_PATH, project_id)
-        else:
-            print(f"[PDF Download] Download already in progress for project {project_id}")
-            return jsonify({
-                "error": "Download already in progress for this project",
-                "hint": "If the download appears stuck, you can force restart it by setting 'force_restart': true"
-            }), 409
+        # No queued/running job owns this progress any more (cancelled or given up on)
+        print(f"[PDF Download] Resetting orphaned download progress for project {project_id}")
+        reset_stale_download(DB_PATH, project_id)
     
     # Get project
     project = get_project_by_id(DB_PATH, project_id)
@@ -1506,23 +1913,22 @@ def download_project_pdfs(project_id: int):
         print(f"[PDF Download] Target directory: {project_dir}")
         print(f"[PDF Download] Requested by: {email}")
         
-        # Initialize progress in database before starting thread to avoid race condition
+        # Initialize progress in database before queueing to avoid race condition
         if not init_pdf_download_progress(DB_PATH, project_id, len(doi_list), project_dir):
             print(f"[PDF Download] Failed to initialize download progress for project {project_id}")
             return jsonify({"error": "Failed to initialize download progress. See server logs."}), 500
         
-        # Start background thread
-        thread = threading.Thread(
-            target=_run_pdf_download_task,
-            args=(project_id, doi_list, project_dir),
-            daemon=True
-        )
-        thread.start()
+        # A harvest_worker claims the job; this request only queues it
+        job_id = _enqueue_background_job("pdf_download", {"project_id": project_id}, f"pdf_download:{project_id}")
+        if job_id < 0:
+            update_pdf_download_progress(DB_PATH, project_id, {"status": "error", "end_time": time.time()})
+            return jsonify({"error": "Failed to queue download. See server logs."}), 500
         
         return jsonify({
             "ok": True,
             "message": "PDF download started",
             "project_id": project_id,
+            "job_id": job_id,
             "total_dois": len(doi_list),
             "status_url": f"/api/admin/projects/{project_id}/download-pdfs/status"
         })
@@ -1554,9 +1960,16 @@ def get_pdf_download_status(project_id: int):
     # Check if download is stale (for running downloads only)
     is_stale = False
     time_since_update = None
+    job = get_active_job(DB_PATH, f"pdf_download:{project_id}")
+    if job:
+        # Jobs left over from before a restart resume once someone is watching
+        _ensure_job_worker()
     if progress.get("status") == "running":
-        is_stale = is_download_stale(DB_PATH, project_id, stale_threshold_seconds=300)
-        import time
+        is_stale = is_download_stale(DB_PATH, project_id, DOWNLOAD_STALE_SECONDS, progress={
+            **progress,
+            "job_status": job["status"] if job else None,
+            "lease_expires_at": job["lease_expires_at"] if job else None,
+        })
         updated_at = progress.get("updated_at", 0)
         time_since_update = int(time.time() - updated_at)
     
@@ -1588,6 +2001,13 @@ def get_pdf_download_status(project_id: int):
         "errors": progress.get("errors", [])[:5],
         "project_dir": progress.get("project_dir", ""),
         "active_mechanisms": mechanisms_info,  # List of active download sources
+        "job": {
+            "id": job["id"],
+            "status": job["status"],
+            "attempts": job["attempts"],
+            "max_attempts": job["max_attempts"],
+            "last_error": job["last_error"],
+        } if job else None,
         # Include full results when completed
         "full_results": {
             "downloaded": progress.get("downloaded", []),
@@ -1605,6 +2025,91 @@ def get_pdf_download_status(project_id: int):
     
     return jsonify(response)
 
+PDF_DOWNLOAD_FINAL_STATUSES = ("completed", "error", "interrupted")
+
+def _sse_message(event_id: int, event: str, data: dict) -> str:
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.get("/api/admin/projects/<int:project_id>/download-pdfs/events")
+def stream_pdf_download_events(project_id: int):
+    """
+    Stream PDF download progress as Server-Sent Events.
+
+    A new stream starts with a "snapshot" event (the current counters); after that every
+    processed DOI arrives as a "doi" event and run state changes as "status" events, all
+    carrying absolute counters. Event ids are resume points: reconnecting with a
+    Last-Event-ID header (or ?last_event_id=) only sends the events that were missed.
+    The stream ends once the download finishes or after PROGRESS_STREAM_MAX_SECONDS;
+    204 tells a resuming client that there is nothing left to follow.
+
+    A stream holds this worker while it is open, so it answers 503 (poll
+    /download-pdfs/status instead) unless PROGRESS_STREAM_ENABLED.
+    """
+    if not PROGRESS_STREAM_ENABLED:
+        return jsonify({"error": "Progress streaming is disabled, poll the status endpoint"}), 503
+
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    try:
+        last_event_id = int(last_event_id) if last_event_id not in (None, "") else None
+    except ValueError:
+        return jsonify({"error": "Invalid Last-Event-ID"}), 400
+
+    # Read the event id before the row: events racing the snapshot are sent again (harmless)
+    latest_id = get_latest_pdf_download_event_id(DB_PATH, project_id)
+    progress = get_pdf_download_progress(DB_PATH, project_id)
+    if not progress:
+        return jsonify({"status": "not_started"}), 404
+
+    status = progress.get("status")
+    if last_event_id is not None and status in PDF_DOWNLOAD_FINAL_STATUSES and last_event_id >= latest_id:
+        return Response(status=204)
+
+    def generate():
+        after_id = last_event_id
+        current_status = status
+        yield "retry: 3000\n\n"
+        if after_id is None:
+            after_id = latest_id
+            yield _sse_message(after_id, "snapshot", {
+                "status": current_status,
+                "current": progress.get("current", 0),
+                "total": progress.get("total", 0),
+                "current_doi": progress.get("current_doi", ""),
+                "current_source": progress.get("current_source", ""),
+                "downloaded_count": len(progress.get("downloaded", [])),
+                "needs_upload_count": len(progress.get("needs_upload", [])),
+                "errors_count": len(progress.get("errors", [])),
+            })
+
+        deadline = time.monotonic() + PROGRESS_STREAM_MAX_SECONDS
+        last_write = time.monotonic()
+        while time.monotonic() < deadline:
+            events = get_pdf_download_events(DB_PATH, project_id, after_id)
+            for event in events:
+                after_id = event["id"]
+                if event["event"] == "status":
+                    current_status = event["data"].get("status", current_status)
+                yield _sse_message(event["id"], event["event"], event["data"])
+            if events:
+                last_write = time.monotonic()
+            if current_status in PDF_DOWNLOAD_FINAL_STATUSES:
+                return
+            if time.monotonic() - last_write >= PROGRESS_STREAM_KEEPALIVE:
+                if get_pdf_download_progress(DB_PATH, project_id) is None:
+                    return  # Project deleted
+                yield ": keep-alive\n\n"
+                last_write = time.monotonic()
+            time.sleep(PROGRESS_STREAM_POLL_INTERVAL)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Don't let nginx buffer the stream
+        },
+    )
+
 @app.get("/api/pdf-download-config")
 def get_pdf_download_config():
     """Get PDF download configuration and available sources (public endpoint)"""
@@ -1658,14 +2163,9 @@ def create_batches_endpoint(project_id: int):
     if not request.json:
         return jsonify({"error": "Request body must be JSON"}), 400
     
-    email = request.json.get("admin_email")
-    password = request.json.get("admin_password")
-    
-    if not email or not password:
-        return jsonify({"error": "Admin authentication required"}), 401
-    
-    if not (verify_admin_password(DB_PATH, email, password) or is_admin_user(email)):
-        return jsonify({"error": "Invalid admin credentials"}), 401
+    email, auth_error = require_admin_auth(request.json, "admin_email", "admin_password")
+    if auth_error:
+        return auth_error
     
     try:
         batch_size = request.json.get("batch_size", 20)
@@ -1850,16 +2350,11 @@ def upload_project_pdf(project_id: int):
     - file: PDF file
     - doi: DOI for the PDF
     """
-    email = request.form.get("email", "").strip()
-    password = request.form.get("password", "")
     doi = request.form.get("doi", "").strip()
     
-    if not email or not password:
-        return jsonify({"error": "Admin authentication required"}), 401
-    
-    # Verify admin credentials
-    if not (verify_admin_password(DB_PATH, email, password) or is_admin_user(email)):
-        return jsonify({"error": "Invalid admin credentials"}), 403
+    email, auth_error = require_admin_auth(request.form.to_dict())
+    if auth_error:
+        return auth_error
     
     if not doi:
         return jsonify({"error": "DOI required"}), 400
@@ -1876,6 +2371,7 @@ def upload_project_pdf(project_id: int):
         return jsonify({"error": "File must be a PDF"}), 400
     
     try:
+        import pdf_store
         from pdf_manager import get_project_pdf_dir, generate_doi_hash
         import os
         from pathlib import Path
@@ -1887,8 +2383,11 @@ def upload_project_pdf(project_id: int):
         filename = f"{doi_hash}.pdf"
         filepath = os.path.join(project_dir, filename)
         
+        # Writing over a stored PDF would change it for every project: unlink it first
+        pdf_store.release(filepath)
         file.save(filepath)
         file_size = os.path.getsize(filepath)
+        pdf_store.add_to_store(filepath, doi_hash)
         
         return jsonify({
             "ok": True,
@@ -2158,12 +2657,7 @@ def export_triples_json():
     except Exception:
         return jsonify({"error": "Invalid JSON"}), 400
     
-    email = (payload.get("email") or "").strip()
-    password = payload.get("password") or ""
-    
     project_id = payload.get("project_id")
-    if not email or not password:
-        return jsonify({"error": "Email and password required"}), 400
     if project_id is not None:
         try:
             project_id = int(project_id)
@@ -2171,17 +2665,10 @@ def export_triples_json():
             return jsonify({"error": "project_id must be an integer"}), 400
     
     try:
-        # Verify admin status
-        is_admin = check_admin_status(DB_PATH, email, password)
-        if not is_admin:
-            return jsonify({"error": "Unauthorized: Admin access required"}), 403
-        
-        import sqlite3
-        
-        # Connect to database
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
-        cursor = conn.cursor()
+        # Verify admin status (token or email/password)
+        email, auth_error = require_admin_auth(payload)
+        if auth_error:
+            return auth_error
         
         # Export structure
         export_data = {
@@ -2196,39 +2683,48 @@ def export_triples_json():
             "relation_types": []  # Global schema (exported in full)
         }
         
-        # Get all triples
+        # Get all triples and the sentences they reference (project shards are ATTACHed if enabled)
         triple_params = []
         triple_where = ""
         if project_id:
             triple_where = " WHERE project_id = ? "
             triple_params.append(project_id)
         
-        cursor.execute(f"""
-            SELECT id, sentence_id, source_entity_name, source_entity_attr, relation_type, 
-                   sink_entity_name, sink_entity_attr, contributor_email, created_at, project_id
-            FROM triples
-            {triple_where}
-            ORDER BY id
-        """, triple_params)
-        triples = cursor.fetchall()
-        for row in triples:
-            export_data["triples"].append(dict(row))
-        
-        sentence_ids = {row["sentence_id"] for row in triples}
-        
-        # Get sentences referenced by exported triples
-        if sentence_ids:
-            placeholders = ",".join("?" for _ in sentence_ids)
+        for conn in iter_read_conns(DB_PATH, [project_id] if project_id else None):
+            conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+            cursor = conn.cursor()
             cursor.execute(f"""
-                SELECT id, text, literature_link, doi_hash, created_at
-                FROM sentences
-                WHERE id IN ({placeholders})
+                SELECT id, sentence_id, source_entity_name, source_entity_attr, relation_type, 
+                       sink_entity_name, sink_entity_attr, contributor_email, created_at, project_id
+                FROM triples
+                {triple_where}
                 ORDER BY id
-            """, tuple(sentence_ids))
-            for row in cursor.fetchall():
-                export_data["sentences"].append(dict(row))
-        else:
-            export_data["sentences"] = []
+            """, triple_params)
+            triples = cursor.fetchall()
+            for row in triples:
+                export_data["triples"].append(dict(row))
+            
+            sentence_ids = {row["sentence_id"] for row in triples}
+            
+            # Get sentences referenced by exported triples
+            if sentence_ids:
+                placeholders = ",".join("?" for _ in sentence_ids)
+                cursor.execute(f"""
+                    SELECT id, text, literature_link, doi_hash, created_at
+                    FROM sentences
+                    WHERE id IN ({placeholders})
+                    ORDER BY id
+                """, tuple(sentence_ids))
+                for row in cursor.fetchall():
+                    export_data["sentences"].append(dict(row))
+        
+        export_data["triples"].sort(key=lambda row: row["id"])
+        export_data["sentences"].sort(key=lambda row: row["id"])
+        
+        # Global tables always live in the central database
+        conn = sqlite3.connect(DB_PATH)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
         
         # Get DOI metadata for exported sentences
         doi_hashes = {row["doi_hash"] for row in export_data["sentences"] if row.get("doi_hash")}
@@ -2675,8 +3171,9 @@ def create_literature_review_project():
     }
     """
     # Check authentication
-    if not check_admin_status(DB_PATH, request):
-        return jsonify({"error": "Unauthorized. Admin authentication required."}), 401
+    _, auth_error = require_admin_auth(request.get_json(silent=True))
+    if auth_error:
+        return auth_error
     
     payload = request.get_json()
     if payload is None:
@@ -2740,8 +3237,9 @@ def upload_papers_to_review(project_id):
     }
     """
     # Check authentication
-    if not check_admin_status(DB_PATH, request):
-        return jsonify({"error": "Unauthorized. Admin authentication required."}), 401
+    _, auth_error = require_admin_auth(request.get_json(silent=True))
+    if auth_error:
+        return auth_error
     
     try:
         payload = request.get_json(force=True, silent=False)
@@ -2788,8 +3286,9 @@ def start_literature_review(project_id):
     }
     """
     # Check authentication
-    if not check_admin_status(DB_PATH, request):
-        return jsonify({"error": "Unauthorized. Admin authentication required."}), 401
+    _, auth_error = require_admin_auth(request.get_json(silent=True))
+    if auth_error:
+        return auth_error
     
     try:
         payload = request.get_json(force=True, silent=True) or {}
@@ -2832,8 +3331,9 @@ def get_next_paper_to_review(project_id):
     Returns the paper with the highest predicted relevance.
     """
     # Check authentication
-    if not check_admin_status(DB_PATH, request):
-        return jsonify({"error": "Unauthorized. Admin authentication required."}), 401
+    _, auth_error = require_admin_auth(request.get_json(silent=True))
+    if auth_error:
+        return auth_error
     
     try:
         from asreview_client import get_asreview_client
@@ -2878,8 +3378,9 @@ def record_review_decision(project_id):
     }
     """
     # Check authentication
-    if not check_admin_status(DB_PATH, request):
-        return jsonify({"error": "Unauthorized. Admin authentication required."}), 401
+    _, auth_error = require_admin_auth(request.get_json(silent=True))
+    if auth_error:
+        return auth_error
     
     try:
         payload = request.get_json(force=True, silent=False)
@@ -2931,8 +3432,9 @@ def get_review_progress(project_id):
     Returns total papers, reviewed count, relevant/irrelevant counts, etc.
     """
     # Check authentication
-    if not check_admin_status(DB_PATH, request):
-        return jsonify({"error": "Unauthorized. Admin authentication required."}), 401
+    _, auth_error = require_admin_auth(request.get_json(silent=True))
+    if auth_error:
+        return auth_error
     
     try:
         from asreview_client import get_asreview_client
@@ -2968,8 +3470,9 @@ def export_review_results(project_id):
     Returns list of papers marked as relevant during screening.
     """
     # Check authentication
-    if not check_admin_status(DB_PATH, request):
-        return jsonify({"error": "Unauthorized. Admin authentication required."}), 401
+    _, auth_error = require_admin_auth(request.get_json(silent=True))
+    if auth_error:
+        return auth_error
     
     try:
         from asreview_client import get_asreview_client
@@ -2995,13 +3498,32 @@ def export_review_results(project_id):
         return jsonify({"ok": False, "error": str(e)}), 500
 
 
+# PDF download analytics endpoints (/api/admin/pdf-analytics/*)
+try:
+    from pdf_analytics_endpoints import init_pdf_analytics_routes
+    init_pdf_analytics_routes(app, require_admin_auth)
+except ImportError as e:
+    logger.warning(f"PDF analytics endpoints not available: {e}")
+
 if __name__ == "__main__":
+    boot()
+    
     # Cleanup old progress entries on startup (older than 1 hour)
     print("[PDF Download] Cleaning up old progress entries...")
     deleted = cleanup_old_pdf_download_progress(DB_PATH, max_age_seconds=3600)
     if deleted > 0:
         print(f"[PDF Download] Cleaned up {deleted} old progress entries")
     
+    cleanup_old_project_creation_jobs(DB_PATH)
+    cleanup_old_literature_search_jobs(DB_PATH)
+    cleanup_literature_search_cache(DB_PATH, LITERATURE_SEARCH_CACHE_TTL)
+    cleanup_old_jobs(DB_PATH)
+    
+    # Drop expired DOI validation cache entries
+    removed = cleanup_doi_validation_cache(DB_PATH, DOI_CACHE_POSITIVE_TTL, DOI_CACHE_NEGATIVE_TTL)
+    if removed > 0:
+        logger.info(f"Cleaned up {removed} expired DOI validation cache entries")
+    
     # Start background cleanup task for email verification if enabled
     try:
         from config import ENABLE_OTP_VALIDATION
@@ -1,12 +1,18 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import bisect
 import logging
 import os
+import re
 import sqlite3
 from datetime import datetime
 import json
 import hashlib
+import hmac
+import secrets
+import threading
+import time
 import traceback
 from typing import Any, List, Optional
 
@@ -76,6 +82,15 @@ def generate_doi_hash(doi: str) -> str:
 
 ADMIN_EMAILS = set(os.environ.get("HARVEST_ADMIN_EMAILS", "").split(","))
 
+# Successful bcrypt verifications are remembered for a short time so repeated
+# admin requests don't pay a bcrypt round each. Entries are keyed by an HMAC
+# (with a per-process random key) over email, password and the stored hash, so
+# no plaintext passwords are kept and a password change invalidates them.
+CREDENTIAL_CACHE_TTL = int(os.environ.get("HARVEST_CREDENTIAL_CACHE_TTL", "300"))
+_credential_cache_key = secrets.token_bytes(32)
+_credential_cache = {}
+_credential_cache_lock = threading.Lock()
+
 def is_admin_user(email: str) -> bool:
     """Check if an email is in the admin list."""
     return email.strip() in ADMIN_EMAILS
@@ -92,9 +107,18 @@ def check_admin_status(db_path: str, email: str, password: str = None) -> bool:
     
     return False
 
+_connection_settings = {"factory": sqlite3.Connection}
+
+
+def configure_connection_factory(factory=None) -> None:
+    """Use a sqlite3.Connection subclass for store connections (e.g. metrics.InstrumentedConnection)."""
+    _connection_settings["factory"] = factory or sqlite3.Connection
+
+
 def get_conn(db_path: str) -> sqlite3.Connection:
     # New connection per call; autocommit; FK on
-    conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+    conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False,
+                           factory=_connection_settings["factory"])
     conn.execute("PRAGMA foreign_keys = ON;")
     return conn
 
@@ -205,6 +229,42 @@ def init_db(db_path: str) -> None:
         );
     """)
     
+    # CrossRef DOI validation results shared by all backend worker processes
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS doi_validation_cache (
+            doi TEXT PRIMARY KEY,
+            valid INTEGER NOT NULL,
+            reason TEXT,
+            checked_at REAL NOT NULL
+        );
+    """)
+    
+    # CrossRef article metadata per normalized DOI (see doi_metadata.py)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS doi_crossref_metadata (
+            doi TEXT PRIMARY KEY,
+            title TEXT,
+            authors TEXT,
+            year TEXT,
+            fetched_at REAL NOT NULL
+        );
+    """)
+    
+    # Admin session tokens shared by all backend worker processes
+    # (only a SHA-256 of each token is stored)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS admin_tokens (
+            token_hash TEXT PRIMARY KEY,
+            email TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            expires_at REAL NOT NULL
+        );
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_admin_tokens_expires
+        ON admin_tokens(expires_at);
+    """)
+    
     cur.execute("""
         CREATE TABLE IF NOT EXISTS app_settings (
             key TEXT PRIMARY KEY,
@@ -226,9 +286,95 @@ def init_db(db_path: str) -> None:
             project_dir TEXT,
             start_time REAL,
             end_time REAL,
+            updated_at REAL NOT NULL,
+            current_source TEXT
+        );
+    """)
+    cur.execute("PRAGMA table_info(pdf_download_progress);")
+    if 'current_source' not in [row[1] for row in cur.fetchall()]:
+        cur.execute("ALTER TABLE pdf_download_progress ADD COLUMN current_source TEXT;")
+    
+    # Incremental download progress events (streamed to clients over SSE, ids are resume points)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS pdf_download_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL,
+            event_type TEXT NOT NULL,  -- doi, status
+            data TEXT NOT NULL,  -- JSON
+            created_at REAL NOT NULL
+        );
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_pdf_download_events_project
+        ON pdf_download_events(project_id, id);
+    """)
+    
+    # Background project creation jobs (DOI validation runs in chunks)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS project_creation_jobs (
+            job_id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,  -- queued, running, completed, failed
+            name TEXT NOT NULL,
+            created_by TEXT,
+            project_id INTEGER,
+            total INTEGER NOT NULL,
+            validated INTEGER NOT NULL DEFAULT 0,
+            valid_count INTEGER NOT NULL DEFAULT 0,
+            invalid_dois TEXT,  -- JSON array of {"doi", "reason"}
+            error TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+    """)
+    
+    # Literature searches run as literature_search jobs (polled by the frontend)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS literature_search_jobs (
+            job_id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,  -- queued, running, completed, failed
+            cache_key TEXT,
+            created_by TEXT,
+            execution_log TEXT,  -- JSON array of pipeline stages completed so far
+            result TEXT,  -- JSON search_papers() result once completed
+            error TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+    """)
+    
+    # Literature search results shared by all users and backend workers
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS literature_search_cache (
+            cache_key TEXT PRIMARY KEY,
+            result TEXT NOT NULL,  -- JSON
+            created_at REAL NOT NULL
+        );
+    """)
+    
+    # Durable job queue (claimed by harvest_worker processes with renewable leases)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_type TEXT NOT NULL,
+            dedupe_key TEXT,  -- at most one queued/running job per key (e.g. pdf_download:<project_id>)
+            payload TEXT NOT NULL,  -- JSON
+            status TEXT NOT NULL,  -- queued, running, completed, failed, cancelled
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 3,
+            lease_owner TEXT,
+            lease_expires_at REAL,
+            heartbeat_at REAL,
+            run_after REAL NOT NULL,
+            last_error TEXT,
+            created_at REAL NOT NULL,
             updated_at REAL NOT NULL
         );
     """)
+    cur.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_active_key
+        ON jobs(dedupe_key) WHERE status IN ('queued', 'running');
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, run_after);")
     
     # Email verification tables for OTP authentication
     # These tables support the email verification feature (ENABLE_OTP_VALIDATION)
@@ -344,6 +490,325 @@ def init_db(db_path: str) -> None:
     conn.commit()
     conn.close()
 
+# -----------------------------
+# Per-project shard routing
+# -----------------------------
+# When sharding is enabled, each project's sentences, triples, batches and
+# annotation statuses live in their own SQLite file next to the central DB
+# (<shard_dir>/project_<id>.db). Global tables (schema types, projects,
+# admins, settings, download progress) always stay in the central DB.
+# Row ids inside a shard start at project_id * SHARD_ID_SPAN so they stay
+# unique across files and the owning shard can be derived from the id alone.
+SHARD_ID_SPAN = 1_000_000_000
+
+SHARDED_TABLE_COLUMNS = {
+    "sentences": ["id", "text", "literature_link", "doi_hash", "created_at"],
+    "triples": ["id", "sentence_id", "source_entity_name", "source_entity_attr",
+                "relation_type", "sink_entity_name", "sink_entity_attr",
+                "contributor_email", "project_id", "created_at"],
+    "doi_batches": ["batch_id", "project_id", "batch_name", "batch_number", "created_at"],
+    "doi_batch_assignments": ["assignment_id", "project_id", "doi", "batch_id", "assigned_at"],
+    "doi_annotation_status": ["status_id", "project_id", "doi", "annotator_email", "status",
+                              "last_updated", "started_at", "completed_at"],
+}
+
+_shard_settings = {"enabled": False, "shard_dir": ""}
+_initialized_shards = set()
+
+
+def configure_project_sharding(enabled: bool, shard_dir: str = "") -> None:
+    """Enable or disable per-project shard files (called once at startup)."""
+    _shard_settings["enabled"] = bool(enabled)
+    _shard_settings["shard_dir"] = shard_dir or ""
+
+
+def is_sharding_enabled() -> bool:
+    return _shard_settings["enabled"]
+
+
+def get_shard_dir(db_path: str) -> str:
+    """Directory holding project shard files (relative dirs resolve next to the central DB)."""
+    shard_dir = _shard_settings["shard_dir"] or "project_shards"
+    if os.path.isabs(shard_dir):
+        return shard_dir
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), shard_dir)
+
+
+def get_shard_path(db_path: str, project_id: int) -> str:
+    return os.path.join(get_shard_dir(db_path), f"project_{int(project_id)}.db")
+
+
+def list_shard_project_ids(db_path: str) -> list:
+    """Return the project ids that currently have a shard file."""
+    shard_dir = get_shard_dir(db_path)
+    if not os.path.isdir(shard_dir):
+        return []
+    project_ids = []
+    for filename in os.listdir(shard_dir):
+        match = re.match(r"^project_(\d+)\.db$", filename)
+        if match:
+            project_ids.append(int(match.group(1)))
+    return sorted(project_ids)
+
+
+def shard_project_for_row_id(row_id) -> Optional[int]:
+    """Project id owning a sentence/triple id, or None for rows in the central DB."""
+    if not is_sharding_enabled() or row_id is None:
+        return None
+    try:
+        row_id = int(row_id)
+    except (TypeError, ValueError):
+        return None
+    if row_id < SHARD_ID_SPAN:
+        return None
+    return row_id // SHARD_ID_SPAN
+
+
+def init_shard_db(shard_path: str, project_id: int) -> None:
+    """Create the per-project tables in a shard file and seed its id range."""
+    os.makedirs(os.path.dirname(shard_path), exist_ok=True)
+    conn = get_conn(shard_path)
+    cur = conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL;")
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS sentences (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            text TEXT NOT NULL,
+            literature_link TEXT,
+            doi_hash TEXT,
+            created_at TEXT
+        );
+    """)
+    # project_id has no FK here: the projects table lives in the central DB
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS triples (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sentence_id INTEGER NOT NULL,
+            source_entity_name TEXT NOT NULL,
+            source_entity_attr TEXT NOT NULL,
+            relation_type TEXT NOT NULL,
+            sink_entity_name TEXT NOT NULL,
+            sink_entity_attr TEXT NOT NULL,
+            contributor_email TEXT,
+            project_id INTEGER,
+            created_at TEXT,
+            FOREIGN KEY(sentence_id) REFERENCES sentences(id) ON DELETE CASCADE
+        );
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS doi_batches (
+            batch_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL,
+            batch_name TEXT NOT NULL,
+            batch_number INTEGER NOT NULL,
+            created_at TEXT NOT NULL,
+            UNIQUE(project_id, batch_number)
+        );
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS doi_batch_assignments (
+            assignment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL,
+            doi TEXT NOT NULL,
+            batch_id INTEGER NOT NULL,
+            assigned_at TEXT NOT NULL,
+            FOREIGN KEY (batch_id) REFERENCES doi_batches(batch_id),
+            UNIQUE(project_id, doi)
+        );
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS doi_annotation_status (
+            status_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL,
+            doi TEXT NOT NULL,
+            annotator_email TEXT,
+            status TEXT DEFAULT 'unstarted',
+            last_updated TEXT NOT NULL,
+            started_at TEXT,
+            completed_at TEXT,
+            UNIQUE(project_id, doi)
+        );
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_triples_sentence ON triples(sentence_id);")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_doi_batches_project ON doi_batches(project_id);")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_doi_batch_assignments_batch ON doi_batch_assignments(batch_id);")
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_doi_annotation_status_project_doi
+        ON doi_annotation_status(project_id, doi);
+    """)
+
+    # Start every AUTOINCREMENT sequence at the project's id range
+    base_id = int(project_id) * SHARD_ID_SPAN
+    for table in ("sentences", "triples", "doi_batches"):
+        cur.execute("""INSERT INTO sqlite_sequence(name, seq)
+                       SELECT ?, ? WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = ?);""",
+                    (table, base_id, table))
+    conn.close()
+
+
+def get_project_conn(db_path: str, project_id: int = None, create: bool = True) -> sqlite3.Connection:
+    """
+    Connection holding a project's sentences, triples, batches and statuses.
+
+    Returns the central connection when sharding is disabled, when no project is
+    given, or when the shard does not exist and create is False.
+    """
+    if not is_sharding_enabled() or project_id is None:
+        return get_conn(db_path)
+
+    shard_path = get_shard_path(db_path, project_id)
+    if shard_path not in _initialized_shards:
+        if not create and not os.path.exists(shard_path):
+            return get_conn(db_path)
+        init_shard_db(shard_path, project_id)
+        _initialized_shards.add(shard_path)
+    return get_conn(shard_path)
+
+
+def get_row_conn(db_path: str, row_id) -> sqlite3.Connection:
+    """Connection holding a given sentence or triple id."""
+    return get_project_conn(db_path, shard_project_for_row_id(row_id), create=False)
+
+
+def _attach_limit(conn: sqlite3.Connection) -> int:
+    try:
+        return max(1, conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED))
+    except AttributeError:
+        # Python < 3.11: assume SQLite's compile-time default
+        return 10
+
+
+def iter_read_conns(db_path: str, project_ids: list = None):
+    """
+    Yield central connections with project shards ATTACHed for cross-project reads.
+
+    Each yielded connection has TEMP views named after the sharded tables that
+    UNION the central rows with the attached shards, so existing queries against
+    `sentences`, `triples`, etc. work unchanged. SQLite caps the number of attached
+    databases, so shards are spread over several connections; the central rows
+    appear only in the first one. Callers must merge (and re-sort) results.
+    Connections are closed when the generator resumes.
+    """
+    if not is_sharding_enabled():
+        conn = get_conn(db_path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+        return
+
+    available = set(list_shard_project_ids(db_path))
+    if project_ids is None:
+        shard_ids = sorted(available)
+    else:
+        shard_ids = [int(pid) for pid in project_ids if pid is not None and int(pid) in available]
+
+    conn = get_conn(db_path)
+    chunk_size = _attach_limit(conn)
+    chunks = [shard_ids[i:i + chunk_size] for i in range(0, len(shard_ids), chunk_size)] or [[]]
+
+    for index, chunk in enumerate(chunks):
+        if conn is None:
+            conn = get_conn(db_path)
+        try:
+            schemas = ["main"] if index == 0 else []
+            for pid in chunk:
+                alias = f"shard_{pid}"
+                conn.execute("ATTACH DATABASE ? AS " + alias + ";", (get_shard_path(db_path, pid),))
+                schemas.append(alias)
+            if chunk:
+                for table, columns in SHARDED_TABLE_COLUMNS.items():
+                    column_sql = ", ".join(columns)
+                    union_sql = " UNION ALL ".join(
+                        f"SELECT {column_sql} FROM {schema}.{table}" for schema in schemas
+                    )
+                    conn.execute(f"CREATE TEMP VIEW {table} AS {union_sql};")
+            yield conn
+        finally:
+            conn.close()
+            conn = None
+
+
+def reassign_project_triples(db_path: str, project_id: int, target_project_id: int = None) -> int:
+    """
+    Move a project's triples to another project (or to no project when target is None).
+
+    With sharding enabled the triples and their sentences are copied into the target
+    shard (or the central DB), with new ids from the target's id range, and removed
+    from the source shard in the same transaction.
+    Returns the number of triples moved, or -1 on failure (nothing is moved).
+    """
+    if not is_sharding_enabled():
+        conn = get_conn(db_path)
+        try:
+            cur = conn.cursor()
+            cur.execute("UPDATE triples SET project_id = ? WHERE project_id = ?;", (target_project_id, project_id))
+            moved = cur.rowcount
+            conn.close()
+            return moved
+        except Exception as e:
+            print(f"Failed to reassign triples: {e}")
+            conn.close()
+            return -1
+
+    source_path = get_shard_path(db_path, project_id)
+    if not os.path.exists(source_path):
+        return 0
+
+    conn = get_project_conn(db_path, target_project_id)
+    try:
+        # Rows get new ids from the target's range (AUTOINCREMENT), so get_row_conn finds them
+        sentence_cols = [c for c in SHARDED_TABLE_COLUMNS["sentences"] if c != "id"]
+        triple_cols = [c for c in SHARDED_TABLE_COLUMNS["triples"] if c != "id"]
+        conn.execute("ATTACH DATABASE ? AS src;", (source_path,))
+        conn.execute("BEGIN;")
+        sentence_ids = {}
+        for row in conn.execute(f"""SELECT id, {", ".join(sentence_cols)} FROM src.sentences
+                                    WHERE id IN (SELECT sentence_id FROM src.triples WHERE project_id = ?)
+                                    ORDER BY id;""", (project_id,)).fetchall():
+            cur = conn.execute(f"""INSERT INTO sentences({", ".join(sentence_cols)})
+                                   VALUES ({", ".join("?" for _ in sentence_cols)});""", row[1:])
+            sentence_ids[row[0]] = cur.lastrowid
+        moved = 0
+        for row in conn.execute(f"""SELECT {", ".join(triple_cols)} FROM src.triples
+                                    WHERE project_id = ? ORDER BY id;""", (project_id,)).fetchall():
+            values = dict(zip(triple_cols, row))
+            values["sentence_id"] = sentence_ids[values["sentence_id"]]
+            values["project_id"] = target_project_id
+            conn.execute(f"""INSERT INTO triples({", ".join(triple_cols)})
+                             VALUES ({", ".join("?" for _ in triple_cols)});""",
+                         [values[c] for c in triple_cols])
+            moved += 1
+        conn.execute("DELETE FROM src.triples WHERE project_id = ?;", (project_id,))
+        conn.executemany("DELETE FROM src.sentences WHERE id = ?;", [(old_id,) for old_id in sentence_ids])
+        conn.execute("COMMIT;")
+        conn.execute("DETACH DATABASE src;")
+        conn.close()
+        return moved
+    except Exception as e:
+        try:
+            conn.execute("ROLLBACK;")
+        except Exception:
+            pass
+        print(f"Failed to reassign sharded triples: {e}")
+        conn.close()
+        return -1
+
+
+def remove_project_shard(db_path: str, project_id: int) -> bool:
+    """Delete a project's shard file (and its WAL side files)."""
+    shard_path = get_shard_path(db_path, project_id)
+    _initialized_shards.discard(shard_path)
+    try:
+        for path in (shard_path, shard_path + "-wal", shard_path + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+        return True
+    except OSError as e:
+        print(f"Failed to remove project shard {shard_path}: {e}")
+        return False
+
 def fetch_entity_dropdown_options(db_path: str):
     conn = get_conn(db_path); cur = conn.cursor()
     cur.execute("SELECT name FROM entity_types ORDER BY name;")
@@ -418,8 +883,10 @@ def upsert_doi_metadata(db_path: str, doi: str) -> str:
     return doi_hash
 
 def upsert_sentence(db_path: str, sid, text: str, link: str,
-                    doi_hash: str = None) -> int:
-    conn = get_conn(db_path); cur = conn.cursor()
+                    doi_hash: str = None, project_id: int = None) -> int:
+    # Existing sentences are updated where they live; new ones go to the project's shard
+    owner = shard_project_for_row_id(sid) if sid not in (None, "") else None
+    conn = get_project_conn(db_path, owner if owner is not None else project_id); cur = conn.cursor()
     now = datetime.utcnow().isoformat()
 
     if sid is None or str(sid).strip() == "":
@@ -458,7 +925,7 @@ def upsert_sentence(db_path: str, sid, text: str, link: str,
         return sid
 
 def insert_triple_rows(db_path: str, sentence_id: int, rows: list[dict], contributor_email: str, project_id: int = None) -> None:
-    conn = get_conn(db_path); cur = conn.cursor()
+    conn = get_row_conn(db_path, sentence_id); cur = conn.cursor()
     now = datetime.utcnow().isoformat()
     q = """INSERT INTO triples(
         sentence_id, source_entity_name, source_entity_attr,
@@ -520,8 +987,17 @@ def create_admin_user(db_path: str, email: str, password: str) -> bool:
         conn.close()
         return False
 
+def _credential_cache_digest(email: str, password: str, stored_hash: str) -> str:
+    message = "\0".join((email, password, stored_hash)).encode('utf-8')
+    return hmac.new(_credential_cache_key, message, hashlib.sha256).hexdigest()
+
+def clear_credential_cache() -> None:
+    """Forget all cached admin credential verifications."""
+    with _credential_cache_lock:
+        _credential_cache.clear()
+
 def verify_admin_password(db_path: str, email: str, password: str) -> bool:
-    """Verify admin user password."""
+    """Verify admin user password (successful checks are cached for CREDENTIAL_CACHE_TTL seconds)."""
     import bcrypt
     conn = get_conn(db_path); cur = conn.cursor()
     
@@ -534,12 +1010,90 @@ def verify_admin_password(db_path: str, email: str, password: str) -> bool:
             return False
         
         stored_hash = result[0]
-        return bcrypt.checkpw(password.encode('utf-8'), stored_hash.encode('utf-8'))
+        digest = _credential_cache_digest(email.strip(), password, stored_hash)
+        now = time.time()
+        with _credential_cache_lock:
+            expires_at = _credential_cache.get(digest)
+            if expires_at and expires_at > now:
+                return True
+        
+        if not bcrypt.checkpw(password.encode('utf-8'), stored_hash.encode('utf-8')):
+            return False
+        
+        if CREDENTIAL_CACHE_TTL > 0:
+            with _credential_cache_lock:
+                # Drop expired entries so the cache stays bounded by active admins
+                for key in [k for k, exp in _credential_cache.items() if exp <= now]:
+                    del _credential_cache[key]
+                _credential_cache[digest] = now + CREDENTIAL_CACHE_TTL
+        return True
     except Exception as e:
         print(f"Failed to verify admin password: {e}")
         conn.close()
         return False
 
+def _hash_admin_token(token: str) -> str:
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+def store_admin_token(db_path: str, token: str, email: str, expires_at: float) -> bool:
+    """Persist an admin session token so every worker process accepts it."""
+    conn = get_conn(db_path); cur = conn.cursor()
+    try:
+        cur.execute("""INSERT OR REPLACE INTO admin_tokens(token_hash, email, created_at, expires_at)
+                       VALUES (?, ?, ?, ?);""",
+                    (_hash_admin_token(token), email, time.time(), expires_at))
+        conn.close()
+        return True
+    except Exception as e:
+        print(f"Failed to store admin token: {e}")
+        conn.close()
+        return False
+
+def get_admin_token_email(db_path: str, token: str) -> Optional[str]:
+    """Return the email for a valid, unexpired admin token, or None."""
+    if not token:
+        return None
+    conn = get_conn(db_path); cur = conn.cursor()
+    try:
+        cur.execute("SELECT email, expires_at FROM admin_tokens WHERE token_hash = ?;",
+                    (_hash_admin_token(token),))
+        row = cur.fetchone()
+        if row and row[1] < time.time():
+            cur.execute("DELETE FROM admin_tokens WHERE token_hash = ?;", (_hash_admin_token(token),))
+            row = None
+        conn.close()
+        return row[0] if row else None
+    except Exception as e:
+        print(f"Failed to verify admin token: {e}")
+        conn.close()
+        return None
+
+def delete_admin_token(db_path: str, token: str) -> bool:
+    """Revoke an admin token. Returns True if a token was removed."""
+    conn = get_conn(db_path); cur = conn.cursor()
+    try:
+        cur.execute("DELETE FROM admin_tokens WHERE token_hash = ?;", (_hash_admin_token(token),))
+        removed = cur.rowcount > 0
+        conn.close()
+        return removed
+    except Exception as e:
+        print(f"Failed to revoke admin token: {e}")
+        conn.close()
+        return False
+
+def cleanup_expired_admin_tokens(db_path: str) -> int:
+    """Delete expired admin tokens. Returns the number removed."""
+    conn = get_conn(db_path); cur = conn.cursor()
+    try:
+        cur.execute("DELETE FROM admin_tokens WHERE expires_at < ?;", (time.time(),))
+        removed = cur.rowcount
+        conn.close()
+        return removed
+    except Exception as e:
+        print(f"Failed to clean up admin tokens: {e}")
+        conn.close()
+        return 0
+
 # -----------------------------
 # Project management functions
 # -----------------------------
@@ -612,6 +1166,68 @@ def get_project_by_id(db_path: str, project_id: int) -> dict:
         conn.close()
         return None
 
+def get_project_summaries(db_path: str) -> list:
+    """Get all projects without their DOI lists (doi_count instead of doi_list)."""
+    conn = get_conn(db_path); cur = conn.cursor()
+    
+    try:
+        try:
+            cur.execute("SELECT id, name, description, json_array_length(doi_list), created_by, created_at "
+                        "FROM projects ORDER BY created_at DESC;")
+            rows = cur.fetchall()
+        except sqlite3.OperationalError:
+            # SQLite built without JSON functions: count in Python
+            cur.execute("SELECT id, name, description, doi_list, created_by, created_at FROM projects ORDER BY created_at DESC;")
+            rows = [(r[0], r[1], r[2], len(json.loads(r[3])), r[4], r[5]) for r in cur.fetchall()]
+        conn.close()
+        
+        return [
+            {
+                "id": row[0],
+                "name": row[1],
+                "description": row[2],
+                "doi_count": row[3] or 0,
+                "created_by": row[4],
+                "created_at": row[5]
+            }
+            for row in rows
+        ]
+    except Exception as e:
+        print(f"Failed to get project summaries: {e}")
+        conn.close()
+        return []
+
+def get_project_dois_page(db_path: str, project_id: int, cursor: str = None, limit: int = 100,
+                          query: str = None) -> Optional[dict]:
+    """
+    Get one page of a project's DOIs, in DOI order.
+    `cursor` is the last DOI of the previous page, so pages stay consistent while DOIs are
+    added or removed; `query` keeps DOIs containing it (case-insensitive).
+    Returns {"dois": [...], "total": matching DOIs, "next_cursor": str or None}, or None if
+    the project does not exist. Database errors are raised, not reported as a missing project.
+    """
+    conn = get_conn(db_path)
+    try:
+        row = conn.execute("SELECT doi_list FROM projects WHERE id = ?;", (project_id,)).fetchone()
+    finally:
+        conn.close()
+    
+    if not row:
+        return None
+    
+    dois = sorted(json.loads(row[0]))
+    if query:
+        needle = query.lower()
+        dois = [doi for doi in dois if needle in doi.lower()]
+    start = bisect.bisect_right(dois, cursor) if cursor else 0
+    page = dois[start:start + limit]
+    has_more = start + limit < len(dois)
+    return {
+        "dois": page,
+        "total": len(dois),
+        "next_cursor": page[-1] if has_more and page else None
+    }
+
 def update_project(db_path: str, project_id: int, name: str = None, description: str = None, doi_list: list = None) -> bool:
     """Update a project."""
     conn = get_conn(db_path); cur = conn.cursor()
@@ -640,6 +1256,41 @@ def update_project(db_path: str, project_id: int, name: str = None, description:
         conn.close()
         return False
 
+def append_project_dois(db_path: str, project_id: int, dois: list) -> int:
+    """
+    Append DOIs to a project's DOI list, skipping ones already present.
+    Returns the number of DOIs added, or -1 on error.
+    """
+    conn = get_conn(db_path); cur = conn.cursor()
+    
+    try:
+        # Read-modify-write under a write lock so concurrent appends don't lose DOIs
+        cur.execute("BEGIN IMMEDIATE;")
+        cur.execute("SELECT doi_list FROM projects WHERE id = ?;", (project_id,))
+        row = cur.fetchone()
+        if not row:
+            cur.execute("ROLLBACK;")
+            conn.close()
+            return -1
+        
+        doi_list = json.loads(row[0]) if row[0] else []
+        existing = set(doi_list)
+        added = [doi for doi in dict.fromkeys(dois) if doi not in existing]
+        if added:
+            cur.execute("UPDATE projects SET doi_list = ? WHERE id = ?;",
+                        (json.dumps(doi_list + added), project_id))
+        cur.execute("COMMIT;")
+        conn.close()
+        return len(added)
+    except Exception as e:
+        print(f"Failed to append project DOIs: {e}")
+        try:
+            conn.execute("ROLLBACK;")
+        except Exception:
+            pass
+        conn.close()
+        return -1
+
 def delete_project(db_path: str, project_id: int) -> bool:
     """Delete a project and all its child records in dependency order."""
     # Create connection with standard isolation mode for transaction support
@@ -663,6 +1314,7 @@ def delete_project(db_path: str, project_id: int) -> bool:
         
         # 4. Delete pdf_download_progress (has project_id as primary key, no FK but should be cleaned)
         cur.execute("DELETE FROM pdf_download_progress WHERE project_id = ?;", (project_id,))
+        cur.execute("DELETE FROM pdf_download_events WHERE project_id = ?;", (project_id,))
         
         # 5. Finally delete the project itself
         cur.execute("DELETE FROM projects WHERE id = ?;", (project_id,))
@@ -670,6 +1322,10 @@ def delete_project(db_path: str, project_id: int) -> bool:
         # Commit transaction
         conn.commit()
         conn.close()
+
+        # A sharded project's batches, statuses and remaining triples go with its file
+        if is_sharding_enabled():
+            remove_project_shard(db_path, project_id)
         return True
     except Exception as e:
         # Rollback on failure to prevent inconsistent database state
@@ -685,7 +1341,7 @@ def update_triple(db_path: str, triple_id: int, source_entity_name: str = None,
                 source_entity_attr: str = None, relation_type: str = None,
                 sink_entity_name: str = None, sink_entity_attr: str = None) -> bool:
     """Update a triple's fields."""
-    conn = get_conn(db_path); cur = conn.cursor()
+    conn = get_row_conn(db_path, triple_id); cur = conn.cursor()
     
     try:
         # Get current triple
@@ -750,7 +1406,7 @@ def update_pdf_download_progress(db_path: str, project_id: int, updates: dict) -
         values = []
         
         for key, value in updates.items():
-            if key in ['status', 'total', 'current', 'current_doi', 'project_dir', 'end_time']:
+            if key in ['status', 'total', 'current', 'current_doi', 'current_source', 'project_dir', 'end_time']:
                 set_clauses.append(f"{key} = ?")
                 values.append(value)
             elif key in ['downloaded', 'needs_upload', 'errors']:
@@ -780,36 +1436,73 @@ def get_pdf_download_progress(db_path: str, project_id: int) -> dict:
         conn = get_conn(db_path)
         cur = conn.cursor()
         
+        # SELECT * so databases created before current_source existed still load
         cur.execute("""
-            SELECT status, total, current, current_doi, downloaded, needs_upload, 
-                   errors, project_dir, start_time, end_time, updated_at
+            SELECT *
             FROM pdf_download_progress
             WHERE project_id = ?
         """, (project_id,))
         
         row = cur.fetchone()
+        columns = [col[0] for col in cur.description]
         conn.close()
         
         if not row:
             return None
         
+        record = dict(zip(columns, row))
         return {
-            "status": row[0],
-            "total": row[1],
-            "current": row[2],
-            "current_doi": row[3],
-            "downloaded": json.loads(row[4]) if row[4] else [],
-            "needs_upload": json.loads(row[5]) if row[5] else [],
-            "errors": json.loads(row[6]) if row[6] else [],
-            "project_dir": row[7],
-            "start_time": row[8],
-            "end_time": row[9],
-            "updated_at": row[10]
+            "status": record["status"],
+            "total": record["total"],
+            "current": record["current"],
+            "current_doi": record["current_doi"],
+            "current_source": record.get("current_source") or "",
+            "downloaded": json.loads(record["downloaded"]) if record["downloaded"] else [],
+            "needs_upload": json.loads(record["needs_upload"]) if record["needs_upload"] else [],
+            "errors": json.loads(record["errors"]) if record["errors"] else [],
+            "project_dir": record["project_dir"],
+            "start_time": record["start_time"],
+            "end_time": record["end_time"],
+            "updated_at": record["updated_at"]
         }
     except Exception as e:
         print(f"Failed to get PDF download progress: {e}")
         return None
 
+def get_pdf_download_overview(db_path: str) -> dict:
+    """
+    Download status of every project in one query (no per-DOI result lists).
+    Returns {project_id: {"status", "current", "total", "updated_at",
+    "job_status", "lease_expires_at"}}; job fields are None without an active job.
+    """
+    try:
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT p.project_id, p.status, p.current, p.total, p.updated_at,
+                   j.status, j.lease_expires_at
+            FROM pdf_download_progress p
+            LEFT JOIN jobs j
+              ON j.dedupe_key = 'pdf_download:' || p.project_id
+             AND j.status IN ('queued', 'running')
+        """)
+        rows = cur.fetchall()
+        conn.close()
+        return {
+            row[0]: {
+                "status": row[1],
+                "current": row[2],
+                "total": row[3],
+                "updated_at": row[4],
+                "job_status": row[5],
+                "lease_expires_at": row[6],
+            }
+            for row in rows
+        }
+    except Exception as e:
+        print(f"Failed to get PDF download overview: {e}")
+        return {}
+
 def cleanup_old_pdf_download_progress(db_path: str, max_age_seconds: int = 3600) -> int:
     """Clean up old completed/error progress entries. Returns number of entries deleted."""
     try:
@@ -826,6 +1519,10 @@ def cleanup_old_pdf_download_progress(db_path: str, max_age_seconds: int = 3600)
         """, (cutoff_time,))
         
         deleted = cur.rowcount
+        cur.execute("""
+            DELETE FROM pdf_download_events
+            WHERE project_id NOT IN (SELECT project_id FROM pdf_download_progress)
+        """)
         conn.close()
         return deleted
     except Exception as e:
@@ -833,35 +1530,110 @@ def cleanup_old_pdf_download_progress(db_path: str, max_age_seconds: int = 3600)
         return 0
 
 
-def is_download_stale(db_path: str, project_id: int, stale_threshold_seconds: int = 300) -> bool:
+def add_pdf_download_event(db_path: str, project_id: int, event_type: str, data: dict) -> int:
+    """Append a progress event for SSE clients. Returns the event id, or -1 on error."""
+    try:
+        import time
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        cur.execute("""
+            INSERT INTO pdf_download_events (project_id, event_type, data, created_at)
+            VALUES (?, ?, ?, ?)
+        """, (project_id, event_type, json.dumps(data), time.time()))
+        event_id = cur.lastrowid
+        conn.close()
+        return event_id
+    except Exception as e:
+        print(f"Failed to add PDF download event: {e}")
+        return -1
+
+
+def clear_pdf_download_events(db_path: str, project_id: int) -> bool:
+    """Drop a project's events before a new download run (ids keep increasing)."""
+    try:
+        conn = get_conn(db_path)
+        conn.execute("DELETE FROM pdf_download_events WHERE project_id = ?", (project_id,))
+        conn.close()
+        return True
+    except Exception as e:
+        print(f"Failed to clear PDF download events: {e}")
+        return False
+
+
+def get_latest_pdf_download_event_id(db_path: str, project_id: int) -> int:
+    """Id of a project's newest progress event (0 if there is none)."""
+    try:
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        cur.execute("SELECT MAX(id) FROM pdf_download_events WHERE project_id = ?", (project_id,))
+        row = cur.fetchone()
+        conn.close()
+        return row[0] or 0
+    except Exception as e:
+        print(f"Failed to get latest PDF download event: {e}")
+        return 0
+
+
+def get_pdf_download_events(db_path: str, project_id: int, after_id: int = 0, limit: int = 500) -> list:
+    """Progress events of a project with id > after_id, oldest first."""
+    try:
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT id, event_type, data, created_at
+            FROM pdf_download_events
+            WHERE project_id = ? AND id > ?
+            ORDER BY id
+            LIMIT ?
+        """, (project_id, after_id, limit))
+        rows = cur.fetchall()
+        conn.close()
+        return [
+            {"id": row[0], "event": row[1], "data": json.loads(row[2]), "created_at": row[3]}
+            for row in rows
+        ]
+    except Exception as e:
+        print(f"Failed to get PDF download events: {e}")
+        return []
+
+
+def is_download_stale(db_path: str, project_id: int, stale_threshold_seconds: int = 300,
+                      progress: dict = None) -> bool:
     """
-    Check if a download is stale (not updated recently despite being 'running').
-    A download is considered stale if status is 'running' but updated_at is older than threshold.
+    Check if a download is stale (its status is 'running' but nothing is running it).
+    With an active pdf_download job the job's lease decides: a queued job is waiting for
+    a worker, a running one is stale once its worker stops renewing the lease. Without a
+    job, the download is stale once updated_at is older than the threshold.
     
     Args:
         db_path: Path to database
         project_id: Project ID
         stale_threshold_seconds: How long without updates before considering stale (default 5 minutes)
+        progress: An entry of get_pdf_download_overview() (status, updated_at, job_status,
+            lease_expires_at), to avoid querying per project; loaded when omitted
     
     Returns:
         True if download is stale, False otherwise
     """
     try:
-        import time
-        progress = get_pdf_download_progress(db_path, project_id)
-        
-        if not progress:
-            return False
+        if progress is None:
+            progress = get_pdf_download_progress(db_path, project_id)
+            if not progress:
+                return False
+            job = get_active_job(db_path, f"pdf_download:{project_id}") if progress.get("status") == "running" else None
+            progress = {**progress,
+                        "job_status": job["status"] if job else None,
+                        "lease_expires_at": job["lease_expires_at"] if job else None}
         
         if progress.get("status") != "running":
             return False
         
-        # Check if updated_at is older than threshold
-        updated_at = progress.get("updated_at", 0)
-        current_time = time.time()
-        time_since_update = current_time - updated_at
+        if progress.get("job_status"):
+            return progress["job_status"] == "running" and (progress.get("lease_expires_at") or 0) < time.time()
         
-        return time_since_update > stale_threshold_seconds
+        # Check if updated_at is older than threshold
+        updated_at = progress.get("updated_at") or 0
+        return time.time() - updated_at > stale_threshold_seconds
     except Exception as e:
         print(f"Failed to check if download is stale: {e}")
         return False
@@ -902,6 +1674,529 @@ def reset_stale_download(db_path: str, project_id: int) -> bool:
         return False
 
 
+# -----------------------------
+# Project Creation Jobs
+# -----------------------------
+
+def create_project_creation_job(db_path: str, job_id: str, name: str, created_by: str, total: int) -> bool:
+    """Register a queued project creation job."""
+    try:
+        now = time.time()
+        conn = get_conn(db_path)
+        conn.execute("""
+            INSERT INTO project_creation_jobs
+            (job_id, status, name, created_by, total, validated, valid_count, invalid_dois,
+             created_at, updated_at)
+            VALUES (?, 'queued', ?, ?, ?, 0, 0, '[]', ?, ?)
+        """, (job_id, name, created_by, total, now, now))
+        conn.close()
+        return True
+    except Exception as e:
+        print(f"Failed to create project creation job: {e}")
+        return False
+
+def update_project_creation_job(db_path: str, job_id: str, updates: dict) -> bool:
+    """Update progress fields of a project creation job."""
+    try:
+        set_clauses = []
+        values = []
+        for key, value in updates.items():
+            if key in ['status', 'project_id', 'validated', 'valid_count', 'error']:
+                set_clauses.append(f"{key} = ?")
+                values.append(value)
+            elif key == 'invalid_dois':
+                set_clauses.append(f"{key} = ?")
+                values.append(json.dumps(value))
+        
+        set_clauses.append("updated_at = ?")
+        values.append(time.time())
+        values.append(job_id)
+        
+        conn = get_conn(db_path)
+        conn.execute(f"UPDATE project_creation_jobs SET {', '.join(set_clauses)} WHERE job_id = ?", values)
+        conn.close()
+        return True
+    except Exception as e:
+        print(f"Failed to update project creation job: {e}")
+        return False
+
+def get_project_creation_job(db_path: str, job_id: str) -> Optional[dict]:
+    """Get the state of a project creation job, or None if unknown."""
+    try:
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT job_id, status, name, created_by, project_id, total, validated, valid_count,
+                   invalid_dois, error, created_at, updated_at
+            FROM project_creation_jobs WHERE job_id = ?
+        """, (job_id,))
+        row = cur.fetchone()
+        conn.close()
+        
+        if not row:
+            return None
+        
+        return {
+            "job_id": row[0],
+            "status": row[1],
+            "name": row[2],
+            "created_by": row[3],
+            "project_id": row[4],
+            "total": row[5],
+            "validated": row[6],
+            "valid_count": row[7],
+            "invalid_dois": json.loads(row[8]) if row[8] else [],
+            "error": row[9],
+            "created_at": row[10],
+            "updated_at": row[11]
+        }
+    except Exception as e:
+        print(f"Failed to get project creation job: {e}")
+        return None
+
+def cleanup_old_project_creation_jobs(db_path: str, max_age_seconds: int = 86400) -> int:
+    """Delete finished project creation jobs older than max_age_seconds. Returns rows deleted."""
+    try:
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        cur.execute("""
+            DELETE FROM project_creation_jobs
+            WHERE status IN ('completed', 'failed') AND updated_at < ?
+        """, (time.time() - max_age_seconds,))
+        deleted = cur.rowcount
+        conn.close()
+        return deleted
+    except Exception as e:
+        print(f"Failed to cleanup project creation jobs: {e}")
+        return 0
+
+
+def create_literature_search_job(db_path: str, job_id: str, created_by: str, cache_key: str = None) -> bool:
+    """Register a queued literature search job."""
+    try:
+        now = time.time()
+        conn = get_conn(db_path)
+        conn.execute("""
+            INSERT INTO literature_search_jobs
+            (job_id, status, cache_key, created_by, execution_log, created_at, updated_at)
+            VALUES (?, 'queued', ?, ?, '[]', ?, ?)
+        """, (job_id, cache_key, created_by, now, now))
+        conn.close()
+        return True
+    except Exception as e:
+        print(f"Failed to create literature search job: {e}")
+        return False
+
+def update_literature_search_job(db_path: str, job_id: str, updates: dict) -> bool:
+    """Update status, execution log, result or error of a literature search job."""
+    try:
+        set_clauses = []
+        values = []
+        for key, value in updates.items():
+            if key in ['status', 'error']:
+                set_clauses.append(f"{key} = ?")
+                values.append(value)
+            elif key in ['execution_log', 'result']:
+                set_clauses.append(f"{key} = ?")
+                values.append(json.dumps(value, default=str))
+        
+        set_clauses.append("updated_at = ?")
+        values.append(time.time())
+        values.append(job_id)
+        
+        conn = get_conn(db_path)
+        conn.execute(f"UPDATE literature_search_jobs SET {', '.join(set_clauses)} WHERE job_id = ?", values)
+        conn.close()
+        return True
+    except Exception as e:
+        print(f"Failed to update literature search job: {e}")
+        return False
+
+def get_literature_search_job(db_path: str, job_id: str) -> Optional[dict]:
+    """Get the state of a literature search job, or None if unknown."""
+    try:
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT job_id, status, cache_key, created_by, execution_log, result, error,
+                   created_at, updated_at
+            FROM literature_search_jobs WHERE job_id = ?
+        """, (job_id,))
+        row = cur.fetchone()
+        conn.close()
+        
+        if not row:
+            return None
+        
+        return {
+            "job_id": row[0],
+            "status": row[1],
+            "cache_key": row[2],
+            "created_by": row[3],
+            "execution_log": json.loads(row[4]) if row[4] else [],
+            "result": json.loads(row[5]) if row[5] else None,
+            "error": row[6],
+            "created_at": row[7],
+            "updated_at": row[8]
+        }
+    except Exception as e:
+        print(f"Failed to get literature search job: {e}")
+        return None
+
+def cleanup_old_literature_search_jobs(db_path: str, max_age_seconds: int = 86400) -> int:
+    """Delete finished literature search jobs older than max_age_seconds. Returns rows deleted."""
+    try:
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        cur.execute("""
+            DELETE FROM literature_search_jobs
+            WHERE status IN ('completed', 'failed') AND updated_at < ?
+        """, (time.time() - max_age_seconds,))
+        deleted = cur.rowcount
+        conn.close()
+        return deleted
+    except Exception as e:
+        print(f"Failed to cleanup literature search jobs: {e}")
+        return 0
+
+def get_cached_literature_search(db_path: str, cache_key: str, ttl: float) -> Optional[dict]:
+    """Return a cached search result younger than ttl seconds, or None."""
+    try:
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        cur.execute("SELECT result, created_at FROM literature_search_cache WHERE cache_key = ?", (cache_key,))
+        row = cur.fetchone()
+        conn.close()
+        if row and time.time() - row[1] < ttl:
+            return json.loads(row[0])
+        return None
+    except Exception as e:
+        print(f"Failed to read literature search cache: {e}")
+        return None
+
+def store_literature_search(db_path: str, cache_key: str, result: dict) -> bool:
+    """Cache a search result under cache_key."""
+    try:
+        conn = get_conn(db_path)
+        conn.execute("""
+            INSERT OR REPLACE INTO literature_search_cache (cache_key, result, created_at)
+            VALUES (?, ?, ?)
+        """, (cache_key, json.dumps(result, default=str), time.time()))
+        conn.close()
+        return True
+    except Exception as e:
+        print(f"Failed to store literature search cache: {e}")
+        return False
+
+def cleanup_literature_search_cache(db_path: str, ttl: float) -> int:
+    """Delete cached search results older than ttl seconds. Returns the number removed."""
+    try:
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        cur.execute("DELETE FROM literature_search_cache WHERE created_at < ?", (time.time() - ttl,))
+        removed = cur.rowcount
+        conn.close()
+        return removed
+    except Exception as e:
+        print(f"Failed to clean up literature search cache: {e}")
+        return 0
+
+
+# -----------------------------
+# Durable Job Queue
+# -----------------------------
+# Jobs are claimed with a lease that the worker renews by heartbeat. A job whose
+# lease expires (worker crashed or was restarted) is claimed again by another
+# worker until max_attempts is reached.
+
+JOB_COLUMNS = ("id, job_type, dedupe_key, payload, status, attempts, max_attempts, lease_owner, "
+               "lease_expires_at, heartbeat_at, run_after, last_error, created_at, updated_at")
+
+
+def _job_from_row(row) -> dict:
+    return {
+        "id": row[0],
+        "job_type": row[1],
+        "dedupe_key": row[2],
+        "payload": json.loads(row[3]) if row[3] else {},
+        "status": row[4],
+        "attempts": row[5],
+        "max_attempts": row[6],
+        "lease_owner": row[7],
+        "lease_expires_at": row[8],
+        "heartbeat_at": row[9],
+        "run_after": row[10],
+        "last_error": row[11],
+        "created_at": row[12],
+        "updated_at": row[13]
+    }
+
+
+def enqueue_job(db_path: str, job_type: str, payload: dict, dedupe_key: str = None,
+                max_attempts: int = 3, delay_seconds: float = 0) -> int:
+    """
+    Add a job to the queue.
+    
+    Returns:
+        The new job id; the existing job id if a queued/running job already has the
+        same dedupe_key; -1 on error
+    """
+    now = time.time()
+    try:
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        try:
+            cur.execute("""
+                INSERT INTO jobs (job_type, dedupe_key, payload, status, attempts, max_attempts,
+                                  run_after, created_at, updated_at)
+                VALUES (?, ?, ?, 'queued', 0, ?, ?, ?, ?)
+            """, (job_type, dedupe_key, json.dumps(payload), max_attempts, now + delay_seconds, now, now))
+            job_id = cur.lastrowid
+        except sqlite3.IntegrityError:
+            # Another request enqueued the same work first
+            cur.execute("""SELECT id FROM jobs WHERE dedupe_key = ? AND status IN ('queued', 'running')""",
+                        (dedupe_key,))
+            row = cur.fetchone()
+            job_id = row[0] if row else -1
+        conn.close()
+        return job_id
+    except Exception as e:
+        print(f"Failed to enqueue job: {e}")
+        return -1
+
+
+def _fail_abandoned_downloads(db_path: str, project_ids: list) -> None:
+    """Mark the download progress of PDF jobs given up on by claim_job as failed."""
+    for project_id in project_ids:
+        progress = get_pdf_download_progress(db_path, project_id)
+        if not progress or progress["status"] != "running":
+            continue
+        update_pdf_download_progress(db_path, project_id, {"status": "error", "end_time": time.time()})
+        add_pdf_download_event(db_path, project_id, "status", {
+            "status": "error",
+            "current": progress["current"],
+            "total": progress["total"],
+            "downloaded_count": len(progress["downloaded"]),
+            "needs_upload_count": len(progress["needs_upload"]),
+            "errors_count": len(progress["errors"]),
+        })
+
+
+def claim_job(db_path: str, worker_id: str, lease_seconds: float, job_types: list = None) -> Optional[dict]:
+    """
+    Atomically claim the next runnable job: a queued job that is due, or a running
+    job whose lease has expired. Returns the claimed job, or None if there is none.
+    """
+    now = time.time()
+    try:
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        cur.execute("BEGIN IMMEDIATE;")
+        
+        # Jobs that keep losing their worker are given up on
+        cur.execute("""
+            SELECT payload FROM jobs
+            WHERE status = 'running' AND lease_expires_at < ? AND attempts >= max_attempts
+              AND job_type = 'pdf_download'
+        """, (now,))
+        abandoned_downloads = [json.loads(row[0] or "{}").get("project_id") for row in cur.fetchall()]
+        cur.execute("""
+            UPDATE jobs SET status = 'failed', lease_owner = NULL, updated_at = ?,
+                   last_error = COALESCE(last_error, 'Worker lease expired')
+            WHERE status = 'running' AND lease_expires_at < ? AND attempts >= max_attempts
+        """, (now, now))
+        
+        type_filter = ""
+        params = [now, now]
+        if job_types:
+            type_filter = f"AND job_type IN ({','.join('?' for _ in job_types)})"
+            params.extend(job_types)
+        cur.execute(f"""
+            SELECT id FROM jobs
+            WHERE ((status = 'queued' AND run_after <= ?) OR (status = 'running' AND lease_expires_at < ?))
+            {type_filter}
+            ORDER BY run_after, id LIMIT 1
+        """, params)
+        row = cur.fetchone()
+        if not row:
+            cur.execute("COMMIT;")
+            conn.close()
+            _fail_abandoned_downloads(db_path, abandoned_downloads)
+            return None
+        
+        cur.execute("""
+            UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_owner = ?,
+                   lease_expires_at = ?, heartbeat_at = ?, updated_at = ?
+            WHERE id = ?
+        """, (worker_id, now + lease_seconds, now, now, row[0]))
+        cur.execute(f"SELECT {JOB_COLUMNS} FROM jobs WHERE id = ?", (row[0],))
+        job = _job_from_row(cur.fetchone())
+        cur.execute("COMMIT;")
+        conn.close()
+        _fail_abandoned_downloads(db_path, abandoned_downloads)
+        return job
+    except Exception as e:
+        print(f"Failed to claim job: {e}")
+        try:
+            conn.execute("ROLLBACK;")
+            conn.close()
+        except Exception:
+            pass
+        return None
+
+
+def heartbeat_job(db_path: str, job_id: int, worker_id: str, lease_seconds: float) -> bool:
+    """
+    Renew a job lease. Returns False if the worker no longer owns the job
+    (lease taken over or job cancelled) and should stop working on it.
+    """
+    now = time.time()
+    try:
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        cur.execute("""
+            UPDATE jobs SET lease_expires_at = ?, heartbeat_at = ?, updated_at = ?
+            WHERE id = ? AND lease_owner = ? AND status = 'running'
+        """, (now + lease_seconds, now, now, job_id, worker_id))
+        renewed = cur.rowcount > 0
+        conn.close()
+        return renewed
+    except Exception as e:
+        # Keep working through transient errors; the lease will tell if we lost the job
+        print(f"Failed to heartbeat job {job_id}: {e}")
+        return True
+
+
+def complete_job(db_path: str, job_id: int, worker_id: str) -> bool:
+    """Mark a job completed (only by the worker holding its lease)."""
+    try:
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        cur.execute("""
+            UPDATE jobs SET status = 'completed', lease_owner = NULL, lease_expires_at = NULL,
+                   updated_at = ?
+            WHERE id = ? AND lease_owner = ? AND status = 'running'
+        """, (time.time(), job_id, worker_id))
+        updated = cur.rowcount > 0
+        conn.close()
+        return updated
+    except Exception as e:
+        print(f"Failed to complete job {job_id}: {e}")
+        return False
+
+
+def fail_job(db_path: str, job_id: int, worker_id: str, error: str, retry_delay_seconds: float = 30) -> bool:
+    """
+    Record a failed attempt. The job is re-queued with exponential backoff until it
+    has used max_attempts, then marked failed.
+    """
+    now = time.time()
+    try:
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        cur.execute("""
+            UPDATE jobs SET
+                status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,
+                run_after = ? + ? * (1 << (attempts - 1)),
+                lease_owner = NULL, lease_expires_at = NULL, last_error = ?, updated_at = ?
+            WHERE id = ? AND lease_owner = ? AND status = 'running'
+        """, (now, retry_delay_seconds, error, now, job_id, worker_id))
+        updated = cur.rowcount > 0
+        conn.close()
+        return updated
+    except Exception as e:
+        print(f"Failed to record job failure for {job_id}: {e}")
+        return False
+
+
+def cancel_job(db_path: str, job_id: int) -> bool:
+    """Cancel a queued or running job; a running worker notices at its next heartbeat."""
+    try:
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        cur.execute("""
+            UPDATE jobs SET status = 'cancelled', lease_owner = NULL, updated_at = ?
+            WHERE id = ? AND status IN ('queued', 'running')
+        """, (time.time(), job_id))
+        updated = cur.rowcount > 0
+        conn.close()
+        return updated
+    except Exception as e:
+        print(f"Failed to cancel job {job_id}: {e}")
+        return False
+
+
+def get_job(db_path: str, job_id: int) -> Optional[dict]:
+    """Get a job by id."""
+    try:
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        cur.execute(f"SELECT {JOB_COLUMNS} FROM jobs WHERE id = ?", (job_id,))
+        row = cur.fetchone()
+        conn.close()
+        return _job_from_row(row) if row else None
+    except Exception as e:
+        print(f"Failed to get job {job_id}: {e}")
+        return None
+
+
+def get_active_job(db_path: str, dedupe_key: str) -> Optional[dict]:
+    """Get the queued or running job for a dedupe key, if any."""
+    try:
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        cur.execute(f"""SELECT {JOB_COLUMNS} FROM jobs
+                        WHERE dedupe_key = ? AND status IN ('queued', 'running')""", (dedupe_key,))
+        row = cur.fetchone()
+        conn.close()
+        return _job_from_row(row) if row else None
+    except Exception as e:
+        print(f"Failed to get active job for {dedupe_key}: {e}")
+        return None
+
+
+def has_runnable_job(db_path: str, job_types: list = None) -> bool:
+    """True if claim_job would find a job (a due queued job or an expired lease)."""
+    now = time.time()
+    try:
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        type_filter = ""
+        params = [now, now]
+        if job_types:
+            type_filter = f"AND job_type IN ({','.join('?' for _ in job_types)})"
+            params.extend(job_types)
+        cur.execute(f"""
+            SELECT 1 FROM jobs
+            WHERE ((status = 'queued' AND run_after <= ?) OR (status = 'running' AND lease_expires_at < ?))
+            {type_filter}
+            LIMIT 1
+        """, params)
+        row = cur.fetchone()
+        conn.close()
+        return row is not None
+    except Exception as e:
+        print(f"Failed to check for runnable jobs: {e}")
+        return False
+
+
+def cleanup_old_jobs(db_path: str, max_age_seconds: int = 7 * 86400) -> int:
+    """Delete finished jobs older than max_age_seconds. Returns rows deleted."""
+    try:
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        cur.execute("""
+            DELETE FROM jobs
+            WHERE status IN ('completed', 'failed', 'cancelled') AND updated_at < ?
+        """, (time.time() - max_age_seconds,))
+        deleted = cur.rowcount
+        conn.close()
+        return deleted
+    except Exception as e:
+        print(f"Failed to cleanup jobs: {e}")
+        return 0
+
+
 # ============================================================================
 # DOI Batch Management Functions
 # ============================================================================
@@ -923,7 +2218,7 @@ def create_batches(db_path: str, project_id: int, batch_size: int = 20, strategy
     from datetime import datetime
     
     try:
-        conn = get_conn(db_path)
+        conn = get_project_conn(db_path, project_id)
         cur = conn.cursor()
         
         # Get project DOIs
@@ -997,7 +2292,7 @@ def get_project_batches(db_path: str, project_id: int) -> list:
         List of batch dictionaries with metadata
     """
     try:
-        conn = get_conn(db_path)
+        conn = get_project_conn(db_path, project_id)
         cur = conn.cursor()
         
         cur.execute("""
@@ -1044,7 +2339,7 @@ def get_batch_dois(db_path: str, project_id: int, batch_id: int) -> list:
         List of DOI dictionaries with status information
     """
     try:
-        conn = get_conn(db_path)
+        conn = get_project_conn(db_path, project_id)
         cur = conn.cursor()
         
         cur.execute("""
@@ -1100,7 +2395,7 @@ def update_doi_status(db_path: str, project_id: int, doi: str, status: str, anno
     from datetime import datetime
     
     try:
-        conn = get_conn(db_path)
+        conn = get_project_conn(db_path, project_id)
         cur = conn.cursor()
         
         now = datetime.now().isoformat()
@@ -1168,7 +2463,7 @@ def get_doi_status_summary(db_path: str, project_id: int) -> dict:
         Dictionary with status counts and breakdown by batch
     """
     try:
-        conn = get_conn(db_path)
+        conn = get_project_conn(db_path, project_id)
         cur = conn.cursor()
         
         # Get total DOI count from project
@@ -1232,3 +2527,180 @@ def get_doi_status_summary(db_path: str, project_id: int) -> dict:
     except Exception as e:
         print(f"Failed to get DOI status summary: {e}")
         return {}
+
+
+# ============================================================================
+# DOI Validation Cache Functions
+# ============================================================================
+
+def get_cached_doi_validations(db_path: str, dois: list, positive_ttl: float, negative_ttl: float) -> dict:
+    """
+    Bulk-lookup cached CrossRef validation results.
+    
+    Args:
+        db_path: Path to database
+        dois: Normalized DOIs to look up
+        positive_ttl: Max age in seconds for valid results
+        negative_ttl: Max age in seconds for invalid results
+    
+    Returns:
+        Dictionary {doi: (is_valid, reason, checked_at)} for fresh entries only
+    """
+    if not dois:
+        return {}
+    
+    results = {}
+    now = time.time()
+    try:
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        dois = list(dois)
+        # Stay well under SQLite's bound-parameter limit
+        for i in range(0, len(dois), 500):
+            chunk = dois[i:i + 500]
+            placeholders = ",".join("?" for _ in chunk)
+            cur.execute(f"""
+                SELECT doi, valid, reason, checked_at FROM doi_validation_cache
+                WHERE doi IN ({placeholders})
+            """, chunk)
+            for doi, valid, reason, checked_at in cur.fetchall():
+                ttl = positive_ttl if valid else negative_ttl
+                if now - checked_at < ttl:
+                    results[doi] = (bool(valid), reason or "", checked_at)
+        conn.close()
+    except Exception as e:
+        print(f"Failed to read DOI validation cache: {e}")
+    return results
+
+
+def store_doi_validations(db_path: str, entries: list) -> bool:
+    """
+    Store CrossRef validation results.
+    
+    Args:
+        db_path: Path to database
+        entries: List of (doi, is_valid, reason) tuples
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    if not entries:
+        return True
+    
+    now = time.time()
+    try:
+        conn = get_conn(db_path)
+        conn.execute("BEGIN;")
+        conn.executemany("""
+            INSERT OR REPLACE INTO doi_validation_cache (doi, valid, reason, checked_at)
+            VALUES (?, ?, ?, ?)
+        """, [(doi, 1 if valid else 0, reason or "", now) for doi, valid, reason in entries])
+        conn.execute("COMMIT;")
+        conn.close()
+        return True
+    except Exception as e:
+        print(f"Failed to store DOI validation cache: {e}")
+        return False
+
+
+def get_doi_validation_cache_size(db_path: str) -> dict:
+    """Return counts of cached valid and invalid DOIs."""
+    try:
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        cur.execute("SELECT valid, COUNT(*) FROM doi_validation_cache GROUP BY valid")
+        counts = {bool(valid): count for valid, count in cur.fetchall()}
+        conn.close()
+        return {
+            'total': sum(counts.values()),
+            'valid': counts.get(True, 0),
+            'invalid': counts.get(False, 0)
+        }
+    except Exception as e:
+        print(f"Failed to get DOI validation cache size: {e}")
+        return {'total': 0, 'valid': 0, 'invalid': 0}
+
+
+def get_cached_doi_metadata(db_path: str, dois: list) -> dict:
+    """
+    Look up stored CrossRef metadata for normalized DOIs, whatever its age.
+    
+    Returns:
+        Dictionary {doi: {"title", "authors", "year", "fetched_at"}}
+    """
+    if not dois:
+        return {}
+    
+    results = {}
+    try:
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        dois = list(dois)
+        # Stay well under SQLite's bound-parameter limit
+        for i in range(0, len(dois), 500):
+            chunk = dois[i:i + 500]
+            placeholders = ",".join("?" for _ in chunk)
+            cur.execute(f"""
+                SELECT doi, title, authors, year, fetched_at FROM doi_crossref_metadata
+                WHERE doi IN ({placeholders})
+            """, chunk)
+            for doi, title, authors, year, fetched_at in cur.fetchall():
+                results[doi] = {
+                    "title": title or "",
+                    "authors": authors or "",
+                    "year": year or "",
+                    "fetched_at": fetched_at,
+                }
+        conn.close()
+    except Exception as e:
+        print(f"Failed to read DOI metadata: {e}")
+    return results
+
+
+def store_doi_metadata(db_path: str, entries: list) -> bool:
+    """
+    Store CrossRef metadata.
+    
+    Args:
+        db_path: Path to database
+        entries: List of (doi, metadata) tuples, metadata with title, authors and year
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    if not entries:
+        return True
+    
+    now = time.time()
+    try:
+        conn = get_conn(db_path)
+        conn.execute("BEGIN;")
+        conn.executemany("""
+            INSERT OR REPLACE INTO doi_crossref_metadata (doi, title, authors, year, fetched_at)
+            VALUES (?, ?, ?, ?, ?)
+        """, [(doi, meta.get("title", ""), meta.get("authors", ""), meta.get("year", ""), now)
+              for doi, meta in entries])
+        conn.execute("COMMIT;")
+        conn.close()
+        return True
+    except Exception as e:
+        print(f"Failed to store DOI metadata: {e}")
+        return False
+
+
+def cleanup_doi_validation_cache(db_path: str, positive_ttl: float, negative_ttl: float) -> int:
+    """Delete expired validation results. Returns the number of rows removed."""
+    now = time.time()
+    try:
+        conn = get_conn(db_path)
+        cur = conn.cursor()
+        cur.execute("""
+            DELETE FROM doi_validation_cache
+            WHERE (valid = 1 AND checked_at < ?) OR (valid = 0 AND checked_at < ?)
+        """, (now - positive_ttl, now - negative_ttl))
+        removed = cur.rowcount
+        conn.close()
+        return removed
+    except Exception as e:
+        print(f"Failed to clean up DOI validation cache: {e}")
+        return 0
@@ -0,0 +1,654 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HARVEST background worker.
+
+Claims jobs from the durable job queue in the harvest database (the `jobs` table,
+see harvest_store) and runs them. While a job runs its lease is renewed by
+heartbeat; if the worker dies, the lease expires and another worker claims the
+job again. PDF downloads resume cheaply because already downloaded files are skipped.
+
+Usage:
+    python3 harvest_worker.py              # run until interrupted
+    python3 harvest_worker.py --once       # run queued jobs, then exit
+
+With JOB_WORKER_MODE = "embedded" (config.py) each backend process runs a worker
+thread instead, so no separate process is needed for simple deployments.
+
+While no job is waiting, workers also retry PDF downloads that failed temporarily
+(the retry queue in pdf_downloads.db), a small batch at a time (PDF_RETRY_* in config.py).
+"""
+
+import argparse
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from harvest_store import (
+    add_pdf_download_event,
+    append_project_dois,
+    claim_job,
+    clear_pdf_download_events,
+    complete_job,
+    create_project,
+    fail_job,
+    get_active_job,
+    get_pdf_download_progress,
+    get_project_by_id,
+    get_project_creation_job,
+    store_literature_search,
+    has_runnable_job,
+    heartbeat_job,
+    init_db,
+    init_pdf_download_progress,
+    update_literature_search_job,
+    update_pdf_download_progress,
+    update_project_creation_job,
+)
+
+logger = logging.getLogger(__name__)
+
+# Import configuration
+try:
+    from config import DB_PATH
+except ImportError:
+    DB_PATH = os.environ.get("HARVEST_DB", "harvest.db")
+
+try:
+    from config import JOB_LEASE_SECONDS, JOB_POLL_INTERVAL, JOB_RETRY_DELAY
+except ImportError:
+    JOB_LEASE_SECONDS = 60
+    JOB_POLL_INTERVAL = 2
+    JOB_RETRY_DELAY = 30
+
+try:
+    from config import (
+        PDF_RETRY_SCHEDULER, PDF_RETRY_INTERVAL, PDF_RETRY_BATCH_SIZE,
+        PDF_RETRY_CONCURRENCY, PDF_RETRY_LEASE_SECONDS
+    )
+except ImportError:
+    PDF_RETRY_SCHEDULER = True
+    PDF_RETRY_INTERVAL = 60
+    PDF_RETRY_BATCH_SIZE = 20
+    PDF_RETRY_CONCURRENCY = 2
+    PDF_RETRY_LEASE_SECONDS = 900
+
+# Project creation validates DOIs in the background, this many at a time
+try:
+    from config import PROJECT_CREATION_CHUNK_SIZE
+except ImportError:
+    PROJECT_CREATION_CHUNK_SIZE = 50
+
+# Embedded worker threads reserved for literature searches
+try:
+    from config import LITERATURE_SEARCH_WORKERS
+except ImportError:
+    LITERATURE_SEARCH_WORKERS = 2
+
+DB_PATH = os.environ.get("HARVEST_DB", DB_PATH)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job handler once the worker no longer owns the job."""
+
+
+class JobContext:
+    """
+    A claimed job plus its lease. Used as a context manager, it renews the lease
+    from a background thread so long single steps do not lose the job.
+    Handlers call check() between steps to stop promptly after a cancel.
+    """
+
+    def __init__(self, db_path: str, job: dict, worker_id: str, lease_seconds: float = JOB_LEASE_SECONDS):
+        self.db_path = db_path
+        self.job = job
+        self.payload = job["payload"]
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.beat_interval = max(1.0, lease_seconds / 3)
+        self._last_beat = time.monotonic()
+        self._lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def is_last_attempt(self) -> bool:
+        return self.job["attempts"] >= self.job["max_attempts"]
+
+    def heartbeat(self, force: bool = False) -> bool:
+        """Renew the lease (at most once per beat interval). Returns False once the job is lost."""
+        if self._lost.is_set():
+            return False
+        now = time.monotonic()
+        if force or now - self._last_beat >= self.beat_interval:
+            self._last_beat = now
+            if not heartbeat_job(self.db_path, self.job["id"], self.worker_id, self.lease_seconds):
+                self._lost.set()
+        return not self._lost.is_set()
+
+    def check(self) -> None:
+        """Raise JobCancelled if the job was cancelled or taken over."""
+        if not self.heartbeat():
+            raise JobCancelled(f"Job {self.job['id']} is no longer owned by {self.worker_id}")
+
+    def _beat_loop(self):
+        while not self._stop.wait(self.beat_interval):
+            if not self.heartbeat(force=True):
+                break
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._beat_loop, daemon=True,
+                                        name=f"job-{self.job['id']}-heartbeat")
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join(timeout=5)
+        return False
+
+
+# -----------------------------
+# Job handlers
+# -----------------------------
+
+def run_pdf_download_job(ctx: JobContext) -> None:
+    """Download PDFs for every DOI of a project, recording progress in pdf_download_progress."""
+    project_id = ctx.payload["project_id"]
+    project = get_project_by_id(ctx.db_path, project_id)
+    if not project:
+        update_pdf_download_progress(ctx.db_path, project_id, {"status": "error", "end_time": time.time()})
+        logger.warning(f"[PDF Download Job] Project {project_id} no longer exists")
+        return
+
+    # Use the unified smart PDF manager
+    try:
+        from pdf_manager import process_dois_smart as process_function
+        from pdf_manager import get_project_pdf_dir, generate_doi_hash
+    except ImportError as e:
+        # Fallback to standard if smart version not available
+        print(f"[PDF Download Job] Warning: Smart PDF manager not available, falling back to standard: {e}")
+        from pdf_manager import process_project_dois_with_progress as process_function
+        from pdf_manager import get_project_pdf_dir, generate_doi_hash
+
+    doi_list = project["doi_list"]
+    project_dir = get_project_pdf_dir(project_id)
+    print(f"[PDF Download Job] Project {project_id}: {len(doi_list)} DOIs "
+          f"(attempt {ctx.job['attempts']}/{ctx.job['max_attempts']})")
+
+    # Restart counters; PDFs saved by an earlier attempt are reported as cached
+    init_pdf_download_progress(ctx.db_path, project_id, len(doi_list), project_dir)
+
+    downloaded = []
+    needs_upload = []
+    errors = []
+
+    def counters(current: int) -> dict:
+        return {
+            "current": current,
+            "total": len(doi_list),
+            "downloaded_count": len(downloaded),
+            "needs_upload_count": len(needs_upload),
+            "errors_count": len(errors),
+        }
+
+    clear_pdf_download_events(ctx.db_path, project_id)
+    add_pdf_download_event(ctx.db_path, project_id, "status", {"status": "running", **counters(0)})
+
+    def progress_callback(current_idx: int, doi: str, success: bool, message: str, source: str = ""):
+        ctx.check()
+        print(f"[PDF Download Job] Progress: {current_idx + 1}/{len(doi_list)} - {doi}: {message}")
+
+        try:
+            filename = f"{generate_doi_hash(doi)}.pdf"
+        except Exception as e:
+            print(f"[PDF Download Job] Warning: Could not generate doi_hash for {doi}: {e}")
+            filename = "unknown.pdf"
+
+        if success:
+            downloaded.append((doi, filename, message, source))
+        else:
+            # Categorize failures: needs_upload (not available) vs errors (technical issues)
+            needs_upload_patterns = ["failed", "not found", "not open access", "not available",
+                                     "no accessible", "not a pdf", "too small"]
+            if any(pattern in message.lower() for pattern in needs_upload_patterns):
+                needs_upload.append((doi, filename, message))
+            else:
+                errors.append((doi, message))
+
+        update_pdf_download_progress(ctx.db_path, project_id, {
+            "current": current_idx + 1,
+            "current_doi": doi,
+            "current_source": source if source else "none",
+            "downloaded": downloaded,
+            "needs_upload": needs_upload,
+            "errors": errors
+        })
+        add_pdf_download_event(ctx.db_path, project_id, "doi", {
+            "doi": doi,
+            "success": success,
+            "message": message,
+            "source": source if source else "none",
+            "current_doi": doi,
+            "current_source": source if source else "none",
+            **counters(current_idx + 1),
+        })
+
+    try:
+        from pdf_download_db import init_pdf_download_db
+        init_pdf_download_db()
+        try:
+            # Smart version needs project_id parameter
+            results = process_function(doi_list, project_id, project_dir, progress_callback)
+        except TypeError:
+            results = process_function(doi_list, project_dir, progress_callback)
+
+        ctx.check()
+        update_pdf_download_progress(ctx.db_path, project_id, {
+            "status": "completed",
+            "downloaded": results["downloaded"],
+            "needs_upload": results["needs_upload"],
+            "errors": results["errors"],
+            "end_time": time.time()
+        })
+        add_pdf_download_event(ctx.db_path, project_id, "status", {
+            "status": "completed",
+            "current": len(doi_list),
+            "total": len(doi_list),
+            "downloaded_count": len(results["downloaded"]),
+            "needs_upload_count": len(results["needs_upload"]),
+            "errors_count": len(results["errors"]),
+            "url_cache": results.get("url_cache"),
+            "suppression": results.get("suppression"),
+        })
+        url_cache = results.get("url_cache") or {}
+        print(f"[PDF Download Job] Completed - Downloaded: {len(results['downloaded'])}, "
+              f"Needs upload: {len(results['needs_upload'])}, Errors: {len(results['errors'])}, "
+              f"URL cache hit rate: {url_cache.get('hit_rate', 0.0):.0%} "
+              f"({url_cache.get('hits', 0)}/{url_cache.get('hits', 0) + url_cache.get('misses', 0)}), "
+              f"estimated lookups saved: {(results.get('suppression') or {}).get('requests_saved', 0)}")
+    except JobCancelled:
+        raise
+    except Exception:
+        # Earlier attempts leave the progress running; the retry resumes it
+        if ctx.is_last_attempt:
+            update_pdf_download_progress(ctx.db_path, project_id, {"status": "error", "end_time": time.time()})
+            processed = len(downloaded) + len(needs_upload) + len(errors)
+            add_pdf_download_event(ctx.db_path, project_id, "status", {"status": "error", **counters(processed)})
+        raise
+
+
+def run_doi_metadata_prefetch_job(ctx: JobContext) -> None:
+    """Store CrossRef metadata for every DOI of a project (DOIs with fresh metadata are skipped)."""
+    from doi_metadata import prefetch_doi_metadata
+
+    project_id = ctx.payload["project_id"]
+    project = get_project_by_id(ctx.db_path, project_id)
+    if not project:
+        logger.warning(f"[Metadata Prefetch Job] Project {project_id} no longer exists")
+        return
+
+    counts = prefetch_doi_metadata(ctx.db_path, project["doi_list"],
+                                   progress_callback=lambda done, total: ctx.check())
+    print(f"[Metadata Prefetch Job] Project {project_id}: {counts['fetched']} fetched, "
+          f"{counts['cached']} already stored, {counts['not_found']} not in CrossRef, {counts['failed']} failed")
+    if counts["failed"]:
+        # The retry only fetches what is still missing
+        raise RuntimeError(f"Metadata for {counts['failed']} DOIs could not be fetched")
+
+
+def run_project_creation_job(ctx: JobContext) -> None:
+    """
+    Validate a new project's DOIs chunk by chunk and commit valid ones as they arrive,
+    recording progress in project_creation_jobs. The project is created with the first
+    valid chunk, so a list without any valid DOI creates no project. A retry resumes
+    after the DOIs an earlier attempt validated.
+    """
+    from harvest_be import normalize_doi, validate_dois_concurrent
+
+    job_id = ctx.payload["job_id"]
+    doi_list = ctx.payload["doi_list"]
+    state = get_project_creation_job(ctx.db_path, job_id)
+    if not state:
+        logger.warning(f"[Project Creation Job] Job {job_id} no longer exists")
+        return
+
+    project_id = state["project_id"]
+    valid_count = state["valid_count"]
+    invalid_dois = state["invalid_dois"]
+    validated = state["validated"]
+    update_project_creation_job(ctx.db_path, job_id, {"status": "running"})
+
+    try:
+        for start in range(validated, len(doi_list), PROJECT_CREATION_CHUNK_SIZE):
+            ctx.check()
+            chunk = doi_list[start:start + PROJECT_CREATION_CHUNK_SIZE]
+            valid, invalid = validate_dois_concurrent(chunk)
+            invalid_dois.extend(invalid)
+
+            # Keep the submitted order (validate_dois_concurrent returns a deduplicated set)
+            valid_set = set(valid)
+            ordered_valid = list(dict.fromkeys(
+                normalize_doi(doi) for doi in chunk if normalize_doi(doi) in valid_set
+            ))
+
+            if ordered_valid:
+                if project_id is None:
+                    project_id = create_project(ctx.db_path, ctx.payload["name"], ctx.payload.get("description", ""),
+                                                ordered_valid, ctx.payload.get("created_by"))
+                    if project_id <= 0:
+                        raise RuntimeError("Failed to create project")
+                    valid_count = len(ordered_valid)
+                else:
+                    added = append_project_dois(ctx.db_path, project_id, ordered_valid)
+                    if added < 0:
+                        raise RuntimeError(f"Failed to add DOIs to project {project_id}")
+                    valid_count += added
+
+            validated = start + len(chunk)
+            update_project_creation_job(ctx.db_path, job_id, {
+                "project_id": project_id,
+                "validated": validated,
+                "valid_count": valid_count,
+                "invalid_dois": invalid_dois,
+            })
+
+        if project_id is None:
+            update_project_creation_job(ctx.db_path, job_id, {
+                "status": "failed",
+                "error": "No valid DOIs provided",
+            })
+        else:
+            update_project_creation_job(ctx.db_path, job_id, {"status": "completed"})
+            print(f"[Project Creation Job] Project {project_id} created by job {job_id}: "
+                  f"{valid_count} valid, {len(invalid_dois)} invalid DOI(s)")
+    except JobCancelled:
+        raise
+    except Exception:
+        # Earlier attempts leave the job running; the retry resumes it
+        if ctx.is_last_attempt:
+            update_project_creation_job(ctx.db_path, job_id, {
+                "status": "failed",
+                "error": "Project creation failed. See server logs for details.",
+            })
+        raise
+
+
+def run_literature_search_job(ctx: JobContext) -> None:
+    """
+    Run a literature search pipeline, recording each completed stage in
+    literature_search_jobs (polled by /api/literature/search/<id>) and storing
+    successful results in the shared search cache.
+    """
+    import literature_search
+
+    search_id = ctx.payload["search_id"]
+    cache_key = ctx.payload.get("cache_key")
+    execution_log = []
+    update_literature_search_job(ctx.db_path, search_id, {"status": "running", "execution_log": execution_log})
+
+    def on_progress(entry):
+        execution_log.append(entry)
+        update_literature_search_job(ctx.db_path, search_id, {"execution_log": execution_log})
+
+    try:
+        result = literature_search.search_papers(progress_callback=on_progress, **ctx.payload["params"])
+    except Exception:
+        # Earlier attempts leave the search running; the retry starts it over
+        if ctx.is_last_attempt:
+            update_literature_search_job(ctx.db_path, search_id, {
+                "status": "failed",
+                "error": "Search failed. See server logs for details.",
+            })
+        raise
+
+    if cache_key and result.get("success"):
+        store_literature_search(ctx.db_path, cache_key, result)
+    update_literature_search_job(ctx.db_path, search_id, {
+        "status": "completed",
+        "execution_log": result.get("execution_log", execution_log),
+        "result": result,
+    })
+
+
+class RetryInterrupted(Exception):
+    """Raised inside a retry batch to stop it (a job is waiting or the worker is stopping)."""
+
+
+def record_retry_success(db_path: str, project_id: int, doi: str, message: str, source: str) -> bool:
+    """Move a DOI downloaded by a retry to the downloaded list of its project's download progress."""
+    from pdf_manager import generate_doi_hash
+
+    progress = get_pdf_download_progress(db_path, project_id)
+    if not progress:
+        return False
+    downloaded = [entry for entry in progress["downloaded"] if entry[0] != doi]
+    downloaded.append((doi, f"{generate_doi_hash(doi)}.pdf", message, source))
+    return update_pdf_download_progress(db_path, project_id, {
+        "downloaded": downloaded,
+        "needs_upload": [entry for entry in progress["needs_upload"] if entry[0] != doi],
+        "errors": [entry for entry in progress["errors"] if entry[0] != doi],
+    })
+
+
+def run_pdf_retry_batch(db_path: str, stop_event: threading.Event = None,
+                        job_types: Optional[List[str]] = None,
+                        batch_size: int = PDF_RETRY_BATCH_SIZE,
+                        max_workers: int = PDF_RETRY_CONCURRENCY,
+                        lease_seconds: float = PDF_RETRY_LEASE_SECONDS) -> int:
+    """
+    Retry a batch of ready DOIs from the PDF retry queue and record downloads in their
+    projects' download progress. The download engine reschedules DOIs that fail
+    temporarily again (up to max_retry_attempts) and drops the others. The batch stops
+    after the current DOIs when a job (of job_types, any type by default) is waiting or
+    stop_event is set; DOIs it did not
+    get to are released. Projects with a download job of their own are left to that job.
+    Returns the number of DOIs retried.
+    """
+    from pdf_download_db import PDF_DB_PATH, claim_retry_batch, release_retries, remove_from_retry_queue
+    from pdf_manager import process_dois_smart, get_project_pdf_dir
+
+    # No download has run here yet, so nothing is queued
+    if not os.path.exists(PDF_DB_PATH):
+        return 0
+
+    retries = claim_retry_batch(batch_size, lease_seconds)
+    if not retries:
+        return 0
+
+    by_project = {}
+    for retry in retries:
+        by_project.setdefault(retry["project_id"], []).append(retry)
+
+    def interrupted() -> bool:
+        return (stop_event is not None and stop_event.is_set()) or has_runnable_job(db_path, job_types)
+
+    done = set()  # (project_id, doi) attempted or handed over
+    retried = 0
+    print(f"[Retry Scheduler] Retrying {len(retries)} DOIs from {len(by_project)} project(s)")
+    try:
+        for project_id, entries in by_project.items():
+            if interrupted():
+                raise RetryInterrupted()
+
+            if not get_project_by_id(db_path, project_id):
+                for entry in entries:
+                    remove_from_retry_queue(project_id, entry["doi"])
+                    done.add((project_id, entry["doi"]))
+                continue
+            if get_active_job(db_path, f"pdf_download:{project_id}"):
+                # The project's download job attempts (and requeues) these DOIs itself
+                done.update((project_id, entry["doi"]) for entry in entries)
+                continue
+
+            def progress_callback(current_idx: int, doi: str, success: bool, message: str, source: str = ""):
+                nonlocal retried
+                done.add((project_id, doi))
+                retried += 1
+                if success:
+                    remove_from_retry_queue(project_id, doi)
+                    record_retry_success(db_path, project_id, doi, message, source)
+                    print(f"[Retry Scheduler] Project {project_id}: {doi} downloaded via {source}")
+                if interrupted():
+                    raise RetryInterrupted()
+
+            process_dois_smart([entry["doi"] for entry in entries], project_id,
+                               get_project_pdf_dir(project_id), progress_callback, max_workers=max_workers)
+    except RetryInterrupted:
+        print("[Retry Scheduler] Stopping the batch for a waiting job")
+    finally:
+        unattempted = [retry["id"] for retry in retries if (retry["project_id"], retry["doi"]) not in done]
+        if unattempted:
+            release_retries(unattempted)
+
+    return retried
+
+
+JOB_HANDLERS: Dict[str, Callable[[JobContext], None]] = {
+    "pdf_download": run_pdf_download_job,
+    "doi_metadata_prefetch": run_doi_metadata_prefetch_job,
+    "project_creation": run_project_creation_job,
+    "literature_search": run_literature_search_job,
+}
+
+
+# -----------------------------
+# Worker loop
+# -----------------------------
+
+def make_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+def run_job(db_path: str, job: dict, worker_id: str, lease_seconds: float = JOB_LEASE_SECONDS,
+            retry_delay: float = None) -> str:
+    """Run one claimed job. Returns the outcome: completed, retry, failed or cancelled."""
+    retry_delay = JOB_RETRY_DELAY if retry_delay is None else retry_delay
+    handler = JOB_HANDLERS.get(job["job_type"])
+    if handler is None:
+        fail_job(db_path, job["id"], worker_id, f"Unknown job type: {job['job_type']}", retry_delay)
+        return "failed"
+
+    try:
+        with JobContext(db_path, job, worker_id, lease_seconds) as ctx:
+            handler(ctx)
+    except JobCancelled:
+        print(f"[Worker] Job {job['id']} was cancelled or taken over, stopping")
+        return "cancelled"
+    except Exception as e:
+        logger.error(f"[Worker] Job {job['id']} ({job['job_type']}) failed: {e}", exc_info=True)
+        fail_job(db_path, job["id"], worker_id, str(e)[:500], retry_delay)
+        return "failed" if job["attempts"] >= job["max_attempts"] else "retry"
+
+    complete_job(db_path, job["id"], worker_id)
+    return "completed"
+
+
+def run_worker(db_path: str = DB_PATH, worker_id: str = None, job_types: Optional[List[str]] = None,
+               poll_interval: float = JOB_POLL_INTERVAL, lease_seconds: float = JOB_LEASE_SECONDS,
+               once: bool = False, stop_event: threading.Event = None,
+               retry_interval: Optional[float] = None) -> int:
+    """
+    Claim and run jobs until stop_event is set (or, with once=True, until the queue is empty).
+    When idle, workers that run pdf_download jobs drain the PDF retry queue every
+    retry_interval seconds (PDF_RETRY_INTERVAL; see run_pdf_retry_batch).
+    Returns the number of jobs run.
+    """
+    worker_id = worker_id or make_worker_id()
+    stop_event = stop_event or threading.Event()
+    job_types = job_types or list(JOB_HANDLERS)
+    retry_interval = PDF_RETRY_INTERVAL if retry_interval is None else retry_interval
+    retry_pdfs = PDF_RETRY_SCHEDULER and "pdf_download" in job_types
+    next_retry_check = time.monotonic()
+    processed = 0
+    print(f"[Worker] {worker_id} polling {db_path} for {', '.join(job_types)} jobs")
+
+    while not stop_event.is_set():
+        job = claim_job(db_path, worker_id, lease_seconds, job_types)
+        if job is None:
+            if retry_pdfs and time.monotonic() >= next_retry_check:
+                next_retry_check = time.monotonic() + retry_interval
+                if run_pdf_retry_batch(db_path, stop_event, job_types):
+                    # More may be ready: keep draining while no job is waiting
+                    next_retry_check = time.monotonic()
+                    continue
+            if once:
+                break
+            stop_event.wait(poll_interval)
+            continue
+
+        print(f"[Worker] Claimed job {job['id']} ({job['job_type']}, attempt {job['attempts']})")
+        outcome = run_job(db_path, job, worker_id, lease_seconds)
+        print(f"[Worker] Job {job['id']}: {outcome}")
+        processed += 1
+
+    return processed
+
+
+_embedded_worker = None
+_embedded_search_workers: List[threading.Thread] = []
+_embedded_lock = threading.Lock()
+
+
+def start_embedded_worker(db_path: str = DB_PATH) -> threading.Thread:
+    """
+    Start (once per process) a daemon worker thread inside the backend, plus
+    LITERATURE_SEARCH_WORKERS threads that only run literature searches.
+    """
+    global _embedded_worker
+    with _embedded_lock:
+        if _embedded_worker is None or not _embedded_worker.is_alive():
+            _embedded_worker = threading.Thread(target=run_worker, kwargs={"db_path": db_path},
+                                                daemon=True, name="harvest-embedded-worker")
+            _embedded_worker.start()
+        _embedded_search_workers[:] = [thread for thread in _embedded_search_workers if thread.is_alive()]
+        while len(_embedded_search_workers) < LITERATURE_SEARCH_WORKERS:
+            thread = threading.Thread(target=run_worker,
+                                      kwargs={"db_path": db_path, "job_types": ["literature_search"]},
+                                      daemon=True, name="harvest-embedded-search-worker")
+            thread.start()
+            _embedded_search_workers.append(thread)
+        return _embedded_worker
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run HARVEST background jobs")
+    parser.add_argument("--db", default=DB_PATH, help="Path to the harvest database")
+    parser.add_argument("--once", action="store_true", help="Exit when no job is queued")
+    parser.add_argument("--poll-interval", type=float, default=JOB_POLL_INTERVAL,
+                        help="Seconds between queue polls when idle")
+    parser.add_argument("--job-type", action="append", dest="job_types",
+                        help="Only run jobs of this type (repeatable)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    init_db(args.db)
+
+    stop_event = threading.Event()
+
+    def handle_signal(signum, frame):
+        # First signal: finish the current job. Second: exit now; the job's lease
+        # expires and another worker resumes it.
+        if stop_event.is_set():
+            sys.exit(1)
+        print("\n[Worker] Shutting down after the current job (signal again to stop now)...")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    processed = run_worker(args.db, job_types=args.job_types, poll_interval=args.poll_interval,
+                           once=args.once, stop_event=stop_event)
+    print(f"[Worker] Ran {processed} job(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Per-host politeness for PDF downloads.
+
+Concurrent downloads share one HostLimiter per process. Each upstream host
+gets its own limits instead of a global sleep between requests:
+
+- at most `concurrency` requests in flight to the host
+- at most `rps` request starts per second (a TokenBucket without bursts)
+
+Limits come from PDF_HOST_LIMITS in config.py; hosts without an entry use
+PDF_HOST_CONCURRENCY and one request per rate_limit_delay_seconds (the delay
+configured in the PDF download database).
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from crossref_client import TokenBucket
+
+# Import configuration
+try:
+    from config import PDF_HOST_CONCURRENCY, PDF_HOST_LIMITS
+except ImportError:
+    PDF_HOST_CONCURRENCY = 2
+    PDF_HOST_LIMITS = {}
+
+# Hosts queried by each lookup source in pdf_sources / pdf_manager.try_source
+SOURCE_HOSTS = {
+    "unpaywall": "api.unpaywall.org",
+    "unpywall": "api.unpaywall.org",
+    "europe_pmc": "www.ebi.ac.uk",
+    "pmc_enhanced": "www.ncbi.nlm.nih.gov",
+    "metapub": "eutils.ncbi.nlm.nih.gov",
+    "arxiv_enhanced": "export.arxiv.org",
+    "biorxiv_medrxiv": "api.biorxiv.org",
+    "core": "api.core.ac.uk",
+    "semantic_scholar": "api.semanticscholar.org",
+    "zenodo": "zenodo.org",
+    "doaj": "doaj.org",
+    "habanero": "api.crossref.org",
+    "scihub": "sci-hub",
+}
+
+
+def source_host(source_name: str, doi: str = "") -> str:
+    """Host key for a lookup source; publisher_direct is keyed by the DOI's publisher prefix."""
+    if source_name == "publisher_direct":
+        return f"publisher:{doi.split('/', 1)[0]}"
+    return SOURCE_HOSTS.get(source_name, source_name)
+
+
+def url_host(url: str) -> str:
+    """Host key for a URL (lower-cased hostname)."""
+    return (urlparse(url).hostname or url).lower()
+
+
+class HostLimiter:
+    """Per-host concurrency and request-rate limits, shared by all download threads."""
+
+    def __init__(self, default_concurrency: int = PDF_HOST_CONCURRENCY,
+                 default_rps: float = 1.0, limits: Optional[Dict[str, dict]] = None):
+        self.default_concurrency = max(1, int(default_concurrency))
+        self.default_rps = float(default_rps)
+        self.limits = dict(limits if limits is not None else PDF_HOST_LIMITS)
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host_state(self, host: str):
+        with self._lock:
+            if host not in self._hosts:
+                limits = self.limits.get(host, {})
+                concurrency = max(1, int(limits.get("concurrency", self.default_concurrency)))
+                rps = float(limits.get("rps", self.default_rps))
+                # No bursts: request starts are spaced 1/rps apart
+                bucket = TokenBucket(rps, capacity=1) if rps > 0 else None
+                self._hosts[host] = (threading.BoundedSemaphore(concurrency), bucket)
+            return self._hosts[host]
+
+    @contextmanager
+    def limit(self, host: str):
+        """Hold one of the host's request slots, starting only when its rate allows."""
+        semaphore, bucket = self._host_state(host)
+        with semaphore:
+            if bucket:
+                bucket.acquire()
+            yield
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_host_limiter() -> HostLimiter:
+    """Return the process-wide limiter (default rate from rate_limit_delay_seconds)."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            try:
+                from pdf_download_db import get_config_value
+                delay = float(get_config_value("rate_limit_delay_seconds", "1"))
+            except Exception:
+                delay = 1.0
+            _limiter = HostLimiter(default_rps=1.0 / delay if delay > 0 else 0)
+        return _limiter
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pooled HTTP sessions for PDF lookups and downloads.
+
+pdf_sources and pdf_manager send their requests through one requests.Session
+per upstream host instead of module-level requests.get, so connections (and
+their TLS handshakes) are reused across DOIs and threads:
+
+- each host's connection pool holds PDF_DOWNLOAD_CONCURRENCY connections, one
+  per download thread
+- connection errors and 500/502/503/504 responses to GET/HEAD are retried
+  PDF_HTTP_RETRIES times with backoff; read timeouts are not, so a hung
+  source costs one timeout (see source_health.py)
+- requests without a User-Agent get one from get_random_user_agent()
+
+Every response is counted as an opened (new TCP/TLS connection) or reused
+connection, per host in connection_stats() and in the
+harvest_external_connections_total metric. track_connections() collects the
+counts of the requests made by the current thread, for download_attempts.
+
+cancel_on(event) makes the current thread's requests raise RequestCancelled
+once the event is set, so a lookup that lost a source race stops before its
+next request. A request already in flight is not interrupted (requests has no
+way to abort a blocking read from another thread); its timeout bounds it.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Import configuration
+try:
+    from config import PDF_DOWNLOAD_CONCURRENCY
+except ImportError:
+    PDF_DOWNLOAD_CONCURRENCY = 8
+
+try:
+    from config import PDF_HTTP_RETRIES
+except ImportError:
+    PDF_HTTP_RETRIES = 2
+
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+_tracking = threading.local()
+
+
+class RequestCancelled(requests.RequestException):
+    """A request refused because the thread's cancel event is set (see cancel_on)."""
+
+
+def _record_connection(host: str, reused: bool) -> None:
+    kind = "reused" if reused else "opened"
+    with _stats_lock:
+        host_stats = _stats.setdefault(host, {"opened": 0, "reused": 0})
+        host_stats[kind] += 1
+    for counts in getattr(_tracking, "stack", []):
+        counts[kind] += 1
+    try:
+        from metrics import registry
+        registry.inc("harvest_external_connections_total", {"host": host, "kind": kind})
+    except ImportError:
+        pass
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that records whether each response came over a new or a reused connection."""
+
+    def build_response(self, req, resp):
+        response = super().build_response(req, resp)
+        connection = getattr(resp, "connection", None)
+        if connection is not None:
+            reused = getattr(connection, "_harvest_used", False)
+            connection._harvest_used = True
+            _record_connection(urlparse(req.url).hostname or "unknown", reused)
+        return response
+
+
+def _new_session() -> requests.Session:
+    session = requests.Session()
+    retries = Retry(
+        total=PDF_HTTP_RETRIES,
+        # Read timeouts are raised as is, not retried: the caller's timeout bounds the request
+        read=False,
+        backoff_factor=0.5,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        raise_on_status=False,
+        # Host pacing is HostLimiter's job; don't hold a slot for a server-chosen delay
+        respect_retry_after_header=False,
+    )
+    pool_size = max(1, int(PDF_DOWNLOAD_CONCURRENCY))
+    adapter = CountingHTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(url: str) -> requests.Session:
+    """Return the shared session for the URL's host."""
+    host = (urlparse(url).hostname or "").lower()
+    with _sessions_lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = _sessions[host] = _new_session()
+        return session
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """requests.request through the host's pooled session, with a rotated User-Agent by default."""
+    scope = getattr(_tracking, "cancel_scope", None)
+    if scope is not None and scope["event"].is_set():
+        scope["refused"] += 1
+        raise RequestCancelled(f"Request to {urlparse(url).hostname} cancelled")
+    headers = dict(kwargs.pop("headers", None) or {})
+    if not any(key.lower() == "user-agent" for key in headers):
+        from pdf_sources import get_random_user_agent
+        headers["User-Agent"] = get_random_user_agent()
+    return get_session(url).request(method, url, headers=headers, **kwargs)
+
+
+def get(url: str, params=None, **kwargs) -> requests.Response:
+    """Pooled equivalent of requests.get."""
+    kwargs.setdefault("allow_redirects", True)
+    return request("GET", url, params=params, **kwargs)
+
+
+def head(url: str, **kwargs) -> requests.Response:
+    """Pooled equivalent of requests.head (redirects are not followed unless allow_redirects=True)."""
+    kwargs.setdefault("allow_redirects", False)
+    return request("HEAD", url, **kwargs)
+
+
+@contextmanager
+def track_connections():
+    """Count the connections opened and reused by this thread's requests inside the block."""
+    counts = {"opened": 0, "reused": 0}
+    stack = getattr(_tracking, "stack", None)
+    if stack is None:
+        stack = _tracking.stack = []
+    stack.append(counts)
+    try:
+        yield counts
+    finally:
+        stack.remove(counts)
+
+
+@contextmanager
+def cancel_on(event: Optional[threading.Event]):
+    """
+    Refuse this thread's requests inside the block once event is set: they raise
+    RequestCancelled instead of being sent. Yields {"refused": requests refused}.
+    """
+    scope = {"event": event, "refused": 0}
+    previous = getattr(_tracking, "cancel_scope", None)
+    if event is not None:
+        _tracking.cancel_scope = scope
+    try:
+        yield scope
+    finally:
+        _tracking.cancel_scope = previous
+
+
+def connection_stats() -> Dict[str, Dict[str, int]]:
+    """Connections opened and reused per host since start-up (or the last reset)."""
+    with _stats_lock:
+        return {host: dict(counts) for host, counts in _stats.items()}
+
+
+def reset_connection_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+def close_sessions() -> None:
+    """Close all pooled sessions (their connections are opened again on next use)."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -34,6 +34,16 @@ DEFAULT_CONTACT_EMAIL = 'harvest-app@example.com'
 # Previous bug: used viewField='fullRecord' which is INVALID - should use optionView='FR'
 WOS_OPTION_VIEW_FULL_RECORD = 'FR'
 
+VALID_SOURCES = {'semantic_scholar', 'arxiv', 'web_of_science', 'openalex'}
+
+# Results fetched per source when no per-source limit is given
+DEFAULT_PER_SOURCE_LIMITS = {
+    'semantic_scholar': 100,  # Increased from 40 to allow more results
+    'arxiv': 50,              # Increased from 10 to allow more results
+    'web_of_science': 100,    # Increased from 20 to allow more results (WoS API max is 100)
+    'openalex': 200           # Increased from 20 to allow more results (OpenAlex API max is 200)
+}
+
 # Configure Hugging Face cache directory to avoid read-only filesystem errors
 # Set cache to a writable directory alongside other HARVEST data
 # Priority order: 
@@ -1468,8 +1478,7 @@ def search_papers(
         sources = ['semantic_scholar', 'arxiv']
     
     # Validate sources
-    valid_sources = {'semantic_scholar', 'arxiv', 'web_of_science', 'openalex'}
-    sources = [s for s in sources if s in valid_sources]
+    sources = [s for s in sources if s in VALID_SOURCES]
     
     if not sources:
         return {
@@ -1530,12 +1539,7 @@ def search_papers(
         
         # Set default per-source limits if not provided
         if per_source_limit is None:
-            per_source_limit = {
-                'semantic_scholar': 100,  # Increased from 40 to allow more results
-                'arxiv': 50,              # Increased from 10 to allow more results
-                'web_of_science': 100,    # Increased from 20 to allow more results (WoS API max is 100)
-                'openalex': 200           # Increased from 20 to allow more results (OpenAlex API max is 200)
-            }
+            per_source_limit = dict(DEFAULT_PER_SOURCE_LIMITS)
         
         # Search Semantic Scholar if requested
         if 'semantic_scholar' in sources:
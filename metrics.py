@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Request, SQL and external-call metrics for the HARVEST backend, exported at
+/metrics in the Prometheus text format.
+
+- HTTP: latency histogram per route template, method and status code.
+- SQL: queries and time per request, through a sqlite3.Connection subclass used
+  for every harvest_store connection (see harvest_store.configure_connection_factory).
+- External calls: latency per host and status for every `requests` call
+  (CrossRef, Unpaywall, PDF sources, ...).
+
+Metrics live in memory per process. With several gunicorn workers, set a shared
+METRICS_MULTIPROC_DIR: each process periodically writes a snapshot file there and
+/metrics sums the snapshots of all processes, so any worker can serve the scrape.
+
+Usage:
+    from metrics import init_metrics
+    init_metrics(app, multiproc_dir="/var/lib/harvest/metrics")
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# name -> (type, help, buckets)
+METRICS = {
+    "harvest_http_request_duration_seconds": (
+        "histogram", "HTTP request latency by route template, method and status code", LATENCY_BUCKETS),
+    "harvest_sql_queries_per_request": (
+        "histogram", "SQL statements executed per HTTP request", QUERY_COUNT_BUCKETS),
+    "harvest_sql_seconds_per_request": (
+        "histogram", "Time spent in SQLite per HTTP request", LATENCY_BUCKETS),
+    "harvest_sql_queries_total": (
+        "counter", "SQL statements executed (route is (background) outside requests)", None),
+    "harvest_sql_seconds_total": (
+        "counter", "Time spent in SQLite (route is (background) outside requests)", None),
+    "harvest_external_request_duration_seconds": (
+        "histogram", "Latency of outgoing HTTP requests by host and status", LATENCY_BUCKETS),
+    "harvest_external_connections_total": (
+        "counter", "Outgoing HTTP responses by host over new (opened) or pooled (reused) connections", None),
+    "harvest_security_events_total": (
+        "counter", "Security events (OTP requests, verification failures, ...)", None),
+}
+
+BACKGROUND_ROUTE = "(background)"
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    """Thread-safe in-process counters and histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, LabelSet], float] = {}
+        self._histograms: Dict[Tuple[str, LabelSet], list] = {}  # [bucket counts, sum, count]
+
+    def inc(self, name: str, labels: Dict[str, str], amount: float = 1.0) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + amount
+
+    def observe(self, name: str, labels: Dict[str, str], value: float) -> None:
+        buckets = METRICS[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            entry = self._histograms.get(key)
+            if entry is None:
+                entry = self._histograms[key] = [[0] * len(buckets), 0.0, 0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def snapshot(self) -> dict:
+        """JSON-serializable copy (non-cumulative bucket counts)."""
+        with self._lock:
+            return {
+                "counters": [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+                "histograms": [[name, list(labels), list(entry[0]), entry[1], entry[2]]
+                               for (name, labels), entry in self._histograms.items()],
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+registry = MetricsRegistry()
+
+_settings = {"multiproc_dir": "", "flush_interval": 5.0, "last_flush": 0.0}
+_request_state = threading.local()
+
+
+# -----------------------------
+# SQL instrumentation
+# -----------------------------
+
+def _record_sql(seconds: float, statements: int = 1) -> None:
+    if getattr(_request_state, "active", False):
+        _request_state.sql_queries += statements
+        _request_state.sql_seconds += seconds
+    else:
+        labels = {"route": BACKGROUND_ROUTE}
+        if statements:
+            registry.inc("harvest_sql_queries_total", labels, statements)
+        registry.inc("harvest_sql_seconds_total", labels, seconds)
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that times statement execution and fetches."""
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            _record_sql(time.perf_counter() - start)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            _record_sql(time.perf_counter() - start)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            _record_sql(time.perf_counter() - start, statements=0)
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        try:
+            return super().fetchmany(size) if size is not None else super().fetchmany()
+        finally:
+            _record_sql(time.perf_counter() - start, statements=0)
+
+    def fetchall(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            _record_sql(time.perf_counter() - start, statements=0)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors (including conn.execute shortcuts) are instrumented."""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+# -----------------------------
+# External HTTP calls
+# -----------------------------
+
+_requests_instrumented = False
+
+
+def instrument_requests() -> None:
+    """Time every `requests` call (requests.get and Session.get both go through Session.send)."""
+    global _requests_instrumented
+    if _requests_instrumented:
+        return
+    try:
+        import requests
+    except ImportError:
+        return
+
+    original_send = requests.Session.send
+
+    def send(self, request, **kwargs):
+        start = time.perf_counter()
+        status = "error"
+        try:
+            response = original_send(self, request, **kwargs)
+            status = str(response.status_code)
+            return response
+        finally:
+            host = urlsplit(request.url).hostname or "unknown"
+            registry.observe("harvest_external_request_duration_seconds",
+                             {"host": host, "status": status}, time.perf_counter() - start)
+
+    requests.Session.send = send
+    _requests_instrumented = True
+
+
+# -----------------------------
+# Multiprocess aggregation
+# -----------------------------
+
+def _snapshot_path(pid: int = None) -> str:
+    return os.path.join(_settings["multiproc_dir"], f"metrics_{pid or os.getpid()}.json")
+
+
+def flush_metrics(force: bool = False) -> None:
+    """Write this process's snapshot for other workers' /metrics (throttled)."""
+    if not _settings["multiproc_dir"] or not os.path.isdir(_settings["multiproc_dir"]):
+        return
+    now = time.monotonic()
+    if not force and now - _settings["last_flush"] < _settings["flush_interval"]:
+        return
+    _settings["last_flush"] = now
+    path = _snapshot_path()
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(registry.snapshot(), f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write metrics snapshot {path}: {e}")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def cleanup_metrics_dir(max_age_seconds: int = 3600) -> int:
+    """Remove snapshots of processes that exited more than max_age_seconds ago."""
+    directory = _settings["multiproc_dir"]
+    if not directory or not os.path.isdir(directory):
+        return 0
+    removed = 0
+    cutoff = time.time() - max_age_seconds
+    for name in os.listdir(directory):
+        if not (name.startswith("metrics_") and name.endswith(".json")):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            pid = int(name[len("metrics_"):-len(".json")])
+            if not _pid_alive(pid) and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except (ValueError, OSError):
+            continue
+    return removed
+
+
+def _collect_snapshots() -> List[dict]:
+    """This process's live metrics plus the latest snapshots of all other processes."""
+    snapshots = [registry.snapshot()]
+    directory = _settings["multiproc_dir"]
+    if not directory or not os.path.isdir(directory):
+        return snapshots
+    own_file = os.path.basename(_snapshot_path())
+    for name in os.listdir(directory):
+        if name == own_file or not (name.startswith("metrics_") and name.endswith(".json")):
+            continue
+        try:
+            with open(os.path.join(directory, name)) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+# -----------------------------
+# Prometheus text format
+# -----------------------------
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Iterable, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [tuple(pair) for pair in labels]
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _format_number(value: float) -> str:
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def render_metrics(snapshots: List[dict] = None) -> str:
+    """Merge snapshots and render them in the Prometheus text exposition format."""
+    if snapshots is None:
+        snapshots = _collect_snapshots()
+
+    counters: Dict[Tuple[str, LabelSet], float] = {}
+    histograms: Dict[Tuple[str, LabelSet], list] = {}
+    for snap in snapshots:
+        for name, labels, value in snap.get("counters", []):
+            key = (name, tuple(tuple(pair) for pair in labels))
+            counters[key] = counters.get(key, 0.0) + value
+        for name, labels, buckets, total, count in snap.get("histograms", []):
+            if name not in METRICS or len(buckets) != len(METRICS[name][2]):
+                continue  # Snapshot from a process with different bucket settings
+            key = (name, tuple(tuple(pair) for pair in labels))
+            entry = histograms.setdefault(key, [[0] * len(buckets), 0.0, 0])
+            entry[0] = [a + b for a, b in zip(entry[0], buckets)]
+            entry[1] += total
+            entry[2] += count
+
+    lines = []
+    for name, (metric_type, help_text, bucket_bounds) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        if metric_type == "counter":
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_number(value)}")
+            continue
+        for (metric, labels), (buckets, total, count) in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, bucket_count in zip(bucket_bounds, buckets):
+                cumulative += bucket_count
+                lines.append(f"{name}_bucket{_format_labels(labels, ('le', _format_number(bound)))} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_number(total)}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+# -----------------------------
+# Flask integration
+# -----------------------------
+
+def init_metrics(app, multiproc_dir: str = "", flush_interval: float = 5.0,
+                 endpoint: str = "/metrics", track_external: bool = True) -> None:
+    """Install request timing, SQL accounting and the /metrics endpoint on a Flask app."""
+    from flask import Response, request
+
+    _settings["multiproc_dir"] = multiproc_dir or ""
+    _settings["flush_interval"] = flush_interval
+    if multiproc_dir:
+        os.makedirs(multiproc_dir, exist_ok=True)
+        cleanup_metrics_dir()
+        atexit.register(flush_metrics, True)
+    if track_external:
+        instrument_requests()
+
+    @app.before_request
+    def _start_request_metrics():
+        _request_state.active = True
+        _request_state.start = time.perf_counter()
+        _request_state.sql_queries = 0
+        _request_state.sql_seconds = 0.0
+
+    @app.after_request
+    def _finish_request_metrics(response):
+        if not getattr(_request_state, "active", False):
+            return response
+        _request_state.active = False
+        elapsed = time.perf_counter() - _request_state.start
+        route = request.url_rule.rule if request.url_rule is not None else "(unmatched)"
+        registry.observe("harvest_http_request_duration_seconds",
+                         {"method": request.method, "route": route, "status": str(response.status_code)},
+                         elapsed)
+        labels = {"route": route}
+        registry.observe("harvest_sql_queries_per_request", labels, _request_state.sql_queries)
+        registry.observe("harvest_sql_seconds_per_request", labels, _request_state.sql_seconds)
+        if _request_state.sql_queries:
+            registry.inc("harvest_sql_queries_total", labels, _request_state.sql_queries)
+        registry.inc("harvest_sql_seconds_total", labels, _request_state.sql_seconds)
+        flush_metrics()
+        return response
+
+    @app.teardown_request
+    def _abandon_request_metrics(exc):
+        _request_state.active = False
+
+    def metrics_endpoint():
+        flush_metrics(force=True)
+        return Response(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+    app.add_url_rule(endpoint, "metrics", metrics_endpoint, methods=["GET"])
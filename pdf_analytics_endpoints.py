@@ -12,38 +12,25 @@ import json
 from pdf_download_db import (
     get_download_statistics, get_source_rankings,
     get_config_value, set_config_value, cleanup_old_attempts,
-    get_retry_queue_ready, init_pdf_download_db,
-    get_pdf_db_connection
+    get_retry_queue_ready, get_breaker_states,
+    get_pdf_db_connection, flush_download_attempts
 )
 
 
-def init_pdf_analytics_routes(app, verify_admin_func, is_admin_func):
+def init_pdf_analytics_routes(app, require_admin_func):
     """
     Initialize PDF analytics routes on the Flask app.
 
     Args:
         app: Flask application instance
-        verify_admin_func: Function to verify admin password (email, password) -> bool
-        is_admin_func: Function to check if email is admin (email) -> bool
+        require_admin_func: The backend's admin check (harvest_be.require_admin_auth):
+            (payload) -> (email, None) or (None, error_response), accepting a token
+            (payload, "Authorization: Bearer" or "X-Admin-Token") or email/password
     """
 
     def require_admin():
-        """Helper to verify admin authentication from request"""
-        try:
-            payload = request.get_json(force=True, silent=True) or {}
-        except:
-            payload = {}
-
-        email = (payload.get("email") or "").strip()
-        password = payload.get("password") or ""
-
-        if not email or not password:
-            return None, (jsonify({"error": "Admin authentication required"}), 401)
-
-        if not (verify_admin_func(email, password) or is_admin_func(email)):
-            return None, (jsonify({"error": "Invalid admin credentials"}), 403)
-
-        return email, None
+        """Helper to verify admin authentication from request (token or email/password)"""
+        return require_admin_func(request.get_json(force=True, silent=True) or {})
 
     @app.get("/api/admin/pdf-analytics/statistics")
     def get_pdf_statistics():
@@ -223,6 +210,34 @@ def init_pdf_analytics_routes(app, verify_admin_func, is_admin_func):
             print(f"[PDF Analytics] Error getting retry queue: {e}")
             return jsonify({"error": "Failed to retrieve retry queue"}), 500
 
+    @app.get("/api/admin/pdf-analytics/circuit-breakers")
+    def get_pdf_circuit_breakers():
+        """
+        Get the circuit breaker state and current lookup timeout of each PDF source.
+        Sources without a breaker row have never tripped and are closed.
+        """
+        email, error_response = require_admin()
+        if error_response:
+            return error_response
+
+        try:
+            from source_health import get_source_health
+
+            health = get_source_health()
+            breakers = get_breaker_states()
+            timeouts = {s["name"]: health.timeout_for(s["name"]) for s in get_source_rankings()}
+
+            return jsonify({
+                "ok": True,
+                "breakers": breakers,
+                "open": [b["source_name"] for b in breakers if b["state"] != "closed"],
+                "timeouts": timeouts
+            })
+
+        except Exception as e:
+            print(f"[PDF Analytics] Error getting circuit breakers: {e}")
+            return jsonify({"error": "Failed to retrieve circuit breakers"}), 500
+
     @app.get("/api/admin/pdf-analytics/config")
     def get_pdf_config():
         """
@@ -363,6 +378,7 @@ def init_pdf_analytics_routes(app, verify_admin_func, is_admin_func):
             limit = min(request.args.get('limit', default=100, type=int), 1000)
             offset = request.args.get('offset', default=0, type=int)
 
+            flush_download_attempts()
             conn = get_pdf_db_connection()
             cursor = conn.cursor()
 
@@ -457,6 +473,7 @@ def init_pdf_analytics_routes(app, verify_admin_func, is_admin_func):
             project_id = request.args.get('project_id', type=int)
             days = request.args.get('days', default=30, type=int)
 
+            flush_download_attempts()
             conn = get_pdf_db_connection()
             cursor = conn.cursor()
 
@@ -504,7 +521,5 @@ def init_pdf_analytics_routes(app, verify_admin_func, is_admin_func):
             print(f"[PDF Analytics] Error exporting statistics: {e}")
             return jsonify({"error": "Failed to export statistics"}), 500
 
-    # Initialize database on first request
-    init_pdf_download_db()
-
+    # The database is created by harvest_be.boot(), or by the first connection
     print("[PDF Analytics] Analytics endpoints initialized")
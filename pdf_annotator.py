@@ -134,6 +134,10 @@ def add_highlights_to_pdf(pdf_path: str, highlights: List[Dict]) -> Tuple[bool,
             if not is_valid:
                 return False, f"Invalid highlight at index {i}: {error}"
         
+        # Highlights are saved into the file: detach it from the shared PDF store first
+        import pdf_store
+        pdf_store.make_private(pdf_path)
+
         # Open the PDF
         doc = fitz.open(pdf_path)
         
@@ -289,6 +293,9 @@ def clear_all_highlights(pdf_path: str) -> Tuple[bool, str]:
         if file_size > MAX_FILE_SIZE:
             return False, f"PDF file too large (max {MAX_FILE_SIZE/1024/1024}MB)"
         
+        import pdf_store
+        pdf_store.make_private(pdf_path)
+
         doc = fitz.open(pdf_path)
         count = 0
         
@@ -5,14 +5,40 @@ PDF Download Tracking Database
 Separate SQLite database for tracking PDF download attempts, source performance, and analytics
 """
 
+import atexit
+import queue
+import re
 import sqlite3
 import os
+import threading
+import time
 from typing import List, Dict, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import json
 
+# Import configuration
+try:
+    from config import (
+        PDF_ATTEMPT_BUFFERING, PDF_ATTEMPT_BATCH_SIZE,
+        PDF_ATTEMPT_FLUSH_INTERVAL, PDF_ATTEMPT_BUFFER_SIZE
+    )
+except ImportError:
+    PDF_ATTEMPT_BUFFERING = True
+    PDF_ATTEMPT_BATCH_SIZE = 200
+    PDF_ATTEMPT_FLUSH_INTERVAL = 1.0
+    PDF_ATTEMPT_BUFFER_SIZE = 10000
+
+try:
+    from config import PDF_SOURCE_STATS_HALF_LIFE_DAYS
+except ImportError:
+    PDF_SOURCE_STATS_HALF_LIFE_DAYS = 30
+
 PDF_DB_PATH = "pdf_downloads.db"
 
+# Failure categories that say a source does not have the paper (not worth asking again
+# soon); pdf_sources.is_temporary_failure() treats the other categories as temporary
+PERMANENT_FAILURE_CATEGORIES = ("not_found", "paywall", "invalid_pdf", "authentication")
+
 # Connection pool to reduce database locking
 _db_connection_pool = {}
 _db_pool_lock = None
@@ -45,6 +71,8 @@ def init_pdf_download_db(db_path: str = PDF_DB_PATH) -> bool:
     """
     try:
         conn = sqlite3.connect(db_path)
+        conn.create_function("harvest_decay", 1, decay_factor, deterministic=True)
+        conn.create_function("harvest_doi_prefix", 1, _doi_prefix, deterministic=True)
         cursor = conn.cursor()
 
         # Table 1: Sources - Configuration for each PDF download source
@@ -78,10 +106,19 @@ def init_pdf_download_db(db_path: str = PDF_DB_PATH) -> bool:
                 file_size_bytes INTEGER,
                 pdf_url TEXT,
                 timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                connections_opened INTEGER,
+                connections_reused INTEGER,
                 FOREIGN KEY (source_name) REFERENCES sources(name)
             )
         """)
 
+        # Migration: HTTP connection counts per attempt (pooled sessions)
+        cursor.execute("PRAGMA table_info(download_attempts)")
+        attempt_columns = {row[1] for row in cursor.fetchall()}
+        for column in ("connections_opened", "connections_reused"):
+            if column not in attempt_columns:
+                cursor.execute(f"ALTER TABLE download_attempts ADD COLUMN {column} INTEGER")
+
         # Table 3: Source Performance - Aggregated metrics per source
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS source_performance (
@@ -95,10 +132,20 @@ def init_pdf_download_db(db_path: str = PDF_DB_PATH) -> bool:
                 last_failure_at TIMESTAMP,
                 success_rate REAL DEFAULT 0.0,
                 last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                timed_attempts INTEGER DEFAULT 0,
                 FOREIGN KEY (source_name) REFERENCES sources(name)
             )
         """)
 
+        # Migration: attempts with a response time, the weight of avg_response_time_ms
+        cursor.execute("PRAGMA table_info(source_performance)")
+        if "timed_attempts" not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute("ALTER TABLE source_performance ADD COLUMN timed_attempts INTEGER DEFAULT 0")
+            cursor.execute("""
+                UPDATE source_performance SET timed_attempts = total_attempts
+                WHERE avg_response_time_ms > 0
+            """)
+
         # Table 4: Publisher Patterns - Learned URL patterns by publisher
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS publisher_patterns (
@@ -138,6 +185,106 @@ def init_pdf_download_db(db_path: str = PDF_DB_PATH) -> bool:
             )
         """)
 
+        # Table 7: PDF URL Cache - Last working PDF URL per DOI, shared across projects
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'pdf_url_cache'")
+        url_cache_exists = cursor.fetchone() is not None
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pdf_url_cache (
+                doi TEXT PRIMARY KEY,
+                pdf_url TEXT NOT NULL,
+                source_name TEXT,
+                verified_at REAL NOT NULL,
+                content_length INTEGER,
+                etag TEXT,
+                hit_count INTEGER DEFAULT 0
+            )
+        """)
+        if not url_cache_exists:
+            # Seed from URLs found before the cache existed; verified_at = 0 forces a
+            # revalidation before first use, and URLs that fail are evicted then
+            cursor.execute("""
+                INSERT OR IGNORE INTO pdf_url_cache (doi, pdf_url, source_name, verified_at)
+                SELECT doi, pdf_url, source_name, 0 FROM download_attempts
+                WHERE id IN (
+                    SELECT MAX(id) FROM download_attempts
+                    WHERE success = 1 AND pdf_url IS NOT NULL
+                    GROUP BY doi
+                )
+            """)
+
+        # Table 8: PDF Blob References - Project files linked to a content-addressed blob
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pdf_blob_refs (
+                path TEXT PRIMARY KEY,
+                sha256 TEXT NOT NULL,
+                doi_hash TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # Table 9: Source Prefix Stats - Time-decayed success/latency per source and DOI prefix
+        cursor.execute("PRAGMA table_info(source_prefix_stats)")
+        prefix_stats_columns = {row[1] for row in cursor.fetchall()}
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS source_prefix_stats (
+                source_name TEXT NOT NULL,
+                doi_prefix TEXT NOT NULL,
+                successes REAL DEFAULT 0.0,
+                failures REAL DEFAULT 0.0,
+                latency_ms REAL DEFAULT 0.0,
+                latency_weight REAL DEFAULT 0.0,
+                updated_at REAL NOT NULL,
+                permanent_failures REAL DEFAULT 0.0,
+                PRIMARY KEY (source_name, doi_prefix)
+            )
+        """)
+        if "permanent_failures" not in prefix_stats_columns:
+            # New table (or one without permanent failures): build it from the attempt history
+            if prefix_stats_columns:
+                cursor.execute("ALTER TABLE source_prefix_stats ADD COLUMN permanent_failures REAL DEFAULT 0.0")
+                cursor.execute("DELETE FROM source_prefix_stats")
+            now = time.time()
+            cursor.execute(f"""
+                INSERT INTO source_prefix_stats
+                (source_name, doi_prefix, successes, failures, permanent_failures,
+                 latency_ms, latency_weight, updated_at)
+                SELECT source_name, doi_prefix, SUM(weight * success), SUM(weight * (1 - success)),
+                       SUM(weight * permanent),
+                       COALESCE(SUM(weight * response_time_ms) / SUM(timed_weight), 0.0),
+                       COALESCE(SUM(timed_weight), 0.0), ?
+                FROM (
+                    SELECT CASE WHEN source_name LIKE '%\\_download' ESCAPE '\\'
+                                THEN substr(source_name, 1, length(source_name) - 9)
+                                ELSE source_name END AS source_name,
+                           harvest_doi_prefix(doi) AS doi_prefix,
+                           success,
+                           CASE WHEN success = 0 AND failure_category IN
+                                ({", ".join("?" for _ in PERMANENT_FAILURE_CATEGORIES)})
+                                THEN 1 ELSE 0 END AS permanent,
+                           response_time_ms,
+                           harvest_decay(? - CAST(strftime('%s', timestamp) AS REAL)) AS weight,
+                           CASE WHEN response_time_ms IS NOT NULL
+                                THEN harvest_decay(? - CAST(strftime('%s', timestamp) AS REAL))
+                                END AS timed_weight
+                    FROM download_attempts
+                )
+                GROUP BY source_name, doi_prefix
+            """, (now, *PERMANENT_FAILURE_CATEGORIES, now, now))
+
+        # Table 10: Source Breakers - Circuit breaker state per lookup source (source_health.py)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS source_breakers (
+                source_name TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                consecutive_failures INTEGER DEFAULT 0,
+                opened_at REAL,
+                retry_at REAL,
+                trips INTEGER DEFAULT 0,
+                last_failure TEXT,
+                updated_at REAL NOT NULL
+            )
+        """)
+
         # Create indexes for performance
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_attempts_doi ON download_attempts(doi)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_attempts_project ON download_attempts(project_id)")
@@ -145,6 +292,8 @@ def init_pdf_download_db(db_path: str = PDF_DB_PATH) -> bool:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_attempts_timestamp ON download_attempts(timestamp)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_publisher_prefix ON publisher_patterns(doi_prefix)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_retry_next ON retry_queue(next_retry_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_blob_refs_sha ON pdf_blob_refs(sha256)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_blob_refs_doi ON pdf_blob_refs(doi_hash)")
 
         # Insert default sources
         default_sources = [
@@ -201,6 +350,265 @@ def init_pdf_download_db(db_path: str = PDF_DB_PATH) -> bool:
         return False
 
 
+_ATTEMPT_COLUMNS = (
+    "project_id", "doi", "source_name", "success", "failure_reason", "failure_category",
+    "response_time_ms", "file_size_bytes", "pdf_url", "connections_opened", "connections_reused"
+)
+
+
+def _upsert_source_performance(
+    cursor: sqlite3.Cursor,
+    source_name: str,
+    attempts: int,
+    successes: int,
+    timed_attempts: int,
+    response_time_sum: float
+) -> None:
+    """
+    Add attempts to a source's aggregates. The counts and the mean response time
+    are updated in SQL from the stored values, so concurrent writers don't overwrite
+    each other's updates.
+    """
+    batch_avg = response_time_sum / timed_attempts if timed_attempts else 0.0
+    failures = attempts - successes
+    cursor.execute("""
+        INSERT INTO source_performance
+        (source_name, total_attempts, success_count, failure_count, timed_attempts,
+         avg_response_time_ms, success_rate, last_success_at, last_failure_at, last_updated)
+        VALUES (?, ?, ?, ?, ?, ?, ?,
+                CASE WHEN ? > 0 THEN CURRENT_TIMESTAMP END,
+                CASE WHEN ? > 0 THEN CURRENT_TIMESTAMP END,
+                CURRENT_TIMESTAMP)
+        ON CONFLICT(source_name) DO UPDATE SET
+            total_attempts = total_attempts + excluded.total_attempts,
+            success_count = success_count + excluded.success_count,
+            failure_count = failure_count + excluded.failure_count,
+            timed_attempts = timed_attempts + excluded.timed_attempts,
+            avg_response_time_ms = CASE WHEN excluded.timed_attempts > 0 THEN
+                (avg_response_time_ms * timed_attempts
+                 + excluded.avg_response_time_ms * excluded.timed_attempts)
+                / (timed_attempts + excluded.timed_attempts)
+                ELSE avg_response_time_ms END,
+            success_rate = 100.0 * (success_count + excluded.success_count)
+                / (total_attempts + excluded.total_attempts),
+            last_success_at = COALESCE(excluded.last_success_at, last_success_at),
+            last_failure_at = COALESCE(excluded.last_failure_at, last_failure_at),
+            last_updated = CURRENT_TIMESTAMP
+    """, (source_name, attempts, successes, failures, timed_attempts, batch_avg,
+          100.0 * successes / attempts, successes, failures))
+
+
+def decay_factor(age_seconds: float) -> float:
+    """Weight left to an observation age_seconds old (halved every PDF_SOURCE_STATS_HALF_LIFE_DAYS)."""
+    half_life = PDF_SOURCE_STATS_HALF_LIFE_DAYS * 86400.0
+    if half_life <= 0:
+        return 1.0
+    return 0.5 ** (max(0.0, age_seconds) / half_life)
+
+
+def _doi_prefix(doi: str) -> str:
+    # Same as pdf_sources.extract_doi_prefix, without importing the source clients
+    match = re.match(r'^(10\.\d+)', doi or "")
+    return match.group(1) if match else ''
+
+
+def _upsert_source_prefix_stats(
+    cursor: sqlite3.Cursor,
+    source_name: str,
+    doi_prefix: str,
+    successes: int,
+    failures: int,
+    permanent_failures: int,
+    timed_attempts: int,
+    response_time_sum: float,
+    now: float
+) -> None:
+    """
+    Decay a (source, DOI prefix) row to now and add the new observations to it.
+    Needs harvest_decay() registered on the connection (see write_download_attempts).
+    """
+    latency = response_time_sum / timed_attempts if timed_attempts else 0.0
+    cursor.execute("""
+        INSERT INTO source_prefix_stats
+        (source_name, doi_prefix, successes, failures, permanent_failures,
+         latency_ms, latency_weight, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(source_name, doi_prefix) DO UPDATE SET
+            successes = successes * harvest_decay(excluded.updated_at - updated_at) + excluded.successes,
+            failures = failures * harvest_decay(excluded.updated_at - updated_at) + excluded.failures,
+            permanent_failures = permanent_failures * harvest_decay(excluded.updated_at - updated_at)
+                + excluded.permanent_failures,
+            latency_ms = CASE WHEN excluded.latency_weight > 0 THEN
+                (latency_ms * latency_weight * harvest_decay(excluded.updated_at - updated_at)
+                 + excluded.latency_ms * excluded.latency_weight)
+                / (latency_weight * harvest_decay(excluded.updated_at - updated_at) + excluded.latency_weight)
+                ELSE latency_ms END,
+            latency_weight = latency_weight * harvest_decay(excluded.updated_at - updated_at)
+                + excluded.latency_weight,
+            updated_at = MAX(updated_at, excluded.updated_at)
+    """, (source_name, doi_prefix, successes, failures, permanent_failures, latency, timed_attempts, now))
+
+
+def write_download_attempts(attempts: List[tuple], db_path: str = PDF_DB_PATH) -> int:
+    """
+    Insert download attempts (tuples in _ATTEMPT_COLUMNS order) and add them to
+    source_performance and source_prefix_stats, all in one transaction.
+    A failed "<source>_download" (the source's URL did not download) counts as
+    a failure of <source> in source_prefix_stats.
+    Returns the ID of the last attempt inserted, or -1 on error.
+    """
+    if not attempts:
+        return 0
+    try:
+        conn = get_pdf_db_connection(db_path)
+        conn.create_function("harvest_decay", 1, decay_factor, deterministic=True)
+        try:
+            cursor = conn.cursor()
+            cursor.executemany(f"""
+                INSERT INTO download_attempts ({", ".join(_ATTEMPT_COLUMNS)})
+                VALUES ({", ".join("?" for _ in _ATTEMPT_COLUMNS)})
+            """, attempts)
+            cursor.execute("SELECT last_insert_rowid()")
+            last_id = cursor.fetchone()[0]
+
+            # source -> [attempts, successes, timed attempts, response time sum]
+            totals = {}
+            for attempt in attempts:
+                source_totals = totals.setdefault(attempt[2], [0, 0, 0, 0.0])
+                source_totals[0] += 1
+                if attempt[3]:
+                    source_totals[1] += 1
+                if attempt[6] is not None:
+                    source_totals[2] += 1
+                    source_totals[3] += attempt[6]
+            for source_name, (count, successes, timed, time_sum) in totals.items():
+                _upsert_source_performance(cursor, source_name, count, successes, timed, time_sum)
+
+            # (source, prefix) -> [successes, failures, permanent failures, timed attempts, response time sum]
+            prefix_totals = {}
+            for attempt in attempts:
+                source_name = attempt[2]
+                if source_name.endswith("_download"):
+                    source_name = source_name[:-len("_download")]
+                prefix_stats = prefix_totals.setdefault((source_name, _doi_prefix(attempt[1])), [0, 0, 0, 0, 0.0])
+                prefix_stats[0 if attempt[3] else 1] += 1
+                if not attempt[3] and attempt[5] in PERMANENT_FAILURE_CATEGORIES:
+                    prefix_stats[2] += 1
+                if attempt[6] is not None:
+                    prefix_stats[3] += 1
+                    prefix_stats[4] += attempt[6]
+            now = time.time()
+            for (source_name, doi_prefix), totals_for_prefix in prefix_totals.items():
+                _upsert_source_prefix_stats(cursor, source_name, doi_prefix, *totals_for_prefix, now)
+
+            conn.commit()
+            return last_id
+        finally:
+            conn.close()
+
+    except Exception as e:
+        print(f"[PDF DB] Error writing {len(attempts)} download attempts: {e}")
+        return -1
+
+
+class AttemptWriter:
+    """
+    Buffers download attempts in memory and writes them from a background thread,
+    one transaction per batch: up to batch_size attempts, or whatever arrived
+    within flush_interval seconds of the first one.
+    """
+
+    def __init__(self, db_path: str = PDF_DB_PATH,
+                 flush_interval: float = PDF_ATTEMPT_FLUSH_INTERVAL,
+                 batch_size: int = PDF_ATTEMPT_BATCH_SIZE,
+                 max_buffered: int = PDF_ATTEMPT_BUFFER_SIZE):
+        self.db_path = db_path
+        self.flush_interval = max(0.0, float(flush_interval))
+        self.batch_size = max(1, int(batch_size))
+        self._queue = queue.Queue(maxsize=max(0, int(max_buffered)))
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            # A forked child inherits the object but not the thread
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="pdf-attempt-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, attempt: tuple) -> None:
+        """Queue an attempt (blocks while max_buffered attempts are waiting)."""
+        self._ensure_thread()
+        self._queue.put(attempt)
+
+    def flush(self, timeout: Optional[float] = 30.0) -> bool:
+        """Wait until every attempt submitted so far is written. Returns False on timeout."""
+        if self._thread is None:
+            return True
+        self._ensure_thread()
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch, waiters = [], []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if isinstance(item, threading.Event):
+                    # Flush requested: write what has been collected now
+                    waiters.append(item)
+                    break
+                batch.append(item)
+                remaining = deadline - time.monotonic()
+                if len(batch) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if batch:
+                write_download_attempts(batch, self.db_path)
+            for waiter in waiters:
+                waiter.set()
+
+
+_attempt_writers: Dict[str, AttemptWriter] = {}
+_attempt_writers_lock = threading.Lock()
+
+
+def _get_attempt_writer(db_path: str) -> AttemptWriter:
+    # Keyed by absolute path: a relative db_path means the file in the current directory
+    db_path = os.path.abspath(db_path)
+    with _attempt_writers_lock:
+        writer = _attempt_writers.get(db_path)
+        if writer is None:
+            writer = _attempt_writers[db_path] = AttemptWriter(
+                db_path, PDF_ATTEMPT_FLUSH_INTERVAL, PDF_ATTEMPT_BATCH_SIZE, PDF_ATTEMPT_BUFFER_SIZE
+            )
+        return writer
+
+
+def flush_download_attempts(db_path: Optional[str] = None, timeout: Optional[float] = 30.0) -> bool:
+    """
+    Write buffered download attempts now (for db_path, or for every database).
+    Returns False if the writer did not finish within timeout.
+    """
+    with _attempt_writers_lock:
+        if db_path is None:
+            writers = list(_attempt_writers.values())
+        else:
+            writer = _attempt_writers.get(os.path.abspath(db_path))
+            writers = [writer] if writer else []
+    return all([writer.flush(timeout) for writer in writers])
+
+
+@atexit.register
+def _flush_download_attempts_at_exit() -> None:
+    flush_download_attempts(timeout=5.0)
+
+
 def log_download_attempt(
     project_id: int,
     doi: str,
@@ -211,36 +619,28 @@ def log_download_attempt(
     response_time_ms: Optional[int] = None,
     file_size_bytes: Optional[int] = None,
     pdf_url: Optional[str] = None,
+    connections_opened: Optional[int] = None,
+    connections_reused: Optional[int] = None,
     db_path: str = PDF_DB_PATH
 ) -> int:
     """
     Log a download attempt to the database.
-    Returns the attempt ID, or -1 on error.
+    connections_opened/connections_reused count the HTTP connections the attempt
+    had to open (TCP/TLS handshakes) and the pooled ones it reused.
+    With PDF_ATTEMPT_BUFFERING the attempt is queued for the background writer
+    (see flush_download_attempts) and 0 is returned; otherwise it is written now.
+    Returns the attempt ID (0 when buffered), or -1 on error.
     """
-    try:
-        conn = get_pdf_db_connection(db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT INTO download_attempts
-            (project_id, doi, source_name, success, failure_reason, failure_category,
-             response_time_ms, file_size_bytes, pdf_url)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (project_id, doi, source_name, success, failure_reason, failure_category,
-              response_time_ms, file_size_bytes, pdf_url))
-
-        attempt_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-
-        # Update aggregated performance metrics
-        update_source_performance(source_name, success, response_time_ms, db_path)
-
-        return attempt_id
-
-    except Exception as e:
-        print(f"[PDF DB] Error logging download attempt: {e}")
-        return -1
+    attempt = (project_id, doi, source_name, int(bool(success)), failure_reason, failure_category,
+               response_time_ms, file_size_bytes, pdf_url, connections_opened, connections_reused)
+    if PDF_ATTEMPT_BUFFERING:
+        try:
+            _get_attempt_writer(db_path).submit(attempt)
+            return 0
+        except Exception as e:
+            print(f"[PDF DB] Error queueing download attempt: {e}")
+            return -1
+    return write_download_attempts([attempt], db_path)
 
 
 def update_source_performance(
@@ -255,62 +655,14 @@ def update_source_performance(
     """
     try:
         conn = get_pdf_db_connection(db_path)
-        cursor = conn.cursor()
-
-        # Get current metrics
-        cursor.execute("""
-            SELECT total_attempts, success_count, failure_count, avg_response_time_ms
-            FROM source_performance
-            WHERE source_name = ?
-        """, (source_name,))
-
-        row = cursor.fetchone()
-        if not row:
-            # Initialize if not exists
-            cursor.execute("""
-                INSERT INTO source_performance (source_name, total_attempts, success_count, failure_count)
-                VALUES (?, 0, 0, 0)
-            """, (source_name,))
-            row = (0, 0, 0, 0.0)
-
-        total, success_count, failure_count, avg_time = row
-
-        # Update counts
-        total += 1
-        if success:
-            success_count += 1
-        else:
-            failure_count += 1
-
-        # Update average response time
-        if response_time_ms is not None:
-            if avg_time == 0:
-                new_avg_time = float(response_time_ms)
-            else:
-                new_avg_time = ((avg_time * (total - 1)) + response_time_ms) / total
-        else:
-            new_avg_time = avg_time
-
-        # Calculate success rate
-        success_rate = (success_count / total * 100.0) if total > 0 else 0.0
-
-        # Update timestamp based on success/failure
-        timestamp_field = "last_success_at" if success else "last_failure_at"
-
-        cursor.execute(f"""
-            UPDATE source_performance
-            SET total_attempts = ?,
-                success_count = ?,
-                failure_count = ?,
-                avg_response_time_ms = ?,
-                success_rate = ?,
-                {timestamp_field} = CURRENT_TIMESTAMP,
-                last_updated = CURRENT_TIMESTAMP
-            WHERE source_name = ?
-        """, (total, success_count, failure_count, new_avg_time, success_rate, source_name))
-
-        conn.commit()
-        conn.close()
+        try:
+            _upsert_source_performance(
+                conn.cursor(), source_name, 1, 1 if success else 0,
+                0 if response_time_ms is None else 1, response_time_ms or 0
+            )
+            conn.commit()
+        finally:
+            conn.close()
         return True
 
     except Exception as e:
@@ -330,7 +682,7 @@ def get_source_rankings(db_path: str = PDF_DB_PATH) -> List[Dict]:
         cursor.execute("""
             SELECT s.name, s.enabled, s.priority, s.requires_library,
                    sp.success_rate, sp.avg_response_time_ms, sp.total_attempts,
-                   sp.success_count, sp.failure_count, s.description
+                   sp.success_count, sp.failure_count, s.description, s.timeout
             FROM sources s
             LEFT JOIN source_performance sp ON s.name = sp.source_name
             WHERE s.enabled = 1
@@ -349,7 +701,8 @@ def get_source_rankings(db_path: str = PDF_DB_PATH) -> List[Dict]:
                 "total_attempts": row[6] or 0,
                 "success_count": row[7] or 0,
                 "failure_count": row[8] or 0,
-                "description": row[9] or ""
+                "description": row[9] or "",
+                "timeout": row[10]
             })
 
         conn.close()
@@ -360,6 +713,171 @@ def get_source_rankings(db_path: str = PDF_DB_PATH) -> List[Dict]:
         return []
 
 
+def get_source_prefix_stats(db_path: str = PDF_DB_PATH) -> List[Dict]:
+    """
+    Get the time-decayed statistics of every (source, DOI prefix) pair, as stored
+    (decayed to updated_at; multiply by decay_factor(now - updated_at) to bring them to now).
+    """
+    try:
+        conn = get_pdf_db_connection(db_path)
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT source_name, doi_prefix, successes, failures, latency_ms, latency_weight, updated_at,
+                   permanent_failures
+            FROM source_prefix_stats
+        """)
+        stats = [
+            {
+                "source_name": row[0],
+                "doi_prefix": row[1],
+                "successes": row[2] or 0.0,
+                "failures": row[3] or 0.0,
+                "latency_ms": row[4] or 0.0,
+                "latency_weight": row[5] or 0.0,
+                "updated_at": row[6],
+                "permanent_failures": row[7] or 0.0,
+            }
+            for row in cursor.fetchall()
+        ]
+        conn.close()
+        return stats
+
+    except Exception as e:
+        print(f"[PDF DB] Error getting source prefix stats: {e}")
+        return []
+
+
+def get_source_latency_percentiles(
+    percentiles: Tuple[float, ...] = (0.5,),
+    window: int = 200,
+    min_samples: int = 5,
+    db_path: str = PDF_DB_PATH
+) -> Dict[str, Dict[float, float]]:
+    """
+    Get lookup response time percentiles (ms) per source over its last `window` attempts,
+    as {source: {percentile: ms}} (percentiles between 0 and 1, linearly interpolated).
+    Sources with fewer than `min_samples` timed attempts are left out.
+    """
+    try:
+        conn = get_pdf_db_connection(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT source_name, response_time_ms FROM (
+                SELECT source_name, response_time_ms,
+                       ROW_NUMBER() OVER (PARTITION BY source_name ORDER BY id DESC) AS rn
+                FROM download_attempts
+                WHERE response_time_ms IS NOT NULL AND response_time_ms > 0
+            )
+            WHERE rn <= ?
+        """, (window,))
+
+        samples = {}
+        for source_name, response_time_ms in cursor.fetchall():
+            samples.setdefault(source_name, []).append(response_time_ms)
+        conn.close()
+
+        latencies = {}
+        for source_name, times in samples.items():
+            if len(times) < min_samples:
+                continue
+            times.sort()
+            latencies[source_name] = {}
+            for q in percentiles:
+                position = min(max(q, 0.0), 1.0) * (len(times) - 1)
+                lower = int(position)
+                upper = min(lower + 1, len(times) - 1)
+                latencies[source_name][q] = times[lower] + (times[upper] - times[lower]) * (position - lower)
+        return latencies
+
+    except Exception as e:
+        print(f"[PDF DB] Error getting source latencies: {e}")
+        return {}
+
+
+def get_source_latency_p50(
+    window: int = 200,
+    min_samples: int = 5,
+    db_path: str = PDF_DB_PATH
+) -> Dict[str, float]:
+    """
+    Get the median lookup response time (ms) per source over its last `window` attempts.
+    Sources with fewer than `min_samples` timed attempts are left out.
+    """
+    latencies = get_source_latency_percentiles((0.5,), window, min_samples, db_path)
+    return {source_name: float(values[0.5]) for source_name, values in latencies.items()}
+
+
+def save_breaker_state(
+    source_name: str,
+    state: str,
+    consecutive_failures: int = 0,
+    opened_at: Optional[float] = None,
+    retry_at: Optional[float] = None,
+    trips: int = 0,
+    last_failure: Optional[str] = None,
+    db_path: str = PDF_DB_PATH
+) -> bool:
+    """
+    Record a source's circuit breaker state (written on state changes).
+    Returns True on success, False on failure.
+    """
+    try:
+        conn = get_pdf_db_connection(db_path)
+        conn.execute("""
+            INSERT INTO source_breakers
+            (source_name, state, consecutive_failures, opened_at, retry_at, trips, last_failure, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(source_name) DO UPDATE SET
+                state = excluded.state,
+                consecutive_failures = excluded.consecutive_failures,
+                opened_at = excluded.opened_at,
+                retry_at = excluded.retry_at,
+                trips = excluded.trips,
+                last_failure = excluded.last_failure,
+                updated_at = excluded.updated_at
+        """, (source_name, state, consecutive_failures, opened_at, retry_at, trips, last_failure, time.time()))
+        conn.commit()
+        conn.close()
+        return True
+
+    except Exception as e:
+        print(f"[PDF DB] Error saving breaker state: {e}")
+        return False
+
+
+def get_breaker_states(db_path: str = PDF_DB_PATH) -> List[Dict]:
+    """Get the last recorded circuit breaker state of every source that has one."""
+    try:
+        conn = get_pdf_db_connection(db_path)
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT source_name, state, consecutive_failures, opened_at, retry_at, trips,
+                   last_failure, updated_at
+            FROM source_breakers
+            ORDER BY source_name
+        """)
+        states = [
+            {
+                "source_name": row[0],
+                "state": row[1],
+                "consecutive_failures": row[2] or 0,
+                "opened_at": row[3],
+                "retry_at": row[4],
+                "trips": row[5] or 0,
+                "last_failure": row[6],
+                "updated_at": row[7],
+            }
+            for row in cursor.fetchall()
+        ]
+        conn.close()
+        return states
+
+    except Exception as e:
+        print(f"[PDF DB] Error getting breaker states: {e}")
+        return []
+
+
 def get_best_source_for_publisher(doi_prefix: str, db_path: str = PDF_DB_PATH) -> Optional[str]:
     """
     Get the best source for a given DOI prefix (publisher) based on historical success.
@@ -402,15 +920,15 @@ def record_publisher_success(
         conn = get_pdf_db_connection(db_path)
         cursor = conn.cursor()
 
-        # Check if pattern exists
+        # Check if pattern exists (one pattern per DOI prefix)
         cursor.execute("""
-            SELECT id, success_count FROM publisher_patterns
-            WHERE doi_prefix = ? AND successful_source = ?
-        """, (doi_prefix, source_name))
+            SELECT id, successful_source FROM publisher_patterns
+            WHERE doi_prefix = ?
+        """, (doi_prefix,))
 
         row = cursor.fetchone()
 
-        if row:
+        if row and row[1] == source_name:
             # Update existing pattern
             cursor.execute("""
                 UPDATE publisher_patterns
@@ -419,6 +937,16 @@ def record_publisher_success(
                     url_pattern = COALESCE(?, url_pattern)
                 WHERE id = ?
             """, (url_pattern, row[0]))
+        elif row:
+            # Another source succeeded for this publisher: it becomes the pattern
+            cursor.execute("""
+                UPDATE publisher_patterns
+                SET successful_source = ?,
+                    success_count = 1,
+                    last_success_at = CURRENT_TIMESTAMP,
+                    url_pattern = ?
+                WHERE id = ?
+            """, (source_name, url_pattern, row[0]))
         else:
             # Insert new pattern
             cursor.execute("""
@@ -435,6 +963,11 @@ def record_publisher_success(
         return False
 
 
+def _utc_timestamp(seconds_from_now: float = 0) -> str:
+    """A time as SQLite's CURRENT_TIMESTAMP writes it (UTC), so retry times compare with it."""
+    return (datetime.now(timezone.utc) + timedelta(seconds=seconds_from_now)).strftime("%Y-%m-%d %H:%M:%S")
+
+
 def add_to_retry_queue(
     project_id: int,
     doi: str,
@@ -461,7 +994,7 @@ def add_to_retry_queue(
 
         # Exponential backoff: base_delay * 2^retry_count
         delay_minutes = retry_delay_minutes * (2 ** retry_count)
-        next_retry = datetime.now() + timedelta(minutes=delay_minutes)
+        next_retry = _utc_timestamp(delay_minutes * 60)
 
         cursor.execute("""
             INSERT OR REPLACE INTO retry_queue
@@ -478,9 +1011,10 @@ def add_to_retry_queue(
         return False
 
 
-def get_retry_queue_ready(db_path: str = PDF_DB_PATH) -> List[Dict]:
+def get_retry_queue_ready(db_path: str = PDF_DB_PATH, limit: Optional[int] = None) -> List[Dict]:
     """
-    Get DOIs from retry queue that are ready to retry (next_retry_at <= now).
+    Get DOIs from retry queue that are ready to retry (next_retry_at <= now),
+    at most limit of them (all without a limit).
     Returns list of retry dicts.
     """
     try:
@@ -492,7 +1026,8 @@ def get_retry_queue_ready(db_path: str = PDF_DB_PATH) -> List[Dict]:
             FROM retry_queue
             WHERE next_retry_at <= CURRENT_TIMESTAMP
             ORDER BY next_retry_at ASC
-        """)
+            LIMIT ?
+        """, (-1 if limit is None else limit,))
 
         retries = []
         for row in cursor.fetchall():
@@ -535,6 +1070,306 @@ def remove_from_retry_queue(project_id: int, doi: str, db_path: str = PDF_DB_PAT
         return False
 
 
+def schedule_retry(
+    project_id: int,
+    doi: str,
+    failure_category: str,
+    max_retry_attempts: Optional[int] = None,
+    db_path: str = PDF_DB_PATH
+) -> bool:
+    """
+    Queue a DOI whose download failed temporarily for another attempt after
+    get_retry_delay_seconds(failure_category, retry_count) (exponential backoff).
+    A DOI that has had max_retry_attempts retries (the "max_retry_attempts"
+    configuration value by default) is dropped from the queue instead.
+    Returns True if a retry was scheduled.
+    """
+    from pdf_sources import get_retry_delay_seconds
+
+    if max_retry_attempts is None:
+        max_retry_attempts = int(get_config_value("max_retry_attempts", "3", db_path=db_path))
+
+    try:
+        conn = get_pdf_db_connection(db_path)
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+
+        cursor.execute("""
+            SELECT retry_count FROM retry_queue
+            WHERE project_id = ? AND doi = ?
+        """, (project_id, doi))
+        row = cursor.fetchone()
+        retry_count = row[0] + 1 if row else 0
+
+        if retry_count >= max_retry_attempts:
+            cursor.execute("DELETE FROM retry_queue WHERE project_id = ? AND doi = ?", (project_id, doi))
+            conn.commit()
+            conn.close()
+            print(f"[PDF DB] Giving up on {doi} after {retry_count} retries")
+            return False
+
+        next_retry = _utc_timestamp(get_retry_delay_seconds(failure_category, retry_count))
+        cursor.execute("""
+            INSERT INTO retry_queue
+            (project_id, doi, failure_category, retry_count, next_retry_at, last_attempted_at)
+            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(project_id, doi) DO UPDATE SET
+                failure_category = excluded.failure_category,
+                retry_count = excluded.retry_count,
+                next_retry_at = excluded.next_retry_at,
+                last_attempted_at = excluded.last_attempted_at
+        """, (project_id, doi, failure_category, retry_count, next_retry))
+
+        conn.commit()
+        conn.close()
+        return True
+
+    except Exception as e:
+        print(f"[PDF DB] Error scheduling retry: {e}")
+        return False
+
+
+def claim_retry_batch(limit: int, lease_seconds: float, db_path: str = PDF_DB_PATH) -> List[Dict]:
+    """
+    Take up to limit ready retries (oldest first) for one worker: their next_retry_at
+    moves lease_seconds ahead, so other workers skip them and they come back if the
+    worker dies. Retrying a DOI reschedules or removes its entry.
+    Returns list of retry dicts (as get_retry_queue_ready).
+    """
+    try:
+        conn = get_pdf_db_connection(db_path)
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+
+        cursor.execute("""
+            SELECT id, project_id, doi, failure_category, retry_count
+            FROM retry_queue
+            WHERE next_retry_at <= CURRENT_TIMESTAMP
+            ORDER BY next_retry_at ASC
+            LIMIT ?
+        """, (limit,))
+        retries = [
+            {"id": row[0], "project_id": row[1], "doi": row[2], "failure_category": row[3], "retry_count": row[4]}
+            for row in cursor.fetchall()
+        ]
+
+        lease_until = _utc_timestamp(lease_seconds)
+        cursor.executemany("UPDATE retry_queue SET next_retry_at = ? WHERE id = ?",
+                           [(lease_until, retry["id"]) for retry in retries])
+
+        conn.commit()
+        conn.close()
+        return retries
+
+    except Exception as e:
+        print(f"[PDF DB] Error claiming retries: {e}")
+        return []
+
+
+def release_retries(retry_ids: List[int], db_path: str = PDF_DB_PATH) -> bool:
+    """
+    Make claimed retries that were not attempted ready again at once.
+    Returns True on success, False on failure.
+    """
+    try:
+        conn = get_pdf_db_connection(db_path)
+        cursor = conn.cursor()
+        cursor.executemany("UPDATE retry_queue SET next_retry_at = CURRENT_TIMESTAMP WHERE id = ?",
+                           [(retry_id,) for retry_id in retry_ids])
+        conn.commit()
+        conn.close()
+        return True
+
+    except Exception as e:
+        print(f"[PDF DB] Error releasing retries: {e}")
+        return False
+
+
+def get_cached_pdf_url(doi: str, db_path: str = PDF_DB_PATH) -> Optional[Dict]:
+    """
+    Get the cached PDF URL for a DOI.
+    Returns dict with pdf_url, source_name, verified_at, content_length and etag, or None.
+    """
+    try:
+        conn = get_pdf_db_connection(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT pdf_url, source_name, verified_at, content_length, etag
+            FROM pdf_url_cache
+            WHERE doi = ?
+        """, (doi,))
+
+        row = cursor.fetchone()
+        conn.close()
+
+        if not row:
+            return None
+        return {
+            "pdf_url": row[0],
+            "source_name": row[1],
+            "verified_at": row[2],
+            "content_length": row[3],
+            "etag": row[4]
+        }
+
+    except Exception as e:
+        print(f"[PDF DB] Error getting cached PDF URL: {e}")
+        return None
+
+
+def cache_pdf_url(
+    doi: str,
+    pdf_url: str,
+    source_name: Optional[str],
+    content_length: Optional[int] = None,
+    etag: Optional[str] = None,
+    hit: bool = False,
+    db_path: str = PDF_DB_PATH
+) -> bool:
+    """
+    Store (or refresh) a verified PDF URL for a DOI; hit=True counts a reuse of the cached URL.
+    Returns True on success, False on failure.
+    """
+    try:
+        conn = get_pdf_db_connection(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            INSERT INTO pdf_url_cache (doi, pdf_url, source_name, verified_at, content_length, etag, hit_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(doi) DO UPDATE SET
+                pdf_url = excluded.pdf_url,
+                source_name = excluded.source_name,
+                verified_at = excluded.verified_at,
+                content_length = COALESCE(excluded.content_length, content_length),
+                etag = COALESCE(excluded.etag, etag),
+                hit_count = hit_count + excluded.hit_count
+        """, (doi, pdf_url, source_name, time.time(), content_length, etag, 1 if hit else 0))
+
+        conn.commit()
+        conn.close()
+        return True
+
+    except Exception as e:
+        print(f"[PDF DB] Error caching PDF URL: {e}")
+        return False
+
+
+def evict_cached_pdf_url(doi: str, db_path: str = PDF_DB_PATH) -> bool:
+    """
+    Remove a DOI's cached PDF URL (after it failed).
+    Returns True on success, False on failure.
+    """
+    try:
+        conn = get_pdf_db_connection(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("DELETE FROM pdf_url_cache WHERE doi = ?", (doi,))
+
+        conn.commit()
+        conn.close()
+        return True
+
+    except Exception as e:
+        print(f"[PDF DB] Error evicting cached PDF URL: {e}")
+        return False
+
+
+def add_blob_ref(path: str, sha256: str, doi_hash: Optional[str] = None, db_path: str = PDF_DB_PATH) -> bool:
+    """
+    Record that the file at path is a link to the blob sha256.
+    Returns True on success, False on failure.
+    """
+    try:
+        conn = get_pdf_db_connection(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            INSERT OR REPLACE INTO pdf_blob_refs (path, sha256, doi_hash)
+            VALUES (?, ?, ?)
+        """, (path, sha256, doi_hash))
+
+        conn.commit()
+        conn.close()
+        return True
+
+    except Exception as e:
+        print(f"[PDF DB] Error adding blob reference: {e}")
+        return False
+
+
+def remove_blob_refs(path: str, prefix: bool = False, db_path: str = PDF_DB_PATH) -> List[str]:
+    """
+    Remove the blob reference of a file, or of every file under a directory (prefix=True).
+    Returns the sha256 of the blobs that lost a reference.
+    """
+    try:
+        conn = get_pdf_db_connection(db_path)
+        cursor = conn.cursor()
+
+        if prefix:
+            directory = path.rstrip(os.sep) + os.sep
+            where, params = "substr(path, 1, ?) = ?", (len(directory), directory)
+        else:
+            where, params = "path = ?", (path,)
+
+        cursor.execute(f"SELECT DISTINCT sha256 FROM pdf_blob_refs WHERE {where}", params)
+        hashes = [row[0] for row in cursor.fetchall()]
+        cursor.execute(f"DELETE FROM pdf_blob_refs WHERE {where}", params)
+
+        conn.commit()
+        conn.close()
+        return hashes
+
+    except Exception as e:
+        print(f"[PDF DB] Error removing blob references: {e}")
+        return []
+
+
+def count_blob_refs(sha256: str, db_path: str = PDF_DB_PATH) -> int:
+    """Number of project files linked to a blob, or -1 on error."""
+    try:
+        conn = get_pdf_db_connection(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT COUNT(*) FROM pdf_blob_refs WHERE sha256 = ?", (sha256,))
+        count = cursor.fetchone()[0]
+        conn.close()
+        return count
+
+    except Exception as e:
+        print(f"[PDF DB] Error counting blob references: {e}")
+        return -1
+
+
+def get_blob_refs(doi_hash: Optional[str] = None, db_path: str = PDF_DB_PATH) -> List[Dict]:
+    """
+    Get blob references, all of them or those of one DOI (newest first).
+    Returns list of {"path", "sha256", "doi_hash"} dicts.
+    """
+    try:
+        conn = get_pdf_db_connection(db_path)
+        cursor = conn.cursor()
+
+        if doi_hash is None:
+            cursor.execute("SELECT path, sha256, doi_hash FROM pdf_blob_refs ORDER BY rowid DESC")
+        else:
+            cursor.execute("""
+                SELECT path, sha256, doi_hash FROM pdf_blob_refs
+                WHERE doi_hash = ?
+                ORDER BY rowid DESC
+            """, (doi_hash,))
+
+        refs = [{"path": row[0], "sha256": row[1], "doi_hash": row[2]} for row in cursor.fetchall()]
+        conn.close()
+        return refs
+
+    except Exception as e:
+        print(f"[PDF DB] Error getting blob references: {e}")
+        return []
+
+
 def get_download_statistics(
     project_id: Optional[int] = None,
     days: int = 30,
@@ -544,6 +1379,7 @@ def get_download_statistics(
     Get download statistics for a project or overall.
     Returns dict with various metrics.
     """
+    flush_download_attempts(db_path)
     try:
         conn = get_pdf_db_connection(db_path)
         cursor = conn.cursor()
@@ -563,7 +1399,9 @@ def get_download_statistics(
                 SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END) as successful,
                 SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END) as failed,
                 AVG(response_time_ms) as avg_response_time,
-                COUNT(DISTINCT doi) as unique_dois
+                COUNT(DISTINCT doi) as unique_dois,
+                SUM(connections_opened) as connections_opened,
+                SUM(connections_reused) as connections_reused
             FROM download_attempts
             {where_clause}
         """, params)
@@ -576,7 +1414,9 @@ def get_download_statistics(
                 source_name,
                 COUNT(*) as attempts,
                 SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END) as successful,
-                AVG(response_time_ms) as avg_response_time
+                AVG(response_time_ms) as avg_response_time,
+                SUM(connections_opened) as connections_opened,
+                SUM(connections_reused) as connections_reused
             FROM download_attempts
             {where_clause}
             GROUP BY source_name
@@ -590,7 +1430,9 @@ def get_download_statistics(
                 "attempts": row[1],
                 "successful": row[2],
                 "success_rate": (row[2] / row[1] * 100) if row[1] > 0 else 0,
-                "avg_response_time_ms": row[3] or 0
+                "avg_response_time_ms": row[3] or 0,
+                "connections_opened": row[4] or 0,
+                "connections_reused": row[5] or 0
             })
 
         # Failure categories
@@ -623,6 +1465,8 @@ def get_download_statistics(
             "success_rate": (successful / total * 100) if total > 0 else 0,
             "avg_response_time_ms": stats_row[3] or 0,
             "unique_dois": stats_row[4] or 0,
+            "connections_opened": stats_row[5] or 0,
+            "connections_reused": stats_row[6] or 0,
             "by_source": source_stats,
             "failure_categories": failure_categories,
             "period_days": days
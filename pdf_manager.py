@@ -14,7 +14,14 @@ from typing import List, Dict, Tuple, Optional
 import time
 from urllib.parse import urlparse
 import ipaddress
+import importlib.util
+import threading
 import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from contextlib import closing
+
+import http_sessions
+import pdf_store
 
 # Suppress pkg_resources deprecation warning from eutils (dependency of metapub)
 # The eutils package uses deprecated pkg_resources API which will be removed in 2025
@@ -29,37 +36,66 @@ except ImportError:
     ENABLE_HABANERO_DOWNLOAD = True
     HABANERO_PROXY_URL = ""
 
-# Try importing optional libraries
-# Note: metapub depends on eutils which uses deprecated pkg_resources
-# The warning is suppressed at module level; prefer pmc_enhanced over metapub
 try:
-    from metapub import PubMedFetcher
-    METAPUB_AVAILABLE = True
+    from config import PDF_DOWNLOAD_CONCURRENCY
 except ImportError:
-    METAPUB_AVAILABLE = False
-    print("[PDF] Warning: metapub not installed. Fallback downloads disabled.")
+    PDF_DOWNLOAD_CONCURRENCY = 8
 
 try:
-    from habanero import Crossref
-    HABANERO_AVAILABLE = True
+    from config import PDF_SOURCE_RACE_MODE, PDF_SOURCE_RACE_WIDTH, PDF_SOURCE_HEDGE_DELAY_MS
 except ImportError:
-    HABANERO_AVAILABLE = False
-    print("[PDF] Warning: habanero not installed. Institutional access disabled.")
+    PDF_SOURCE_RACE_MODE = "hedged"
+    PDF_SOURCE_RACE_WIDTH = 3
+    PDF_SOURCE_HEDGE_DELAY_MS = 3000
 
 try:
-    from unpywall import Unpywall
-    from unpywall.utils import UnpywallCredentials
-    UNPYWALL_AVAILABLE = True
-    # Configure Unpywall with email if available
-    if UNPAYWALL_EMAIL and UNPAYWALL_EMAIL != "your-email@example.com":
-        try:
-            UnpywallCredentials(UNPAYWALL_EMAIL)
-        except Exception as e:
-            print(f"[PDF] Warning: Could not set Unpywall credentials: {e}")
+    from config import PDF_URL_CACHE_TTL
 except ImportError:
-    UNPYWALL_AVAILABLE = False
+    PDF_URL_CACHE_TTL = 7 * 24 * 3600
+
+try:
+    from config import PDF_SOURCE_ORDERING
+except ImportError:
+    PDF_SOURCE_ORDERING = "thompson"
+
+try:
+    from config import PDF_SOURCE_SUPPRESSION
+except ImportError:
+    PDF_SOURCE_SUPPRESSION = True
+
+# Optional libraries are only checked for here and imported on first use:
+# metapub (with eutils), habanero and unpywall add noticeably to worker start-up.
+# Note: metapub depends on eutils which uses deprecated pkg_resources
+# The warning is suppressed at module level; prefer pmc_enhanced over metapub
+METAPUB_AVAILABLE = importlib.util.find_spec("metapub") is not None
+if not METAPUB_AVAILABLE:
+    print("[PDF] Warning: metapub not installed. Fallback downloads disabled.")
+
+HABANERO_AVAILABLE = importlib.util.find_spec("habanero") is not None
+if not HABANERO_AVAILABLE:
+    print("[PDF] Warning: habanero not installed. Institutional access disabled.")
+
+UNPYWALL_AVAILABLE = importlib.util.find_spec("unpywall") is not None
+if not UNPYWALL_AVAILABLE:
     print("[PDF] Warning: unpywall library not installed. Using REST API fallback only.")
 
+_unpywall = None
+
+def _get_unpywall():
+    """Lazy load the unpywall library, configured with UNPAYWALL_EMAIL"""
+    global _unpywall
+    if _unpywall is None:
+        from unpywall import Unpywall
+        from unpywall.utils import UnpywallCredentials
+        # Configure Unpywall with email if available
+        if UNPAYWALL_EMAIL and UNPAYWALL_EMAIL != "your-email@example.com":
+            try:
+                UnpywallCredentials(UNPAYWALL_EMAIL)
+            except Exception as e:
+                print(f"[PDF] Warning: Could not set Unpywall credentials: {e}")
+        _unpywall = Unpywall
+    return _unpywall
+
 # Security constants
 MAX_PDF_SIZE = 100 * 1024 * 1024  # 100 MB limit for PDF downloads
 ALLOWED_URL_SCHEMES = ['http', 'https']  # Only allow HTTP(S) downloads
@@ -178,7 +214,7 @@ def check_open_access(doi: str, email: str = None) -> Tuple[bool, str]:
         if email is None:
             email = UNPAYWALL_EMAIL
         url = f"https://api.unpaywall.org/v2/{doi}?email={email}"
-        r = requests.get(url, timeout=10)
+        r = http_sessions.get(url, timeout=10)
         
         if r.ok:
             data = r.json()
@@ -192,7 +228,7 @@ def check_open_access(doi: str, email: str = None) -> Tuple[bool, str]:
                     if UNPYWALL_AVAILABLE:
                         print(f"[PDF] Unpaywall REST API: is_oa=True but url_for_pdf is null, trying unpywall library...")
                         try:
-                            pdf_link = Unpywall.get_pdf_link(doi=doi)
+                            pdf_link = _get_unpywall().get_pdf_link(doi=doi)
                             if pdf_link:
                                 print(f"[PDF] Unpywall library found PDF link: {pdf_link}")
                                 return True, pdf_link
@@ -209,7 +245,7 @@ def check_open_access(doi: str, email: str = None) -> Tuple[bool, str]:
         if UNPYWALL_AVAILABLE:
             print(f"[PDF] Unpaywall REST API failed ({str(e)}), trying unpywall library...")
             try:
-                pdf_link = Unpywall.get_pdf_link(doi=doi)
+                pdf_link = _get_unpywall().get_pdf_link(doi=doi)
                 if pdf_link:
                     print(f"[PDF] Unpywall library found PDF link: {pdf_link}")
                     return True, pdf_link
@@ -232,6 +268,7 @@ def try_metapub_download(doi: str) -> Tuple[bool, str]:
     
     try:
         print(f"[PDF] Trying metapub for: {doi}")
+        from metapub import PubMedFetcher
         fetcher = PubMedFetcher()
         
         # Try to get article by DOI
@@ -267,6 +304,7 @@ def try_habanero_download(doi: str) -> Tuple[bool, str]:
     
     try:
         print(f"[PDF] Trying habanero/Crossref for: {doi}")
+        from habanero import Crossref
         cr = Crossref()
         
         # Get work metadata
@@ -296,9 +334,11 @@ def try_habanero_download(doi: str) -> Tuple[bool, str]:
     except Exception as e:
         return False, f"Habanero error: {str(e)}"
 
-def download_pdf(doi: str, pdf_url: str, save_dir: str, use_proxy: bool = False) -> Tuple[bool, str]:
+def download_pdf(doi: str, pdf_url: str, save_dir: str, use_proxy: bool = False,
+                 response_info: Optional[Dict] = None) -> Tuple[bool, str]:
     """
     Download PDF from URL and save with doi_hash filename.
+    If response_info is given, a successful download fills in its etag and content_length.
     Returns: (success, message)
     """
     try:
@@ -334,40 +374,47 @@ def download_pdf(doi: str, pdf_url: str, save_dir: str, use_proxy: bool = False)
             }
             print(f"[PDF] Using proxy: {HABANERO_PROXY_URL}")
         
-        response = requests.get(pdf_url, headers=headers, proxies=proxies, timeout=30, stream=True, allow_redirects=True)
-        
-        if response.ok:
-            # Check if response is actually a PDF
-            content_type = response.headers.get('content-type', '').lower()
-            if 'pdf' not in content_type and 'application/octet-stream' not in content_type:
-                return False, f"Response is not a PDF (content-type: {content_type})"
+        # Stream through the host's pooled session; leaving the with block releases the connection
+        with http_sessions.get(pdf_url, headers=headers, proxies=proxies, timeout=30, stream=True,
+                               allow_redirects=True) as response:
+            if response.ok:
+                # Check if response is actually a PDF
+                content_type = response.headers.get('content-type', '').lower()
+                if 'pdf' not in content_type and 'application/octet-stream' not in content_type:
+                    return False, f"Response is not a PDF (content-type: {content_type})"
             
-            # Check content length to prevent DoS
-            content_length = response.headers.get('content-length')
-            if content_length and int(content_length) > MAX_PDF_SIZE:
-                return False, f"File too large ({int(content_length)} bytes exceeds {MAX_PDF_SIZE} bytes limit)"
+                # Check content length to prevent DoS
+                content_length = response.headers.get('content-length')
+                if content_length and int(content_length) > MAX_PDF_SIZE:
+                    return False, f"File too large ({int(content_length)} bytes exceeds {MAX_PDF_SIZE} bytes limit)"
             
-            # Save file with size limit
-            total_size = 0
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        total_size += len(chunk)
-                        # Check size during download
-                        if total_size > MAX_PDF_SIZE:
-                            f.close()
-                            os.remove(filepath)
-                            return False, f"Download aborted: file size exceeds {MAX_PDF_SIZE} bytes limit"
-                        f.write(chunk)
-            
-            file_size = os.path.getsize(filepath)
-            if file_size < 1000:  # Likely an error page
-                os.remove(filepath)
-                return False, f"Downloaded file too small ({file_size} bytes), likely an error page"
+                # Save file with size limit
+                total_size = 0
+                with open(filepath, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=8192):
+                        if chunk:
+                            total_size += len(chunk)
+                            # Check size during download
+                            if total_size > MAX_PDF_SIZE:
+                                f.close()
+                                os.remove(filepath)
+                                return False, f"Download aborted: file size exceeds {MAX_PDF_SIZE} bytes limit"
+                            f.write(chunk)
             
-            return True, f"Downloaded: {filename} ({file_size} bytes)"
-        else:
-            return False, f"Download failed: HTTP {response.status_code}"
+                file_size = os.path.getsize(filepath)
+                if file_size < 1000:  # Likely an error page
+                    os.remove(filepath)
+                    return False, f"Downloaded file too small ({file_size} bytes), likely an error page"
+
+                if response_info is not None:
+                    response_info["etag"] = response.headers.get("ETag")
+                    response_info["content_length"] = file_size
+
+                # Keep one copy per distinct PDF; the project file becomes a link to it
+                pdf_store.add_to_store(filepath, doi_hash)
+                return True, f"Downloaded: {filename} ({file_size} bytes)"
+            else:
+                return False, f"Download failed: HTTP {response.status_code}"
             
     except Exception as e:
         return False, f"Download error: {str(e)}"
@@ -621,8 +668,7 @@ def try_source(source_name: str, doi: str, config: Dict) -> Tuple[bool, str, Opt
 
         elif source_name == 'unpywall':
             try:
-                from unpywall import Unpywall
-                pdf_link = Unpywall.get_pdf_link(doi=doi)
+                pdf_link = _get_unpywall().get_pdf_link(doi=doi)
                 response_time = int((time.time() - start_time) * 1000)
                 if pdf_link:
                     return True, pdf_link, response_time
@@ -714,34 +760,211 @@ def try_source(source_name: str, doi: str, config: Dict) -> Tuple[bool, str, Opt
         return False, f"Exception: {str(e)}", response_time
 
 
+def try_source_guarded(source_name: str, doi: str,
+                       cancel_event: Optional[threading.Event] = None) -> Optional[Tuple[bool, str, Optional[int]]]:
+    """
+    try_source behind the source's circuit breaker and with its adaptive timeout
+    (see source_health.py). Returns None, without a lookup, while the breaker is open.
+    Once cancel_event is set the lookup's remaining requests are refused (see
+    http_sessions.cancel_on); a lookup cut short that way returns None and is not
+    counted for or against the source. A request already in flight runs until it
+    answers or times out.
+    """
+    from source_health import get_source_health
+
+    health = get_source_health()
+    if not health.allow(source_name):
+        return None
+    with http_sessions.cancel_on(cancel_event) as scope:
+        success, result, response_time = try_source(source_name, doi, {"timeout": health.timeout_for(source_name)})
+    if scope["refused"] and not success:
+        return None
+    health.record(source_name, success, result)
+    return success, result, response_time
+
+
+def revalidate_cached_url(entry: Dict) -> Tuple[bool, Optional[str]]:
+    """
+    Check that a cached PDF URL still works with a conditional HEAD request (If-None-Match
+    with the stored ETag). Servers that do not answer HEAD (405/501) are given the benefit
+    of the doubt; the download itself then decides.
+    Returns: (still_valid, etag)
+    """
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    try:
+        response = http_sessions.head(entry["pdf_url"], headers=headers, timeout=10, allow_redirects=True)
+        response.close()
+    except Exception as e:
+        print(f"[PDF Smart] Revalidation of {entry['pdf_url']} failed: {e}")
+        return False, None
+    if response.status_code == 304:
+        return True, entry.get("etag")
+    if response.status_code < 400 or response.status_code in (405, 501):
+        return True, response.headers.get("ETag") or entry.get("etag")
+    return False, None
+
+
+def _race_sources(
+    doi: str,
+    project_id: int,
+    sources: List[str],
+    mode: str = PDF_SOURCE_RACE_MODE,
+    width: int = PDF_SOURCE_RACE_WIDTH,
+    hedge_delays: Optional[Dict[str, float]] = None,
+    cancel_event=None,
+    failures: Optional[List[str]] = None
+):
+    """
+    Look up PDF URLs from sources (in ranking order) and yield (source_name, pdf_url)
+    for every source that finds one, in the order they answer.
+
+    serial:   one lookup at a time
+    parallel: up to `width` lookups in flight
+    hedged:   the next source starts when the newest lookup has not answered within its
+              p50 latency (hedge_delays, ms) or when a lookup fails; up to `width` in flight
+
+    Each lookup is logged to download_attempts, and the failure category of each failed
+    lookup is appended to failures (if given). Closing the generator (a PDF was
+    downloaded) or setting cancel_event stops it from starting more sources and cancels
+    the lookups in flight: lookups still waiting for their host's HostLimiter slot give
+    up, and the others make no further requests (see try_source_guarded). An HTTP request
+    already sent cannot be aborted from here, so its lookup keeps its slot until the
+    request answers or hits the source's timeout; lookups cut short are not logged.
+    """
+    from pdf_download_db import log_download_attempt
+    from pdf_sources import classify_failure
+    from host_limiter import get_host_limiter, source_host
+
+    limiter = get_host_limiter()
+    hedge_delays = hedge_delays or {}
+    width = 1 if mode == "serial" else max(1, int(width))
+    pending = list(sources)
+    in_flight = {}
+    # Set once the race is over; cancels the lookups still running
+    finished = threading.Event()
+
+    def cancelled():
+        return finished.is_set() or (cancel_event is not None and cancel_event.is_set())
+
+    def lookup(source_name):
+        with limiter.limit(source_host(source_name, doi)):
+            # The race may have been decided while waiting for the host
+            if cancelled():
+                return False, None
+            with http_sessions.track_connections() as connections:
+                outcome = try_source_guarded(source_name, doi, finished)
+        if outcome is None:
+            if finished.is_set():
+                print(f"[PDF Smart] Stopped {source_name}: race decided")
+            else:
+                print(f"[PDF Smart] Skipping {source_name}: circuit open")
+            return False, None
+        success, result, response_time = outcome
+        failure_category = None if success else classify_failure(result)
+        if failure_category and failures is not None:
+            failures.append(failure_category)
+
+        log_download_attempt(
+            project_id=project_id,
+            doi=doi,
+            source_name=source_name,
+            success=success,
+            failure_reason=None if success else result,
+            failure_category=failure_category,
+            response_time_ms=response_time,
+            pdf_url=result if success else None,
+            connections_opened=connections["opened"],
+            connections_reused=connections["reused"]
+        )
+        if not success:
+            print(f"[PDF Smart] {source_name} failed: {result}")
+        return success, result
+
+    executor = ThreadPoolExecutor(max_workers=width, thread_name_prefix="pdf-source")
+    hedge_at = 0.0
+    try:
+        while pending or in_flight:
+            if cancel_event is not None and cancel_event.is_set():
+                # finally sets finished, which cancels the lookups in flight
+                return
+
+            while pending and len(in_flight) < width and (
+                    mode == "parallel" or not in_flight
+                    or (mode == "hedged" and time.monotonic() >= hedge_at)):
+                source_name = pending.pop(0)
+                if in_flight:
+                    print(f"[PDF Smart] Hedging with {source_name}")
+                else:
+                    print(f"[PDF Smart] Trying {source_name}")
+                in_flight[executor.submit(lookup, source_name)] = source_name
+                hedge_at = time.monotonic() + hedge_delays.get(source_name, PDF_SOURCE_HEDGE_DELAY_MS) / 1000.0
+
+            # Wake up for the next hedge, and regularly to notice cancellation
+            timeout = 1.0
+            if mode == "hedged" and pending and len(in_flight) < width:
+                timeout = min(timeout, max(0.0, hedge_at - time.monotonic()))
+            done, _ = wait(list(in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                source_name = in_flight.pop(future)
+                success, result = future.result()
+                if success:
+                    yield source_name, result
+                else:
+                    # A failed lookup frees its slot for the next source at once
+                    hedge_at = 0.0
+    finally:
+        finished.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 def download_pdf_smart(
     doi: str,
     project_id: int,
     save_dir: str,
-    progress_callback=None
+    progress_callback=None,
+    cancel_event=None,
+    resolution: Optional[Dict] = None
 ) -> Tuple[bool, str, str]:
     """
     Smart PDF download using database-driven source selection.
+    Requests are paced per upstream host by the shared HostLimiter, so this is
+    safe to call from several threads; set cancel_event to stop before the next source.
+    If resolution is given, resolution["url_cache"] is set to "hit" or "miss"
+    (it stays unset when the file already exists, is linked from the store or the DOI is invalid),
+    and resolution["suppressed"] lists the sources skipped because they never have
+    papers of this publisher, with resolution["requests_saved"] the lookups that
+    would have been made otherwise (those ranked before the source that found the PDF).
 
     Strategy:
-    1. Check if file already exists
-    2. Check publisher-specific successful source from history
-    3. Get sources ranked by overall performance
-    4. Try sources in optimized order
+    1. Check if file already exists, in this project or in the shared PDF store
+    1b. Try the DOI's cached PDF URL (revalidated when older than PDF_URL_CACHE_TTL)
+    2. Check publisher-specific successful source from history ("success_rate" ordering)
+    3. Get sources ranked for the DOI's prefix (PDF_SOURCE_ORDERING, see source_ranking.py)
+    4. Try sources in optimized order, racing the top-ranked ones (PDF_SOURCE_RACE_MODE)
+       and skipping those that never have the publisher's papers (PDF_SOURCE_SUPPRESSION)
+       or are down (per-source circuit breakers and adaptive timeouts, see source_health.py)
     5. Log all attempts to database
     6. Record successful patterns for future use
-    7. Add to retry queue if temporary failure
+    7. Add to retry queue if temporary failure (at most max_retry_attempts times,
+       with exponential backoff; see harvest_worker's retry scheduler)
 
     Returns: (success, message, source_used)
     """
     from pdf_download_db import (
         init_pdf_download_db, log_download_attempt, get_source_rankings,
         get_best_source_for_publisher, record_publisher_success,
-        add_to_retry_queue, remove_from_retry_queue, get_config_value
+        schedule_retry, remove_from_retry_queue,
+        get_cached_pdf_url, cache_pdf_url, evict_cached_pdf_url
     )
     from pdf_sources import (
         classify_failure, is_temporary_failure, extract_doi_prefix, get_publisher_name
     )
+    from host_limiter import get_host_limiter, source_host, url_host
+    from source_health import get_source_health
+    from source_ranking import get_source_ranker
     
     # Initialize database if needed
     init_pdf_download_db()
@@ -758,8 +981,12 @@ def download_pdf_smart(
     if os.path.exists(filepath) and os.path.getsize(filepath) > 0:
         return True, f"File already exists: {filename}", "cached"
 
-    # Get configuration
-    rate_limit_delay = int(get_config_value('rate_limit_delay_seconds', '1'))
+    # Another project already has this PDF: link it instead of downloading it again
+    if pdf_store.link_from_store(doi_hash, filepath):
+        remove_from_retry_queue(project_id, doi)
+        return True, f"Linked from PDF store: {filename}", "pdf_store"
+
+    limiter = get_host_limiter()
 
     # Extract publisher info
     doi_prefix = extract_doi_prefix(doi)
@@ -767,15 +994,71 @@ def download_pdf_smart(
 
     print(f"[PDF Smart] Processing {doi} (Publisher: {publisher_name})")
 
-    # Step 1: Try publisher-specific best source first
-    best_for_publisher = get_best_source_for_publisher(doi_prefix)
+    if resolution is None:
+        resolution = {}
+    resolution["url_cache"] = "miss"
+    failure_categories = []  # of every failed lookup and download, to decide on a retry
+
+    # Step 0: Reuse the URL that worked last time (any project), without a source lookup
+    cached = get_cached_pdf_url(doi)
+    if cached:
+        host = url_host(cached["pdf_url"])
+        valid, etag = True, cached.get("etag")
+        if time.time() - (cached.get("verified_at") or 0) > PDF_URL_CACHE_TTL:
+            with limiter.limit(host):
+                valid, etag = revalidate_cached_url(cached)
+
+        if valid:
+            response_info = {}
+            with limiter.limit(host), http_sessions.track_connections() as connections:
+                dl_success, dl_message = download_pdf(doi, cached["pdf_url"], save_dir,
+                                                      response_info=response_info)
+            if dl_success:
+                cache_pdf_url(doi, cached["pdf_url"], cached["source_name"],
+                              response_info.get("content_length"), response_info.get("etag") or etag, hit=True)
+                remove_from_retry_queue(project_id, doi)
+                resolution["url_cache"] = "hit"
+                print(f"[PDF Smart] Success via cached URL ({cached['source_name']})")
+                return True, dl_message, cached["source_name"]
+
+            failure_categories.append(classify_failure(dl_message))
+            log_download_attempt(
+                project_id=project_id,
+                doi=doi,
+                source_name=f"{cached['source_name']}_download",
+                success=False,
+                failure_reason=dl_message,
+                failure_category=failure_categories[-1],
+                response_time_ms=None,
+                pdf_url=cached["pdf_url"],
+                connections_opened=connections["opened"],
+                connections_reused=connections["reused"]
+            )
+
+        print(f"[PDF Smart] Cached URL for {doi} no longer works, resolving again")
+        evict_cached_pdf_url(doi)
+
+    # Step 1: Try publisher-specific best source first (the bandit ordering learns it per prefix)
+    best_for_publisher = None
+    if PDF_SOURCE_ORDERING == "success_rate":
+        best_for_publisher = get_best_source_for_publisher(doi_prefix)
     tried_sources = set()
+    outcome = None
 
     if best_for_publisher:
         print(f"[PDF Smart] Trying publisher-optimized source: {best_for_publisher}")
         tried_sources.add(best_for_publisher)
 
-        success, result, response_time = try_source(best_for_publisher, doi, {})
+        with limiter.limit(source_host(best_for_publisher, doi)), \
+                http_sessions.track_connections() as connections:
+            outcome = try_source_guarded(best_for_publisher, doi)
+        if outcome is None:
+            print(f"[PDF Smart] Skipping {best_for_publisher}: circuit open")
+
+    if outcome is not None:
+        success, result, response_time = outcome
+        if not success:
+            failure_categories.append(classify_failure(result))
 
         # Log attempt
         log_download_attempt(
@@ -784,26 +1067,38 @@ def download_pdf_smart(
             source_name=best_for_publisher,
             success=success,
             failure_reason=None if success else result,
-            failure_category=None if success else classify_failure(result),
+            failure_category=None if success else failure_categories[-1],
             response_time_ms=response_time,
-            pdf_url=result if success else None
+            pdf_url=result if success else None,
+            connections_opened=connections["opened"],
+            connections_reused=connections["reused"]
         )
 
         if success:
             # Try to download the PDF
-            dl_success, dl_message = download_pdf(doi, result, save_dir)
+            response_info = {}
+            with limiter.limit(url_host(result)):
+                dl_success, dl_message = download_pdf(doi, result, save_dir, response_info=response_info)
             if dl_success:
                 # Update publisher pattern
                 record_publisher_success(doi_prefix, publisher_name, best_for_publisher, result)
+                cache_pdf_url(doi, result, best_for_publisher,
+                              response_info.get("content_length"), response_info.get("etag"))
                 print(f"[PDF Smart] Success via publisher-optimized source: {best_for_publisher}")
                 return True, dl_message, best_for_publisher
-
-        time.sleep(rate_limit_delay)
+            failure_categories.append(classify_failure(dl_message))
 
     # Step 2: Try sources ranked by performance
-    source_rankings = get_source_rankings()
+    ranker = get_source_ranker()
+    if PDF_SOURCE_ORDERING == "thompson":
+        ranked_sources = ranker.rank(doi_prefix)
+    else:
+        ranked_sources = get_source_rankings()
 
-    for source_info in source_rankings:
+    health = get_source_health()
+    candidates = []
+    suppressed = []  # (number of candidates ranked before it, source name)
+    for source_info in ranked_sources:
         source_name = source_info['name']
 
         # Skip if already tried
@@ -821,60 +1116,80 @@ def download_pdf_smart(
             print(f"[PDF Smart] Skipping {source_name}: disabled")
             continue
 
-        print(f"[PDF Smart] Trying {source_name} (success rate: {source_info['success_rate']:.1f}%)")
-        tried_sources.add(source_name)
+        # Skip while the source is down (its circuit breaker is open); worth a retry later
+        if health.is_open(source_name):
+            print(f"[PDF Smart] Skipping {source_name}: circuit open")
+            failure_categories.append("server_error")
+            continue
 
-        success, result, response_time = try_source(source_name, doi, {})
+        # Skip if it (almost) never has this publisher's papers, bar an occasional re-probe
+        if PDF_SOURCE_SUPPRESSION and ranker.should_skip(source_name, doi_prefix):
+            suppressed.append((len(candidates), source_name))
+            continue
 
-        # Classify failure
-        failure_category = None if success else classify_failure(result)
+        candidates.append(source_name)
 
-        # Log attempt
-        log_download_attempt(
-            project_id=project_id,
-            doi=doi,
-            source_name=source_name,
-            success=success,
-            failure_reason=None if success else result,
-            failure_category=failure_category,
-            response_time_ms=response_time,
-            pdf_url=result if success else None
-        )
+    resolution["suppressed"] = [name for _, name in suppressed]
+    resolution["requests_saved"] = len(suppressed)
+    if suppressed:
+        print(f"[PDF Smart] Skipping for prefix {doi_prefix}: {', '.join(resolution['suppressed'])}")
 
-        if success:
+    hedge_delays = health.latency_p50() if PDF_SOURCE_RACE_MODE == "hedged" else {}
+    race = _race_sources(doi, project_id, candidates, PDF_SOURCE_RACE_MODE,
+                         PDF_SOURCE_RACE_WIDTH, hedge_delays, cancel_event, failure_categories)
+
+    # Closing the race when a PDF is downloaded skips the sources not yet started
+    with closing(race):
+        for source_name, result in race:
             # Try to download the PDF
-            dl_success, dl_message = download_pdf(doi, result, save_dir)
+            response_info = {}
+            with limiter.limit(url_host(result)), http_sessions.track_connections() as connections:
+                dl_success, dl_message = download_pdf(doi, result, save_dir, response_info=response_info)
 
             if dl_success:
+                # Only the suppressed sources ranked before the winner would have been asked
+                winner_rank = candidates.index(source_name)
+                resolution["requests_saved"] = sum(1 for rank, _ in suppressed if rank <= winner_rank)
+
                 # Record this success for publisher pattern learning
                 record_publisher_success(doi_prefix, publisher_name, source_name, result)
+                cache_pdf_url(doi, result, source_name,
+                              response_info.get("content_length"), response_info.get("etag"))
                 print(f"[PDF Smart] Success via {source_name}")
 
                 # Remove from retry queue if it was there
                 remove_from_retry_queue(project_id, doi)
 
                 return True, dl_message, source_name
-            else:
-                # Download failed even though we got a URL
-                failure_cat = classify_failure(dl_message)
-                log_download_attempt(
-                    project_id=project_id,
-                    doi=doi,
-                    source_name=f"{source_name}_download",
-                    success=False,
-                    failure_reason=dl_message,
-                    failure_category=failure_cat,
-                    response_time_ms=None,
-                    pdf_url=result
-                )
-        else:
-            print(f"[PDF Smart] {source_name} failed: {result}")
 
-        # Rate limiting between sources
-        time.sleep(rate_limit_delay)
+            # Download failed even though we got a URL
+            failure_cat = classify_failure(dl_message)
+            failure_categories.append(failure_cat)
+            log_download_attempt(
+                project_id=project_id,
+                doi=doi,
+                source_name=f"{source_name}_download",
+                success=False,
+                failure_reason=dl_message,
+                failure_category=failure_cat,
+                response_time_ms=None,
+                pdf_url=result,
+                connections_opened=connections["opened"],
+                connections_reused=connections["reused"]
+            )
+
+    if cancel_event is not None and cancel_event.is_set():
+        return False, "Cancelled", "none"
 
     # All sources failed
     print(f"[PDF Smart] All sources failed for {doi}")
+
+    # Retry later if any failure was temporary (the worker's retry scheduler drains the queue)
+    temporary = [category for category in failure_categories if is_temporary_failure(category)]
+    if temporary and schedule_retry(project_id, doi, temporary[0]):
+        print(f"[PDF Smart] Queued {doi} for retry ({temporary[0]})")
+    elif not temporary:
+        remove_from_retry_queue(project_id, doi)
     return False, "All download sources failed", "none"
 
 
@@ -882,24 +1197,35 @@ def process_dois_smart(
     doi_list: List[str],
     project_id: int,
     project_dir: str,
-    progress_callback=None
+    progress_callback=None,
+    max_workers: Optional[int] = None
 ) -> Dict:
     """
     Process multiple DOIs using smart download strategy.
 
+    DOIs are downloaded concurrently by up to max_workers threads (default
+    PDF_DOWNLOAD_CONCURRENCY); requests are paced per upstream host by the shared
+    HostLimiter rather than by sleeping between DOIs.
+
     Args:
         doi_list: List of DOIs to download
         project_id: Project ID for tracking
         project_dir: Directory to save PDFs
-        progress_callback: Optional callback(idx, doi, success, message, source)
+        progress_callback: Optional callback(idx, doi, success, message, source), called from
+            the calling thread once per DOI as DOIs finish; idx counts finished DOIs, so
+            idx + 1 is the progress so far. An exception raised by the callback (e.g. job
+            cancellation) stops the remaining downloads and is re-raised.
+        max_workers: Optional number of DOIs processed at once
 
     Returns: {
         "downloaded": [(doi, filename, message, source), ...],
         "needs_upload": [(doi, filename, reason), ...],
-        "errors": [(doi, error), ...]
+        "errors": [(doi, error), ...],
+        "url_cache": {"hits": int, "misses": int, "hit_rate": float},  # DOIs that needed a URL
+        "suppression": {"requests_saved": int, "skipped": {source: int}}  # sources skipped per prefix
     }
     """
-    from pdf_download_db import init_pdf_download_db, get_config_value
+    from pdf_download_db import init_pdf_download_db
     
     # Initialize database
     init_pdf_download_db()
@@ -912,7 +1238,9 @@ def process_dois_smart(
         return {
             "downloaded": [],
             "needs_upload": [],
-            "errors": [("", f"Failed to create project directory: {str(e)}")]
+            "errors": [("", f"Failed to create project directory: {str(e)}")],
+            "url_cache": {"hits": 0, "misses": 0, "hit_rate": 0.0},
+            "suppression": {"requests_saved": 0, "skipped": {}}
         }
 
     results = {
@@ -920,8 +1248,19 @@ def process_dois_smart(
         "needs_upload": [],
         "errors": []
     }
-
-    for idx, doi in enumerate(doi_list):
+    url_cache = {"hit": 0, "miss": 0}
+    suppression = {"requests_saved": 0, "skipped": {}}
+    completed = 0
+
+    def report(doi, success, message, source):
+        nonlocal completed
+        if progress_callback:
+            progress_callback(completed, doi, success, message, source)
+        completed += 1
+
+    # Clean and validate DOIs up front; each distinct DOI is downloaded once
+    pending = []
+    for doi in doi_list:
         doi = doi.strip()
         if not doi:
             continue
@@ -933,41 +1272,73 @@ def process_dois_smart(
         if not validate_doi(doi):
             print(f"[PDF Smart] Invalid DOI: {doi}")
             results["errors"].append((doi, "Invalid DOI format"))
-            if progress_callback:
-                progress_callback(idx, doi, False, "Invalid DOI format", "")
+            report(doi, False, "Invalid DOI format", "")
             continue
+        pending.append(doi)
 
-        doi_hash = generate_doi_hash(doi)
-        filename = sanitize_filename(f"{doi_hash}.pdf")
-
-        print(f"[PDF Smart] Processing DOI {idx + 1}/{len(doi_list)}: {doi}")
-
-        try:
-            success, message, source = download_pdf_smart(doi, project_id, project_dir, progress_callback)
+    workers = max(1, min(max_workers or PDF_DOWNLOAD_CONCURRENCY, len(set(pending)) or 1))
+    cancel_event = threading.Event()
+    print(f"[PDF Smart] Processing {len(pending)} DOIs with {workers} workers")
 
-            if success:
-                print(f"[PDF Smart] Success via {source}: {message}")
-                results["downloaded"].append((doi, filename, message, source))
-                if progress_callback:
-                    progress_callback(idx, doi, True, message, source)
-            else:
-                print(f"[PDF Smart] Failed: {message}")
-                results["needs_upload"].append((doi, filename, message))
-                if progress_callback:
-                    progress_callback(idx, doi, False, message, "")
-
-            # Rate limiting between DOIs
-            rate_limit_delay = int(get_config_value('rate_limit_delay_seconds', '1'))
-            time.sleep(rate_limit_delay)
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdf-download")
+    try:
+        futures = {}
+        resolutions = {}
+        for doi in dict.fromkeys(pending):
+            resolutions[doi] = {}
+            futures[executor.submit(download_pdf_smart, doi, project_id, project_dir, None, cancel_event,
+                                    resolutions[doi])] = doi
+        # DOIs listed more than once are reported once per occurrence
+        occurrences = {doi: pending.count(doi) for doi in futures.values()}
+
+        for future in as_completed(futures):
+            doi = futures[future]
+            filename = sanitize_filename(f"{generate_doi_hash(doi)}.pdf")
+            if resolutions[doi].get("url_cache") in url_cache:
+                url_cache[resolutions[doi]["url_cache"]] += 1
+            suppression["requests_saved"] += resolutions[doi].get("requests_saved", 0)
+            for source_name in resolutions[doi].get("suppressed", []):
+                suppression["skipped"][source_name] = suppression["skipped"].get(source_name, 0) + 1
+            for _ in range(occurrences[doi]):
+                try:
+                    success, message, source = future.result()
+                except Exception as e:
+                    print(f"[PDF Smart] Error processing {doi}: {e}")
+                    results["errors"].append((doi, str(e)))
+                    report(doi, False, f"Error: {str(e)}", "")
+                    continue
 
-        except Exception as e:
-            print(f"[PDF Smart] Error processing {doi}: {e}")
-            results["errors"].append((doi, str(e)))
-            if progress_callback:
-                progress_callback(idx, doi, False, f"Error: {str(e)}", "")
+                if success:
+                    print(f"[PDF Smart] Success via {source}: {message}")
+                    results["downloaded"].append((doi, filename, message, source))
+                    report(doi, True, message, source)
+                else:
+                    print(f"[PDF Smart] Failed: {message}")
+                    results["needs_upload"].append((doi, filename, message))
+                    report(doi, False, message, "")
+    except BaseException:
+        # Stop queued DOIs and let running ones give up at their next source
+        cancel_event.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown(wait=True)
+
+    # Attempts are logged through a buffered writer; persist this batch's before returning
+    from pdf_download_db import flush_download_attempts
+    flush_download_attempts()
+
+    looked_up = url_cache["hit"] + url_cache["miss"]
+    results["url_cache"] = {
+        "hits": url_cache["hit"],
+        "misses": url_cache["miss"],
+        "hit_rate": url_cache["hit"] / looked_up if looked_up else 0.0
+    }
+    results["suppression"] = suppression
 
     print(f"[PDF Smart] Batch complete - Downloaded: {len(results['downloaded'])}, "
-          f"Needs upload: {len(results['needs_upload'])}, Errors: {len(results['errors'])}")
+          f"Needs upload: {len(results['needs_upload'])}, Errors: {len(results['errors'])}, "
+          f"URL cache hits: {url_cache['hit']}/{looked_up}, "
+          f"Lookups saved by source suppression: {suppression['requests_saved']}")
 
     return results
 
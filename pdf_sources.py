@@ -11,6 +11,8 @@ from typing import Tuple, Optional, Dict, List
 import time
 import random
 
+import http_sessions
+
 USER_AGENTS = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -76,7 +78,7 @@ def try_europe_pmc(doi: str, timeout: int = 15) -> Tuple[bool, str]:
             'resultType': 'core'
         }
 
-        response = requests.get(search_url, params=params, headers=headers, timeout=timeout)
+        response = http_sessions.get(search_url, params=params, headers=headers, timeout=timeout)
 
         if not response.ok:
             return False, f"Europe PMC API error: HTTP {response.status_code}"
@@ -157,7 +159,7 @@ def try_core(doi: str, api_key: Optional[str] = None, timeout: int = 15) -> Tupl
             'limit': 1
         }
 
-        response = requests.get(search_url, params=params, headers=headers, timeout=timeout)
+        response = http_sessions.get(search_url, params=params, headers=headers, timeout=timeout)
 
         if not response.ok:
             if response.status_code == 401:
@@ -217,7 +219,7 @@ def try_semantic_scholar(doi: str, timeout: int = 15) -> Tuple[bool, str]:
             'fields': 'title,openAccessPdf,isOpenAccess,externalIds'
         }
 
-        response = requests.get(api_url, params=params, headers=headers, timeout=timeout)
+        response = http_sessions.get(api_url, params=params, headers=headers, timeout=timeout)
 
         if not response.ok:
             if response.status_code == 404:
@@ -280,7 +282,7 @@ def try_scihub(doi: str, mirror_index: int = 0, timeout: int = 20) -> Tuple[bool
 
         # Request the DOI page
         scihub_url = f"{mirror}/{doi}"
-        response = requests.get(scihub_url, headers=headers, timeout=timeout, allow_redirects=True)
+        response = http_sessions.get(scihub_url, headers=headers, timeout=timeout, allow_redirects=True)
 
         if not response.ok:
             # Try next mirror
@@ -350,7 +352,7 @@ def try_biorxiv_medrxiv(doi: str, timeout: int = 15) -> Tuple[bool, str]:
             # (HEAD requests often fail even when PDF exists)
             pdf_url = f"https://www.biorxiv.org/content/{doi}.full.pdf"
             try:
-                response = requests.head(pdf_url, headers=headers, timeout=timeout, allow_redirects=True)
+                response = http_sessions.head(pdf_url, headers=headers, timeout=timeout, allow_redirects=True)
                 if response.status_code == 200:
                     return True, pdf_url
             except requests.RequestException:
@@ -359,7 +361,7 @@ def try_biorxiv_medrxiv(doi: str, timeout: int = 15) -> Tuple[bool, str]:
             # Try medRxiv
             pdf_url = f"https://www.medrxiv.org/content/{doi}.full.pdf"
             try:
-                response = requests.head(pdf_url, headers=headers, timeout=timeout, allow_redirects=True)
+                response = http_sessions.head(pdf_url, headers=headers, timeout=timeout, allow_redirects=True)
                 if response.status_code == 200:
                     return True, pdf_url
             except requests.RequestException:
@@ -369,7 +371,7 @@ def try_biorxiv_medrxiv(doi: str, timeout: int = 15) -> Tuple[bool, str]:
         # bioRxiv/medRxiv content details API
         api_url = f"https://api.biorxiv.org/details/biorxiv/{doi}"
         try:
-            response = requests.get(api_url, headers=headers, timeout=timeout)
+            response = http_sessions.get(api_url, headers=headers, timeout=timeout)
             
             if response.status_code == 200:
                 data = response.json()
@@ -386,7 +388,7 @@ def try_biorxiv_medrxiv(doi: str, timeout: int = 15) -> Tuple[bool, str]:
         # Try medRxiv API
         api_url = f"https://api.biorxiv.org/details/medrxiv/{doi}"
         try:
-            response = requests.get(api_url, headers=headers, timeout=timeout)
+            response = http_sessions.get(api_url, headers=headers, timeout=timeout)
             
             if response.status_code == 200:
                 data = response.json()
@@ -428,7 +430,7 @@ def try_arxiv_enhanced(doi: str, timeout: int = 15) -> Tuple[bool, str]:
         else:
             # Try arXiv API to find by DOI
             api_url = f"http://export.arxiv.org/api/query?search_query=doi:{doi}&max_results=1"
-            response = requests.get(api_url, headers=headers, timeout=timeout)
+            response = http_sessions.get(api_url, headers=headers, timeout=timeout)
             
             if response.ok:
                 content = response.text
@@ -469,7 +471,7 @@ def try_pmc_enhanced(doi: str, timeout: int = 15) -> Tuple[bool, str]:
             'email': 'research@example.com'
         }
         
-        response = requests.get(id_converter_url, params=params, headers=headers, timeout=timeout)
+        response = http_sessions.get(id_converter_url, params=params, headers=headers, timeout=timeout)
         
         if not response.ok:
             return False, f"PMC ID converter error: HTTP {response.status_code}"
@@ -503,7 +505,7 @@ def try_pmc_enhanced(doi: str, timeout: int = 15) -> Tuple[bool, str]:
 
         for pdf_url in pdf_urls:
             # Quick check if URL is accessible
-            head_response = requests.head(pdf_url, headers=headers, timeout=timeout, allow_redirects=True)
+            head_response = http_sessions.head(pdf_url, headers=headers, timeout=timeout, allow_redirects=True)
             if head_response.ok:
                 return True, pdf_url
 
@@ -534,7 +536,7 @@ def try_zenodo(doi: str, timeout: int = 15) -> Tuple[bool, str]:
             'size': 1
         }
 
-        response = requests.get(api_url, params=params, headers=headers, timeout=timeout)
+        response = http_sessions.get(api_url, params=params, headers=headers, timeout=timeout)
 
         if response.status_code != 200:
             return False, f"Zenodo API error: HTTP {response.status_code}"
@@ -612,7 +614,7 @@ def try_doaj(doi: str, timeout: int = 15) -> Tuple[bool, str]:
         # Search by DOI
         search_url = f"{api_url}:{clean_doi}"
         
-        response = requests.get(search_url, headers=headers, timeout=timeout)
+        response = http_sessions.get(search_url, headers=headers, timeout=timeout)
 
         if not response.ok:
             return False, f"DOAJ API error: HTTP {response.status_code}"
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Content-addressed PDF store shared by all projects.
+
+Every PDF is kept once as a blob named by the sha256 of its bytes:
+
+    project_pdfs/.blobs/ab/ab12...ef.pdf
+    project_pdfs/project_1/<doi_hash>.pdf   -> hard link to the blob
+    project_pdfs/project_7/<doi_hash>.pdf   -> hard link to the same blob
+
+Where hard links are not possible the project file is a reflink (copy-on-write
+clone) of the blob, or as a last resort a plain copy. Project files keep their
+paths, so serving, listing and zipping PDFs is unchanged.
+
+Blob references (project file path -> sha256) are counted in pdf_downloads.db
+(pdf_blob_refs). Removing a project file or directory only unlinks it; a blob is
+deleted when its last reference goes. Files that are edited in place (PDF
+highlights) are first turned into private copies with make_private().
+
+A DOI already stored for another project is linked instead of downloaded again
+(link_from_store). dedupe_directory() converts existing project directories.
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+import uuid
+from typing import Dict, Optional
+
+# Import configuration
+try:
+    from config import PDF_BLOB_STORE_ENABLED
+except ImportError:
+    PDF_BLOB_STORE_ENABLED = True
+
+BLOB_DIR_NAME = ".blobs"
+_FICLONE = 0x40049409  # Linux ioctl for reflinks (btrfs, XFS, ...)
+
+_lock = threading.Lock()
+
+
+def blob_dir(project_dir: str) -> str:
+    """Blob directory for a project directory (a sibling, so hard links stay on one filesystem)."""
+    return os.path.join(os.path.dirname(os.path.abspath(project_dir)), BLOB_DIR_NAME)
+
+
+def blob_path(store_dir: str, sha256: str) -> str:
+    return os.path.join(store_dir, sha256[:2], f"{sha256}.pdf")
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _reflink(src: str, dst: str) -> None:
+    import fcntl
+    with open(src, "rb") as source, open(dst, "wb") as target:
+        fcntl.ioctl(target.fileno(), _FICLONE, source.fileno())
+
+
+def _link(src: str, dst: str) -> str:
+    """Create dst as a hard link to src, else a reflink, else a copy. Returns the method used."""
+    try:
+        os.link(src, dst)
+        return "hardlink"
+    except OSError:
+        pass
+    try:
+        _reflink(src, dst)
+        return "reflink"
+    except (OSError, ImportError):
+        if os.path.exists(dst):
+            os.remove(dst)
+    shutil.copy2(src, dst)
+    return "copy"
+
+
+def _replace_with_link(src: str, path: str) -> str:
+    """Atomically replace path with a link to src."""
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        method = _link(src, tmp_path)
+        os.replace(tmp_path, path)
+        return method
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _same_file(a: str, b: str) -> bool:
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+
+def _drop_unreferenced(store_dir: str, hashes) -> int:
+    """Delete blobs that no project file references any more."""
+    from pdf_download_db import count_blob_refs
+    removed = 0
+    for sha256 in set(hashes):
+        if count_blob_refs(sha256) == 0:
+            try:
+                os.remove(blob_path(store_dir, sha256))
+                removed += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"[PDF Store] Could not remove blob {sha256}: {e}")
+    return removed
+
+
+def add_to_store(path: str, doi_hash: Optional[str] = None) -> Optional[str]:
+    """
+    Put a project PDF into the store: the file becomes a link to the blob with its
+    content (creating the blob if it is new) and the reference is recorded.
+    Returns the sha256, or None if the store is disabled or the file could not be stored.
+    """
+    if not PDF_BLOB_STORE_ENABLED:
+        return None
+    from pdf_download_db import add_blob_ref, remove_blob_refs
+
+    path = os.path.abspath(path)
+    store_dir = blob_dir(os.path.dirname(path))
+    try:
+        sha256 = file_sha256(path)
+        blob = blob_path(store_dir, sha256)
+        with _lock:
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            if not os.path.exists(blob):
+                try:
+                    _link(path, blob)
+                except FileExistsError:
+                    pass  # Stored by another process meanwhile
+            if not _same_file(path, blob):
+                _replace_with_link(blob, path)
+        previous = remove_blob_refs(path)
+        add_blob_ref(path, sha256, doi_hash)
+        _drop_unreferenced(store_dir, [h for h in previous if h != sha256])
+        return sha256
+    except OSError as e:
+        print(f"[PDF Store] Could not store {path}: {e}")
+        return None
+
+
+def link_from_store(doi_hash: str, path: str) -> bool:
+    """
+    Link a PDF already stored for this DOI (by any project) to path.
+    Returns True if linked, False if the DOI is not stored (or the store is disabled).
+    """
+    if not PDF_BLOB_STORE_ENABLED:
+        return False
+    from pdf_download_db import add_blob_ref, get_blob_refs
+
+    path = os.path.abspath(path)
+    store_dir = blob_dir(os.path.dirname(path))
+    for ref in get_blob_refs(doi_hash):
+        blob = blob_path(store_dir, ref["sha256"])
+        if not os.path.exists(blob):
+            continue
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            _replace_with_link(blob, path)
+        except OSError as e:
+            # Blob removed meanwhile, or the directory is not writable
+            print(f"[PDF Store] Could not link {ref['sha256']} to {path}: {e}")
+            continue
+        add_blob_ref(path, ref["sha256"], doi_hash)
+        return True
+    return False
+
+
+def release(path: str) -> bool:
+    """
+    Remove a project PDF: unlink the file, drop its reference and delete the blob
+    if nothing else uses it. Returns True if the file existed.
+    """
+    from pdf_download_db import remove_blob_refs
+
+    path = os.path.abspath(path)
+    existed = os.path.exists(path)
+    if existed:
+        os.remove(path)
+    _drop_unreferenced(blob_dir(os.path.dirname(path)), remove_blob_refs(path))
+    return existed
+
+
+def release_dir(project_dir: str) -> bool:
+    """Remove a project's PDF directory, dropping its references and orphaned blobs."""
+    from pdf_download_db import remove_blob_refs
+
+    project_dir = os.path.abspath(project_dir)
+    existed = os.path.exists(project_dir)
+    if existed:
+        shutil.rmtree(project_dir)
+    _drop_unreferenced(blob_dir(project_dir), remove_blob_refs(project_dir, prefix=True))
+    return existed
+
+
+def make_private(path: str) -> bool:
+    """
+    Give a project PDF its own copy before it is modified in place, so the edit
+    does not reach other projects through the shared blob. Returns True if copied.
+    """
+    from pdf_download_db import remove_blob_refs
+
+    path = os.path.abspath(path)
+    hashes = remove_blob_refs(path)
+    if not hashes or not os.path.exists(path):
+        return False
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    shutil.copy2(path, tmp_path)
+    os.replace(tmp_path, path)
+    _drop_unreferenced(blob_dir(os.path.dirname(path)), hashes)
+    return True
+
+
+def dedupe_directory(base_dir: str) -> Dict[str, int]:
+    """
+    Convert existing project directories under base_dir to store links.
+    Returns {"files", "stored", "deduplicated", "bytes_saved"}.
+    """
+    from pdf_download_db import get_blob_refs
+
+    stats = {"files": 0, "stored": 0, "deduplicated": 0, "bytes_saved": 0}
+    if not os.path.isdir(base_dir):
+        return stats
+    known = {ref["path"]: ref["sha256"] for ref in get_blob_refs()}
+    store_dir = os.path.join(os.path.abspath(base_dir), BLOB_DIR_NAME)
+
+    for entry in sorted(os.listdir(base_dir)):
+        project_dir = os.path.abspath(os.path.join(base_dir, entry))
+        if entry == BLOB_DIR_NAME or not os.path.isdir(project_dir):
+            continue
+        for filename in sorted(os.listdir(project_dir)):
+            path = os.path.join(project_dir, filename)
+            if not filename.endswith(".pdf") or os.path.islink(path) or not os.path.isfile(path):
+                continue
+            stats["files"] += 1
+            if path in known and _same_file(path, blob_path(store_dir, known[path])):
+                continue
+            size = os.path.getsize(path)
+            blob_existed = os.path.exists(blob_path(store_dir, file_sha256(path)))
+            if add_to_store(path, doi_hash=filename[:-len(".pdf")]):
+                stats["stored"] += 1
+                if blob_existed:
+                    stats["deduplicated"] += 1
+                    stats["bytes_saved"] += size
+    return stats
+
+
+def collect_garbage(base_dir: str) -> int:
+    """Drop references to project files that no longer exist and delete unreferenced blobs."""
+    from pdf_download_db import get_blob_refs, remove_blob_refs
+
+    store_dir = os.path.join(os.path.abspath(base_dir), BLOB_DIR_NAME)
+    for ref in get_blob_refs():
+        if not os.path.exists(ref["path"]):
+            remove_blob_refs(ref["path"])
+    hashes = []
+    if os.path.isdir(store_dir):
+        for root, _, files in os.walk(store_dir):
+            hashes.extend(name[:-len(".pdf")] for name in files if name.endswith(".pdf"))
+    return _drop_unreferenced(store_dir, hashes)
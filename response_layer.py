@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Opt-in response layer for the HARVEST backend.
+
+- Fast JSON: jsonify() serializes with orjson when it is installed (falling back to
+  the standard encoder for values orjson does not handle).
+- Compression: JSON/text responses above a size threshold are compressed with
+  brotli or gzip, whichever the client accepts (brotli needs the `brotli` package).
+  Useful in internal mode, where no nginx compresses responses.
+
+Time spent serializing and compressing is reported in a Server-Timing header
+(visible in the browser's network panel) and logged at debug level.
+
+Usage:
+    from response_layer import init_response_layer
+    init_response_layer(app, fast_json=True, compression=True)
+"""
+
+import gzip
+import logging
+import time
+
+from flask import g, request
+from flask.json.provider import DefaultJSONProvider
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "text/csv",
+    "text/plain",
+    "text/html",
+}
+
+
+def _add_timing(name: str, seconds: float) -> None:
+    """Accumulate per-request timings (outside a request context this is a no-op)."""
+    try:
+        timings = g.setdefault("response_timings", {})
+    except RuntimeError:
+        return
+    timings[name] = timings.get(name, 0.0) + seconds
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider, timing serialization for the Server-Timing header."""
+
+    use_orjson = False
+
+    def _orjson_option(self) -> int:
+        # Dates go through Flask's default handler so they stay HTTP dates, as with jsonify
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if self.compact is False or (self.compact is None and self._app.debug):
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs) -> str:
+        start = time.perf_counter()
+        try:
+            if self.use_orjson and not kwargs:
+                try:
+                    return orjson.dumps(obj, default=self.default, option=self._orjson_option()).decode("utf-8")
+                except TypeError:
+                    # e.g. integers beyond 64 bits; the standard encoder handles them
+                    pass
+            return super().dumps(obj, **kwargs)
+        finally:
+            _add_timing("json", time.perf_counter() - start)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if self.use_orjson:
+            start = time.perf_counter()
+            try:
+                # Bytes go straight into the response, without a str round trip
+                body = orjson.dumps(obj, default=self.default, option=self._orjson_option())
+                _add_timing("json", time.perf_counter() - start)
+                return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+            except TypeError:
+                pass
+        return super().response(obj)
+
+
+class OrjsonProvider(TimedJSONProvider):
+    """Serializes with orjson (falls back to the standard encoder per value)."""
+
+    use_orjson = True
+
+
+def _choose_encoding(accept_encoding: str):
+    """Pick br or gzip from an Accept-Encoding header (None if neither is acceptable)."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        pieces = part.strip().split(";")
+        coding = pieces[0].strip().lower()
+        quality = 1.0
+        for param in pieces[1:]:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            accepted[coding] = quality
+
+    def allowed(coding):
+        return accepted.get(coding, accepted.get("*", 0.0)) > 0
+
+    if BROTLI_AVAILABLE and allowed("br"):
+        return "br"
+    if allowed("gzip"):
+        return "gzip"
+    return None
+
+
+def init_response_layer(app, fast_json: bool = False, compression: bool = False,
+                        min_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4) -> None:
+    """Install the fast JSON provider and/or response compression on a Flask app."""
+    provider_class = TimedJSONProvider
+    if fast_json:
+        if ORJSON_AVAILABLE:
+            provider_class = OrjsonProvider
+            logger.info("Fast JSON serialization enabled (orjson)")
+        else:
+            logger.warning("RESPONSE_FAST_JSON is enabled but orjson is not installed; using the standard encoder")
+    app.json_provider_class = provider_class
+    app.json = provider_class(app)
+
+    @app.before_request
+    def _start_response_timing():
+        g.response_timings = {}
+
+    @app.after_request
+    def _finish_response(response):
+        if compression:
+            response = _compress_response(response, min_size, gzip_level, brotli_quality)
+
+        timings = g.get("response_timings") or {}
+        if timings:
+            response.headers["Server-Timing"] = ", ".join(
+                f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items()
+            )
+            logger.debug(f"{request.method} {request.path}: " + ", ".join(
+                f"{name} {seconds * 1000:.1f}ms" for name, seconds in timings.items()))
+        return response
+
+
+def _compress_response(response, min_size: int, gzip_level: int, brotli_quality: int):
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code >= 300
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = _choose_encoding(request.headers.get("Accept-Encoding", ""))
+    if encoding is None:
+        return response
+
+    data = response.get_data()
+    if len(data) < min_size:
+        return response
+
+    start = time.perf_counter()
+    if encoding == "br":
+        compressed = brotli.compress(data, quality=brotli_quality)
+    else:
+        compressed = gzip.compress(data, compresslevel=gzip_level)
+    _add_timing("compress", time.perf_counter() - start)
+
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    response.headers["Content-Length"] = str(len(compressed))
+    return response
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark the Browse payload (/api/rows) with and without the response layer.
+
+Fills a temporary database with synthetic sentences/triples, then requests
+/api/rows?limit=10000 through the Flask test client for each configuration:
+
+    stdlib       standard json encoder, uncompressed (the default)
+    orjson       RESPONSE_FAST_JSON
+    orjson+gzip  RESPONSE_FAST_JSON + RESPONSE_COMPRESSION (gzip)
+    orjson+br    ... with brotli (only if the brotli package is installed)
+
+and reports the server time, the serialization/compression time from the
+Server-Timing header, the bytes on the wire, the client decode time and an
+end-to-end estimate including transfer at --bandwidth-mbps.
+
+Usage:
+    python3 scripts/benchmark_browse.py [--rows 10000] [--repeat 5] [--bandwidth-mbps 20]
+"""
+
+import argparse
+import gzip
+import importlib
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def fill_database(db_path: str, rows: int) -> None:
+    from harvest_store import get_conn, init_db
+    init_db(db_path)
+    conn = get_conn(db_path)
+    conn.execute("BEGIN;")
+    conn.execute("INSERT INTO projects (id, name, description, doi_list, created_by, created_at) "
+                 "VALUES (1, 'Benchmark', '', '[]', 'bench@example.com', '2024-01-01T00:00:00')")
+    for i in range(1, rows // 2 + 1):
+        doi_hash = f"{i % 500:016x}"
+        conn.execute("INSERT OR IGNORE INTO doi_metadata (doi_hash, doi, created_at) VALUES (?, ?, ?)",
+                     (doi_hash, f"10.1234/bench.{i % 500}", "2024-01-01T00:00:00"))
+        conn.execute("INSERT INTO sentences (id, text, literature_link, doi_hash, created_at) VALUES (?, ?, ?, ?, ?)",
+                      (i, f"Gene ABC{i} regulates drought tolerance in Arabidopsis thaliana under "
+                          f"controlled conditions (sentence {i}).", f"https://doi.org/10.1234/bench.{i % 500}",
+                      doi_hash, "2024-01-01T00:00:00"))
+        for j in range(2):
+            conn.execute("""INSERT INTO triples (sentence_id, source_entity_name, source_entity_attr,
+                            relation_type, sink_entity_name, sink_entity_attr, contributor_email,
+                            project_id, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?)""",
+                         (i, f"ABC{i}", "Gene", "regulates" if j else "is_related_to",
+                          "drought tolerance", "Trait", "annotator@example.com", "2024-01-01T00:00:00"))
+    conn.execute("COMMIT;")
+    conn.close()
+
+
+def load_backend(fast_json: bool, compression: bool):
+    os.environ["HARVEST_FAST_JSON"] = str(fast_json)
+    os.environ["HARVEST_RESPONSE_COMPRESSION"] = str(compression)
+    import harvest_be
+    return importlib.reload(harvest_be)
+
+
+def run_case(name, backend, accept_encoding, rows, repeat, bandwidth_mbps):
+    client = backend.app.test_client()
+    url = f"/api/rows?limit={rows}"
+    server_times, decode_times = [], []
+    timing_header, size = "", 0
+    for _ in range(repeat + 1):  # first request warms caches
+        start = time.perf_counter()
+        resp = client.get(url, headers={"Accept-Encoding": accept_encoding})
+        body = resp.get_data()
+        server_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        encoding = resp.headers.get("Content-Encoding")
+        if encoding == "gzip":
+            raw = gzip.decompress(body)
+        elif encoding == "br":
+            import brotli
+            raw = brotli.decompress(body)
+        else:
+            raw = body
+        data = json.loads(raw)
+        decode_times.append(time.perf_counter() - start)
+
+        timing_header = resp.headers.get("Server-Timing", "")
+        size = len(body)
+    assert len(data) == rows, f"{name}: expected {rows} rows, got {len(data)}"
+
+    server = statistics.median(server_times[1:])
+    decode = statistics.median(decode_times[1:])
+    transfer = size * 8 / (bandwidth_mbps * 1_000_000)
+    return {
+        "name": name,
+        "server_ms": server * 1000,
+        "timing": timing_header or "-",
+        "kb": size / 1024,
+        "decode_ms": decode * 1000,
+        "total_ms": (server + transfer + decode) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the /api/rows payload")
+    parser.add_argument("--rows", type=int, default=10000, help="Rows returned by /api/rows")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed requests per configuration")
+    parser.add_argument("--bandwidth-mbps", type=float, default=20.0,
+                        help="Link speed for the transfer estimate (Mbit/s)")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    os.environ["HARVEST_DB"] = os.path.join(tmp_dir, "harvest.db")
+    os.environ["HARVEST_JOB_WORKER_MODE"] = "external"
+    try:
+        fill_database(os.environ["HARVEST_DB"], args.rows)
+
+        from response_layer import BROTLI_AVAILABLE, ORJSON_AVAILABLE
+        cases = [("stdlib", False, False, "identity")]
+        if ORJSON_AVAILABLE:
+            cases.append(("orjson", True, False, "identity"))
+        cases.append(("orjson+gzip" if ORJSON_AVAILABLE else "gzip", ORJSON_AVAILABLE, True, "gzip"))
+        if BROTLI_AVAILABLE:
+            cases.append(("orjson+br" if ORJSON_AVAILABLE else "br", ORJSON_AVAILABLE, True, "br, gzip"))
+
+        results = []
+        for name, fast_json, compression, accept in cases:
+            backend = load_backend(fast_json, compression)
+            results.append(run_case(name, backend, accept, args.rows, args.repeat, args.bandwidth_mbps))
+
+        print(f"\n/api/rows?limit={args.rows}  (median of {args.repeat}, transfer at {args.bandwidth_mbps:g} Mbit/s)")
+        print(f"{'config':<13}{'server ms':>10}{'size KB':>10}{'decode ms':>11}{'end-to-end ms':>15}  Server-Timing")
+        for r in results:
+            print(f"{r['name']:<13}{r['server_ms']:>10.1f}{r['kb']:>10.0f}{r['decode_ms']:>11.1f}"
+                  f"{r['total_ms']:>15.1f}  {r['timing']}")
+        baseline = results[0]["total_ms"]
+        best = min(results, key=lambda r: r["total_ms"])
+        print(f"\nBest: {best['name']} ({baseline / best['total_ms']:.1f}x faster end-to-end than stdlib)")
+        if not ORJSON_AVAILABLE:
+            print("Install orjson to benchmark fast JSON serialization")
+        if not BROTLI_AVAILABLE:
+            print("Install brotli to benchmark brotli compression")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Measure cold start-up of the backend, frontend and job worker with -X importtime.
+
+Each target is imported in a fresh interpreter (so nothing is shared between
+runs) with a temporary HARVEST_DB and working directory:
+
+    backend    import harvest_be
+    frontend   import frontend        (the Dash app with all callbacks)
+    worker     import harvest_worker
+
+and the script reports the import time of the target (cumulative, from the
+importtime log) and the slowest modules by self time. It exits with status 1
+when a target's best run exceeds its budget, or when a module that must stay
+lazy (sentence-transformers, arXiv/Semantic Scholar clients, metapub, ...) is
+imported at start-up, so it can gate CI:
+
+    python3 scripts/benchmark_startup.py                      # all targets
+    python3 scripts/benchmark_startup.py --targets backend --repeat 5
+    python3 scripts/benchmark_startup.py --budget backend=400 --top 20
+"""
+
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = {
+    "backend": "harvest_be",
+    "frontend": "frontend",
+    "worker": "harvest_worker",
+}
+
+# Budgets for the best run, in milliseconds. Generous enough for slow CI machines;
+# lower them with --budget once a baseline for the machine is known.
+DEFAULT_BUDGETS_MS = {
+    "backend": 1500,
+    "frontend": 4000,
+    "worker": 1500,
+}
+
+# Heavy optional dependencies that are only imported on first use
+LAZY_MODULES = (
+    "literature_search",
+    "sentence_transformers",
+    "torch",
+    "semanticscholar",
+    "arxiv",
+    "metapub",
+    "habanero",
+    "unpywall",
+    "fitz",
+    "asreview",
+)
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)")
+
+
+def parse_importtime(log: str):
+    """Parse -X importtime output into (module, self_us, cumulative_us, depth) tuples."""
+    rows = []
+    for line in log.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return rows
+
+
+def measure(module: str) -> dict:
+    """Import module in a fresh interpreter; return its import time and the modules loaded."""
+    tmp_dir = tempfile.mkdtemp()
+    env = dict(os.environ)
+    env.update({
+        "HARVEST_DB": os.path.join(tmp_dir, "harvest.db"),
+        "HARVEST_JOB_WORKER_MODE": "external",
+        "PYTHONPATH": REPO_DIR + os.pathsep + env.get("PYTHONPATH", ""),
+    })
+    try:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=tmp_dir, env=env, capture_output=True, text=True, timeout=300,
+        )
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    rows = parse_importtime(result.stderr)
+    total_us = next((cumulative for name, _, cumulative, depth in rows if name == module and depth == 0), None)
+    if total_us is None:
+        raise RuntimeError(f"No importtime entry for {module}")
+    return {
+        "total_ms": total_us / 1000,
+        "rows": rows,
+        "modules": {name for name, _, _, _ in rows},
+    }
+
+
+def parse_budgets(values):
+    budgets = dict(DEFAULT_BUDGETS_MS)
+    for value in values or []:
+        target, _, ms = value.partition("=")
+        if target not in TARGETS or not ms:
+            raise SystemExit(f"Invalid --budget {value!r}, expected <target>=<ms> with target in {', '.join(TARGETS)}")
+        budgets[target] = float(ms)
+    return budgets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check cold start-up time against a budget")
+    parser.add_argument("--targets", nargs="+", choices=sorted(TARGETS), default=list(TARGETS),
+                        help="What to measure (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per target (best run counts)")
+    parser.add_argument("--budget", action="append", metavar="TARGET=MS",
+                        help="Override a budget in milliseconds (repeatable)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules to list per target")
+    args = parser.parse_args(argv)
+    budgets = parse_budgets(args.budget)
+
+    failures = []
+    for target in args.targets:
+        module = TARGETS[target]
+        runs = [measure(module) for _ in range(max(1, args.repeat))]
+        best = min(runs, key=lambda run: run["total_ms"])
+        budget = budgets[target]
+        status = "ok" if best["total_ms"] <= budget else "OVER BUDGET"
+
+        print(f"\n{target} (import {module}): best {best['total_ms']:.0f} ms of {len(runs)}, "
+              f"budget {budget:.0f} ms - {status}")
+        print(f"  {'self ms':>8}  {'cumul ms':>8}  module")
+        for name, self_us, cumulative_us, _ in sorted(best["rows"], key=lambda row: -row[1])[:args.top]:
+            print(f"  {self_us / 1000:>8.1f}  {cumulative_us / 1000:>8.1f}  {name}")
+
+        if best["total_ms"] > budget:
+            failures.append(f"{target}: {best['total_ms']:.0f} ms > {budget:.0f} ms")
+        eager = sorted(name for name in LAZY_MODULES if name in best["modules"])
+        if eager:
+            print(f"  imported at start-up but should be lazy: {', '.join(eager)}")
+            failures.append(f"{target}: eagerly imports {', '.join(eager)}")
+
+    if failures:
+        print("\nStart-up check failed:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("\nStart-up within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
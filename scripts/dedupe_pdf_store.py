@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Convert existing project PDF directories to the shared, content-addressed PDF store.
+
+Every PDF under PDF_STORAGE_DIR/project_*/ is hashed; identical PDFs end up as
+links to one blob in PDF_STORAGE_DIR/.blobs and are recorded in
+pdf_downloads.db. Safe to run repeatedly (files already in the store are
+skipped) and while the application is running. Run from the directory the
+backend runs in, so pdf_downloads.db and the storage directory resolve the same:
+
+    python3 scripts/dedupe_pdf_store.py
+    python3 scripts/dedupe_pdf_store.py --storage-dir /srv/harvest/project_pdfs
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config import PDF_STORAGE_DIR
+except ImportError:
+    PDF_STORAGE_DIR = "project_pdfs"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Deduplicate project PDFs into the shared PDF store")
+    parser.add_argument("--storage-dir", default=PDF_STORAGE_DIR,
+                        help=f"Project PDF base directory (default: {PDF_STORAGE_DIR})")
+    args = parser.parse_args(argv)
+
+    import pdf_store
+    from pdf_download_db import init_pdf_download_db
+
+    if not pdf_store.PDF_BLOB_STORE_ENABLED:
+        print("PDF store is disabled (PDF_BLOB_STORE_ENABLED = False); nothing to do")
+        return 1
+    if not os.path.isdir(args.storage_dir):
+        print(f"No PDF storage directory at {args.storage_dir}")
+        return 1
+
+    init_pdf_download_db()
+    stats = pdf_store.dedupe_directory(args.storage_dir)
+    removed = pdf_store.collect_garbage(args.storage_dir)
+
+    print(f"Scanned {stats['files']} project PDFs: {stats['stored']} added to the store, "
+          f"{stats['deduplicated']} were duplicates ({stats['bytes_saved'] / 1024 / 1024:.1f} MB freed)")
+    if removed:
+        print(f"Removed {removed} unreferenced blobs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
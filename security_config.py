@@ -193,35 +193,47 @@ def validate_session_id(session_id: str) -> Tuple[bool, str]:
 # Monitoring Metrics
 # ============================================================================
 
+try:
+    from metrics import registry as metrics_registry
+except ImportError:
+    metrics_registry = None
+
+
+def _count_security_event(event: str) -> None:
+    """Log the metric and count it for /metrics (harvest_security_events_total)."""
+    logger.debug(f"METRIC|{event}_total|+1")
+    if metrics_registry is not None:
+        metrics_registry.inc("harvest_security_events_total", {"event": event})
+
+
 class SecurityMetrics:
     """Track security-related metrics for monitoring."""
     
-    # These would typically be stored in a metrics backend (Prometheus, etc.)
-    # For now, we just log them
+    # Logged as METRIC|... lines and counted in the /metrics registry (metrics.py)
     
     @staticmethod
     def increment_otp_requests():
         """Increment OTP request counter."""
         if SECURITY_MONITORING_ENABLED:
-            logger.debug("METRIC|otp_requests_total|+1")
+            _count_security_event("otp_requests")
     
     @staticmethod
     def increment_verification_failures():
         """Increment verification failure counter."""
         if SECURITY_MONITORING_ENABLED:
-            logger.debug("METRIC|verification_failures_total|+1")
+            _count_security_event("verification_failures")
     
     @staticmethod
     def increment_rate_limit_triggers():
         """Increment rate limit trigger counter."""
         if SECURITY_MONITORING_ENABLED:
-            logger.debug("METRIC|rate_limit_triggers_total|+1")
+            _count_security_event("rate_limit_triggers")
     
     @staticmethod
     def increment_email_send_failures():
         """Increment email send failure counter."""
         if SECURITY_MONITORING_ENABLED:
-            logger.debug("METRIC|email_send_failures_total|+1")
+            _count_security_event("email_send_failures")
 
 
 # Export security event logger singleton
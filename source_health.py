@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Circuit breakers and adaptive timeouts for PDF lookup sources.
+
+Each lookup source has a circuit breaker:
+
+- closed:    lookups go through; outages (timeouts, connection errors, 5xx
+             answers) are counted, any other answer resets the count
+- open:      after PDF_BREAKER_FAILURE_THRESHOLD outages in a row the source is
+             skipped for PDF_BREAKER_OPEN_SECONDS
+- half-open: then a single probe lookup goes through; success closes the
+             breaker, failure opens it again for twice as long (at most
+             PDF_BREAKER_MAX_OPEN_SECONDS)
+
+Breakers live in the process that runs the downloads; every state change is
+also written to pdf_downloads.db (source_breakers) for the pdf-analytics
+endpoints.
+
+Lookup timeouts follow each source's recent latency: PDF_SOURCE_TIMEOUT_MULTIPLIER
+times its p95 response time, between PDF_SOURCE_MIN_TIMEOUT and the source's
+configured timeout, so a source that normally answers in 300 ms is not waited
+on for 15 s when it hangs. The median (p50) latencies loaded with them are the
+hedge delays of hedged source racing (see pdf_manager._race_sources). Both are
+reloaded every PDF_SOURCE_RANKING_REFRESH_SECONDS, not queried for every DOI.
+"""
+
+import re
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+# Import configuration
+try:
+    from config import PDF_BREAKER_FAILURE_THRESHOLD, PDF_BREAKER_OPEN_SECONDS, PDF_BREAKER_MAX_OPEN_SECONDS
+except ImportError:
+    PDF_BREAKER_FAILURE_THRESHOLD = 5
+    PDF_BREAKER_OPEN_SECONDS = 60
+    PDF_BREAKER_MAX_OPEN_SECONDS = 900
+
+try:
+    from config import PDF_SOURCE_TIMEOUT_MULTIPLIER, PDF_SOURCE_MIN_TIMEOUT
+except ImportError:
+    PDF_SOURCE_TIMEOUT_MULTIPLIER = 2.0
+    PDF_SOURCE_MIN_TIMEOUT = 3.0
+
+try:
+    from config import PDF_SOURCE_RANKING_REFRESH_SECONDS
+except ImportError:
+    PDF_SOURCE_RANKING_REFRESH_SECONDS = 30
+
+DEFAULT_TIMEOUT = 15  # seconds, try_source's default
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Failure messages from pdf_sources that mean the source is unreachable or broken
+_OUTAGE_PATTERN = re.compile(
+    r"timeout|timed out|connection|HTTP 5\d\d|server error",
+    re.IGNORECASE
+)
+
+
+def is_outage(message: Optional[str]) -> bool:
+    """True if a failed lookup's message means the source is down rather than without the paper."""
+    return bool(message) and bool(_OUTAGE_PATTERN.search(message))
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one source."""
+
+    def __init__(self, name: str,
+                 failure_threshold: int = PDF_BREAKER_FAILURE_THRESHOLD,
+                 open_seconds: float = PDF_BREAKER_OPEN_SECONDS,
+                 max_open_seconds: float = PDF_BREAKER_MAX_OPEN_SECONDS,
+                 clock: Callable[[], float] = time.time,
+                 on_change: Optional[Callable[["CircuitBreaker"], None]] = None):
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.base_open_seconds = float(open_seconds)
+        self.max_open_seconds = max(float(max_open_seconds), self.base_open_seconds)
+        self.clock = clock
+        self.on_change = on_change
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.open_seconds = self.base_open_seconds
+        self.opened_at = None
+        self.retry_at = None
+        self.probe_started_at = None
+        self.trips = 0
+        self.last_failure = None
+        self._lock = threading.Lock()
+
+    def _changed(self) -> None:
+        if self.on_change:
+            self.on_change(self)
+
+    def is_open(self) -> bool:
+        """True while lookups are being skipped (open, and not yet due for a probe)."""
+        with self._lock:
+            if self.state == OPEN:
+                return self.clock() < self.retry_at
+            if self.state == HALF_OPEN:
+                # A probe is in flight; a probe that never reported is replaced after open_seconds
+                return self.clock() < self.probe_started_at + self.open_seconds
+            return False
+
+    def allow(self) -> bool:
+        """True if a lookup may go through now (in half-open state, only the one probe)."""
+        with self._lock:
+            now = self.clock()
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and now < self.retry_at:
+                return False
+            if self.state == HALF_OPEN and now < self.probe_started_at + self.open_seconds:
+                return False
+            self.state = HALF_OPEN
+            self.probe_started_at = now
+        self._changed()
+        return True
+
+    def record_success(self) -> None:
+        """The source answered (with or without the paper)."""
+        with self._lock:
+            changed = self.state != CLOSED
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self.open_seconds = self.base_open_seconds
+            self.opened_at = self.retry_at = self.probe_started_at = None
+        if changed:
+            self._changed()
+
+    def record_failure(self, message: Optional[str] = None) -> None:
+        """The lookup timed out, could not connect or got a server error."""
+        with self._lock:
+            now = self.clock()
+            self.consecutive_failures += 1
+            self.last_failure = message
+            if self.state == HALF_OPEN:
+                self.open_seconds = min(self.open_seconds * 2, self.max_open_seconds)
+            elif self.state == OPEN or self.consecutive_failures < self.failure_threshold:
+                return
+            self.state = OPEN
+            self.trips += 1
+            self.opened_at = now
+            self.retry_at = now + self.open_seconds
+            self.probe_started_at = None
+        print(f"[Source Health] Circuit open for {self.name} after {self.consecutive_failures} "
+              f"failures ({message}); next probe in {self.open_seconds:.0f}s")
+        self._changed()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "source_name": self.name,
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "opened_at": self.opened_at,
+                "retry_at": self.retry_at,
+                "trips": self.trips,
+                "last_failure": self.last_failure,
+            }
+
+
+def _persist(breaker: CircuitBreaker) -> None:
+    from pdf_download_db import save_breaker_state
+    save_breaker_state(**breaker.snapshot())
+
+
+class SourceHealth:
+    """Breakers and adaptive timeouts for all sources, shared by the download threads."""
+
+    def __init__(self, refresh_seconds: float = PDF_SOURCE_RANKING_REFRESH_SECONDS,
+                 timeout_multiplier: float = PDF_SOURCE_TIMEOUT_MULTIPLIER,
+                 min_timeout: float = PDF_SOURCE_MIN_TIMEOUT,
+                 persist: bool = True, **breaker_options):
+        self.refresh_seconds = float(refresh_seconds)
+        self.timeout_multiplier = float(timeout_multiplier)
+        self.min_timeout = float(min_timeout)
+        self.breaker_options = breaker_options
+        if persist:
+            self.breaker_options.setdefault("on_change", _persist)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._timeouts: Dict[str, float] = {}
+        self._p50: Dict[str, float] = {}
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def breaker(self, source_name: str) -> CircuitBreaker:
+        with self._lock:
+            if source_name not in self._breakers:
+                self._breakers[source_name] = CircuitBreaker(source_name, **self.breaker_options)
+            return self._breakers[source_name]
+
+    def is_open(self, source_name: str) -> bool:
+        return self.breaker(source_name).is_open()
+
+    def allow(self, source_name: str) -> bool:
+        return self.breaker(source_name).allow()
+
+    def record(self, source_name: str, success: bool, message: Optional[str] = None) -> None:
+        """Feed a lookup result to the source's breaker."""
+        if not success and is_outage(message):
+            self.breaker(source_name).record_failure(message)
+        else:
+            self.breaker(source_name).record_success()
+
+    def _load_timeouts(self) -> None:
+        import pdf_download_db
+
+        ceilings = {s["name"]: s.get("timeout") or DEFAULT_TIMEOUT for s in pdf_download_db.get_source_rankings()}
+        percentiles = pdf_download_db.get_source_latency_percentiles((0.5, 0.95))
+        timeouts = {}
+        for source_name, ceiling in ceilings.items():
+            p95 = percentiles.get(source_name, {}).get(0.95)
+            if p95 is None:
+                timeouts[source_name] = float(ceiling)
+            else:
+                adaptive = p95 / 1000.0 * self.timeout_multiplier
+                timeouts[source_name] = min(float(ceiling), max(self.min_timeout, adaptive))
+        self._timeouts = timeouts
+        self._p50 = {source_name: float(values[0.5]) for source_name, values in percentiles.items()}
+        self._loaded_at = time.monotonic()
+
+    def _refresh(self) -> None:
+        # Called with self._lock held
+        if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.refresh_seconds:
+            self._load_timeouts()
+
+    def timeout_for(self, source_name: str, default: float = DEFAULT_TIMEOUT) -> float:
+        """Lookup timeout (seconds) for the source, from its recent p95 latency."""
+        with self._lock:
+            self._refresh()
+            return self._timeouts.get(source_name, float(default))
+
+    def latency_p50(self) -> Dict[str, float]:
+        """Median lookup response time (ms) per source with enough history, for hedge delays."""
+        with self._lock:
+            self._refresh()
+            return dict(self._p50)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Breaker state and current timeout of every source seen by this process."""
+        with self._lock:
+            breakers = list(self._breakers.values())
+            timeouts = dict(self._timeouts)
+        states = {b.name: dict(b.snapshot(), timeout_seconds=timeouts.get(b.name)) for b in breakers}
+        for source_name, timeout in timeouts.items():
+            states.setdefault(source_name, {"source_name": source_name, "state": CLOSED, "timeout_seconds": timeout})
+        return states
+
+
+_health = None
+_health_lock = threading.Lock()
+
+
+def get_source_health() -> SourceHealth:
+    """Return the process-wide source health tracker."""
+    global _health
+    with _health_lock:
+        if _health is None:
+            _health = SourceHealth()
+        return _health
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Source ordering for PDF lookups.
+
+Instead of one global order by lifetime success rate, sources are ordered for
+each DOI by their expected cost to success at the DOI's publisher prefix:
+
+    cost = expected lookup latency / sampled success probability
+
+The success probability is drawn from Beta(1 + successes, 1 + failures)
+(Thompson sampling), so sources with little data still get tried now and then.
+Successes, failures and latencies are kept per (source, DOI prefix) in
+source_prefix_stats and decay with a half-life of PDF_SOURCE_STATS_HALF_LIFE_DAYS,
+so a source that stopped working falls behind. A prefix with few observations
+borrows PDF_SOURCE_PRIOR_WEIGHT pseudo-observations from the source's record
+across all prefixes.
+
+Sources that keep answering "not there" (failure categories in
+PERMANENT_FAILURE_CATEGORIES, e.g. not_found) for a prefix are suppressed: when
+the 95% upper bound of their hit rate at the prefix is below
+PDF_SOURCE_SUPPRESS_MAX_HIT_RATE they are skipped, except for a re-probe with
+probability PDF_SOURCE_REPROBE_RATE so a source that starts carrying the
+publisher is noticed. Temporary failures (timeouts, rate limits) are no evidence.
+
+The statistics and the list of enabled sources are loaded into memory and
+reloaded every PDF_SOURCE_RANKING_REFRESH_SECONDS, not queried for every DOI.
+"""
+
+import math
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Import configuration
+try:
+    from config import (
+        PDF_SOURCE_RANKING_REFRESH_SECONDS, PDF_SOURCE_PRIOR_WEIGHT, PDF_SOURCE_DEFAULT_LATENCY_MS
+    )
+except ImportError:
+    PDF_SOURCE_RANKING_REFRESH_SECONDS = 30
+    PDF_SOURCE_PRIOR_WEIGHT = 2.0
+    PDF_SOURCE_DEFAULT_LATENCY_MS = 3000
+
+try:
+    from config import PDF_SOURCE_SUPPRESS_MAX_HIT_RATE, PDF_SOURCE_REPROBE_RATE
+except ImportError:
+    PDF_SOURCE_SUPPRESS_MAX_HIT_RATE = 0.05
+    PDF_SOURCE_REPROBE_RATE = 0.05
+
+_Z_95 = 1.96
+
+
+def hit_rate_upper_bound(successes: float, trials: float, z: float = _Z_95) -> float:
+    """Wilson score upper bound of a hit rate (1.0 without trials)."""
+    if trials <= 0:
+        return 1.0
+    rate = min(1.0, successes / trials)
+    denominator = 1.0 + z * z / trials
+    centre = rate + z * z / (2.0 * trials)
+    margin = z * math.sqrt(rate * (1.0 - rate) / trials + z * z / (4.0 * trials * trials))
+    return min(1.0, (centre + margin) / denominator)
+
+
+class SourceRanker:
+    """Thompson-sampling source order per DOI prefix, from cached time-decayed statistics."""
+
+    def __init__(self, refresh_seconds: float = PDF_SOURCE_RANKING_REFRESH_SECONDS,
+                 prior_weight: float = PDF_SOURCE_PRIOR_WEIGHT,
+                 default_latency_ms: float = PDF_SOURCE_DEFAULT_LATENCY_MS,
+                 suppress_max_hit_rate: float = PDF_SOURCE_SUPPRESS_MAX_HIT_RATE,
+                 reprobe_rate: float = PDF_SOURCE_REPROBE_RATE,
+                 rng: Optional[random.Random] = None):
+        self.refresh_seconds = float(refresh_seconds)
+        self.prior_weight = max(0.0, float(prior_weight))
+        self.default_latency_ms = float(default_latency_ms)
+        self.suppress_max_hit_rate = float(suppress_max_hit_rate)
+        self.reprobe_rate = float(reprobe_rate)
+        self._rng = rng or random.Random()
+        self._sources: List[Dict] = []
+        # (source, prefix) -> (successes, failures, latency_ms, latency_weight), decayed to load time
+        self._stats: Dict[Tuple[str, str], Tuple[float, float, float, float]] = {}
+        # source -> the same, summed over all prefixes
+        self._overall: Dict[str, Tuple[float, float, float, float]] = {}
+        # (source, prefix) -> (successes, permanent failures), decayed to load time
+        self._evidence: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> None:
+        import pdf_download_db
+
+        now = time.time()
+        stats = {}
+        overall = {}
+        evidence = {}
+        for row in pdf_download_db.get_source_prefix_stats():
+            decay = pdf_download_db.decay_factor(now - row["updated_at"])
+            successes = row["successes"] * decay
+            failures = row["failures"] * decay
+            latency_weight = row["latency_weight"] * decay
+            stats[(row["source_name"], row["doi_prefix"])] = (
+                successes, failures, row["latency_ms"], latency_weight
+            )
+            evidence[(row["source_name"], row["doi_prefix"])] = (successes, row["permanent_failures"] * decay)
+            total_s, total_f, latency_sum, total_w = overall.get(row["source_name"], (0.0, 0.0, 0.0, 0.0))
+            overall[row["source_name"]] = (total_s + successes, total_f + failures,
+                                           latency_sum + row["latency_ms"] * latency_weight,
+                                           total_w + latency_weight)
+        self._overall = {
+            name: (s, f, latency_sum / w if w > 0 else 0.0, w)
+            for name, (s, f, latency_sum, w) in overall.items()
+        }
+        self._stats = stats
+        self._evidence = evidence
+        self._sources = pdf_download_db.get_source_rankings()
+        self._loaded_at = time.monotonic()
+
+    def _refresh(self) -> None:
+        with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.refresh_seconds:
+                self._load()
+
+    def invalidate(self) -> None:
+        """Reload the statistics on the next ranking."""
+        with self._lock:
+            self._loaded_at = None
+
+    def estimate(self, source: Dict, doi_prefix: str) -> Tuple[float, float, float]:
+        """Beta parameters (alpha, beta) of the source's success probability at the prefix, and its latency."""
+        name = source["name"]
+        successes, failures, latency, latency_weight = self._stats.get((name, doi_prefix), (0.0, 0.0, 0.0, 0.0))
+        all_s, all_f, all_latency, all_latency_weight = self._overall.get(name, (0.0, 0.0, 0.0, 0.0))
+
+        # Prior from the source's record across prefixes (lifetime success rate before any decayed data)
+        observed = all_s + all_f
+        if observed > 0:
+            prior_rate, prior_n = all_s / observed, observed
+        elif source.get("total_attempts"):
+            prior_rate, prior_n = (source.get("success_rate") or 0.0) / 100.0, source["total_attempts"]
+        else:
+            prior_rate, prior_n = 0.5, 0.0
+        weight = min(self.prior_weight, prior_n)
+        alpha = 1.0 + successes + weight * prior_rate
+        beta = 1.0 + failures + weight * (1.0 - prior_rate)
+
+        if latency_weight >= 1.0:
+            expected_latency = latency
+        elif all_latency_weight > 0:
+            expected_latency = all_latency
+        else:
+            expected_latency = source.get("avg_response_time_ms") or self.default_latency_ms
+        return alpha, beta, max(1.0, expected_latency)
+
+    def is_suppressed(self, source_name: str, doi_prefix: str) -> bool:
+        """True if the source confidently (almost) never has papers of this prefix."""
+        self._refresh()
+        successes, permanent_failures = self._evidence.get((source_name, doi_prefix), (0.0, 0.0))
+        upper = hit_rate_upper_bound(successes, successes + permanent_failures)
+        return upper < self.suppress_max_hit_rate
+
+    def should_skip(self, source_name: str, doi_prefix: str) -> bool:
+        """True if a suppressed source should be skipped for this DOI (False when re-probing it)."""
+        return self.is_suppressed(source_name, doi_prefix) and self._rng.random() >= self.reprobe_rate
+
+    def rank(self, doi_prefix: str) -> List[Dict]:
+        """
+        Enabled sources (as from get_source_rankings) ordered by sampled expected cost to
+        success at doi_prefix, cheapest first. Each dict gets "sampled_success_rate" and
+        "expected_cost_ms".
+        """
+        self._refresh()
+        scored = []
+        for source in self._sources:
+            alpha, beta, latency = self.estimate(source, doi_prefix)
+            sampled = max(self._rng.betavariate(alpha, beta), 1e-6)
+            scored.append(dict(source, sampled_success_rate=sampled, expected_cost_ms=latency / sampled))
+        scored.sort(key=lambda s: (s["expected_cost_ms"], s.get("priority", 100)))
+        return scored
+
+
+_ranker = None
+_ranker_lock = threading.Lock()
+
+
+def get_source_ranker() -> SourceRanker:
+    """Return the process-wide ranker."""
+    global _ranker
+    with _ranker_lock:
+        if _ranker is None:
+            _ranker = SourceRanker()
+        return _ranker
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Split an existing harvest database into per-project shard files.
+
+Moves each project's triples, sentences, batches and annotation statuses from the
+central database into <shard_dir>/project_<id>.db (see ENABLE_PROJECT_SHARDING in
+config.py). Row ids are renumbered into the project's id range so the owning shard
+can be derived from a sentence/triple id. Schema types, projects, admins and settings
+stay in the central database. Sentences shared by several projects are copied into
+each shard; sentences without project triples stay central.
+
+Run with the backend stopped, then set ENABLE_PROJECT_SHARDING = True.
+"""
+
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from harvest_store import (
+    SHARD_ID_SPAN,
+    SHARDED_TABLE_COLUMNS,
+    configure_project_sharding,
+    get_shard_path,
+    init_shard_db,
+)
+
+# Import configuration
+try:
+    from config import DB_PATH
+except ImportError:
+    # Fallback to environment variable if config.py doesn't exist
+    DB_PATH = os.environ.get("HARVEST_DB", "harvest.db")
+
+try:
+    from config import PROJECT_SHARD_DIR
+except ImportError:
+    PROJECT_SHARD_DIR = "project_shards"
+
+DB_PATH = os.environ.get("HARVEST_DB", DB_PATH)
+PROJECT_SHARD_DIR = os.environ.get("HARVEST_PROJECT_SHARD_DIR", PROJECT_SHARD_DIR)
+
+
+def _columns(table, renumber=None):
+    """Column list for INSERT ... SELECT, offsetting the given id columns by ? placeholders."""
+    renumber = renumber or {}
+    return ", ".join(f"{col} + ?" if col in renumber else col for col in SHARDED_TABLE_COLUMNS[table])
+
+
+def split_project(conn, db_path, project_id, dry_run=True):
+    """Move one project's rows into its shard. Returns a dict of row counts."""
+    cur = conn.cursor()
+    counts = {}
+    for table in ("triples", "doi_batches", "doi_batch_assignments", "doi_annotation_status"):
+        cur.execute(f"SELECT COUNT(*) FROM main.{table} WHERE project_id = ?;", (project_id,))
+        counts[table] = cur.fetchone()[0]
+    cur.execute("""SELECT COUNT(DISTINCT sentence_id) FROM main.triples WHERE project_id = ?;""", (project_id,))
+    counts["sentences"] = cur.fetchone()[0]
+
+    if dry_run or not any(counts.values()):
+        return counts
+
+    shard_path = get_shard_path(db_path, project_id)
+    init_shard_db(shard_path, project_id)
+    base = project_id * SHARD_ID_SPAN
+
+    cur.execute("ATTACH DATABASE ? AS shard;", (shard_path,))
+    try:
+        cur.execute("BEGIN;")
+        cols = ", ".join(SHARDED_TABLE_COLUMNS["sentences"])
+        cur.execute(f"""INSERT INTO shard.sentences({cols})
+                        SELECT {_columns("sentences", {"id"})} FROM main.sentences
+                        WHERE id IN (SELECT sentence_id FROM main.triples WHERE project_id = ?);""",
+                    (base, project_id))
+        cols = ", ".join(SHARDED_TABLE_COLUMNS["triples"])
+        cur.execute(f"""INSERT INTO shard.triples({cols})
+                        SELECT {_columns("triples", {"id", "sentence_id"})} FROM main.triples
+                        WHERE project_id = ?;""",
+                    (base, base, project_id))
+        cols = ", ".join(SHARDED_TABLE_COLUMNS["doi_batches"])
+        cur.execute(f"""INSERT INTO shard.doi_batches({cols})
+                        SELECT {_columns("doi_batches", {"batch_id"})} FROM main.doi_batches
+                        WHERE project_id = ?;""",
+                    (base, project_id))
+        cols = ", ".join(SHARDED_TABLE_COLUMNS["doi_batch_assignments"])
+        cur.execute(f"""INSERT INTO shard.doi_batch_assignments({cols})
+                        SELECT {_columns("doi_batch_assignments", {"batch_id"})} FROM main.doi_batch_assignments
+                        WHERE project_id = ?;""",
+                    (base, project_id))
+        cols = ", ".join(SHARDED_TABLE_COLUMNS["doi_annotation_status"])
+        cur.execute(f"""INSERT INTO shard.doi_annotation_status({cols})
+                        SELECT {cols} FROM main.doi_annotation_status
+                        WHERE project_id = ?;""",
+                    (project_id,))
+
+        # Remove the moved rows from the central database
+        cur.execute("""CREATE TEMP TABLE moved_sentences AS
+                       SELECT DISTINCT sentence_id AS id FROM main.triples WHERE project_id = ?;""",
+                    (project_id,))
+        cur.execute("DELETE FROM main.triples WHERE project_id = ?;", (project_id,))
+        cur.execute("""DELETE FROM main.sentences
+                       WHERE id IN (SELECT id FROM temp.moved_sentences)
+                       AND id NOT IN (SELECT sentence_id FROM main.triples);""")
+        cur.execute("DROP TABLE temp.moved_sentences;")
+        cur.execute("DELETE FROM main.doi_annotation_status WHERE project_id = ?;", (project_id,))
+        cur.execute("DELETE FROM main.doi_batch_assignments WHERE project_id = ?;", (project_id,))
+        cur.execute("DELETE FROM main.doi_batches WHERE project_id = ?;", (project_id,))
+        cur.execute("COMMIT;")
+    except Exception:
+        cur.execute("ROLLBACK;")
+        raise
+    finally:
+        cur.execute("DETACH DATABASE shard;")
+    return counts
+
+
+def split_project_shards(db_path=DB_PATH, shard_dir=PROJECT_SHARD_DIR, dry_run=True):
+    """
+    Split every project in the central database into its own shard file.
+
+    Args:
+        db_path: Path to the central database
+        shard_dir: Shard directory (relative paths resolve next to db_path)
+        dry_run: If True, only report what would be moved.
+
+    Returns:
+        True if successful, False otherwise
+    """
+    print(f"{'DRY RUN: ' if dry_run else ''}Splitting {db_path} into project shards")
+
+    if not os.path.exists(db_path):
+        print("Database does not exist.")
+        return False
+
+    configure_project_sharding(True, shard_dir)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute("PRAGMA foreign_keys = OFF;")  # rows are deleted in dependency order
+
+    try:
+        project_ids = [row[0] for row in conn.execute("SELECT id FROM projects ORDER BY id;")]
+        if not project_ids:
+            print("✓ No projects found.")
+            return True
+
+        for project_id in project_ids:
+            counts = split_project(conn, db_path, project_id, dry_run=dry_run)
+            summary = ", ".join(f"{n} {table}" for table, n in counts.items())
+            action = "would move" if dry_run else "moved"
+            print(f"  Project {project_id}: {action} {summary}")
+
+        if dry_run:
+            print("\nDRY RUN: No changes made. Run with --execute to split the database.")
+        else:
+            print(f"\n✅ Split {len(project_ids)} project(s) into {os.path.dirname(get_shard_path(db_path, 0))}")
+            print("Set ENABLE_PROJECT_SHARDING = True in config.py before restarting the backend.")
+        return True
+    except Exception as e:
+        print(f"\n❌ Shard split failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Split a harvest database into per-project shard files")
+    parser.add_argument("--execute", action="store_true", help="Actually move the data (default is dry-run)")
+    parser.add_argument("--db", default=DB_PATH, help="Path to the central database")
+    parser.add_argument("--shard-dir", default=PROJECT_SHARD_DIR, help="Directory for project shard files")
+    args = parser.parse_args()
+
+    ok = split_project_shards(args.db, args.shard_dir, dry_run=not args.execute)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for the shared admin token store and verified-credential cache
+Tests that admin tokens persist in the database (so every worker accepts them),
+that repeated admin password checks skip bcrypt, and that admin endpoints
+accept tokens in the payload or the Authorization header.
+"""
+
+import sys
+import os
+import tempfile
+import shutil
+import time
+
+# Add parent directory to path to import harvest_store
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import harvest_store
+from harvest_store import (
+    init_db, create_admin_user, verify_admin_password, clear_credential_cache,
+    store_admin_token, get_admin_token_email, delete_admin_token,
+    cleanup_expired_admin_tokens,
+)
+
+
+def test_token_store_is_shared():
+    """Tokens are readable through any connection and expire/revoke correctly"""
+    print("Testing database-backed admin token store...")
+    tmp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(tmp_dir, "harvest.db")
+    try:
+        init_db(db_path)
+        assert store_admin_token(db_path, "tok-valid", "admin@example.com", time.time() + 60)
+        assert store_admin_token(db_path, "tok-expired", "admin@example.com", time.time() - 1)
+
+        assert get_admin_token_email(db_path, "tok-valid") == "admin@example.com"
+        assert get_admin_token_email(db_path, "tok-expired") is None, "Expired token must be rejected"
+        assert get_admin_token_email(db_path, "unknown") is None
+
+        conn = harvest_store.get_conn(db_path)
+        stored = [row[0] for row in conn.execute("SELECT token_hash FROM admin_tokens")]
+        conn.close()
+        assert "tok-valid" not in stored, "Raw tokens must not be stored"
+
+        store_admin_token(db_path, "tok-old", "admin@example.com", time.time() - 1)
+        assert cleanup_expired_admin_tokens(db_path) == 1
+        assert delete_admin_token(db_path, "tok-valid")
+        assert get_admin_token_email(db_path, "tok-valid") is None
+
+        print("✓ Admin tokens stored, expired and revoked in the database")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def test_credential_cache_skips_bcrypt():
+    """A verified password is cached; wrong or changed passwords are not"""
+    print("\nTesting verified-credential cache...")
+    tmp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(tmp_dir, "harvest.db")
+    import bcrypt
+    original_checkpw = bcrypt.checkpw
+    calls = []
+
+    def counting_checkpw(password, hashed):
+        calls.append(1)
+        return original_checkpw(password, hashed)
+
+    try:
+        init_db(db_path)
+        clear_credential_cache()
+        create_admin_user(db_path, "admin@example.com", "secret")
+        bcrypt.checkpw = counting_checkpw
+
+        assert verify_admin_password(db_path, "admin@example.com", "secret")
+        assert verify_admin_password(db_path, "admin@example.com", "secret")
+        assert len(calls) == 1, f"Expected one bcrypt check, got {len(calls)}"
+
+        assert not verify_admin_password(db_path, "admin@example.com", "wrong")
+        assert not verify_admin_password(db_path, "admin@example.com", "wrong")
+        assert len(calls) == 3, "Failed checks must not be cached"
+
+        # Changing the password invalidates the cached entry
+        create_admin_user(db_path, "admin@example.com", "new-secret")
+        assert not verify_admin_password(db_path, "admin@example.com", "secret")
+
+        print("✓ Repeated admin checks avoid bcrypt")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        bcrypt.checkpw = original_checkpw
+        clear_credential_cache()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def test_endpoints_accept_tokens():
+    """Admin endpoints accept a token in the payload or the Authorization header"""
+    print("\nTesting token auth on admin endpoints...")
+    tmp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(tmp_dir, "harvest.db")
+    os.environ["HARVEST_DB"] = db_path
+    try:
+        init_db(db_path)
+        create_admin_user(db_path, "admin@example.com", "secret")
+
+        import harvest_be
+        harvest_be.DB_PATH = db_path
+        client = harvest_be.app.test_client()
+
+        resp = client.post("/api/admin/auth", json={"email": "admin@example.com", "password": "secret"})
+        assert resp.status_code == 200
+        token = resp.get_json()["token"]
+
+        resp = client.post("/api/admin/projects/999/batches", json={"token": token, "batch_size": 5})
+        assert resp.status_code != 401 and resp.status_code != 403, f"Token rejected: {resp.status_code}"
+
+        resp = client.get("/api/admin/pdf-analytics/sources",
+                          headers={"Authorization": f"Bearer {token}"})
+        assert resp.status_code not in (401, 403), f"Bearer token rejected: {resp.status_code}"
+        # The analytics endpoints share the backend's admin check
+        assert client.get("/api/admin/pdf-analytics/sources").status_code == 401
+        resp = client.get("/api/admin/pdf-analytics/sources",
+                          json={"email": "admin@example.com", "password": "wrong"})
+        assert resp.status_code == 403, "An admin email needs the right password"
+
+        resp = client.post("/api/admin/validate-dois", json={"token": "bogus", "dois": ["10.1/x"]})
+        assert resp.status_code == 403
+
+        resp = client.post("/api/admin/logout", json={"token": token})
+        assert resp.get_json()["revoked"] is True
+        resp = client.post("/api/admin/validate-dois", json={"token": token, "dois": ["10.1/x"]})
+        assert resp.status_code == 403, "Revoked token must be rejected"
+
+        print("✓ Admin endpoints accept session tokens")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("Admin Token Store Tests")
+    print("=" * 70)
+    print()
+
+    tests = [
+        test_token_store_is_shared,
+        test_credential_cache_skips_bcrypt,
+        test_endpoints_accept_tokens,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
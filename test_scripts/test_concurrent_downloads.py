@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for concurrent PDF downloads (pdf_manager.process_dois_smart)
+Tests that DOIs are downloaded in parallel while progress callbacks keep their
+contract (called from the calling thread, once per DOI, with increasing idx),
+that a callback exception cancels the remaining downloads, and that
+HostLimiter enforces per-host concurrency and request rates.
+Downloads are simulated so the test runs offline.
+"""
+
+import sys
+import os
+import tempfile
+import shutil
+import threading
+import time
+from unittest import mock
+
+# Add parent directory to path to import harvest modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tmp_dir = tempfile.mkdtemp()
+os.environ["HARVEST_DB"] = os.path.join(tmp_dir, "harvest.db")
+
+import pdf_manager
+from host_limiter import HostLimiter, source_host, url_host
+
+
+def fake_download(doi, project_id, save_dir, progress_callback=None, cancel_event=None, resolution=None):
+    time.sleep(0.2)
+    if doi.endswith("missing"):
+        return False, "All download sources failed", "none"
+    return True, f"Downloaded {doi}", "unpaywall"
+
+
+def test_parallel_downloads_keep_callback_contract():
+    """DOIs run in parallel; callbacks come from the caller with increasing idx"""
+    print("Testing concurrent DOI processing...")
+    try:
+        dois = [f"10.1234/paper{i}" for i in range(9)] + ["10.1234/missing", "not-a-doi", "10.1234/paper0"]
+        calls = []
+        caller = threading.get_ident()
+
+        def callback(idx, doi, success, message, source):
+            assert threading.get_ident() == caller, "Callbacks run on the calling thread"
+            calls.append((idx, doi, success, source))
+
+        with mock.patch.object(pdf_manager, "download_pdf_smart", side_effect=fake_download) as download:
+            start = time.time()
+            results = pdf_manager.process_dois_smart(dois, 1, os.path.join(tmp_dir, "pdfs"), callback, max_workers=5)
+            elapsed = time.time() - start
+
+        assert download.call_count == 10, "Each distinct valid DOI is downloaded once"
+        assert elapsed < 1.0, f"10 downloads of 0.2 s with 5 workers took {elapsed:.2f} s"
+        assert [c[0] for c in calls] == list(range(12)), "idx counts finished DOIs"
+        assert len(results["downloaded"]) == 10 and len(results["needs_upload"]) == 1
+        assert results["errors"] == [("not-a-doi", "Invalid DOI format")]
+        assert sum(1 for c in calls if c[1] == "10.1234/paper0") == 2, "Duplicates reported per occurrence"
+
+        # A failing callback (job cancelled) stops the remaining DOIs
+        def cancel(idx, *args):
+            if idx == 1:
+                raise RuntimeError("cancelled")
+
+        with mock.patch.object(pdf_manager, "download_pdf_smart", side_effect=fake_download) as download:
+            try:
+                pdf_manager.process_dois_smart([f"10.1/x{i}" for i in range(40)], 1, tmp_dir, cancel, max_workers=2)
+                raise AssertionError("Expected the callback exception")
+            except RuntimeError as e:
+                assert str(e) == "cancelled"
+            assert download.call_count < 10, "Queued DOIs are not started after cancellation"
+        print("✓ Parallel downloads with unchanged progress contract")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_host_limits():
+    """Per-host concurrency and rate limits; different hosts do not wait for each other"""
+    print("\nTesting per-host limits...")
+    try:
+        limiter = HostLimiter(default_concurrency=2, default_rps=0,
+                              limits={"slow.example.org": {"concurrency": 1, "rps": 10}})
+        in_flight = {"fast.example.org": 0, "slow.example.org": 0}
+        peak = dict(in_flight)
+        lock = threading.Lock()
+        starts = []
+
+        def request(host):
+            with limiter.limit(host):
+                with lock:
+                    in_flight[host] += 1
+                    peak[host] = max(peak[host], in_flight[host])
+                    if host == "slow.example.org":
+                        starts.append(time.monotonic())
+                time.sleep(0.05)
+                with lock:
+                    in_flight[host] -= 1
+
+        threads = [threading.Thread(target=request, args=(host,))
+                   for host in ["fast.example.org"] * 6 + ["slow.example.org"] * 4]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert peak["fast.example.org"] == 2 and peak["slow.example.org"] == 1
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+        assert min(gaps) >= 0.09, f"Request starts are spaced by 1/rps: {gaps}"
+
+        assert source_host("europe_pmc") == "www.ebi.ac.uk"
+        assert source_host("publisher_direct", "10.1371/journal.pone.1") == "publisher:10.1371"
+        assert url_host("https://EuropePMC.org/articles/PMC1?pdf=render") == "europepmc.org"
+        print("✓ Host limits enforced")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("Concurrent Download Tests")
+    print("=" * 70)
+    print()
+
+    # The PDF tracking database is created in the working directory
+    original_cwd = os.getcwd()
+    os.chdir(tmp_dir)
+
+    tests = [
+        test_parallel_downloads_keep_callback_contract,
+        test_host_limits,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    os.chdir(original_cwd)
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
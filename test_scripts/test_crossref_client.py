@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for the shared CrossRef client
+Tests the token bucket rate limit, retries with backoff on 429 responses
+(honouring Retry-After), batched filter=doi: lookups with per-DOI fallback,
+and adaptation to the rate limit advertised by CrossRef.
+CrossRef responses are simulated so the test runs offline.
+"""
+
+import sys
+import os
+import time
+from unittest import mock
+
+import requests
+
+# Add parent directory to path to import crossref_client
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crossref_client import CrossRefClient, TokenBucket, NOT_FOUND_REASON
+
+
+def _response(status, items=None, headers=None):
+    response = mock.Mock()
+    response.status_code = status
+    response.headers = headers or {}
+    response.json.return_value = {"message": {"items": items or []}}
+    if status >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(f"HTTP {status}")
+    return response
+
+
+def test_token_bucket_limits_rate():
+    """Requests beyond the burst capacity wait for new tokens"""
+    print("Testing token bucket rate limiting...")
+    try:
+        bucket = TokenBucket(rate=20, capacity=2)
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        elapsed = time.monotonic() - start
+        # 2 tokens are available immediately, the other 4 arrive at 20/s
+        assert elapsed >= 0.18, f"Bucket allowed requests too fast ({elapsed:.3f}s)"
+        print(f"✓ 6 acquisitions took {elapsed:.2f}s")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_retry_on_429():
+    """429 responses are retried after Retry-After / jittered backoff"""
+    print("\nTesting retry with backoff on HTTP 429...")
+    try:
+        client = CrossRefClient(rate_per_second=100, max_retries=3)
+        responses = [
+            _response(429, headers={"Retry-After": "0"}),
+            _response(503),
+            _response(200, items=[{"DOI": "10.1/A"}]),
+        ]
+        with mock.patch.object(client.session, "get", side_effect=responses) as get, \
+                mock.patch("crossref_client.time.sleep") as sleep:
+            found = client.lookup_works(["10.1/a"])
+        assert get.call_count == 3, f"Expected 3 attempts, got {get.call_count}"
+        assert sleep.call_count == 2, "Each retry should back off"
+        assert sleep.call_args_list[0][0][0] == 0, "Retry-After should be honoured"
+        assert list(found) == ["10.1/a"]
+
+        with mock.patch.object(client.session, "get", return_value=_response(429)) as get, \
+                mock.patch("crossref_client.time.sleep"):
+            response = client.get("/works")
+        assert response.status_code == 429 and get.call_count == 4, "Retries must be bounded"
+
+        print("✓ Throttled requests retried with backoff")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_batch_validation():
+    """Many DOIs are validated per request; a failing batch falls back to single lookups"""
+    print("\nTesting batched DOI validation...")
+    try:
+        client = CrossRefClient(rate_per_second=100, batch_size=2)
+        params_seen = []
+
+        def fake_get(url, params=None, timeout=None):
+            params_seen.append(params)
+            dois = [f.split(":", 1)[1] for f in params["filter"].split(",")]
+            return _response(200, items=[{"DOI": d.upper()} for d in dois if d != "10.1/missing"])
+
+        dois = ["10.1/a", "10.1/b", "10.1/missing", "10.1/a"]
+        with mock.patch.object(client.session, "get", side_effect=fake_get):
+            results = client.validate_dois(dois)
+        assert len(params_seen) == 2, f"Expected 2 batch requests, got {len(params_seen)}"
+        assert params_seen[0]["filter"] == "doi:10.1/a,doi:10.1/b"
+        assert results["10.1/a"] == (True, "", True)
+        assert results["10.1/missing"] == (False, NOT_FOUND_REASON, True)
+
+        # Batch query rejected -> each DOI is checked on its own
+        def single_get(url, params=None, timeout=None):
+            if url.endswith("/works"):
+                return _response(400)
+            response = _response(404 if url.endswith("missing") else 200)
+            response.json.return_value = {"message": {}}
+            return response
+
+        with mock.patch.object(client.session, "get", side_effect=single_get) as get:
+            results = client.validate_dois(["10.1/a", "10.1/missing"])
+        assert get.call_count == 3
+        assert results["10.1/a"][0] is True and results["10.1/missing"][0] is False
+
+        print("✓ DOIs validated in batches")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_adapts_to_advertised_rate():
+    """The bucket follows X-Rate-Limit headers without exceeding the configured maximum"""
+    print("\nTesting adaptation to X-Rate-Limit headers...")
+    try:
+        client = CrossRefClient(rate_per_second=10)
+        client._adapt_rate(_response(200, headers={"X-Rate-Limit-Limit": "5", "X-Rate-Limit-Interval": "1s"}))
+        assert client.bucket.rate == 5
+        client._adapt_rate(_response(200, headers={"X-Rate-Limit-Limit": "50", "X-Rate-Limit-Interval": "1s"}))
+        assert client.bucket.rate == 10, "Rate must not exceed the configured maximum"
+        print("✓ Rate follows CrossRef's advertised limit")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("CrossRef Client Tests")
+    print("=" * 70)
+    print()
+
+    tests = [
+        test_token_bucket_limits_rate,
+        test_retry_on_429,
+        test_batch_validation,
+        test_adapts_to_advertised_rate,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for stored CrossRef metadata (doi_metadata.py)
+Tests that /api/validate-doi fetches a DOI's metadata once and then serves it
+from the database, that stale metadata is returned immediately and refreshed
+in the background, and that the prefetch job stores metadata for a whole
+project with batched queries.
+CrossRef responses are simulated so the test runs offline.
+"""
+
+import sys
+import os
+import tempfile
+import shutil
+import time
+from unittest import mock
+
+# Add parent directory to path to import harvest modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tmp_dir = tempfile.mkdtemp()
+os.environ["HARVEST_DB"] = os.path.join(tmp_dir, "harvest.db")
+os.environ["HARVEST_JOB_WORKER_MODE"] = "external"
+
+import harvest_be
+import harvest_worker
+import doi_metadata
+from crossref_client import get_crossref_client
+from harvest_store import create_admin_user, create_project, get_cached_doi_metadata, get_conn
+
+DB_PATH = os.environ["HARVEST_DB"]
+ADMIN = {"email": "admin@example.com", "password": "secret"}
+TITLES = {"10.1234/a": "First title", "10.1234/b": "Second title", "10.1234/c": "Third title"}
+
+
+def _work(doi, title):
+    return {"DOI": doi, "title": [title], "author": [{"given": "Ada", "family": "Lovelace"}],
+            "published-print": {"date-parts": [[2021, 5]]}}
+
+
+def fake_get(url, params=None, timeout=None):
+    """Simulate CrossRef single-work and batch (filter=doi:...) queries"""
+    response = mock.Mock()
+    response.headers = {}
+    if params and "filter" in params:
+        dois = [f.split(":", 1)[1] for f in params["filter"].split(",")]
+        response.status_code = 200
+        response.json.return_value = {"message": {"items": [
+            _work(doi, TITLES[doi]) for doi in dois if doi in TITLES
+        ]}}
+    else:
+        doi = url.split("/works/", 1)[1]
+        response.status_code = 200 if doi in TITLES else 404
+        response.json.return_value = {"message": _work(doi, TITLES.get(doi, ""))}
+    return response
+
+
+def test_validate_doi_uses_stored_metadata():
+    """Metadata is fetched once, then served from the store; stale entries refresh in the background"""
+    print("Testing stored metadata for /api/validate-doi...")
+    try:
+        client = harvest_be.app.test_client()
+        session = get_crossref_client().session
+        with mock.patch.object(session, "get", side_effect=fake_get) as get:
+            resp = client.post("/api/validate-doi", json={"doi": "https://doi.org/10.1234/A"})
+            data = resp.get_json()
+            assert data["valid"] and data["metadata"] == {
+                "title": "First title", "authors": "Ada Lovelace", "year": "2021"}
+            assert get.call_count == 1
+
+            for _ in range(3):
+                assert client.post("/api/validate-doi", json={"doi": "10.1234/a"}).get_json()["valid"]
+            assert get.call_count == 1, "Stored metadata must not hit CrossRef again"
+
+            assert not client.post("/api/validate-doi", json={"doi": "10.1234/zzz"}).get_json()["valid"]
+            assert "10.1234/zzz" not in get_cached_doi_metadata(DB_PATH, ["10.1234/zzz"])
+
+            # Stale: served at once, refreshed by the background thread
+            TITLES["10.1234/a"] = "Corrected title"
+            conn = get_conn(DB_PATH)
+            conn.execute("UPDATE doi_crossref_metadata SET fetched_at = ? WHERE doi = ?",
+                         (time.time() - doi_metadata.DOI_METADATA_TTL - 1, "10.1234/a"))
+            conn.close()
+            data = client.post("/api/validate-doi", json={"doi": "10.1234/a"}).get_json()
+            assert data["metadata"]["title"] == "First title", "Stale metadata is returned immediately"
+
+            deadline = time.time() + 5
+            while time.time() < deadline:
+                entry = get_cached_doi_metadata(DB_PATH, ["10.1234/a"])["10.1234/a"]
+                if entry["title"] == "Corrected title":
+                    break
+                time.sleep(0.05)
+            assert entry["title"] == "Corrected title", "Background refresh stores new metadata"
+            assert time.time() - entry["fetched_at"] < 60
+        print("✓ Metadata stored and revalidated in the background")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_project_prefetch_job():
+    """The prefetch job stores metadata for every DOI of a project in batches"""
+    print("\nTesting project metadata prefetch...")
+    try:
+        create_admin_user(DB_PATH, ADMIN["email"], ADMIN["password"])
+        dois = ["10.1234/a", "10.1234/b", "10.1234/c", "10.1234/gone"]
+        project_id = create_project(DB_PATH, "Prefetch", "", dois, ADMIN["email"])
+        client = harvest_be.app.test_client()
+        url = f"/api/admin/projects/{project_id}/prefetch-metadata"
+
+        status = client.get(url).get_json()
+        assert status["total"] == 4 and status["cached"] == 1 and status["job_status"] is None
+
+        resp = client.post(url, json=ADMIN)
+        assert resp.status_code == 202, resp.get_data(as_text=True)
+        assert client.post(url, json=ADMIN).get_json()["job_id"] == resp.get_json()["job_id"], "Deduplicated"
+        assert client.post(url, json={"email": ADMIN["email"], "password": "wrong"}).status_code == 403
+
+        session = get_crossref_client().session
+        with mock.patch.object(session, "get", side_effect=fake_get) as get:
+            assert harvest_worker.run_worker(DB_PATH, once=True, poll_interval=0) == 1
+            assert get.call_count == 1, "Missing DOIs are fetched with one batched query"
+
+        stored = get_cached_doi_metadata(DB_PATH, dois)
+        assert stored["10.1234/c"]["title"] == "Third title" and "10.1234/gone" not in stored
+        status = client.get(url).get_json()
+        assert status["cached"] == 3 and status["stale"] == 0 and status["job_status"] is None
+        print("✓ Project metadata prefetched")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("DOI Metadata Tests")
+    print("=" * 70)
+    print()
+
+    tests = [
+        test_validate_doi_uses_stored_metadata,
+        test_project_prefetch_job,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for the persistent DOI validation cache
+Tests that validation results are shared through the database, that cached
+entries are looked up in bulk before any CrossRef call, that negative results
+expire sooner than positive ones, and that the in-memory front stays bounded.
+CrossRef responses are simulated so the test runs offline.
+"""
+
+import sys
+import os
+import tempfile
+import shutil
+import time
+from unittest import mock
+
+# Add parent directory to path to import harvest_be
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tmp_dir = tempfile.mkdtemp()
+os.environ["HARVEST_DB"] = os.path.join(tmp_dir, "harvest.db")
+
+import harvest_be
+harvest_be.boot()
+from crossref_client import get_crossref_client
+from harvest_store import store_doi_validations
+
+NOT_FOUND = {"10.9999/missing"}
+
+
+def fake_get(url, params=None, timeout=None):
+    """Simulate CrossRef batch (filter=doi:...) queries"""
+    dois = [f.split(":", 1)[1] for f in params["filter"].split(",")]
+    response = mock.Mock()
+    response.status_code = 200
+    response.headers = {}
+    response.json.return_value = {"message": {"items": [
+        {"DOI": doi} for doi in dois if doi not in NOT_FOUND
+    ]}}
+    return response
+
+
+def _reset_memory():
+    harvest_be._doi_validation_cache.clear()
+    for key in harvest_be._doi_cache_stats:
+        harvest_be._doi_cache_stats[key] = 0
+
+
+def test_bulk_lookup_before_network():
+    """Second validation of the same list makes no CrossRef calls"""
+    print("Testing bulk cache lookup...")
+    try:
+        _reset_memory()
+        dois = ["10.1234/a", "10.1234/B", "10.9999/missing", "not-a-doi"]
+        session = get_crossref_client().session
+        with mock.patch.object(session, "get", side_effect=fake_get) as get:
+            valid, invalid = harvest_be.validate_dois_concurrent(dois)
+            assert get.call_count == 1, f"Expected one batched CrossRef call, got {get.call_count}"
+            assert sorted(valid) == ["10.1234/a", "10.1234/b"]
+            assert len(invalid) == 2
+
+            # New worker: empty memory, shared database cache
+            _reset_memory()
+            valid2, invalid2 = harvest_be.validate_dois_concurrent(dois)
+            assert get.call_count == 1, "Cached DOIs must not hit CrossRef again"
+            assert sorted(valid2) == sorted(valid)
+            assert harvest_be._doi_cache_stats["db_hits"] == 3
+
+            harvest_be.validate_dois_concurrent(dois)
+            assert harvest_be._doi_cache_stats["memory_hits"] == 3
+
+        stats = harvest_be.get_doi_cache_stats()
+        assert stats["hit_rate"] == 1.0 and stats["db_entries"]["invalid"] == 1
+        print("✓ Cached DOIs resolved without network calls")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_negative_results_expire_sooner():
+    """An old 'not found' entry is re-checked while an equally old valid entry is not"""
+    print("\nTesting separate positive/negative TTLs...")
+    try:
+        _reset_memory()
+        old = time.time() - harvest_be.DOI_CACHE_NEGATIVE_TTL - 10
+        with mock.patch("harvest_store.time.time", return_value=old):
+            store_doi_validations(harvest_be.DB_PATH, [
+                ("10.5555/old-valid", True, ""),
+                ("10.5555/old-invalid", False, "DOI not found in CrossRef database"),
+            ])
+        cached = harvest_be._doi_cache_get_many(["10.5555/old-valid", "10.5555/old-invalid"])
+        assert "10.5555/old-valid" in cached
+        assert "10.5555/old-invalid" not in cached, "Expired negative entry must be re-validated"
+        print("✓ Negative results use the shorter TTL")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_memory_front_is_bounded():
+    """The in-memory LRU never exceeds its configured size"""
+    print("\nTesting LRU bound of the in-memory cache...")
+    original = harvest_be.DOI_CACHE_MAX_MEMORY_ENTRIES
+    try:
+        _reset_memory()
+        harvest_be.DOI_CACHE_MAX_MEMORY_ENTRIES = 5
+        harvest_be._doi_cache_put_many([(f"10.7777/{i}", True, "") for i in range(20)])
+        assert len(harvest_be._doi_validation_cache) == 5
+        assert "10.7777/19" in harvest_be._doi_validation_cache
+        assert "10.7777/0" not in harvest_be._doi_validation_cache
+        print("✓ In-memory cache evicts least recently used DOIs")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        harvest_be.DOI_CACHE_MAX_MEMORY_ENTRIES = original
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("DOI Validation Cache Tests")
+    print("=" * 70)
+    print()
+
+    tests = [
+        test_bulk_lookup_before_network,
+        test_negative_results_expire_sooner,
+        test_memory_front_is_bounded,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for buffered download attempt logging (pdf_download_db.py)
+Tests that attempts logged by concurrent threads are written in a few batched
+transactions by the background writer, and that the source_performance
+aggregates (counts, mean response time, success rate) stay exact when several
+writers update the same database concurrently.
+"""
+
+import sys
+import os
+import tempfile
+import shutil
+import sqlite3
+import threading
+from unittest import mock
+
+# Add parent directory to path to import harvest modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tmp_dir = tempfile.mkdtemp()
+os.environ["HARVEST_DB"] = os.path.join(tmp_dir, "harvest.db")
+
+import pdf_download_db
+from pdf_download_db import (
+    flush_download_attempts, init_pdf_download_db, log_download_attempt, write_download_attempts
+)
+
+
+def run_threads(target, count):
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def performance(db_path, source_name):
+    conn = sqlite3.connect(db_path)
+    row = conn.execute("""SELECT total_attempts, success_count, failure_count, timed_attempts,
+                                 avg_response_time_ms, success_rate, last_success_at, last_failure_at
+                          FROM source_performance WHERE source_name = ?""", (source_name,)).fetchone()
+    conn.close()
+    return row
+
+
+def test_batched_writes():
+    """Concurrent attempts are buffered and written in batched transactions"""
+    print("Testing batched attempt writes...")
+    try:
+        db_path = os.path.join(tmp_dir, "batched.db")
+        init_pdf_download_db(db_path)
+        transactions = []
+
+        def counting_write(attempts, path=pdf_download_db.PDF_DB_PATH):
+            transactions.append(len(attempts))
+            return write_download_attempts(attempts, path)
+
+        def engine(n):
+            for i in range(30):
+                attempt_id = log_download_attempt(
+                    n, f"10.1000/{n}.{i}", "unpaywall", i % 3 == 0,
+                    response_time_ms=100, db_path=db_path
+                )
+                assert attempt_id == 0, "Buffered attempts are queued"
+
+        with mock.patch.object(pdf_download_db, "PDF_ATTEMPT_BUFFERING", True), \
+                mock.patch.object(pdf_download_db, "PDF_ATTEMPT_BATCH_SIZE", 50), \
+                mock.patch.object(pdf_download_db, "write_download_attempts", side_effect=counting_write):
+            run_threads(engine, 8)
+            assert flush_download_attempts(db_path), "Flush completes"
+
+        conn = sqlite3.connect(db_path)
+        attempts = conn.execute("SELECT COUNT(*) FROM download_attempts").fetchone()[0]
+        conn.close()
+        assert attempts == 240, attempts
+        assert sum(transactions) == 240 and len(transactions) < 20, transactions
+        assert max(transactions) <= 50, "Batches are capped at the batch size"
+        assert performance(db_path, "unpaywall")[:4] == (240, 80, 160, 240)
+        assert flush_download_attempts(db_path), "Flushing an empty buffer returns at once"
+        print(f"✓ 240 attempts written in {len(transactions)} transactions")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_concurrent_aggregates():
+    """source_performance stays exact with concurrent writers and is migrated from old databases"""
+    print("\nTesting source_performance aggregates...")
+    try:
+        db_path = os.path.join(tmp_dir, "aggregates.db")
+        init_pdf_download_db(db_path)
+
+        # Every thread writes its own single-attempt transactions (unbuffered engines)
+        def engine(n):
+            for i in range(25):
+                response_time = None if i % 5 == 4 else 100 * (n + 1)
+                assert write_download_attempts(
+                    [(1, f"10.2000/{n}.{i}", "core", int(i % 2 == 0), None, None,
+                      response_time, None, None, None, None)], db_path) > 0
+
+        run_threads(engine, 8)
+        total, successes, failures, timed, avg, rate, last_success, last_failure = performance(db_path, "core")
+        assert (total, successes, failures, timed) == (200, 104, 96, 160), (total, successes, failures, timed)
+        assert abs(avg - 450.0) < 1e-6, f"Mean of the timed attempts only: {avg}"
+        assert abs(rate - 52.0) < 1e-6, rate
+        assert last_success and last_failure
+
+        # A new source gets a row of its own
+        assert pdf_download_db.update_source_performance("new_source", False, db_path=db_path)
+        assert performance(db_path, "new_source")[:6] == (1, 0, 1, 0, 0.0, 0.0)
+
+        # Averages kept before timed_attempts existed carry their full weight
+        old_db = os.path.join(tmp_dir, "old.db")
+        conn = sqlite3.connect(old_db)
+        conn.execute("""CREATE TABLE source_performance (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, source_name TEXT UNIQUE NOT NULL,
+            total_attempts INTEGER DEFAULT 0, success_count INTEGER DEFAULT 0,
+            failure_count INTEGER DEFAULT 0, avg_response_time_ms REAL DEFAULT 0.0,
+            last_success_at TIMESTAMP, last_failure_at TIMESTAMP, success_rate REAL DEFAULT 0.0,
+            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP)""")
+        conn.execute("""INSERT INTO source_performance
+            (source_name, total_attempts, success_count, failure_count, avg_response_time_ms, success_rate)
+            VALUES ('zenodo', 4, 4, 0, 100.0, 100.0)""")
+        conn.commit()
+        conn.close()
+        init_pdf_download_db(old_db)
+        assert pdf_download_db.update_source_performance("zenodo", False, 200, db_path=old_db)
+        total, successes, failures, timed, avg, rate = performance(old_db, "zenodo")[:6]
+        assert (total, successes, failures, timed) == (5, 4, 1, 5)
+        assert abs(avg - 120.0) < 1e-6 and abs(rate - 80.0) < 1e-6, (avg, rate)
+        print("✓ Aggregates are exact under concurrency")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("Download Attempt Writer Tests")
+    print("=" * 70)
+    print()
+
+    tests = [
+        test_batched_writes,
+        test_concurrent_aggregates,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
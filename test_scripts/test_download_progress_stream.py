@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for the PDF download progress stream (Server-Sent Events)
+Tests that download jobs record per-DOI progress events, that the SSE endpoint
+sends a snapshot followed by those events and closes when the download ends,
+that reconnecting with Last-Event-ID only replays missed events, and that the
+stream is refused (clients poll) unless PROGRESS_STREAM_ENABLED.
+PDF downloads are simulated so the test runs offline.
+"""
+
+import sys
+import os
+import json
+import tempfile
+import shutil
+from unittest import mock
+
+# Add parent directory to path to import harvest modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tmp_dir = tempfile.mkdtemp()
+os.environ["HARVEST_DB"] = os.path.join(tmp_dir, "harvest.db")
+os.environ["HARVEST_JOB_WORKER_MODE"] = "external"
+os.environ["HARVEST_PROGRESS_STREAM"] = "true"
+
+import harvest_be
+harvest_be.boot()
+import harvest_worker
+from harvest_store import create_admin_user, create_project, get_pdf_download_events
+
+ADMIN = {"email": "admin@example.com", "password": "secret"}
+
+
+def _parse_sse(body):
+    """Split an SSE body into (id, event, data) tuples, skipping comments and retry hints"""
+    messages = []
+    for block in body.strip().split("\n\n"):
+        fields = {}
+        for line in block.split("\n"):
+            if line.startswith(":") or ":" not in line:
+                continue
+            key, value = line.split(":", 1)
+            fields[key] = value.strip()
+        if "event" in fields:
+            messages.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+    return messages
+
+
+def fake_process(doi_list, project_id, project_dir, progress_callback):
+    results = {"downloaded": [], "needs_upload": [], "errors": []}
+    for idx, doi in enumerate(doi_list):
+        if doi.endswith("closed"):
+            results["needs_upload"].append((doi, "x.pdf", "not open access"))
+            progress_callback(idx, doi, False, "not open access", "")
+        else:
+            results["downloaded"].append((doi, "x.pdf", "ok", "unpaywall"))
+            progress_callback(idx, doi, True, "ok", "unpaywall")
+    return results
+
+
+def _run_download(client, project_id):
+    resp = client.post(f"/api/admin/projects/{project_id}/download-pdfs", json=ADMIN)
+    assert resp.status_code == 200, resp.get_json()
+    with mock.patch("pdf_manager.process_dois_smart", side_effect=fake_process):
+        harvest_worker.run_worker(harvest_be.DB_PATH, worker_id="w1", once=True)
+
+
+def test_stream_sends_progress_events():
+    """A finished download streams a snapshot, per-DOI events and the final status"""
+    print("Testing progress event stream...")
+    try:
+        client = harvest_be.app.test_client()
+        project_id = create_project(harvest_be.DB_PATH, "Stream", "", ["10.1/a", "10.1/closed"],
+                                    ADMIN["email"])
+        _run_download(client, project_id)
+
+        events = get_pdf_download_events(harvest_be.DB_PATH, project_id)
+        assert [e["event"] for e in events] == ["status", "doi", "doi", "status"], events
+        assert events[2]["data"]["needs_upload_count"] == 1
+        assert events[1]["data"]["current_source"] == "unpaywall"
+
+        resp = client.get(f"/api/admin/projects/{project_id}/download-pdfs/events")
+        assert resp.status_code == 200 and resp.mimetype == "text/event-stream"
+        messages = _parse_sse(resp.get_data(as_text=True))
+        assert messages[0][1] == "snapshot" and messages[0][2]["status"] == "completed"
+        assert messages[0][2]["downloaded_count"] == 1, "Snapshot carries the counters"
+        assert len(messages) == 1, "Stream of a finished download ends after the snapshot"
+
+        status = client.get(f"/api/admin/projects/{project_id}/download-pdfs/status").get_json()
+        assert status["current_source"] == "none", "Last source should be stored with progress"
+
+        print("✓ Progress events recorded and streamed")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_resume_with_last_event_id():
+    """Reconnecting clients only receive events after Last-Event-ID"""
+    print("\nTesting Last-Event-ID resume...")
+    try:
+        client = harvest_be.app.test_client()
+        project_id = create_project(harvest_be.DB_PATH, "Resume", "", ["10.1/a", "10.1/b", "10.1/c"],
+                                    ADMIN["email"])
+        _run_download(client, project_id)
+        events = get_pdf_download_events(harvest_be.DB_PATH, project_id)
+        url = f"/api/admin/projects/{project_id}/download-pdfs/events"
+
+        resp = client.get(url, headers={"Last-Event-ID": str(events[1]["id"])})
+        messages = _parse_sse(resp.get_data(as_text=True))
+        assert [m[0] for m in messages] == [e["id"] for e in events[2:]], messages
+        assert messages[-1][1] == "status" and messages[-1][2]["status"] == "completed"
+        assert messages[-1][2]["downloaded_count"] == 3
+
+        resp = client.get(url, headers={"Last-Event-ID": str(events[-1]["id"])})
+        assert resp.status_code == 204, "Nothing left to follow"
+        assert client.get(f"{url}?last_event_id=abc").status_code == 400
+        assert client.get("/api/admin/projects/99999/download-pdfs/events").status_code == 404
+
+        # Streams hold a worker each: without threaded workers clients poll instead
+        with mock.patch.object(harvest_be, "PROGRESS_STREAM_ENABLED", False):
+            assert client.get(url).status_code == 503
+
+        print("✓ Stream resumes after Last-Event-ID")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("Download Progress Stream Tests")
+    print("=" * 70)
+    print()
+
+    create_admin_user(harvest_be.DB_PATH, ADMIN["email"], ADMIN["password"])
+
+    tests = [
+        test_stream_sends_progress_events,
+        test_resume_with_last_event_id,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for bytecode-cache-safe frontend start-up (frontend/bytecode.py)
+Tests that checked hash-based pycs pick up source edits that keep the file's
+size and mtime (which timestamp pycs miss - the stale-callback bug), and that
+a callback registry differing from the one recorded for the same sources
+clears the bytecode cache and fails start-up.
+"""
+
+import sys
+import os
+import tempfile
+import shutil
+import subprocess
+import py_compile
+
+# Add parent directory to path to import harvest modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tmp_dir = tempfile.mkdtemp()
+os.environ["HARVEST_DB"] = os.path.join(tmp_dir, "harvest.db")
+
+from frontend.bytecode import (
+    ensure_checked_pycs,
+    is_checked_pyc,
+    verify_callback_registry,
+    REGISTRY_RECORD,
+)
+
+
+def _make_package(name, source):
+    package_dir = os.path.join(tmp_dir, name)
+    os.makedirs(package_dir)
+    open(os.path.join(package_dir, "__init__.py"), "w").close()
+    with open(os.path.join(package_dir, "mod.py"), "w") as f:
+        f.write(source)
+    return package_dir
+
+
+def _edit_keeping_stat(path, source):
+    """Rewrite a file with same-size content and restore its mtime"""
+    stat = os.stat(path)
+    with open(path, "w") as f:
+        f.write(source)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+
+def _import_value(package):
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    result = subprocess.run([sys.executable, "-c", f"import {package}.mod as m; print(m.VALUE)"],
+                            cwd=tmp_dir, env=env, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip()
+
+
+class FakeApp:
+    def __init__(self, names):
+        self.callback_map = {f"{name}.children": {
+            "inputs": [{"id": f"btn-{name}", "property": "n_clicks"}], "state": [],
+            "callback": _callback} for name in names}
+
+
+def _callback(n_clicks):
+    return n_clicks
+
+
+def test_checked_pycs_detect_edits():
+    """Checked pycs are recompiled on edits that timestamp pycs do not notice"""
+    print("Testing checked hash-based pycs...")
+    try:
+        # Timestamp pyc: an edit that keeps size and mtime is not noticed
+        stamped = _make_package("stamped", "VALUE = 1\n")
+        py_compile.compile(os.path.join(stamped, "mod.py"), doraise=True,
+                           invalidation_mode=py_compile.PycInvalidationMode.TIMESTAMP)
+        _edit_keeping_stat(os.path.join(stamped, "mod.py"), "VALUE = 2\n")
+        assert _import_value("stamped") == "1", "Timestamp pycs serve stale code"
+
+        checked = _make_package("checked", "VALUE = 1\n")
+        assert ensure_checked_pycs(checked) == 2
+        assert is_checked_pyc(os.path.join(checked, "mod.py"))
+        assert ensure_checked_pycs(checked) == 0, "Checked pycs are reused"
+        assert _import_value("checked") == "1"
+
+        _edit_keeping_stat(os.path.join(checked, "mod.py"), "VALUE = 2\n")
+        assert _import_value("checked") == "2", "Checked pycs follow the source"
+        assert is_checked_pyc(os.path.join(checked, "mod.py")), "Recompiled pycs stay hash-based"
+        print("✓ Checked pycs pick up edits with unchanged mtime")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_callback_registry_fingerprint():
+    """A different registry for unchanged sources clears the cache and fails start-up"""
+    print("\nTesting callback registry fingerprint...")
+    try:
+        package_dir = _make_package("registry", "VALUE = 1\n")
+        ensure_checked_pycs(package_dir)
+        record_path = os.path.join(package_dir, "__pycache__", REGISTRY_RECORD)
+
+        first = verify_callback_registry(FakeApp(["a", "b"]), package_dir)
+        assert os.path.exists(record_path), "First start records the registry"
+        assert verify_callback_registry(FakeApp(["a", "b"]), package_dir) == first
+
+        try:
+            verify_callback_registry(FakeApp(["a"]), package_dir)
+            raise AssertionError("Expected RuntimeError for a stale registry")
+        except RuntimeError as e:
+            assert "1 missing" in str(e)
+        assert not is_checked_pyc(os.path.join(package_dir, "mod.py")), "Bytecode cache cleared"
+        assert not os.path.exists(record_path)
+
+        # After a source change the new registry is recorded
+        verify_callback_registry(FakeApp(["a", "b"]), package_dir)
+        with open(os.path.join(package_dir, "mod.py"), "a") as f:
+            f.write("OTHER = 3\n")
+        changed = verify_callback_registry(FakeApp(["a", "b", "c"]), package_dir)
+        assert changed != first
+        assert verify_callback_registry(FakeApp(["a", "b", "c"]), package_dir) == changed
+
+        assert verify_callback_registry(FakeApp(["c"]), package_dir, strict=False), "Non-strict only logs"
+        print("✓ Stale callback registry detected")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("Frontend Bytecode Tests")
+    print("=" * 70)
+    print()
+
+    tests = [
+        test_checked_pycs_detect_edits,
+        test_callback_registry_fingerprint,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
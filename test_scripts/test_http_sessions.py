@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for pooled HTTP sessions (http_sessions.py)
+Tests that requests to a host reuse one keep-alive connection, that 5xx
+responses (but not read timeouts) are retried, that requests get a rotated User-Agent, and that
+connection counts are recorded per download attempt in download_attempts
+(including the migration of existing databases).
+Uses a local HTTP server so the test runs offline.
+"""
+
+import sys
+import os
+import tempfile
+import shutil
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import requests
+
+# Add parent directory to path to import harvest modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tmp_dir = tempfile.mkdtemp()
+os.environ["HARVEST_DB"] = os.path.join(tmp_dir, "harvest.db")
+
+import http_sessions
+import pdf_manager
+from metrics import registry
+from pdf_download_db import flush_download_attempts, get_download_statistics, init_pdf_download_db
+from pdf_sources import USER_AGENTS
+
+seen_user_agents = []
+failures_left = {"count": 0}
+hang_requests = []
+release_hung = threading.Event()
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        seen_user_agents.append(self.headers.get("User-Agent"))
+        if self.path.startswith("/hang"):
+            hang_requests.append(self.path)
+            release_hung.wait(10)
+            return
+        if self.path.startswith("/flaky") and failures_left["count"] > 0:
+            failures_left["count"] -= 1
+            status, body = 503, b"busy"
+        else:
+            status, body = 200, b'{"ok": true}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_connection_reuse_and_retries():
+    """Requests to a host share a keep-alive connection; 5xx is retried; UAs rotate"""
+    print("Testing pooled sessions...")
+    server, base = start_server()
+    try:
+        http_sessions.reset_connection_stats()
+        with http_sessions.track_connections() as counts:
+            for i in range(5):
+                response = http_sessions.get(f"{base}/item/{i}", timeout=5)
+                assert response.status_code == 200 and response.json() == {"ok": True}
+        assert counts == {"opened": 1, "reused": 4}, counts
+        assert http_sessions.connection_stats()["127.0.0.1"] == {"opened": 1, "reused": 4}
+        assert http_sessions.get_session(f"{base}/x") is http_sessions.get_session(f"{base}/y")
+
+        assert all(ua in USER_AGENTS for ua in seen_user_agents), "Default User-Agent comes from the rotation list"
+        http_sessions.get(f"{base}/item/custom", headers={"User-Agent": "Custom/1.0"}, timeout=5)
+        assert seen_user_agents[-1] == "Custom/1.0", "An explicit User-Agent is kept"
+
+        failures_left["count"] = 2
+        response = http_sessions.get(f"{base}/flaky", timeout=5)
+        assert response.status_code == 200 and failures_left["count"] == 0, "503s are retried"
+
+        # A source that never answers costs one timeout, not one per retry
+        try:
+            http_sessions.get(f"{base}/hang", timeout=0.5)
+            raise AssertionError("Expected a read timeout")
+        except requests.exceptions.ReadTimeout:
+            pass
+        assert hang_requests == ["/hang"], f"Read timeouts are not retried: {hang_requests}"
+
+        metric = {(name, tuple(tuple(pair) for pair in labels)): value
+                  for name, labels, value in registry.snapshot()["counters"]}
+        key = ("harvest_external_connections_total", (("host", "127.0.0.1"), ("kind", "reused")))
+        assert metric.get(key, 0) >= 4, metric
+        print("✓ Connections reused, retries and User-Agent rotation work")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        release_hung.set()
+        server.shutdown()
+        http_sessions.close_sessions()
+
+
+def test_attempts_record_connections():
+    """download_attempts stores opened/reused counts; old databases are migrated"""
+    print("\nTesting connection counts in download_attempts...")
+    server, base = start_server()
+    try:
+        # Database created before the connection columns existed
+        old_db = os.path.join(tmp_dir, "old_pdf_downloads.db")
+        conn = sqlite3.connect(old_db)
+        conn.execute("""CREATE TABLE download_attempts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, project_id INTEGER NOT NULL, doi TEXT NOT NULL,
+            source_name TEXT NOT NULL, success INTEGER NOT NULL, failure_reason TEXT,
+            failure_category TEXT, response_time_ms INTEGER, file_size_bytes INTEGER,
+            pdf_url TEXT, timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP)""")
+        conn.commit()
+        conn.close()
+        assert init_pdf_download_db(old_db)
+        conn = sqlite3.connect(old_db)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(download_attempts)")}
+        conn.close()
+        assert {"connections_opened", "connections_reused"} <= columns
+
+        def try_source(source_name, doi, config):
+            http_sessions.get(f"{base}/lookup/{doi}", timeout=5)
+            return True, f"{base}/paper.pdf", 5
+
+        rankings = [{"name": "local", "enabled": 1, "requires_library": None, "success_rate": 0.0}]
+        with mock.patch.object(pdf_manager, "try_source", side_effect=try_source), \
+                mock.patch.object(pdf_manager, "download_pdf", return_value=(True, "Downloaded")), \
+                mock.patch("pdf_download_db.get_source_rankings", return_value=rankings), \
+                mock.patch("pdf_download_db.get_best_source_for_publisher", return_value=None), \
+                mock.patch.object(pdf_manager, "PDF_SOURCE_ORDERING", "success_rate"):
+            for doi in ("10.1000/one", "10.1000/two", "10.1000/three"):
+                assert pdf_manager.download_pdf_smart(doi, 7, tmp_dir)[0]
+
+        flush_download_attempts()
+        conn = sqlite3.connect("pdf_downloads.db")
+        rows = conn.execute("""SELECT doi, connections_opened, connections_reused FROM download_attempts
+                               WHERE project_id = 7 ORDER BY id""").fetchall()
+        conn.close()
+        assert rows == [("10.1000/one", 1, 0), ("10.1000/two", 0, 1), ("10.1000/three", 0, 1)], rows
+
+        stats = get_download_statistics(project_id=7)
+        assert stats["connections_opened"] == 1 and stats["connections_reused"] == 2
+        assert stats["by_source"][0]["connections_reused"] == 2
+        print("✓ Connection counts recorded per attempt")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        release_hung.set()
+        server.shutdown()
+        http_sessions.close_sessions()
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("HTTP Session Pool Tests")
+    print("=" * 70)
+    print()
+
+    # The PDF tracking database is created in the working directory
+    original_cwd = os.getcwd()
+    os.chdir(tmp_dir)
+
+    tests = [
+        test_connection_reuse_and_retries,
+        test_attempts_record_connections,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    os.chdir(original_cwd)
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
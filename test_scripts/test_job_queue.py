@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for the durable job queue and harvest_worker
+Tests leases, heartbeats and retries of queued jobs, resumption of a job whose
+worker died, running PDF download jobs in the worker, and that the download
+endpoint only enqueues (one active job per project).
+PDF downloads are simulated so the test runs offline.
+"""
+
+import sys
+import os
+import tempfile
+import shutil
+from unittest import mock
+
+# Add parent directory to path to import harvest modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tmp_dir = tempfile.mkdtemp()
+os.environ["HARVEST_DB"] = os.path.join(tmp_dir, "harvest.db")
+os.environ["HARVEST_JOB_WORKER_MODE"] = "external"
+
+import harvest_worker
+from harvest_store import (
+    init_db, create_project, create_admin_user, enqueue_job, claim_job, heartbeat_job,
+    fail_job, cancel_job, get_job, get_active_job, get_pdf_download_progress,
+    init_pdf_download_progress, get_pdf_download_events,
+)
+
+
+def _new_db():
+    db_path = os.path.join(tempfile.mkdtemp(dir=tmp_dir), "harvest.db")
+    init_db(db_path)
+    return db_path
+
+
+def test_leases_and_retries():
+    """Jobs are deduplicated, re-claimed after lease expiry and retried until max_attempts"""
+    print("Testing job leases and retries...")
+    try:
+        db_path = _new_db()
+        job_id = enqueue_job(db_path, "test", {"n": 1}, dedupe_key="test:1", max_attempts=2)
+        assert enqueue_job(db_path, "test", {"n": 1}, dedupe_key="test:1") == job_id, "Duplicate active job"
+
+        # worker-a claims the job and dies (its lease is already expired)
+        job = claim_job(db_path, "worker-a", lease_seconds=-1)
+        assert job["id"] == job_id and job["attempts"] == 1
+
+        taken = claim_job(db_path, "worker-b", lease_seconds=60)
+        assert taken["id"] == job_id and taken["attempts"] == 2, "Expired lease should be re-claimed"
+        assert not heartbeat_job(db_path, job_id, "worker-a", 60), "Old worker must lose the lease"
+        assert heartbeat_job(db_path, job_id, "worker-b", 60)
+        assert claim_job(db_path, "worker-c", lease_seconds=60) is None, "Leased job must not be claimed"
+
+        assert fail_job(db_path, job_id, "worker-b", "boom", retry_delay_seconds=0)
+        job = get_job(db_path, job_id)
+        assert job["status"] == "failed" and job["last_error"] == "boom", "No attempts left"
+
+        job_id = enqueue_job(db_path, "test", {"n": 2}, dedupe_key="test:2", max_attempts=3)
+        claim_job(db_path, "worker-a", lease_seconds=60)
+        assert fail_job(db_path, job_id, "worker-a", "transient", retry_delay_seconds=0)
+        assert get_job(db_path, job_id)["status"] == "queued", "Failed attempt should be retried"
+        assert cancel_job(db_path, job_id)
+        assert get_active_job(db_path, "test:2") is None
+
+        job_id = enqueue_job(db_path, "test", {"n": 3}, max_attempts=1)
+        claim_job(db_path, "worker-a", lease_seconds=-1)
+        assert claim_job(db_path, "worker-b", lease_seconds=60) is None
+        assert get_job(db_path, job_id)["status"] == "failed", "Job out of attempts should fail"
+
+        print("✓ Leases, heartbeats and retries behave correctly")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_worker_runs_and_resumes_jobs():
+    """The worker completes jobs, retries failures and resumes an abandoned job"""
+    print("\nTesting worker loop...")
+    calls = []
+
+    def flaky_handler(ctx):
+        calls.append(ctx.job["attempts"])
+        if ctx.payload.get("fail_first") and ctx.job["attempts"] == 1:
+            raise RuntimeError("transient failure")
+
+    try:
+        db_path = _new_db()
+        with mock.patch.dict(harvest_worker.JOB_HANDLERS, {"test": flaky_handler}), \
+                mock.patch.object(harvest_worker, "JOB_RETRY_DELAY", 0):
+            # A job claimed by a worker that then crashed
+            abandoned_id = enqueue_job(db_path, "test", {}, dedupe_key="abandoned")
+            assert claim_job(db_path, "crashed-worker", lease_seconds=-1)["id"] == abandoned_id
+
+            ok_id = enqueue_job(db_path, "test", {}, dedupe_key="ok")
+            flaky_id = enqueue_job(db_path, "test", {"fail_first": True}, dedupe_key="flaky")
+
+            ran = harvest_worker.run_worker(db_path, worker_id="w1", job_types=["test"],
+                                            once=True, lease_seconds=60)
+
+        assert get_job(db_path, ok_id)["status"] == "completed"
+        assert get_job(db_path, flaky_id)["status"] == "completed", "Failed job should be retried"
+        assert get_job(db_path, abandoned_id)["status"] == "completed", "Abandoned job should resume"
+        assert get_job(db_path, abandoned_id)["attempts"] == 2
+        assert ran >= 4, f"Expected at least 4 runs, got {ran}"
+
+        # A download whose worker died on its last attempt is failed, and so is its progress
+        project_id = create_project(db_path, "P", "", ["10.1/a"], "admin@example.com")
+        init_pdf_download_progress(db_path, project_id, 1, "project_pdfs")
+        dead_id = enqueue_job(db_path, "pdf_download", {"project_id": project_id}, max_attempts=1)
+        assert claim_job(db_path, "crashed-worker", lease_seconds=-1)["id"] == dead_id
+        assert claim_job(db_path, "w2", lease_seconds=60) is None
+        assert get_job(db_path, dead_id)["status"] == "failed"
+        assert get_pdf_download_progress(db_path, project_id)["status"] == "error", "Progress must not stay running"
+        events = get_pdf_download_events(db_path, project_id)
+        assert events[-1]["event"] == "status" and events[-1]["data"]["status"] == "error"
+
+        print("✓ Worker completes, retries and resumes jobs")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_embedded_worker_starts_at_boot():
+    """In embedded mode the backend starts its worker at boot, so interrupted jobs resume"""
+    print("\nTesting embedded worker start...")
+    try:
+        import harvest_be
+        with mock.patch.object(harvest_be, "JOB_WORKER_MODE", "embedded"), \
+                mock.patch("harvest_worker.start_embedded_worker") as start:
+            harvest_be.boot()
+            assert start.call_count == 1, "boot() must start the embedded worker"
+            harvest_be.app.test_client().get("/api/projects")
+            assert start.call_count == 2, "Requests restart a worker lost to a fork"
+        with mock.patch("harvest_worker.start_embedded_worker") as start:
+            harvest_be.boot()
+            assert not start.called, "External mode leaves jobs to harvest_worker.py"
+
+        print("✓ Embedded worker starts at boot")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_download_endpoint_enqueues():
+    """The download endpoint only enqueues; the worker runs the download job"""
+    print("\nTesting PDF download jobs...")
+    try:
+        import harvest_be
+        harvest_be.boot()
+        client = harvest_be.app.test_client()
+        db_path = harvest_be.DB_PATH
+        create_admin_user(db_path, "admin@example.com", "secret")
+        project_id = create_project(db_path, "P", "", ["10.1/a", "10.1/b"], "admin@example.com")
+        auth = {"email": "admin@example.com", "password": "secret"}
+
+        resp = client.post(f"/api/admin/projects/{project_id}/download-pdfs", json=auth)
+        assert resp.status_code == 200, resp.get_json()
+        job_id = resp.get_json()["job_id"]
+        assert get_job(db_path, job_id)["status"] == "queued", "Request must not run the download"
+
+        resp = client.post(f"/api/admin/projects/{project_id}/download-pdfs", json=auth)
+        assert resp.status_code == 409
+
+        resp = client.post(f"/api/admin/projects/{project_id}/download-pdfs", json={**auth, "force_restart": True})
+        assert resp.status_code == 200
+        new_job_id = resp.get_json()["job_id"]
+        assert new_job_id != job_id and get_job(db_path, job_id)["status"] == "cancelled"
+
+        def fake_process(doi_list, project_id, project_dir, progress_callback):
+            results = {"downloaded": [], "needs_upload": [], "errors": []}
+            for idx, doi in enumerate(doi_list):
+                results["downloaded"].append((doi, "x.pdf", "ok", "unpaywall"))
+                progress_callback(idx, doi, True, "ok", "unpaywall")
+            return results
+
+        with mock.patch("pdf_manager.process_dois_smart", side_effect=fake_process):
+            harvest_worker.run_worker(db_path, worker_id="w1", once=True)
+
+        assert get_job(db_path, new_job_id)["status"] == "completed"
+        progress = get_pdf_download_progress(db_path, project_id)
+        assert progress["status"] == "completed" and len(progress["downloaded"]) == 2
+
+        status = client.get(f"/api/admin/projects/{project_id}/download-pdfs/status").get_json()
+        assert status["status"] == "completed" and status["job"] is None
+
+        print("✓ Downloads are queued and run by the worker")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("Job Queue Tests")
+    print("=" * 70)
+    print()
+
+    tests = [
+        test_leases_and_retries,
+        test_worker_runs_and_resumes_jobs,
+        test_embedded_worker_starts_at_boot,
+        test_download_endpoint_enqueues,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
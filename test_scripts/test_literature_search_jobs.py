@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for literature search jobs (/api/literature/search)
+Tests that searches run as literature_search worker jobs and report each
+pipeline stage while polling, that identical searches are answered from the
+shared result cache, that session-building searches always run, that the
+status endpoint is admin only, and that searches are only reported stale once
+their worker's lease lapses.
+The search pipeline is simulated so the test runs offline.
+"""
+
+import sys
+import os
+import tempfile
+import shutil
+import time
+from unittest import mock
+
+# Add parent directory to path to import harvest modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tmp_dir = tempfile.mkdtemp()
+os.environ["HARVEST_DB"] = os.path.join(tmp_dir, "harvest.db")
+os.environ["HARVEST_JOB_WORKER_MODE"] = "external"
+
+import harvest_be
+import harvest_worker
+harvest_be.boot()
+import literature_search
+from harvest_store import claim_job, create_admin_user
+
+DB_PATH = os.environ["HARVEST_DB"]
+ADMIN = {"email": "admin@example.com", "password": "secret"}
+
+
+def fake_search_papers(query, progress_callback=None, **kwargs):
+    """Report two pipeline stages, then return one paper"""
+    log = []
+    for step in ("AutoResearch", "DeepResearch"):
+        log.append({"step": len(log) + 1, "name": step, "description": query})
+        if progress_callback:
+            progress_callback(log[-1])
+    paper = {"title": f"Paper about {query}", "doi": "10.1234/paper", "source": "openalex"}
+    return {"success": True, "papers": [paper], "message": "Found 1 paper", "execution_log": log,
+            "total_found": 1, "total_unique": 1, "returned": 1, "sources_used": kwargs.get("sources", [])}
+
+
+def _status(client, job_id):
+    return client.get(f"/api/literature/search/{job_id}", json=ADMIN).get_json()
+
+
+def _run_search(client, job_id):
+    """Run queued jobs the way harvest_worker.py does and return the search's final status"""
+    harvest_worker.run_worker(DB_PATH, once=True)
+    data = _status(client, job_id)
+    assert data["status"] in ("completed", "failed"), data
+    return data
+
+
+def test_search_job_and_cache():
+    """Searches run as jobs with stage progress; repeats come from the cache"""
+    print("Testing literature search jobs...")
+    try:
+        create_admin_user(DB_PATH, ADMIN["email"], ADMIN["password"])
+        client = harvest_be.app.test_client()
+        search = {"query": "Protein  Folding", "sources": ["openalex"], "top_k": 10}
+
+        assert client.post("/api/literature/search", json=search).status_code in (401, 403)
+
+        with mock.patch.object(literature_search, "search_papers", side_effect=fake_search_papers) as run:
+            resp = client.post("/api/literature/search", json={**ADMIN, **search})
+            assert resp.status_code == 202, resp.get_data(as_text=True)
+            data = _run_search(client, resp.get_json()["job_id"])
+            assert data["status"] == "completed", data
+            assert [entry["name"] for entry in data["execution_log"]] == ["AutoResearch", "DeepResearch"]
+            assert data["result"]["papers"][0]["doi"] == "10.1234/paper"
+
+            resp = client.post("/api/literature/search", json={**ADMIN, **search, "query": " protein folding "})
+            assert resp.status_code == 200 and resp.get_json()["status"] == "completed"
+            data = _status(client, resp.get_json()["job_id"])
+            assert data["result"]["cached"] is True and data["result"]["papers"]
+            assert run.call_count == 1, "Identical searches are served from the cache"
+        print("✓ Search ran as a job and was cached")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_session_searches_and_validation():
+    """previous_papers bypasses the cache; bad requests and unknown jobs are rejected"""
+    print("\nTesting session searches and validation...")
+    try:
+        client = harvest_be.app.test_client()
+        search = {**ADMIN, "query": "protein folding", "sources": ["openalex"], "top_k": 10,
+                  "previous_papers": [{"title": "Earlier paper", "doi": "10.1234/old"}]}
+
+        with mock.patch.object(literature_search, "search_papers", side_effect=fake_search_papers) as run:
+            resp = client.post("/api/literature/search", json=search)
+            assert resp.status_code == 202, "Session searches are never answered from the cache"
+            assert _run_search(client, resp.get_json()["job_id"])["status"] == "completed"
+            assert run.call_args.kwargs["previous_papers"] == search["previous_papers"]
+
+        assert client.post("/api/literature/search", json={**search, "sources": ["google"]}).status_code == 400
+        assert client.post("/api/literature/search", json={**search, "query": "  "}).status_code == 400
+        assert client.get("/api/literature/search/unknown", json=ADMIN).status_code == 404
+        print("✓ Session searches run and invalid requests rejected")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_status_requires_admin():
+    """Search status and results are only returned to admins"""
+    print("\nTesting literature search status authentication...")
+    try:
+        client = harvest_be.app.test_client()
+        with mock.patch.object(literature_search, "search_papers", side_effect=fake_search_papers):
+            resp = client.post("/api/literature/search", json={**ADMIN, "query": "private", "sources": ["openalex"]})
+            job_id = resp.get_json()["job_id"]
+            _run_search(client, job_id)
+
+        url = f"/api/literature/search/{job_id}"
+        assert client.get(url).status_code == 401
+        assert client.get(url, json={"email": ADMIN["email"], "password": "wrong"}).status_code == 403
+        with mock.patch.object(harvest_be, "verify_admin_token",
+                               side_effect=lambda token: ADMIN["email"] if token == "tok" else None):
+            assert client.get(url, headers={"X-Admin-Token": "expired"}).status_code == 403
+            resp = client.get(url, headers={"Authorization": "Bearer tok"})
+            assert resp.status_code == 200 and resp.get_json()["result"]["papers"], resp.get_json()
+            assert client.get(url, headers={"X-Admin-Token": "tok"}).status_code == 200
+        print("✓ Status endpoint is admin only")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_stale_searches():
+    """Queued searches are never stale; a search is stale once its worker's lease lapses"""
+    print("\nTesting stale literature searches...")
+    try:
+        client = harvest_be.app.test_client()
+        with mock.patch.object(literature_search, "search_papers", side_effect=fake_search_papers):
+            resp = client.post("/api/literature/search", json={**ADMIN, "query": "slow search", "sources": ["openalex"]})
+            job_id = resp.get_json()["job_id"]
+            data = _status(client, job_id)
+            assert data["status"] == "queued" and data["is_stale"] is False, "Waiting for a worker is not stale"
+
+            # A worker claims the search and dies without renewing its lease
+            claim_job(DB_PATH, "dead-worker", 0.05, ["literature_search"])
+            assert _status(client, job_id)["is_stale"] is False, "Alive while the lease is held"
+            time.sleep(0.1)
+            assert _status(client, job_id)["is_stale"] is True, "Stale once the lease lapses"
+
+            # The next worker re-claims it and finishes the search
+            data = _run_search(client, job_id)
+            assert data["status"] == "completed" and "is_stale" not in data, data
+        print("✓ Only searches whose worker is gone are stale")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("Literature Search Job Tests")
+    print("=" * 70)
+    print()
+
+    tests = [
+        test_search_job_and_cache,
+        test_session_searches_and_validation,
+        test_status_requires_admin,
+        test_stale_searches,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
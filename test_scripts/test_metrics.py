@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for the /metrics endpoint (metrics.py)
+Tests per-route latency histograms, SQL query accounting through the
+instrumented store connections, outgoing request latency per host, and
+aggregation of snapshots written by other worker processes.
+Outgoing HTTP requests are simulated so the test runs offline.
+"""
+
+import sys
+import os
+import json
+import tempfile
+import shutil
+from unittest import mock
+
+import requests
+
+# Add parent directory to path to import harvest modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tmp_dir = tempfile.mkdtemp()
+os.environ["HARVEST_DB"] = os.path.join(tmp_dir, "harvest.db")
+os.environ["HARVEST_JOB_WORKER_MODE"] = "external"
+os.environ["HARVEST_ENABLE_METRICS"] = "true"
+os.environ["HARVEST_METRICS_DIR"] = os.path.join(tmp_dir, "metrics")
+
+import harvest_be
+import metrics
+
+
+def _metric_value(text, prefix):
+    """Value of the first exposition line starting with prefix"""
+    for line in text.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+def test_route_and_sql_metrics():
+    """Requests are timed per route template and their SQL statements counted"""
+    print("Testing route latency and SQL metrics...")
+    try:
+        client = harvest_be.app.test_client()
+        for _ in range(3):
+            assert client.get("/api/projects").status_code == 200
+        client.get("/api/projects/12345")
+
+        resp = client.get("/metrics")
+        assert resp.status_code == 200 and resp.mimetype == "text/plain"
+        text = resp.get_data(as_text=True)
+        assert "# TYPE harvest_http_request_duration_seconds histogram" in text
+
+        count = _metric_value(text, 'harvest_http_request_duration_seconds_count'
+                                    '{method="GET",route="/api/projects",status="200"}')
+        assert count == 3, f"Expected 3 timed requests, got {count}"
+        assert 'route="/api/projects/<int:project_id>"' in text, "Routes are labelled by template"
+        inf = _metric_value(text, 'harvest_http_request_duration_seconds_bucket'
+                                  '{method="GET",route="/api/projects",status="200",le="+Inf"}')
+        assert inf == 3
+
+        queries = _metric_value(text, 'harvest_sql_queries_total{route="/api/projects"}')
+        assert queries and queries >= 3, f"Each request runs SQL through the store, got {queries}"
+        assert _metric_value(text, 'harvest_sql_queries_per_request_count{route="/api/projects"}') == 3
+
+        print("✓ Route latency and SQL metrics recorded")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_external_calls_and_multiprocess():
+    """Outgoing requests are timed per host; snapshots of other workers are summed"""
+    print("\nTesting external call metrics and worker aggregation...")
+    try:
+        fake = requests.Response()
+        fake.status_code = 200
+        fake._content = b"{}"
+        with mock.patch("requests.adapters.HTTPAdapter.send", return_value=fake):
+            requests.get("https://api.crossref.org/works/10.1/x", timeout=5)
+
+        # Another gunicorn worker's snapshot
+        other = metrics.MetricsRegistry()
+        other.observe("harvest_http_request_duration_seconds",
+                      {"method": "GET", "route": "/api/projects", "status": "200"}, 0.2)
+        other.inc("harvest_security_events_total", {"event": "otp_requests"}, 2)
+        with open(os.path.join(os.environ["HARVEST_METRICS_DIR"], "metrics_999999.json"), "w") as f:
+            json.dump(other.snapshot(), f)
+
+        text = harvest_be.app.test_client().get("/metrics").get_data(as_text=True)
+        assert _metric_value(text, 'harvest_external_request_duration_seconds_count'
+                                   '{host="api.crossref.org",status="200"}') == 1
+        count = _metric_value(text, 'harvest_http_request_duration_seconds_count'
+                                    '{method="GET",route="/api/projects",status="200"}')
+        assert count == 4, f"Worker snapshots should be summed, got {count}"
+        assert _metric_value(text, 'harvest_security_events_total{event="otp_requests"}') == 2
+
+        print("✓ External calls timed and worker snapshots aggregated")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("Metrics Tests")
+    print("=" * 70)
+    print()
+
+    tests = [
+        test_route_and_sql_metrics,
+        test_external_calls_and_multiprocess,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
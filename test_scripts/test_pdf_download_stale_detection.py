@@ -1,6 +1,7 @@
 """
 Test for PDF download stale detection and recovery.
-Tests the new is_download_stale and reset_stale_download functions.
+Tests the new is_download_stale and reset_stale_download functions, including
+lease-based staleness for downloads run by a pdf_download job.
 """
 import unittest
 import sys
@@ -12,6 +13,10 @@ import time
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from harvest_store import (
+    claim_job,
+    enqueue_job,
+    get_pdf_download_overview,
+    init_db,
     init_pdf_download_progress,
     get_pdf_download_progress,
     update_pdf_download_progress,
@@ -225,6 +230,42 @@ class TestPDFDownloadStaleDetection(unittest.TestCase):
         
         self.assertTrue(is_stale_1, "Project 1 should be stale")
         self.assertFalse(is_stale_2, "Project 2 should not be stale")
+    
+    def test_job_lease_decides_staleness(self):
+        """Test that a download run by a job is stale only once the job's lease lapses"""
+        init_db(self.db_path)
+        init_pdf_download_progress(self.db_path, self.project_id, 10, self.project_dir)
+        
+        # No progress update for 10 minutes
+        import sqlite3
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            "UPDATE pdf_download_progress SET updated_at = ? WHERE project_id = ?",
+            (time.time() - 600, self.project_id)
+        )
+        conn.commit()
+        conn.close()
+        
+        dedupe_key = f"pdf_download:{self.project_id}"
+        enqueue_job(self.db_path, "pdf_download", {"project_id": self.project_id}, dedupe_key=dedupe_key)
+        self.assertFalse(is_download_stale(self.db_path, self.project_id),
+                         "A queued job is waiting for a worker, not stale")
+        
+        job = claim_job(self.db_path, "worker-1", 60, ["pdf_download"])
+        self.assertFalse(is_download_stale(self.db_path, self.project_id),
+                         "A slow download whose worker holds the lease is not stale")
+        
+        # The worker stops renewing its lease
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("UPDATE jobs SET lease_expires_at = ? WHERE id = ?", (time.time() - 1, job["id"]))
+        conn.commit()
+        conn.close()
+        self.assertTrue(is_download_stale(self.db_path, self.project_id),
+                        "Download should be stale once the lease lapses")
+        
+        # The overview entry (one query for all projects) gives the same answer
+        overview = get_pdf_download_overview(self.db_path)[self.project_id]
+        self.assertTrue(is_download_stale(self.db_path, self.project_id, progress=overview))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for the PDF retry queue and the worker's retry scheduler
+Tests that temporary download failures are queued with backoff and dropped after
+max_retry_attempts, that retries are claimed in leased batches, and that an idle
+worker drains the queue through the download engine, updates project progress
+and yields to waiting jobs.
+Lookups are simulated so the test runs offline.
+"""
+
+import sys
+import os
+import tempfile
+import shutil
+import sqlite3
+from contextlib import ExitStack
+from unittest import mock
+
+# Add parent directory to path to import harvest modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tmp_dir = tempfile.mkdtemp()
+os.environ["HARVEST_DB"] = os.path.join(tmp_dir, "harvest.db")
+os.environ["HARVEST_JOB_WORKER_MODE"] = "external"
+
+import harvest_worker
+import pdf_manager
+from harvest_store import (
+    init_db, create_project, enqueue_job, get_pdf_download_progress,
+    init_pdf_download_progress, update_pdf_download_progress,
+)
+from host_limiter import HostLimiter
+from pdf_download_db import (
+    claim_retry_batch, get_retry_queue_ready, init_pdf_download_db, release_retries, schedule_retry
+)
+from source_health import SourceHealth
+
+
+def offline_engine(try_source):
+    """Patches for download_pdf_smart with simulated lookups and downloads, retries due at once."""
+    rankings = [{"name": "core", "enabled": 1, "requires_library": None, "success_rate": 0.0}]
+    stack = ExitStack()
+    for patcher in (
+        mock.patch.object(pdf_manager, "try_source", side_effect=try_source),
+        mock.patch.object(pdf_manager, "download_pdf", return_value=(True, "Downloaded")),
+        mock.patch("pdf_download_db.get_source_rankings", return_value=rankings),
+        mock.patch("pdf_download_db.get_best_source_for_publisher", return_value=None),
+        mock.patch("pdf_download_db.get_cached_pdf_url", return_value=None),
+        mock.patch("source_health.get_source_health",
+                   return_value=SourceHealth(failure_threshold=100, persist=False)),
+        mock.patch("host_limiter.get_host_limiter", return_value=HostLimiter(default_rps=0)),
+        mock.patch("pdf_sources.get_retry_delay_seconds", return_value=0),
+        mock.patch.object(pdf_manager, "PDF_SOURCE_ORDERING", "success_rate"),
+        mock.patch.object(pdf_manager, "PDF_SOURCE_SUPPRESSION", False),
+        mock.patch.object(pdf_manager, "PDF_SOURCE_RACE_MODE", "serial"),
+    ):
+        stack.enter_context(patcher)
+    return stack
+
+
+def queued(project_id):
+    return {r["doi"]: r for r in get_retry_queue_ready() if r["project_id"] == project_id}
+
+
+def test_retry_queue():
+    """Temporary failures are queued with backoff, dropped after max retries and claimed in batches"""
+    print("Testing the retry queue...")
+    try:
+        with mock.patch("pdf_sources.get_retry_delay_seconds", return_value=0):
+            assert schedule_retry(1, "10.1000/a", "timeout", max_retry_attempts=2)
+            assert schedule_retry(1, "10.1000/a", "timeout", max_retry_attempts=2)
+            assert queued(1)["10.1000/a"]["retry_count"] == 1
+            assert not schedule_retry(1, "10.1000/a", "timeout", max_retry_attempts=2), "Retries used up"
+            assert "10.1000/a" not in queued(1)
+
+        assert schedule_retry(1, "10.1000/b", "rate_limit")
+        conn = sqlite3.connect("pdf_downloads.db")
+        delay = conn.execute("""SELECT (julianday(next_retry_at) - julianday('now')) * 86400
+                                FROM retry_queue WHERE doi = '10.1000/b'""").fetchone()[0]
+        conn.close()
+        assert 250 < delay < 400, f"Rate limits back off 5+ minutes: {delay}"
+        assert "10.1000/b" not in queued(1)
+
+        with mock.patch("pdf_sources.get_retry_delay_seconds", return_value=0):
+            for doi in ("10.1000/c", "10.1000/d", "10.1000/e"):
+                schedule_retry(2, doi, "server_error")
+        first = claim_retry_batch(2, 600)
+        assert len(first) == 2 and len(claim_retry_batch(2, 600)) == 1
+        assert claim_retry_batch(2, 600) == [], "Claimed retries are leased"
+        release_retries([r["id"] for r in first])
+        assert len(claim_retry_batch(5, 600)) == 2
+
+        # The download engine queues temporary failures and forgets permanent ones
+        answers = {"10.1000/f": "CORE timeout"}
+        with offline_engine(lambda source, doi, config: (False, answers[doi], 10)):
+            assert not pdf_manager.download_pdf_smart("10.1000/f", 3, "project_pdfs/project_3")[0]
+            assert queued(3)["10.1000/f"]["failure_category"] == "timeout"
+            answers["10.1000/f"] = "Not found"
+            pdf_manager.download_pdf_smart("10.1000/f", 3, "project_pdfs/project_3")
+            assert queued(3) == {}, "A permanent failure leaves the queue"
+        print("✓ Retry queue with backoff, max retries and leases")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_worker_drains_retries():
+    """An idle worker retries queued DOIs, updates progress and yields to waiting jobs"""
+    print("\nTesting the worker's retry scheduler...")
+    try:
+        db_path = os.environ["HARVEST_DB"]
+        init_db(db_path)
+        dois = ["10.2000/ok", "10.2000/down", "10.2000/gone"]
+        project_id = create_project(db_path, "P", "", dois, "admin@example.com")
+        init_pdf_download_progress(db_path, project_id, len(dois), "project_pdfs")
+        update_pdf_download_progress(db_path, project_id, {
+            "status": "completed",
+            "downloaded": [],
+            "needs_upload": [["10.2000/gone", "x.pdf", "All download sources failed"]],
+            "errors": [["10.2000/ok", "All download sources failed"], ["10.2000/down", "timeout"]],
+        })
+
+        lookups = []
+
+        def try_source(source_name, doi, config):
+            lookups.append(doi)
+            if doi == "10.2000/ok":
+                return True, f"https://core.example/{doi}.pdf", 10
+            return False, "CORE timeout", 10
+
+        with mock.patch("pdf_sources.get_retry_delay_seconds", return_value=0):
+            for doi in dois:
+                schedule_retry(project_id, doi, "timeout")
+
+        # A waiting job comes first: the batch is released untouched
+        job_id = enqueue_job(db_path, "doi_metadata_prefetch", {"project_id": project_id})
+        assert harvest_worker.run_pdf_retry_batch(db_path) == 0
+        assert len(queued(project_id)) == 3
+        with offline_engine(try_source):
+            retried = harvest_worker.run_pdf_retry_batch(db_path, job_types=["pdf_download"])
+        assert retried == 3 and sorted(lookups) == sorted(dois), lookups
+
+        # The worker drains the rest until the retries are used up (max_retry_attempts = 3)
+        lookups.clear()
+        with offline_engine(try_source), \
+                mock.patch.object(harvest_worker, "run_job", return_value="completed"):
+            ran = harvest_worker.run_worker(db_path, worker_id="w1", once=True, retry_interval=0)
+        assert ran == 1
+        assert lookups.count("10.2000/down") == 2 and "10.2000/ok" not in lookups, lookups
+        assert queued(project_id) == {}
+
+        progress = get_pdf_download_progress(db_path, project_id)
+        assert [entry[0] for entry in progress["downloaded"]] == ["10.2000/ok"], progress["downloaded"]
+        assert progress["downloaded"][0][3] == "core"
+        assert [entry[0] for entry in progress["errors"]] == ["10.2000/down"]
+        assert [entry[0] for entry in progress["needs_upload"]] == ["10.2000/gone"]
+
+        with mock.patch.object(harvest_worker, "PDF_RETRY_SCHEDULER", False), \
+                mock.patch.object(harvest_worker, "run_pdf_retry_batch") as batch:
+            harvest_worker.run_worker(db_path, worker_id="w2", once=True)
+            assert not batch.called, "The scheduler can be turned off"
+        print(f"✓ Worker drains the retry queue (job {job_id} ran first)")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("PDF Retry Scheduler Tests")
+    print("=" * 70)
+    print()
+
+    # The PDF tracking database is created in the working directory
+    original_cwd = os.getcwd()
+    os.chdir(tmp_dir)
+    init_pdf_download_db()
+
+    tests = [
+        test_retry_queue,
+        test_worker_drains_retries,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    os.chdir(original_cwd)
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for the shared, content-addressed PDF store (pdf_store.py)
+Tests that a PDF is stored once and linked into every project that uses it
+(without downloading it again), that removing a DOI or deleting a project only
+unlinks until the last reference goes, that in-place edits get a private copy,
+and that the dedupe migration converts existing project directories.
+Downloads are simulated so the test runs offline.
+"""
+
+import sys
+import os
+import tempfile
+import shutil
+from unittest import mock
+
+# Add parent directory to path to import harvest modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tmp_dir = tempfile.mkdtemp()
+os.environ["HARVEST_DB"] = os.path.join(tmp_dir, "harvest.db")
+os.environ["HARVEST_JOB_WORKER_MODE"] = "external"
+
+import harvest_be
+import pdf_manager
+import pdf_store
+from harvest_store import create_admin_user, create_project
+from pdf_download_db import count_blob_refs, init_pdf_download_db
+
+DB_PATH = os.environ["HARVEST_DB"]
+ADMIN = {"email": "admin@example.com", "password": "secret"}
+PDF_BYTES = b"%PDF-1.4\n" + b"shared paper " * 200
+OTHER_BYTES = b"%PDF-1.4\n" + b"other paper " * 200
+
+
+def write_pdf(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def blob_for(data, base="project_pdfs"):
+    import hashlib
+    return pdf_store.blob_path(os.path.join(os.path.abspath(base), ".blobs"), hashlib.sha256(data).hexdigest())
+
+
+def test_link_release_and_private_copies():
+    """Projects share one blob; DOI removal and project deletion only unlink"""
+    print("Testing shared PDF store...")
+    try:
+        harvest_be.boot()
+        create_admin_user(DB_PATH, ADMIN["email"], ADMIN["password"])
+        doi = "10.1000/shared"
+        doi_hash = pdf_manager.generate_doi_hash(doi)
+        first = create_project(DB_PATH, "First", "", [doi], ADMIN["email"])
+        second = create_project(DB_PATH, "Second", "", [doi], ADMIN["email"])
+        third = create_project(DB_PATH, "Third", "", [doi], ADMIN["email"])
+        paths = [os.path.abspath(os.path.join(pdf_manager.get_project_pdf_dir(p), f"{doi_hash}.pdf"))
+                 for p in (first, second, third)]
+
+        # Downloaded once for the first project
+        write_pdf(paths[0], PDF_BYTES)
+        sha256 = pdf_store.add_to_store(paths[0], doi_hash)
+        blob = blob_for(PDF_BYTES)
+        assert os.path.samefile(paths[0], blob) and count_blob_refs(sha256) == 1
+
+        # The other projects link it; no source is asked and nothing is downloaded
+        with mock.patch.object(pdf_manager, "try_source", side_effect=AssertionError("no lookup")), \
+                mock.patch.object(pdf_manager, "download_pdf", side_effect=AssertionError("no download")):
+            for project_id, path in ((second, paths[1]), (third, paths[2])):
+                result = pdf_manager.download_pdf_smart(doi, project_id, pdf_manager.get_project_pdf_dir(project_id))
+                assert result[0] and result[2] == "pdf_store", result
+                assert os.path.samefile(path, blob)
+        assert count_blob_refs(sha256) == 3 and os.stat(blob).st_nlink == 4
+
+        # Deleting the first project only unlinks its copy
+        client = harvest_be.app.test_client()
+        resp = client.delete(f"/api/admin/projects/{first}", json=ADMIN)
+        assert resp.status_code == 200, resp.get_data(as_text=True)
+        assert not os.path.exists(paths[0]) and os.path.exists(blob) and count_blob_refs(sha256) == 2
+
+        # Highlights are written into the file: the third project gets a private copy
+        assert pdf_store.make_private(paths[2])
+        assert not os.path.samefile(paths[2], blob) and count_blob_refs(sha256) == 1
+        with open(paths[2], "ab") as f:
+            f.write(b"% highlight")
+        with open(paths[1], "rb") as f:
+            assert f.read() == PDF_BYTES, "Edits do not reach other projects"
+
+        # Removing the DOI from the last project that links it deletes the blob
+        resp = client.post(f"/api/admin/projects/{second}/remove-dois",
+                           json={**ADMIN, "dois": [doi], "delete_pdfs": True})
+        assert resp.status_code == 200 and resp.get_json()["deleted_pdfs"] == 1, resp.get_data(as_text=True)
+        assert not os.path.exists(paths[1]) and not os.path.exists(blob) and count_blob_refs(sha256) == 0
+        print("✓ Shared blobs linked, unlinked and copied on write")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_dedupe_migration():
+    """Existing project directories are converted; identical PDFs share one blob"""
+    print("\nTesting dedupe migration...")
+    try:
+        base = os.path.join(tmp_dir, "legacy_pdfs")
+        write_pdf(os.path.join(base, "project_1", "aaa.pdf"), PDF_BYTES)
+        write_pdf(os.path.join(base, "project_2", "aaa.pdf"), PDF_BYTES)
+        write_pdf(os.path.join(base, "project_2", "bbb.pdf"), OTHER_BYTES)
+        write_pdf(os.path.join(base, "project_3", "aaa.pdf"), PDF_BYTES)
+
+        stats = pdf_store.dedupe_directory(base)
+        assert stats == {"files": 4, "stored": 4, "deduplicated": 2, "bytes_saved": 2 * len(PDF_BYTES)}, stats
+        blob = blob_for(PDF_BYTES, base)
+        for project in ("project_1", "project_2", "project_3"):
+            assert os.path.samefile(os.path.join(base, project, "aaa.pdf"), blob)
+        assert pdf_store.dedupe_directory(base)["stored"] == 0, "Already converted files are skipped"
+
+        # Files removed outside the application are reconciled by garbage collection
+        os.remove(os.path.join(base, "project_2", "bbb.pdf"))
+        assert pdf_store.collect_garbage(base) == 1
+        assert not os.path.exists(blob_for(OTHER_BYTES, base)) and os.path.exists(blob)
+
+        from scripts.dedupe_pdf_store import main as dedupe_main
+        assert dedupe_main(["--storage-dir", base]) == 0
+        print("✓ Project directories deduplicated")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("PDF Store Tests")
+    print("=" * 70)
+    print()
+
+    # Project PDFs and the PDF tracking database are created in the working directory
+    original_cwd = os.getcwd()
+    os.chdir(tmp_dir)
+    init_pdf_download_db()
+
+    tests = [
+        test_link_release_and_private_copies,
+        test_dedupe_migration,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    os.chdir(original_cwd)
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
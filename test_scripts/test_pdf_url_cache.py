@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for the DOI -> PDF URL resolution cache (pdf_url_cache)
+Tests that a DOI resolved once is downloaded from its cached URL in any
+project without source lookups, that stale entries are revalidated with a
+conditional request, that failing URLs are evicted and resolved again, that
+existing download history seeds the cache, and that process_dois_smart
+reports the cache hit rate.
+Source lookups and downloads are simulated so the test runs offline.
+"""
+
+import sys
+import os
+import tempfile
+import shutil
+import sqlite3
+import time
+from unittest import mock
+
+# Add parent directory to path to import harvest modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tmp_dir = tempfile.mkdtemp()
+os.environ["HARVEST_DB"] = os.path.join(tmp_dir, "harvest.db")
+
+import pdf_manager
+from pdf_download_db import flush_download_attempts, get_cached_pdf_url, init_pdf_download_db, log_download_attempt
+
+RANKINGS = [{"name": "europe_pmc", "enabled": 1, "requires_library": None, "success_rate": 0.0}]
+
+
+class FakeWeb:
+    """Source lookups return source_urls[doi]; only URLs in `working` download"""
+
+    def __init__(self):
+        self.source_urls = {}
+        self.working = set()
+        self.lookups = []
+        self.downloads = []
+
+    def try_source(self, source_name, doi, config):
+        self.lookups.append(doi)
+        if doi in self.source_urls:
+            return True, self.source_urls[doi], 10
+        return False, "Not found", 10
+
+    def download_pdf(self, doi, pdf_url, save_dir, use_proxy=False, response_info=None):
+        self.downloads.append(pdf_url)
+        if pdf_url not in self.working:
+            return False, "Download failed: HTTP 404"
+        if response_info is not None:
+            response_info.update({"etag": f'"{hash(pdf_url)}"', "content_length": 123456})
+        return True, f"Downloaded: {doi}"
+
+    def patches(self):
+        return [
+            mock.patch.object(pdf_manager, "try_source", side_effect=self.try_source),
+            mock.patch.object(pdf_manager, "download_pdf", side_effect=self.download_pdf),
+            mock.patch("pdf_download_db.get_source_rankings", return_value=RANKINGS),
+            mock.patch("pdf_download_db.get_best_source_for_publisher", return_value=None),
+            mock.patch.object(pdf_manager, "PDF_SOURCE_ORDERING", "success_rate"),
+        ]
+
+
+def run_with(web, func, *args, **kwargs):
+    patches = web.patches()
+    for patch in patches:
+        patch.start()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        for patch in patches:
+            patch.stop()
+
+
+def age_entry(doi):
+    conn = sqlite3.connect("pdf_downloads.db")
+    conn.execute("UPDATE pdf_url_cache SET verified_at = ? WHERE doi = ?",
+                 (time.time() - pdf_manager.PDF_URL_CACHE_TTL - 60, doi))
+    conn.commit()
+    conn.close()
+
+
+def test_cache_reuse_revalidation_and_eviction():
+    """Cached URLs skip source lookups; stale ones are revalidated; failing ones evicted"""
+    print("Testing PDF URL cache...")
+    try:
+        doi = "10.1000/cached"
+        web = FakeWeb()
+        web.source_urls[doi] = "https://europepmc.org/a.pdf"
+        web.working.add("https://europepmc.org/a.pdf")
+
+        resolution = {}
+        result = run_with(web, pdf_manager.download_pdf_smart, doi, 1, os.path.join(tmp_dir, "p1"),
+                          resolution=resolution)
+        assert result[0] and web.lookups == [doi]
+        assert resolution == {"url_cache": "miss", "suppressed": [], "requests_saved": 0}, resolution
+        entry = get_cached_pdf_url(doi)
+        assert entry["pdf_url"] == "https://europepmc.org/a.pdf" and entry["source_name"] == "europe_pmc"
+        assert entry["content_length"] == 123456 and entry["etag"]
+
+        # Another project: served from the cache without any lookup or revalidation
+        resolution = {}
+        with mock.patch("http_sessions.head") as head:
+            result = run_with(web, pdf_manager.download_pdf_smart, doi, 2, os.path.join(tmp_dir, "p2"),
+                              resolution=resolution)
+        assert result == (True, f"Downloaded: {doi}", "europe_pmc"), result
+        assert resolution == {"url_cache": "hit"} and web.lookups == [doi] and not head.called
+
+        # Stale entry: conditional HEAD with the stored ETag; 304 keeps it
+        age_entry(doi)
+        with mock.patch("http_sessions.head", return_value=mock.Mock(status_code=304, headers={})) as head:
+            result = run_with(web, pdf_manager.download_pdf_smart, doi, 3, os.path.join(tmp_dir, "p3"))
+        assert result[0] and web.lookups == [doi]
+        assert head.call_args.kwargs["headers"] == {"If-None-Match": entry["etag"]}
+        assert time.time() - get_cached_pdf_url(doi)["verified_at"] < 60, "Revalidation refreshes verified_at"
+
+        # Stale and gone: evicted, resolved again through the sources, new URL cached
+        age_entry(doi)
+        web.source_urls[doi] = "https://europepmc.org/b.pdf"
+        web.working = {"https://europepmc.org/b.pdf"}
+        with mock.patch("http_sessions.head", return_value=mock.Mock(status_code=404, headers={})):
+            result = run_with(web, pdf_manager.download_pdf_smart, doi, 4, os.path.join(tmp_dir, "p4"))
+        assert result[0] and web.lookups == [doi, doi]
+        assert get_cached_pdf_url(doi)["pdf_url"] == "https://europepmc.org/b.pdf"
+
+        # Fresh entry whose download fails: evicted and resolved again
+        web.source_urls[doi] = "https://europepmc.org/c.pdf"
+        web.working = {"https://europepmc.org/c.pdf"}
+        result = run_with(web, pdf_manager.download_pdf_smart, doi, 5, os.path.join(tmp_dir, "p5"))
+        assert result[0] and web.lookups == [doi] * 3
+        assert web.downloads[-2:] == ["https://europepmc.org/b.pdf", "https://europepmc.org/c.pdf"]
+        assert get_cached_pdf_url(doi)["pdf_url"] == "https://europepmc.org/c.pdf"
+        print("✓ Cache reused, revalidated and evicted")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_hit_rate_and_seeding():
+    """process_dois_smart reports the hit rate; download history seeds a new cache table"""
+    print("\nTesting hit rate reporting and seeding...")
+    try:
+        web = FakeWeb()
+        dois = [f"10.2000/paper{i}" for i in range(4)]
+        for doi in dois:
+            web.source_urls[doi] = f"https://www.ebi.ac.uk/{doi}.pdf"
+            web.working.add(f"https://www.ebi.ac.uk/{doi}.pdf")
+
+        first = run_with(web, pdf_manager.process_dois_smart, dois[:2], 10, os.path.join(tmp_dir, "j1"))
+        assert first["url_cache"] == {"hits": 0, "misses": 2, "hit_rate": 0.0}, first["url_cache"]
+        second = run_with(web, pdf_manager.process_dois_smart, dois, 11, os.path.join(tmp_dir, "j2"))
+        assert second["url_cache"] == {"hits": 2, "misses": 2, "hit_rate": 0.5}, second["url_cache"]
+        assert len(second["downloaded"]) == 4 and len(web.lookups) == 4
+
+        # Files already in the project directory are not cache lookups
+        with mock.patch.object(pdf_manager, "download_pdf_smart",
+                               return_value=(True, "File already exists", "cached")):
+            cached = pdf_manager.process_dois_smart(dois, 11, os.path.join(tmp_dir, "j2"))
+        assert cached["url_cache"] == {"hits": 0, "misses": 0, "hit_rate": 0.0}
+
+        # A database without the cache table is seeded from successful lookups
+        old_db = os.path.join(tmp_dir, "history.db")
+        init_pdf_download_db(old_db)
+        log_download_attempt(1, "10.3000/old", "unpaywall", False, "404", db_path=old_db)
+        log_download_attempt(1, "10.3000/old", "core", True, pdf_url="https://core.ac.uk/old.pdf", db_path=old_db)
+        flush_download_attempts(old_db)
+        conn = sqlite3.connect(old_db)
+        conn.execute("DROP TABLE pdf_url_cache")
+        conn.commit()
+        conn.close()
+        init_pdf_download_db(old_db)
+        seeded = get_cached_pdf_url("10.3000/old", db_path=old_db)
+        assert seeded["pdf_url"] == "https://core.ac.uk/old.pdf" and seeded["source_name"] == "core"
+        assert seeded["verified_at"] == 0, "Seeded URLs are revalidated before use"
+        print("✓ Hit rate reported and cache seeded")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("PDF URL Cache Tests")
+    print("=" * 70)
+    print()
+
+    # The PDF tracking database is created in the working directory
+    original_cwd = os.getcwd()
+    os.chdir(tmp_dir)
+
+    tests = [
+        test_cache_reuse_revalidation_and_eviction,
+        test_hit_rate_and_seeding,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    os.chdir(original_cwd)
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for background project creation
+Tests that creating a project returns a job id immediately, that DOIs are
+validated in chunks by a "project_creation" worker job and committed as each
+chunk completes, that a retried job resumes after its last committed chunk,
+and that the job reports progress, staleness (from its lease) and the final
+outcome through the status endpoint.
+CrossRef responses are simulated so the test runs offline.
+"""
+
+import sys
+import os
+import tempfile
+import shutil
+import time
+from unittest import mock
+
+# Add parent directory to path to import harvest_be
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tmp_dir = tempfile.mkdtemp()
+os.environ["HARVEST_DB"] = os.path.join(tmp_dir, "harvest.db")
+# Jobs are run explicitly below
+os.environ["HARVEST_JOB_WORKER_MODE"] = "external"
+
+import harvest_be
+import harvest_worker
+harvest_be.boot()
+from crossref_client import get_crossref_client
+from harvest_store import claim_job, create_admin_user, get_project_by_id
+
+NOT_FOUND = {"10.9999/missing"}
+ADMIN = {"email": "admin@example.com", "password": "secret"}
+
+
+def fake_get(url, params=None, timeout=None):
+    """Simulate CrossRef batch (filter=doi:...) queries"""
+    dois = [f.split(":", 1)[1] for f in params["filter"].split(",")]
+    response = mock.Mock()
+    response.status_code = 200
+    response.headers = {}
+    response.json.return_value = {"message": {"items": [
+        {"DOI": doi} for doi in dois if doi not in NOT_FOUND
+    ]}}
+    return response
+
+
+def _job_status(client, job_id):
+    return client.get(f"/api/admin/project-jobs/{job_id}", json=ADMIN).get_json()
+
+
+def _run_job(client, job_id):
+    """Run queued jobs the way harvest_worker.py does and return the job's final status"""
+    harvest_worker.run_worker(harvest_be.DB_PATH, once=True)
+    result = _job_status(client, job_id)
+    assert result["status"] in ("completed", "failed"), result
+    return result
+
+
+def test_project_created_in_chunks():
+    """The endpoint returns a job id; valid DOIs are committed chunk by chunk in order"""
+    print("Testing chunked background project creation...")
+    original_chunk = harvest_worker.PROJECT_CREATION_CHUNK_SIZE
+    try:
+        harvest_worker.PROJECT_CREATION_CHUNK_SIZE = 2
+        client = harvest_be.app.test_client()
+        dois = ["10.1234/c", "not-a-doi", "10.1234/A", "10.9999/missing", "10.1234/b", "10.1234/a"]
+        session = get_crossref_client().session
+        with mock.patch.object(session, "get", side_effect=fake_get) as get:
+            resp = client.post("/api/admin/projects", json={**ADMIN, "name": "Chunked", "doi_list": dois})
+            assert resp.status_code == 202, f"Expected 202, got {resp.status_code}"
+            job_id = resp.get_json()["job_id"]
+            queued = _job_status(client, job_id)
+            assert queued["status"] == "queued" and not queued["is_stale"], queued
+            result = _run_job(client, job_id)
+            assert get.call_count == 3, f"Expected one CrossRef call per chunk, got {get.call_count}"
+
+        assert result["status"] == "completed", result
+        assert result["validated"] == 6 and result["valid_count"] == 3
+        assert {item["doi"] for item in result["invalid_dois"]} == {"not-a-doi", "10.9999/missing"}
+
+        project = get_project_by_id(harvest_be.DB_PATH, result["project_id"])
+        assert project["doi_list"] == ["10.1234/c", "10.1234/a", "10.1234/b"], project["doi_list"]
+
+        print("✓ Project created by background job")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        harvest_worker.PROJECT_CREATION_CHUNK_SIZE = original_chunk
+
+
+def test_retry_resumes_after_committed_chunks():
+    """A job whose worker died is stale once its lease lapses; the retry reuses the project"""
+    print("\nTesting project creation retry...")
+    original_chunk = harvest_worker.PROJECT_CREATION_CHUNK_SIZE
+    try:
+        harvest_worker.PROJECT_CREATION_CHUNK_SIZE = 2
+        client = harvest_be.app.test_client()
+        dois = ["10.2345/a", "10.2345/b", "10.2345/c", "10.2345/d"]
+        session = get_crossref_client().session
+        with mock.patch.object(session, "get", side_effect=fake_get):
+            job_id = client.post("/api/admin/projects",
+                                 json={**ADMIN, "name": "Retried", "doi_list": dois}).get_json()["job_id"]
+
+            # A worker claims the job and dies without renewing its lease
+            job = claim_job(harvest_be.DB_PATH, "dead-worker", 0.05, ["project_creation"])
+            assert not _job_status(client, job_id)["is_stale"], "Not stale while the lease is held"
+            time.sleep(0.1)
+            assert _job_status(client, job_id)["is_stale"], "Stale once the lease lapses"
+
+            # The next attempt fails after committing the first chunk
+            job = claim_job(harvest_be.DB_PATH, "worker-1", 60, ["project_creation"])
+            with mock.patch.object(harvest_worker, "append_project_dois", side_effect=RuntimeError("disk full")):
+                assert harvest_worker.run_job(harvest_be.DB_PATH, job, "worker-1", 60, retry_delay=0) == "retry"
+            partial = _job_status(client, job_id)
+            assert partial["status"] == "running" and partial["validated"] == 2, partial
+            assert get_project_by_id(harvest_be.DB_PATH, partial["project_id"])["doi_list"] == dois[:2]
+
+            result = _run_job(client, job_id)
+
+        assert result["status"] == "completed" and result["project_id"] == partial["project_id"], result
+        assert result["validated"] == 4 and result["valid_count"] == 4
+        project = get_project_by_id(harvest_be.DB_PATH, result["project_id"])
+        assert project["doi_list"] == dois, project["doi_list"]
+        projects = [p for p in client.get("/api/projects").get_json() if p["name"] == "Retried"]
+        assert len(projects) == 1, "The retry does not create a second project"
+
+        print("✓ Retried job resumes the same project")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        harvest_worker.PROJECT_CREATION_CHUNK_SIZE = original_chunk
+
+
+def test_no_valid_dois_creates_no_project():
+    """A list without any valid DOI fails the job and creates no project"""
+    print("\nTesting job with no valid DOIs...")
+    try:
+        client = harvest_be.app.test_client()
+        before = len(client.get("/api/projects").get_json())
+        resp = client.post("/api/admin/projects",
+                           json={**ADMIN, "name": "Empty", "doi_list": ["bad-1", "bad-2"]})
+        result = _run_job(client, resp.get_json()["job_id"])
+
+        assert result["status"] == "failed" and result["error"] == "No valid DOIs provided"
+        assert result["project_id"] is None and result["invalid_count"] == 2
+        assert len(client.get("/api/projects").get_json()) == before
+
+        resp = client.post("/api/admin/projects", json={"email": "x@example.com", "password": "no",
+                                                         "name": "X", "doi_list": ["10.1/a"]})
+        assert resp.status_code == 403
+        assert client.get("/api/admin/project-jobs/unknown", json=ADMIN).status_code == 404
+        assert client.get("/api/admin/project-jobs/unknown").status_code == 401, "Job status is admin only"
+
+        print("✓ Failed job reported without creating a project")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("Project Creation Job Tests")
+    print("=" * 70)
+    print()
+
+    create_admin_user(harvest_be.DB_PATH, ADMIN["email"], ADMIN["password"])
+
+    tests = [
+        test_project_created_in_chunks,
+        test_retry_resumes_after_committed_chunks,
+        test_no_valid_dois_creates_no_project,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for project summaries and paged DOI listing
+Tests that /api/projects?fields=summary leaves out DOI lists and reports
+counts instead, and that /api/projects/<id>/dois pages through a project's
+DOIs with a cursor that stays consistent while DOIs are added, with an
+optional search filter.
+"""
+
+import sys
+import os
+import tempfile
+import shutil
+import sqlite3
+from unittest import mock
+
+# Add parent directory to path to import harvest modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tmp_dir = tempfile.mkdtemp()
+os.environ["HARVEST_DB"] = os.path.join(tmp_dir, "harvest.db")
+os.environ["HARVEST_JOB_WORKER_MODE"] = "external"
+
+import harvest_be
+harvest_be.boot()
+from harvest_store import create_project, append_project_dois
+
+DB_PATH = os.environ["HARVEST_DB"]
+
+
+def test_summary_mode():
+    """fields=summary returns ids, names and counts without DOI lists"""
+    print("Testing project summaries...")
+    try:
+        create_project(DB_PATH, "Large", "many DOIs", [f"10.1000/{i:04d}" for i in range(250)], "admin@example.com")
+        create_project(DB_PATH, "Empty", "", [], "admin@example.com")
+        client = harvest_be.app.test_client()
+
+        resp = client.get("/api/projects?fields=summary")
+        assert resp.status_code == 200
+        projects = {p["name"]: p for p in resp.get_json()}
+        assert "doi_list" not in projects["Large"], "Summaries leave out DOI lists"
+        assert projects["Large"]["doi_count"] == 250 and projects["Empty"]["doi_count"] == 0
+        assert projects["Large"]["description"] == "many DOIs"
+
+        full = {p["name"]: p for p in client.get("/api/projects").get_json()}
+        assert len(full["Large"]["doi_list"]) == 250, "The default still returns full projects"
+
+        resp = client.get("/api/projects?fields=summary&include=pdf_count")
+        assert resp.get_json()[0]["pdf_count"] == 0, "Includes work in summary mode"
+        assert client.get("/api/projects?fields=everything").status_code == 400
+        print("✓ Summary mode returns counts only")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_paged_dois():
+    """DOIs are paged with a cursor, filtered by q, 404 for unknown projects and 500 on database errors"""
+    print("\nTesting paged DOI listing...")
+    try:
+        client = harvest_be.app.test_client()
+        project_id = {p["name"]: p["id"] for p in client.get("/api/projects?fields=summary").get_json()}["Large"]
+        url = f"/api/projects/{project_id}/dois"
+
+        first = client.get(url, query_string={"limit": 100}).get_json()
+        assert first["total"] == 250 and len(first["dois"]) == 100
+        assert first["dois"] == sorted(first["dois"]) and first["next_cursor"] == first["dois"][-1]
+
+        # DOIs added before the cursor do not shift the next page
+        append_project_dois(DB_PATH, project_id, ["10.0999/early"])
+        seen = list(first["dois"])
+        cursor = first["next_cursor"]
+        while cursor:
+            page = client.get(url, query_string={"limit": 100, "cursor": cursor}).get_json()
+            seen.extend(page["dois"])
+            cursor = page["next_cursor"]
+        assert seen == [f"10.1000/{i:04d}" for i in range(250)], "Every DOI exactly once"
+
+        found = client.get(url, query_string={"q": "10.1000/012"}).get_json()
+        assert found["total"] == 10 and found["next_cursor"] is None
+        assert client.get(url, query_string={"q": "EARLY"}).get_json()["dois"] == ["10.0999/early"]
+
+        assert len(client.get(url, query_string={"limit": 5000}).get_json()["dois"]) == 251, "Limit is capped"
+        assert client.get(url, query_string={"limit": 0}).status_code == 400
+        assert client.get("/api/projects/99999/dois").status_code == 404
+        locked = mock.MagicMock()
+        locked.execute.side_effect = locked.cursor.return_value.execute.side_effect = \
+            sqlite3.OperationalError("database is locked")
+        with mock.patch("harvest_store.get_conn", return_value=locked):
+            assert client.get(url).status_code == 500, "A database error is not a missing project"
+        print("✓ DOIs paged, filtered and cursor-stable")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("Project DOI Paging Tests")
+    print("=" * 70)
+    print()
+
+    tests = [
+        test_summary_mode,
+        test_paged_dois,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
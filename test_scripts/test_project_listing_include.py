@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for /api/projects?include=download_status,pdf_count,doi_count
+Tests that the project list carries DOI/PDF counts and each project's download
+status (with the stale flag the admin panel uses for Force Restart), that PDF
+counts follow changes to the project directory, and that unknown include
+values are rejected.
+"""
+
+import sys
+import os
+import time
+import tempfile
+import shutil
+
+# Add parent directory to path to import harvest modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tmp_dir = tempfile.mkdtemp()
+os.environ["HARVEST_DB"] = os.path.join(tmp_dir, "harvest.db")
+os.environ["HARVEST_JOB_WORKER_MODE"] = "external"
+
+import harvest_be
+harvest_be.boot()
+from harvest_store import (
+    create_project,
+    init_pdf_download_progress,
+    update_pdf_download_progress,
+    enqueue_job,
+    claim_job,
+    get_conn,
+)
+
+DB_PATH = os.environ["HARVEST_DB"]
+
+
+def _list(client, include):
+    resp = client.get("/api/projects", query_string={"include": include})
+    assert resp.status_code == 200, resp.get_data(as_text=True)
+    return {p["name"]: p for p in resp.get_json()}
+
+
+def test_download_status_and_counts():
+    """Counts and download status (including staleness) come with the project list"""
+    print("Testing project list includes...")
+    try:
+        stale = create_project(DB_PATH, "stale", "", ["10.1/a", "10.1/b", "10.1/c"], "admin@example.com")
+        leased = create_project(DB_PATH, "leased", "", ["10.1/d"], "admin@example.com")
+        queued = create_project(DB_PATH, "queued", "", ["10.1/e"], "admin@example.com")
+        create_project(DB_PATH, "idle", "", [], "admin@example.com")
+
+        # Running without a job and not updated for ten minutes
+        init_pdf_download_progress(DB_PATH, stale, 3, "project_pdfs/project_1")
+        update_pdf_download_progress(DB_PATH, stale, {"status": "running", "current": 1})
+        conn = get_conn(DB_PATH)
+        conn.execute("UPDATE pdf_download_progress SET updated_at = ? WHERE project_id = ?",
+                     (time.time() - 600, stale))
+        conn.close()
+
+        # Running with a job whose worker lost its lease, and with a job still waiting for a worker
+        for pid in (leased, queued):
+            init_pdf_download_progress(DB_PATH, pid, 1, f"project_pdfs/project_{pid}")
+            update_pdf_download_progress(DB_PATH, pid, {"status": "running"})
+            enqueue_job(DB_PATH, "pdf_download", {"project_id": pid}, dedupe_key=f"pdf_download:{pid}")
+            if pid == leased:
+                assert claim_job(DB_PATH, "worker-1", lease_seconds=-1)
+
+        client = harvest_be.app.test_client()
+        projects = _list(client, "download_status,pdf_count,doi_count")
+
+        assert projects["stale"]["doi_count"] == 3
+        status = projects["stale"]["download_status"]
+        assert status["status"] == "running" and status["current"] == 1 and status["total"] == 3
+        assert status["is_stale"] is True, "No updates for ten minutes"
+        assert projects["leased"]["download_status"]["is_stale"] is True, "Expired job lease"
+        assert projects["queued"]["download_status"]["is_stale"] is False, "Queued jobs are not stale"
+        assert projects["idle"]["download_status"] is None
+        assert projects["idle"]["doi_count"] == 0 and projects["idle"]["pdf_count"] == 0
+
+        plain = _list(client, "")["stale"]
+        assert not {"doi_count", "pdf_count", "download_status"} & set(plain), "Fields are opt-in"
+
+        resp = client.get("/api/projects?include=pdf_count,everything")
+        assert resp.status_code == 400 and "everything" in resp.get_json()["error"]
+        print("✓ Download status and counts included")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_pdf_count_follows_directory():
+    """PDF counts are cached per directory and refreshed when files are added"""
+    print("\nTesting cached PDF counts...")
+    try:
+        client = harvest_be.app.test_client()
+        project_id = _list(client, "pdf_count")["stale"]["id"]
+        project_dir = os.path.join("project_pdfs", f"project_{project_id}")
+        os.makedirs(project_dir)
+        for name in ("a.pdf", "b.pdf", "notes.txt"):
+            open(os.path.join(project_dir, name), "w").close()
+
+        assert _list(client, "pdf_count")["stale"]["pdf_count"] == 2
+
+        with open(os.path.join(project_dir, "c.pdf"), "w"):
+            pass
+        # Make the directory change visible even on filesystems with coarse timestamps
+        stat = os.stat(project_dir)
+        os.utime(project_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert _list(client, "pdf_count")["stale"]["pdf_count"] == 3
+        print("✓ PDF counts refreshed when the directory changes")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("Project Listing Include Tests")
+    print("=" * 70)
+    print()
+
+    # PDF directories are relative to the working directory
+    original_cwd = os.getcwd()
+    os.chdir(tmp_dir)
+
+    tests = [
+        test_download_status_and_counts,
+        test_pdf_count_follows_directory,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    os.chdir(original_cwd)
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
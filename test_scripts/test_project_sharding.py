@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for per-project database sharding
+Tests shard routing of writes, cross-project reads through ATTACH views,
+triple reassignment between shards, and splitting an existing database.
+"""
+
+import sys
+import os
+import tempfile
+import shutil
+import sqlite3
+
+# Add parent directory to path to import harvest_store
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import harvest_store
+from harvest_store import (
+    init_db, create_project, delete_project, configure_project_sharding,
+    upsert_sentence, insert_triple_rows, update_triple, create_batches,
+    get_project_batches, update_doi_status, get_doi_status_summary,
+    get_shard_path, get_project_conn, get_row_conn, iter_read_conns, reassign_project_triples,
+    shard_project_for_row_id, SHARD_ID_SPAN,
+)
+
+TRIPLE = {
+    "source_entity_name": "GeneA", "source_entity_attr": "Gene",
+    "relation_type": "regulates",
+    "sink_entity_name": "TraitB", "sink_entity_attr": "Trait",
+}
+
+
+def _setup(sharded):
+    tmp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(tmp_dir, "harvest.db")
+    configure_project_sharding(sharded, "shards")
+    harvest_store._initialized_shards.clear()
+    init_db(db_path)
+    return tmp_dir, db_path
+
+
+def _add_annotation(db_path, project_id, text):
+    sid = upsert_sentence(db_path, None, text, "", None, project_id)
+    insert_triple_rows(db_path, sid, [TRIPLE], "user@example.com", project_id)
+    return sid
+
+
+def _all_triples(db_path, project_ids=None):
+    rows = []
+    for conn in iter_read_conns(db_path, project_ids):
+        rows.extend(conn.execute("""
+            SELECT t.id, t.project_id, s.text FROM triples t
+            JOIN sentences s ON s.id = t.sentence_id ORDER BY t.id
+        """).fetchall())
+    return rows
+
+
+def test_writes_are_routed_to_shards():
+    """Sentences, triples, batches and statuses land in the project's shard"""
+    print("Testing shard routing of project writes...")
+    tmp_dir, db_path = _setup(True)
+    try:
+        p1 = create_project(db_path, "P1", "", ["10.1/a", "10.1/b"], "admin@example.com")
+        sid = _add_annotation(db_path, p1, "sentence one")
+
+        assert shard_project_for_row_id(sid) == p1, "Sentence id should encode its project"
+        assert os.path.exists(get_shard_path(db_path, p1)), "Shard file should be created"
+
+        central = harvest_store.get_conn(db_path)
+        assert central.execute("SELECT COUNT(*) FROM triples").fetchone()[0] == 0
+        central.close()
+
+        batches = create_batches(db_path, p1, batch_size=1)
+        assert len(batches) == 2 and len(get_project_batches(db_path, p1)) == 2
+        assert update_doi_status(db_path, p1, "10.1/a", "completed", "user@example.com")
+        assert get_doi_status_summary(db_path, p1)["completed"] == 1
+
+        triple_id = _all_triples(db_path)[0][0]
+        assert update_triple(db_path, triple_id, relation_type="increases")
+        conn = get_project_conn(db_path, p1)
+        assert conn.execute("SELECT relation_type FROM triples").fetchone()[0] == "increases"
+        conn.close()
+
+        print("✓ Project writes routed to shard")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        configure_project_sharding(False)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def test_cross_project_reads_use_attach():
+    """Reads span the central DB and every shard, even beyond the ATTACH limit"""
+    print("\nTesting cross-project reads...")
+    tmp_dir, db_path = _setup(True)
+    try:
+        project_ids = [create_project(db_path, f"P{i}", "", [], "admin@example.com") for i in range(12)]
+        for pid in project_ids:
+            _add_annotation(db_path, pid, f"text {pid}")
+        _add_annotation(db_path, None, "unassigned text")
+
+        rows = _all_triples(db_path)
+        assert len(rows) == 13, f"Expected 13 triples, got {len(rows)}"
+        assert len({r[0] for r in rows}) == 13, "Triple ids should be unique across shards"
+
+        rows = _all_triples(db_path, [project_ids[3]])
+        assert [r[2] for r in rows if r[1] == project_ids[3]] == [f"text {project_ids[3]}"]
+
+        print("✓ Cross-project reads include all shards")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        configure_project_sharding(False)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def test_reassign_and_delete_sharded_project():
+    """Reassigned triples move to the target shard with new ids; deleting removes the shard file"""
+    print("\nTesting reassignment and deletion of a sharded project...")
+    tmp_dir, db_path = _setup(True)
+    try:
+        p1 = create_project(db_path, "P1", "", [], "admin@example.com")
+        p2 = create_project(db_path, "P2", "", [], "admin@example.com")
+        _add_annotation(db_path, p1, "moving sentence")
+
+        # A failing source delete rolls back the copy: the triple stays only in the source
+        conn = sqlite3.connect(get_shard_path(db_path, p1))
+        conn.execute("""CREATE TRIGGER fail_delete BEFORE DELETE ON triples
+                        BEGIN SELECT RAISE(ABORT, 'source shard busy'); END;""")
+        conn.commit()
+        assert reassign_project_triples(db_path, p1, p2) == -1
+        assert [r[1] for r in _all_triples(db_path)] == [p1], "Failed moves leave no copies"
+        conn.execute("DROP TRIGGER fail_delete;")
+        conn.commit()
+        conn.close()
+
+        assert reassign_project_triples(db_path, p1, p2) == 1
+        assert delete_project(db_path, p1)
+        assert not os.path.exists(get_shard_path(db_path, p1)), "Shard file should be removed"
+
+        rows = _all_triples(db_path)
+        assert rows == [(rows[0][0], p2, "moving sentence")], f"Unexpected rows: {rows}"
+
+        # Moved rows are renumbered into the target's id range, so they can still be edited
+        moved_id = rows[0][0]
+        assert shard_project_for_row_id(moved_id) == p2, f"Moved triple id {moved_id} routes elsewhere"
+        assert update_triple(db_path, moved_id, relation_type="inhibits")
+        conn = get_row_conn(db_path, moved_id)
+        assert conn.execute("SELECT relation_type FROM triples WHERE id = ?;", (moved_id,)).fetchone() == ("inhibits",)
+        conn.execute("DELETE FROM triples WHERE id = ?;", (moved_id,))
+        conn.close()
+        assert _all_triples(db_path) == [], "Moved triple should be deletable"
+
+        # New rows in the target keep using the target's range
+        new_sid = _add_annotation(db_path, p2, "new sentence")
+        assert shard_project_for_row_id(new_sid) == p2
+
+        # Moving to no project renumbers into the central DB
+        assert reassign_project_triples(db_path, p2, None) == 1
+        central = _all_triples(db_path)
+        assert central == [(central[0][0], None, "new sentence")], f"Unexpected rows: {central}"
+        assert shard_project_for_row_id(central[0][0]) is None
+        assert update_triple(db_path, central[0][0], relation_type="inhibits")
+
+        print("✓ Triples reassigned across shards")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        configure_project_sharding(False)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def test_split_existing_database():
+    """The split tool moves project rows into shards with renumbered ids"""
+    print("\nTesting split of an existing database...")
+    tmp_dir, db_path = _setup(False)
+    try:
+        from split_project_shards import split_project_shards
+
+        p1 = create_project(db_path, "P1", "", ["10.1/a"], "admin@example.com")
+        _add_annotation(db_path, p1, "project sentence")
+        _add_annotation(db_path, None, "central sentence")
+        create_batches(db_path, p1, batch_size=1)
+        before = _all_triples(db_path)
+
+        assert split_project_shards(db_path, "shards", dry_run=False)
+        harvest_store._initialized_shards.clear()
+
+        rows = _all_triples(db_path)
+        assert sorted(r[2] for r in rows) == sorted(r[2] for r in before)
+        moved = [r for r in rows if r[1] == p1][0]
+        assert moved[0] > SHARD_ID_SPAN and shard_project_for_row_id(moved[0]) == p1
+        assert len(get_project_batches(db_path, p1)) == 1, "Batches should move with the project"
+
+        print("✓ Existing database split into shards")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        configure_project_sharding(False)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("Per-Project Sharding Tests")
+    print("=" * 70)
+    print()
+
+    tests = [
+        test_writes_are_routed_to_shards,
+        test_cross_project_reads_use_attach,
+        test_reassign_and_delete_sharded_project,
+        test_split_existing_database,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for the opt-in response layer (response_layer.py)
+Tests that the orjson provider produces the same JSON as Flask's encoder
+(including values orjson cannot serialize), that responses are compressed
+only above the size threshold and when the client accepts it, and that
+serialization time is reported in the Server-Timing header.
+"""
+
+import sys
+import os
+import gzip
+import json
+import decimal
+from datetime import date
+
+from flask import Flask, Response, jsonify
+
+# Add parent directory to path to import response_layer
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import response_layer
+from response_layer import init_response_layer, _choose_encoding
+
+
+def _make_app(fast_json=True, compression=True):
+    app = Flask(__name__)
+    init_response_layer(app, fast_json=fast_json, compression=compression, min_size=200)
+
+    @app.get("/small")
+    def small():
+        return jsonify({"ok": True})
+
+    @app.get("/rows")
+    def rows():
+        return jsonify([{"id": i, "sentence": f"Sentence {i}"} for i in range(100)])
+
+    @app.get("/odd")
+    def odd():
+        return jsonify({"day": date(2024, 1, 2), "amount": decimal.Decimal("1.50"), "big": 2 ** 70, "ids": {3: "int keys"}})
+
+    @app.get("/events")
+    def events():
+        return Response(iter(["data: x\n\n"] * 100), mimetype="text/event-stream")
+
+    return app
+
+
+def test_orjson_matches_stdlib():
+    """Fast JSON output decodes to the same data as the standard encoder"""
+    print("Testing orjson provider...")
+    try:
+        if not response_layer.ORJSON_AVAILABLE:
+            print("⚠ orjson not installed, checking the standard encoder fallback")
+        fast = _make_app(fast_json=True, compression=False).test_client()
+        standard = _make_app(fast_json=False, compression=False).test_client()
+        for path in ("/rows", "/odd"):
+            resp = fast.get(path)
+            assert resp.status_code == 200 and resp.mimetype == "application/json"
+            assert json.loads(resp.data) == json.loads(standard.get(path).data), path
+        assert json.loads(fast.get("/odd").data)["big"] == 2 ** 70, "Fallback for values orjson rejects"
+        assert "json;dur=" in fast.get("/rows").headers.get("Server-Timing", "")
+        print("✓ orjson output matches the standard encoder")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_compression_negotiation():
+    """Large responses are gzipped when accepted; small, refused and streamed ones are not"""
+    print("\nTesting response compression...")
+    try:
+        client = _make_app().test_client()
+
+        resp = client.get("/rows", headers={"Accept-Encoding": "gzip, deflate"})
+        assert resp.headers.get("Content-Encoding") == "gzip"
+        assert "Accept-Encoding" in resp.headers.get("Vary", "")
+        assert len(json.loads(gzip.decompress(resp.data))) == 100
+        assert "compress;dur=" in resp.headers["Server-Timing"]
+
+        assert "Content-Encoding" not in client.get("/rows").headers, "No Accept-Encoding, no compression"
+        resp = client.get("/rows", headers={"Accept-Encoding": "gzip;q=0, identity"})
+        assert "Content-Encoding" not in resp.headers, "q=0 refuses gzip"
+        resp = client.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in resp.headers, "Responses below the threshold stay as they are"
+        resp = client.get("/events", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in resp.headers, "Event streams must not be buffered"
+
+        assert _choose_encoding("br;q=1.0, gzip;q=0.5") == ("br" if response_layer.BROTLI_AVAILABLE else "gzip")
+        assert _choose_encoding("*") in ("br", "gzip")
+        assert _choose_encoding("identity") is None
+        print("✓ Compression negotiated correctly")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("Response Layer Tests")
+    print("=" * 70)
+    print()
+
+    tests = [
+        test_orjson_matches_stdlib,
+        test_compression_negotiation,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
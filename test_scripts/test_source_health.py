@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for per-source circuit breakers and adaptive timeouts (source_health.py)
+Tests the closed/open/half-open breaker cycle driven by timeouts and 5xx
+answers, lookup timeouts and hedge delays derived from each source's cached
+latency percentiles, and that downloads skip a source that is down while its
+breaker state shows up in the pdf-analytics endpoints. Lookups are simulated so the test runs offline.
+"""
+
+import sys
+import os
+import tempfile
+import shutil
+from unittest import mock
+
+# Add parent directory to path to import harvest modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tmp_dir = tempfile.mkdtemp()
+os.environ["HARVEST_DB"] = os.path.join(tmp_dir, "harvest.db")
+os.environ["HARVEST_JOB_WORKER_MODE"] = "external"
+
+import pdf_manager
+from host_limiter import HostLimiter
+from pdf_download_db import (
+    flush_download_attempts, get_breaker_states, get_source_latency_percentiles, init_pdf_download_db,
+    write_download_attempts
+)
+from source_health import CircuitBreaker, SourceHealth, is_outage
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def attempts(source_name, response_times):
+    return [(1, f"10.1000/paper.{i}", source_name, 1, None, None, ms, None, None, None, None)
+            for i, ms in enumerate(response_times)]
+
+
+def test_breaker_and_timeouts():
+    """Breakers open on outages, probe when due and back off; timeouts follow p95 latency"""
+    print("Testing circuit breaker cycle and adaptive timeouts...")
+    try:
+        assert is_outage("CORE timeout") and is_outage("Europe PMC API error: HTTP 503")
+        assert is_outage("Unpaywall error: ('Connection aborted.')")
+        assert not is_outage("Not found") and not is_outage("Europe PMC API error: HTTP 404")
+
+        clock = FakeClock()
+        changes = []
+        breaker = CircuitBreaker("core", failure_threshold=3, open_seconds=60, max_open_seconds=100,
+                                 clock=clock, on_change=lambda b: changes.append(b.state))
+        breaker.record_failure("CORE timeout")
+        breaker.record_failure("CORE timeout")
+        breaker.record_success()
+        breaker.record_failure("CORE timeout")
+        breaker.record_failure("CORE timeout")
+        assert breaker.allow() and breaker.state == "closed", "Any answer resets the count"
+        breaker.record_failure("CORE timeout")
+        assert breaker.state == "open" and breaker.is_open() and not breaker.allow()
+
+        clock.now += 60
+        assert not breaker.is_open()
+        assert breaker.allow() and breaker.state == "half_open"
+        assert not breaker.allow(), "Only one probe while half-open"
+        breaker.record_failure("CORE API error: HTTP 502")
+        assert breaker.state == "open" and breaker.retry_at == clock.now + 100, "Failed probe backs off (capped)"
+        clock.now += 100
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == "closed" and breaker.open_seconds == 60 and breaker.trips == 2
+        assert changes == ["open", "half_open", "open", "half_open", "closed"], changes
+
+        write_download_attempts(attempts("fast", [200] * 19 + [400])
+                                + attempts("slow", [9000] * 20)
+                                + attempts("sparse", [100, 100]))
+        percentiles = get_source_latency_percentiles((0.5, 0.95))
+        assert percentiles["fast"][0.5] == 200 and abs(percentiles["fast"][0.95] - 210) < 1e-9, percentiles
+        assert "sparse" not in percentiles, "Too few samples for a percentile"
+
+        rankings = [{"name": name, "timeout": timeout}
+                    for name, timeout in (("fast", 15), ("slow", 15), ("sparse", 10), ("fresh", None))]
+        health = SourceHealth(timeout_multiplier=2.0, min_timeout=3.0, persist=False)
+        with mock.patch("pdf_download_db.get_source_rankings", return_value=rankings):
+            assert health.timeout_for("fast") == 3.0, "Fast sources get the minimum timeout"
+            assert health.timeout_for("slow") == 15.0, "Never above the configured timeout"
+            assert health.timeout_for("sparse") == 10.0
+            assert health.timeout_for("fresh") == 15.0
+            assert health.latency_p50() == {"fast": 200.0, "slow": 9000.0}, "Hedge delays come with the timeouts"
+
+        # The percentiles are queried once per refresh interval, not per lookup or DOI
+        with mock.patch("pdf_download_db.get_source_rankings", return_value=rankings), \
+                mock.patch("pdf_download_db.get_source_latency_percentiles",
+                           wraps=get_source_latency_percentiles) as query:
+            cached = SourceHealth(refresh_seconds=60, persist=False)
+            for _ in range(10):
+                cached.timeout_for("fast")
+                cached.latency_p50()
+            assert query.call_count == 1, query.call_count
+            cached._loaded_at -= 60
+            assert cached.latency_p50()["fast"] == 200.0 and query.call_count == 2
+        print("✓ Breaker cycle and adaptive timeouts")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_downloads_skip_open_circuits():
+    """A source that is down is skipped after the threshold and shows up as open"""
+    print("\nTesting circuit breakers in downloads...")
+    try:
+        lookups = []
+
+        def try_source(source_name, doi, config):
+            lookups.append((source_name, config.get("timeout")))
+            if source_name == "core":
+                return False, "CORE API error: HTTP 503", 10
+            return False, "Not found", 10
+
+        rankings = [{"name": name, "enabled": 1, "requires_library": None, "success_rate": 0.0, "timeout": 15}
+                    for name in ("core", "finder")]
+        health = SourceHealth(failure_threshold=3, open_seconds=600)
+        with mock.patch.object(pdf_manager, "try_source", side_effect=try_source), \
+                mock.patch("pdf_download_db.get_source_rankings", return_value=rankings), \
+                mock.patch("pdf_download_db.get_best_source_for_publisher", return_value=None), \
+                mock.patch("source_health.get_source_health", return_value=health), \
+                mock.patch("host_limiter.get_host_limiter", return_value=HostLimiter(default_rps=0)), \
+                mock.patch.object(pdf_manager, "PDF_SOURCE_ORDERING", "success_rate"), \
+                mock.patch.object(pdf_manager, "PDF_SOURCE_SUPPRESSION", False), \
+                mock.patch.object(pdf_manager, "PDF_SOURCE_RACE_MODE", "serial"):
+            for i in range(6):
+                pdf_manager.download_pdf_smart(f"10.8000/down.{i}", 4, os.path.join(tmp_dir, "project_4"))
+
+            core_lookups = [timeout for name, timeout in lookups if name == "core"]
+            assert len(core_lookups) == 3, lookups
+            assert [name for name, _ in lookups].count("finder") == 6
+            assert core_lookups == [15.0] * 3, "Lookups use the source's timeout"
+
+            import harvest_be
+
+            client = harvest_be.app.test_client()
+            assert client.get("/api/admin/pdf-analytics/circuit-breakers").status_code == 401
+            with mock.patch.object(harvest_be, "verify_admin_token",
+                                   side_effect=lambda token: "admin@example.com" if token == "tok" else None):
+                assert client.get("/api/admin/pdf-analytics/circuit-breakers",
+                                  headers={"X-Admin-Token": "expired"}).status_code == 403
+                resp = client.get("/api/admin/pdf-analytics/circuit-breakers",
+                                  headers={"Authorization": "Bearer tok"})
+            assert resp.status_code == 200, resp.status_code
+            data = resp.get_json()
+            assert data["open"] == ["core"], data
+            breaker = data["breakers"][0]
+            assert breaker["source_name"] == "core" and breaker["trips"] == 1
+            assert breaker["last_failure"] == "CORE API error: HTTP 503"
+            assert breaker["retry_at"] - breaker["opened_at"] == 600
+            assert data["timeouts"] == {"core": 15.0, "finder": 15.0}, data["timeouts"]
+
+        assert get_breaker_states()[0]["state"] == "open", "Breaker state is persisted"
+        print("✓ Downloads skip sources that are down")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("Source Health Tests")
+    print("=" * 70)
+    print()
+
+    # The PDF tracking database is created in the working directory
+    original_cwd = os.getcwd()
+    os.chdir(tmp_dir)
+    init_pdf_download_db()
+
+    tests = [
+        test_breaker_and_timeouts,
+        test_downloads_skip_open_circuits,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    # Write buffered download attempts before their database is removed
+    flush_download_attempts()
+    os.chdir(original_cwd)
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for source racing within a DOI (pdf_manager.download_pdf_smart)
+Tests that hedged mode starts the next source when a lookup is slower than its
+p50 latency or fails, that the first PDF URL wins and sources not yet started
+are skipped, that lookups still running when a race is won make no further
+requests, that every completed lookup is logged to download_attempts, and
+that the serial and parallel modes behave as configured.
+Source lookups and downloads are simulated so the test runs offline.
+"""
+
+import sys
+import os
+import tempfile
+import shutil
+import sqlite3
+import time
+from unittest import mock
+
+# Add parent directory to path to import harvest modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tmp_dir = tempfile.mkdtemp()
+os.environ["HARVEST_DB"] = os.path.join(tmp_dir, "harvest.db")
+
+import http_sessions
+import pdf_manager
+from pdf_download_db import flush_download_attempts, get_source_latency_p50, log_download_attempt
+from source_health import SourceHealth
+
+
+def fake_sources(behaviour, calls):
+    """try_source replacement: behaviour maps source -> (delay_seconds, pdf_url or None)"""
+    def try_source(source_name, doi, config):
+        calls.append((source_name, time.monotonic()))
+        delay, url = behaviour[source_name]
+        time.sleep(delay)
+        if url:
+            return True, url, int(delay * 1000)
+        return False, "404 Not Found", int(delay * 1000)
+    return try_source
+
+
+def run(doi, sources, behaviour, mode, width=3, hedge_delay_ms=200):
+    calls = []
+    rankings = [{"name": name, "enabled": 1, "requires_library": None, "success_rate": 0.0}
+                for name in sources]
+    with mock.patch.object(pdf_manager, "try_source", side_effect=fake_sources(behaviour, calls)), \
+            mock.patch.object(pdf_manager, "download_pdf", return_value=(True, "Downloaded")), \
+            mock.patch("pdf_download_db.get_source_rankings", return_value=rankings), \
+            mock.patch("pdf_download_db.get_best_source_for_publisher", return_value=None), \
+            mock.patch.object(pdf_manager, "PDF_SOURCE_ORDERING", "success_rate"), \
+            mock.patch.object(pdf_manager, "PDF_SOURCE_RACE_MODE", mode), \
+            mock.patch.object(pdf_manager, "PDF_SOURCE_RACE_WIDTH", width), \
+            mock.patch.object(pdf_manager, "PDF_SOURCE_HEDGE_DELAY_MS", hedge_delay_ms):
+        start = time.monotonic()
+        result = pdf_manager.download_pdf_smart(doi, 1, os.path.join(tmp_dir, "pdfs"))
+        elapsed = time.monotonic() - start
+    return result, elapsed, calls
+
+
+def logged_attempts(doi):
+    flush_download_attempts()
+    conn = sqlite3.connect("pdf_downloads.db")
+    rows = conn.execute("SELECT source_name, success FROM download_attempts WHERE doi = ? ORDER BY id",
+                        (doi,)).fetchall()
+    conn.close()
+    return rows
+
+
+def test_hedged_racing():
+    """Slow sources are hedged, failures start the next source, the first URL wins"""
+    print("Testing hedged source racing...")
+    try:
+        behaviour = {
+            "slow": (1.0, None),
+            "fast": (0.05, "https://fast.example.org/paper.pdf"),
+            "unused": (0.05, "https://unused.example.org/paper.pdf"),
+            "broken": (0.05, None),
+        }
+        result, elapsed, calls = run("10.1000/hedge", ["slow", "fast", "unused"], behaviour, "hedged")
+        assert result == (True, "Downloaded", "fast"), result
+        assert elapsed < 0.7, f"Hedge after the 200 ms delay, not after the 1 s lookup ({elapsed:.2f} s)"
+        assert [c[0] for c in calls] == ["slow", "fast"], "Sources after the winner are not started"
+
+        # The slow loser finishes in the background and is still logged
+        time.sleep(1.0)
+        assert sorted(logged_attempts("10.1000/hedge")) == [("fast", 1), ("slow", 0)]
+
+        # A failed lookup starts the next source without waiting for the hedge delay
+        result, elapsed, calls = run("10.1000/failover", ["broken", "fast"], behaviour, "hedged",
+                                     hedge_delay_ms=5000)
+        assert result[2] == "fast" and elapsed < 1.0, (result, elapsed)
+        assert logged_attempts("10.1000/failover") == [("broken", 0), ("fast", 1)]
+        print("✓ Hedged racing")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_losers_cancelled():
+    """A lookup still running when the race is won makes no further requests and is not counted"""
+    print("\nTesting cancellation of losing lookups...")
+    try:
+        second_request = []
+        real_try_source = fake_sources({"fast": (0.05, "https://fast.example.org/paper.pdf")}, [])
+
+        def try_source(source_name, doi, config):
+            if source_name != "two_step":
+                return real_try_source(source_name, doi, config)
+            time.sleep(1.0)  # First request in flight while "fast" wins
+            try:
+                http_sessions.get("https://two-step.invalid/pdf", timeout=5)
+                second_request.append("sent")
+            except Exception as e:
+                second_request.append(type(e).__name__)
+                return False, f"Two-step error: {e}", 400
+            return False, "Not found", 400
+
+        health = SourceHealth(persist=False)
+        rankings = [{"name": name, "enabled": 1, "requires_library": None, "success_rate": 0.0}
+                    for name in ("two_step", "fast")]
+        with mock.patch.object(pdf_manager, "try_source", side_effect=try_source), \
+                mock.patch.object(pdf_manager, "download_pdf", return_value=(True, "Downloaded")), \
+                mock.patch("pdf_download_db.get_source_rankings", return_value=rankings), \
+                mock.patch("pdf_download_db.get_best_source_for_publisher", return_value=None), \
+                mock.patch("source_health.get_source_health", return_value=health), \
+                mock.patch.object(health, "record", wraps=health.record) as record, \
+                mock.patch.object(pdf_manager, "PDF_SOURCE_ORDERING", "success_rate"), \
+                mock.patch.object(pdf_manager, "PDF_SOURCE_RACE_MODE", "hedged"), \
+                mock.patch.object(pdf_manager, "PDF_SOURCE_HEDGE_DELAY_MS", 100):
+            result = pdf_manager.download_pdf_smart("10.1000/cancel", 1, os.path.join(tmp_dir, "pdfs"))
+            assert result == (True, "Downloaded", "fast"), result
+            time.sleep(1.2)
+
+        assert second_request == ["RequestCancelled"], second_request
+        assert [c.args[0] for c in record.call_args_list] == ["fast"], "Cancelled lookups do not touch breakers"
+        assert logged_attempts("10.1000/cancel") == [("fast", 1)], "Cancelled lookups are not logged"
+        print("✓ Losing lookups cancelled")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_serial_parallel_and_latency():
+    """Serial keeps one lookup in flight, parallel starts the top-k at once; p50 per source"""
+    print("\nTesting serial and parallel modes...")
+    try:
+        behaviour = {
+            "first": (0.3, "https://first.example.org/paper.pdf"),
+            "second": (0.05, "https://second.example.org/paper.pdf"),
+            "miss": (0.1, None),
+        }
+        result, _, calls = run("10.1000/parallel", ["first", "second"], behaviour, "parallel", width=2)
+        assert result[2] == "second", "The first URL to arrive wins"
+        assert abs(calls[0][1] - calls[1][1]) < 0.1, "Both lookups start together"
+
+        result, _, calls = run("10.1000/serial", ["miss", "first", "second"], behaviour, "serial")
+        assert result[2] == "first"
+        assert [c[0] for c in calls] == ["miss", "first"]
+        assert calls[1][1] - calls[0][1] >= 0.1, "Serial mode waits for each lookup"
+
+        for ms in (100, 300, 200, 500, 400):
+            log_download_attempt(2, "10.1000/x", "timed", False, "timeout", "timeout", ms)
+        log_download_attempt(2, "10.1000/x", "sparse", True, response_time_ms=50)
+        flush_download_attempts()
+        latencies = get_source_latency_p50()
+        assert latencies["timed"] == 300.0 and "sparse" not in latencies, latencies
+        assert get_source_latency_p50(window=2, min_samples=2)["timed"] == 450.0, "Only recent attempts count"
+        print("✓ Serial and parallel modes")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("Source Racing Tests")
+    print("=" * 70)
+    print()
+
+    # The PDF tracking database is created in the working directory
+    original_cwd = os.getcwd()
+    os.chdir(tmp_dir)
+
+    tests = [
+        test_hedged_racing,
+        test_losers_cancelled,
+        test_serial_parallel_and_latency,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    # Lookups still in flight when a race was won log their attempts late
+    flush_download_attempts()
+    os.chdir(original_cwd)
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
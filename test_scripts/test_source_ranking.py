@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for the time-decayed, per-prefix source ordering (source_ranking.py)
+Tests that download attempts maintain decayed success/latency statistics per
+(source, DOI prefix), and that the Thompson-sampling ranker orders sources per
+prefix by expected cost to success, lets stale successes fade, and serves
+rankings from memory between refreshes.
+"""
+
+import sys
+import os
+import tempfile
+import shutil
+import random
+import time
+from unittest import mock
+
+# Add parent directory to path to import harvest modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tmp_dir = tempfile.mkdtemp()
+os.environ["HARVEST_DB"] = os.path.join(tmp_dir, "harvest.db")
+
+import pdf_download_db
+from pdf_download_db import get_source_prefix_stats, init_pdf_download_db, write_download_attempts
+from source_ranking import SourceRanker
+
+DAY = 86400.0
+HALF_LIFE = pdf_download_db.PDF_SOURCE_STATS_HALF_LIFE_DAYS * DAY
+
+
+def attempts(source_name, doi_prefix, count, success, response_time_ms=None):
+    return [(1, f"{doi_prefix}/paper.{i}", source_name, int(success), None, None,
+             response_time_ms, None, None, None, None) for i in range(count)]
+
+
+def write_at(when, rows):
+    with mock.patch.object(pdf_download_db.time, "time", return_value=when):
+        assert write_download_attempts(rows) > 0
+
+
+def stats_for(source_name, doi_prefix):
+    for row in get_source_prefix_stats():
+        if (row["source_name"], row["doi_prefix"]) == (source_name, doi_prefix):
+            return row
+    return None
+
+
+def test_decayed_prefix_stats():
+    """Attempts update decayed per-prefix statistics; URL download failures count against the source"""
+    print("Testing decayed per-prefix statistics...")
+    try:
+        start = time.time()
+        write_at(start, attempts("unpaywall", "10.1000", 10, True, 100))
+        write_at(start + HALF_LIFE, attempts("unpaywall", "10.1000", 10, False, 300)
+                 + attempts("unpaywall", "10.2000", 4, True))
+        write_at(start + HALF_LIFE, attempts("core", "10.1000", 1, True, 200)
+                 + attempts("core_download", "10.1000", 1, False))
+
+        row = stats_for("unpaywall", "10.1000")
+        assert abs(row["successes"] - 5.0) < 1e-9 and abs(row["failures"] - 10.0) < 1e-9, row
+        # 5 decayed observations of 100ms and 10 fresh ones of 300ms
+        assert abs(row["latency_weight"] - 15.0) < 1e-9 and abs(row["latency_ms"] - 700 / 3) < 1e-6, row
+        assert row["updated_at"] == start + HALF_LIFE
+
+        other = stats_for("unpaywall", "10.2000")
+        assert (other["successes"], other["failures"], other["latency_weight"]) == (4.0, 0.0, 0.0), other
+        core = stats_for("core", "10.1000")
+        assert (core["successes"], core["failures"]) == (1.0, 1.0), "A failed download counts for the source"
+        assert stats_for("core_download", "10.1000") is None
+
+        assert abs(pdf_download_db.decay_factor(2 * HALF_LIFE) - 0.25) < 1e-12
+        assert pdf_download_db.decay_factor(-DAY) == 1.0, "Out-of-order writes are not boosted"
+        print("✓ Decayed statistics per (source, prefix)")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_thompson_ranking():
+    """Sources are ranked per prefix, stale successes fade and rankings are cached"""
+    print("\nTesting Thompson-sampling source ranking...")
+    try:
+        now = time.time()
+        write_at(now, attempts("europe_pmc", "10.3000", 40, True, 500)
+                 + attempts("core", "10.3000", 40, False, 400)
+                 + attempts("core", "10.4000", 40, True, 500)
+                 + attempts("europe_pmc", "10.4000", 40, False, 400))
+        # Unpaywall was excellent for 10.3000 a year ago but fails now
+        write_at(now - 365 * DAY, attempts("unpaywall", "10.3000", 200, True, 1000))
+        write_at(now, attempts("unpaywall", "10.3000", 20, False, 1000))
+
+        ranker = SourceRanker(refresh_seconds=3600, rng=random.Random(0))
+        with mock.patch("pdf_download_db.get_source_rankings",
+                        wraps=pdf_download_db.get_source_rankings) as rankings:
+            failing_positions = []
+            for _ in range(20):
+                first = [s["name"] for s in ranker.rank("10.3000")]
+                second = [s["name"] for s in ranker.rank("10.4000")]
+                assert first[0] == "europe_pmc" and second[0] == "core", (first, second)
+                assert first.index("unpaywall") > first.index("europe_pmc"), first
+                failing_positions += [first.index("core"), second.index("europe_pmc")]
+            # Failing sources mostly rank behind the untried ones
+            assert sum(failing_positions) / len(failing_positions) >= 5, failing_positions
+            assert rankings.call_count == 1, "Rankings are served from memory between refreshes"
+
+            # New data is picked up after a refresh
+            write_at(time.time(), attempts("zenodo", "10.5000", 30, True, 50))
+            ranker.rank("10.5000")
+            assert rankings.call_count == 1
+            ranker.invalidate()
+            assert ranker.rank("10.5000")[0]["name"] == "zenodo"
+            assert rankings.call_count == 2
+
+        ranked = {s["name"]: s for s in ranker.rank("10.3000")}
+        assert ranked["europe_pmc"]["expected_cost_ms"] >= 500, "Cost is latency over success probability"
+        assert {"priority", "requires_library", "enabled"} <= set(ranked["europe_pmc"])
+        assert ranked["zenodo"]["expected_cost_ms"] < ranked["core"]["expected_cost_ms"], \
+            "A source's overall record carries over to prefixes it has not seen"
+
+        # A prefix never seen borrows the source's overall record
+        alpha, beta, latency = ranker.estimate({"name": "core"}, "10.9999")
+        assert abs(alpha + beta - 4.0) < 1e-9 and alpha > 1.5 and latency > 400, (alpha, beta, latency)
+        alpha, beta, latency = ranker.estimate({"name": "unknown", "total_attempts": 0}, "10.9999")
+        assert (alpha, beta, latency) == (1.0, 1.0, ranker.default_latency_ms)
+        print("✓ Per-prefix Thompson ranking")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("Source Ranking Tests")
+    print("=" * 70)
+    print()
+
+    # The PDF tracking database is created in the working directory
+    original_cwd = os.getcwd()
+    os.chdir(tmp_dir)
+    init_pdf_download_db()
+
+    tests = [
+        test_decayed_prefix_stats,
+        test_thompson_ranking,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    os.chdir(original_cwd)
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
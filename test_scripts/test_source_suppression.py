@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for skipping sources that never have a publisher's papers
+Tests that not_found/paywall answers build a per-(source, DOI prefix) failure
+model (also from the attempt history of existing databases), that a source is
+suppressed only once its hit rate is confidently near zero and is still
+re-probed now and then, and that jobs report the lookups saved.
+Lookups are simulated so the test runs offline.
+"""
+
+import sys
+import os
+import tempfile
+import shutil
+import random
+import sqlite3
+from unittest import mock
+
+# Add parent directory to path to import harvest modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tmp_dir = tempfile.mkdtemp()
+os.environ["HARVEST_DB"] = os.path.join(tmp_dir, "harvest.db")
+
+import pdf_manager
+import source_ranking
+from host_limiter import HostLimiter
+from pdf_download_db import (
+    flush_download_attempts, get_source_prefix_stats, init_pdf_download_db, write_download_attempts
+)
+from source_ranking import SourceRanker
+
+
+def attempts(source_name, doi_prefix, count, success, failure_category=None):
+    return [(1, f"{doi_prefix}/paper.{i}", source_name, int(success), None, failure_category,
+             100, None, None, None, None) for i in range(count)]
+
+
+def test_failure_model():
+    """Only confident, permanent misses suppress a source; suppressed sources are re-probed"""
+    print("Testing per-prefix failure model...")
+    try:
+        write_download_attempts(
+            attempts("zenodo", "10.1000", 120, False, "not_found")
+            + attempts("doaj", "10.1000", 120, False, "timeout")
+            + attempts("arxiv_enhanced", "10.1000", 30, False, "not_found")
+            + attempts("zenodo", "10.2000", 120, False, "not_found")
+            + attempts("zenodo", "10.2000", 6, True)
+        )
+        ranker = SourceRanker(reprobe_rate=0.1, rng=random.Random(1))
+        assert ranker.is_suppressed("zenodo", "10.1000")
+        assert not ranker.is_suppressed("doaj", "10.1000"), "Timeouts are no evidence"
+        assert not ranker.is_suppressed("arxiv_enhanced", "10.1000"), "30 misses are not yet confident"
+        assert not ranker.is_suppressed("zenodo", "10.2000"), "The source does carry this publisher"
+        assert not ranker.is_suppressed("zenodo", "10.3000"), "Unknown prefixes are not suppressed"
+
+        skips = sum(ranker.should_skip("zenodo", "10.1000") for _ in range(1000))
+        assert 850 < skips < 950, f"About 10% of DOIs re-probe the source: {skips} skipped"
+        assert not any(ranker.should_skip("doaj", "10.1000") for _ in range(100))
+
+        assert source_ranking.hit_rate_upper_bound(0, 0) == 1.0
+        assert source_ranking.hit_rate_upper_bound(0, 80) < 0.05 < source_ranking.hit_rate_upper_bound(0, 70)
+
+        # Databases from before the failure model rebuild it from download_attempts
+        conn = sqlite3.connect("pdf_downloads.db")
+        conn.execute("DROP TABLE source_prefix_stats")
+        conn.commit()
+        conn.close()
+        init_pdf_download_db()
+        rebuilt = {(r["source_name"], r["doi_prefix"]): r for r in get_source_prefix_stats()}
+        zenodo = rebuilt[("zenodo", "10.2000")]
+        assert abs(zenodo["successes"] - 6) < 1e-3 and abs(zenodo["permanent_failures"] - 120) < 1e-2, zenodo
+        assert rebuilt[("doaj", "10.1000")]["permanent_failures"] == 0
+        assert round(rebuilt[("doaj", "10.1000")]["latency_ms"], 6) == 100
+        ranker.invalidate()
+        assert ranker.is_suppressed("zenodo", "10.1000") and not ranker.is_suppressed("zenodo", "10.2000")
+        print("✓ Failure model suppresses confident misses only")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_job_skips_and_reports_savings():
+    """A job skips suppressed sources and reports the lookups saved"""
+    print("\nTesting suppression in download jobs...")
+    try:
+        write_download_attempts(attempts("nowhere", "10.7000", 100, False, "not_found")
+                                + attempts("elsewhere", "10.7000", 100, False, "paywall"))
+        lookups = []
+
+        def try_source(source_name, doi, config):
+            lookups.append(source_name)
+            if source_name == "finder":
+                return True, f"https://finder.example/{doi}.pdf", 10
+            return False, "Not found", 10
+
+        rankings = [{"name": name, "enabled": 1, "requires_library": None, "success_rate": 0.0}
+                    for name in ("nowhere", "finder", "elsewhere", "unknown")]
+        ranker = SourceRanker(reprobe_rate=0.0)
+        dois = [f"10.7000/job.{i}" for i in range(5)]
+        with mock.patch.object(pdf_manager, "try_source", side_effect=try_source), \
+                mock.patch.object(pdf_manager, "download_pdf", return_value=(True, "Downloaded")), \
+                mock.patch("pdf_download_db.get_source_rankings", return_value=rankings), \
+                mock.patch("pdf_download_db.get_best_source_for_publisher", return_value=None), \
+                mock.patch("source_ranking.get_source_ranker", return_value=ranker), \
+                mock.patch("host_limiter.get_host_limiter", return_value=HostLimiter(default_rps=0)), \
+                mock.patch.object(pdf_manager, "PDF_SOURCE_ORDERING", "success_rate"), \
+                mock.patch.object(pdf_manager, "PDF_SOURCE_RACE_MODE", "serial"):
+            results = pdf_manager.process_dois_smart(dois, 3, os.path.join(tmp_dir, "project_3"))
+
+            assert len(results["downloaded"]) == 5
+            assert "nowhere" not in lookups and "elsewhere" not in lookups, lookups
+            assert lookups.count("finder") == 5
+            # "elsewhere" is ranked after the source that found the PDFs, so it saved nothing
+            assert results["suppression"] == {"requests_saved": 5, "skipped": {"nowhere": 5, "elsewhere": 5}}, \
+                results["suppression"]
+
+            # When nothing is found, every skipped lookup is saved
+            lookups.clear()
+            with mock.patch.object(pdf_manager, "download_pdf", return_value=(False, "Download failed: HTTP 404")):
+                resolution = {}
+                result = pdf_manager.download_pdf_smart("10.7000/missing", 3, os.path.join(tmp_dir, "project_3"),
+                                                        resolution=resolution)
+            assert not result[0] and resolution["requests_saved"] == 2
+            assert resolution["suppressed"] == ["nowhere", "elsewhere"]
+            assert lookups == ["finder", "unknown"], lookups
+
+        with mock.patch.object(pdf_manager, "PDF_SOURCE_SUPPRESSION", False), \
+                mock.patch.object(pdf_manager, "try_source", side_effect=try_source), \
+                mock.patch.object(pdf_manager, "download_pdf", return_value=(False, "Download failed")), \
+                mock.patch("pdf_download_db.get_source_rankings", return_value=rankings), \
+                mock.patch("pdf_download_db.get_best_source_for_publisher", return_value=None), \
+                mock.patch("source_ranking.get_source_ranker", return_value=ranker), \
+                mock.patch("host_limiter.get_host_limiter", return_value=HostLimiter(default_rps=0)), \
+                mock.patch.object(pdf_manager, "PDF_SOURCE_ORDERING", "success_rate"), \
+                mock.patch.object(pdf_manager, "PDF_SOURCE_RACE_MODE", "serial"):
+            lookups.clear()
+            pdf_manager.download_pdf_smart("10.7000/all", 3, os.path.join(tmp_dir, "project_3"))
+            assert lookups == ["nowhere", "finder", "elsewhere", "unknown"], "Suppression can be turned off"
+        print("✓ Jobs skip suppressed sources and report savings")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("Source Suppression Tests")
+    print("=" * 70)
+    print()
+
+    # The PDF tracking database is created in the working directory
+    original_cwd = os.getcwd()
+    os.chdir(tmp_dir)
+    init_pdf_download_db()
+
+    tests = [
+        test_failure_model,
+        test_job_skips_and_reports_savings,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    # Write buffered download attempts before their database is removed
+    flush_download_attempts()
+    os.chdir(original_cwd)
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
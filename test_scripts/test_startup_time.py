@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for lazy start-up of the backend and frontend
+Tests that importing harvest_be creates no databases or directories and
+loads no heavy optional dependencies, that boot() (explicit, or run before
+the first request) creates the schemas, and that scripts/benchmark_startup.py
+passes within budget and fails when a budget is exceeded.
+"""
+
+import sys
+import os
+import tempfile
+import shutil
+import subprocess
+
+# Add parent directory to path to import harvest modules
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+tmp_dir = tempfile.mkdtemp()
+
+CHECK_IMPORT = """
+import os, sys
+import harvest_be
+eager = [m for m in ("literature_search", "sentence_transformers", "metapub", "habanero", "fitz") if m in sys.modules]
+assert not eager, f"Imported at start-up: {eager}"
+assert not os.path.exists(os.path.dirname(harvest_be.DB_PATH)), "Import must not create the database or its directory"
+assert not os.path.exists("pdf_downloads.db"), "Import must not create the PDF tracking database"
+
+client = harvest_be.app.test_client()
+assert client.get("/api/projects").status_code == 200, "First request boots the backend"
+assert os.path.exists(harvest_be.DB_PATH) and os.path.exists("pdf_downloads.db")
+harvest_be.boot()  # idempotent
+print("BOOT_OK")
+"""
+
+
+def _run(args, cwd, **env):
+    return subprocess.run(
+        [sys.executable] + args, cwd=cwd, capture_output=True, text=True, timeout=300,
+        env={**os.environ, "PYTHONPATH": REPO_DIR, "HARVEST_JOB_WORKER_MODE": "external", **env},
+    )
+
+
+def test_import_has_no_side_effects():
+    """Importing harvest_be is side-effect free; boot() runs before the first request"""
+    print("Testing lazy backend boot...")
+    try:
+        work_dir = os.path.join(tmp_dir, "backend")
+        os.makedirs(work_dir)
+        result = _run(["-c", CHECK_IMPORT], work_dir, HARVEST_DB=os.path.join(work_dir, "data", "harvest.db"))
+        assert "BOOT_OK" in result.stdout, result.stdout[-1000:] + result.stderr[-2000:]
+        print("✓ Import is side-effect free and boot() runs on first request")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_startup_benchmark_budget():
+    """The start-up benchmark passes within budget and fails past it"""
+    print("\nTesting start-up benchmark...")
+    try:
+        script = os.path.join(REPO_DIR, "scripts", "benchmark_startup.py")
+        result = _run([script, "--targets", "backend", "worker", "--repeat", "1"], tmp_dir)
+        assert result.returncode == 0, result.stdout[-2000:] + result.stderr[-2000:]
+        assert "backend (import harvest_be)" in result.stdout and "within budget" in result.stdout
+
+        result = _run([script, "--targets", "backend", "--repeat", "1", "--budget", "backend=1"], tmp_dir)
+        assert result.returncode == 1, "Exceeding the budget fails the check"
+        assert "OVER BUDGET" in result.stdout and "backend:" in result.stdout
+        print("✓ Benchmark enforces the start-up budget")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print("Start-up Time Tests")
+    print("=" * 70)
+    print()
+
+    tests = [
+        test_import_has_no_side_effects,
+        test_startup_benchmark_budget,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            results.append(test())
+        except Exception as e:
+            print(f"✗ Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print()
+    print("=" * 70)
+    passed = sum(results)
+    total = len(results)
+    print(f"Results: {passed}/{total} tests passed")
+    print("=" * 70)
+
+    if all(results):
+        print("\n✓ All tests passed!")
+        return 0
+    else:
+        print("\n✗ Some tests failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
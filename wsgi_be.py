@@ -9,6 +9,10 @@ Usage:
     
 Or with systemd service:
     ExecStart=/path/to/venv/bin/gunicorn -w 4 -b 127.0.0.1:5001 wsgi_be:app
+
+Live download progress streams (PROGRESS_STREAM_ENABLED) hold a worker each;
+enable them only with threaded workers:
+    gunicorn -w 4 --worker-class gthread --threads 16 -b 127.0.0.1:5001 wsgi_be:app
 """
 
 import os
@@ -18,8 +22,9 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Import the Flask app from harvest_be
-from harvest_be import app
+# Import the Flask app from harvest_be and create directories and schemas
+from harvest_be import app, boot
+boot()
 
 # Note: Avoid DB side effects at import time. If cleanup is desired on startup,
 # configure a Gunicorn server hook (e.g., post_fork) or run a periodic job.
@@ -7,13 +7,16 @@ This file is used by production WSGI servers like Gunicorn.
 Usage:
     gunicorn -w 4 -b 0.0.0.0:8050 wsgi_fe:server
     
-Or with systemd service (recommended - prevents bytecode caching issues):
+Or with systemd service:
     [Service]
-    Environment="PYTHONDONTWRITEBYTECODE=1"
     ExecStart=/path/to/venv/bin/gunicorn -w 4 -b 0.0.0.0:8050 wsgi_fe:server
     
-This prevents Python bytecode (.pyc) generation which can cause stale callback
-registration issues when code is updated. See harvest_fe.py for details.
+The frontend package keeps source-hash-checked bytecode (FRONTEND_BYTECODE_MODE in
+config.py), so workers start without recompiling and never register stale callbacks
+after code updates. Set PYTHONDONTWRITEBYTECODE=1 to disable bytecode caching.
+
+The /proxy/download-events route holds a worker per open stream; with
+PROGRESS_STREAM_ENABLED run threaded workers (--worker-class gthread --threads 16).
 """
 
 import os